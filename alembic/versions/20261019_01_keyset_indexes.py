@@ -0,0 +1,33 @@
+"""Composite (created_at, id) indexes for keyset pagination.
+
+Revision ID: 20261019_01_keyset_indexes
+Revises: 20260213_01_donation_sender
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261019_01_keyset_indexes"
+down_revision: str | None = "20260213_01_donation_sender"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_accrual_user_created_id", "reward_accruals", ["user_id", "created_at", "id"]
+    )
+    op.drop_index("ix_accrual_user_created", table_name="reward_accruals")
+    op.create_index("ix_payout_user_created_id", "payouts", ["user_id", "created_at", "id"])
+    op.drop_index("ix_payout_user_created", table_name="payouts")
+    op.create_index("ix_admin_audit_created_id", "admin_audit", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_admin_audit_created_id", table_name="admin_audit")
+    op.create_index("ix_payout_user_created", "payouts", ["user_id", "created_at"])
+    op.drop_index("ix_payout_user_created_id", table_name="payouts")
+    op.create_index("ix_accrual_user_created", "reward_accruals", ["user_id", "created_at"])
+    op.drop_index("ix_accrual_user_created_id", table_name="reward_accruals")
@@ -0,0 +1,41 @@
+"""Covering/composite indexes for settlement, cap-window, feed and donor queries.
+
+Revision ID: 20261019_02_hot_query_indexes
+Revises: 20261019_01_keyset_indexes
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20261019_02_hot_query_indexes"
+down_revision: str | None = "20261019_01_keyset_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_accrual_settled_user",
+        "reward_accruals",
+        ["settled", "user_id", "kills", "amount_ban"],
+    )
+    op.drop_index("ix_accrual_settled", table_name="reward_accruals")
+    op.create_index(
+        "ix_accrual_payout", "reward_accruals", ["payout_id", "user_id", "kills", "amount_ban"]
+    )
+    op.create_index("ix_accrual_created", "reward_accruals", ["created_at"])
+    op.create_index("ix_payout_status_created", "payouts", ["status", "created_at", "amount_ban"])
+    op.create_index("ix_payout_created", "payouts", ["created_at"])
+    op.create_index("ix_donation_sender", "donation_ledger", ["sender_address", "amount_ban"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_donation_sender", table_name="donation_ledger")
+    op.drop_index("ix_payout_created", table_name="payouts")
+    op.drop_index("ix_payout_status_created", table_name="payouts")
+    op.drop_index("ix_accrual_created", table_name="reward_accruals")
+    op.drop_index("ix_accrual_payout", table_name="reward_accruals")
+    op.create_index("ix_accrual_settled", "reward_accruals", ["settled"])
+    op.drop_index("ix_accrual_settled_user", table_name="reward_accruals")
@@ -0,0 +1,46 @@
+"""Add user_daily_summaries for retention rollups.
+
+Revision ID: 20261019_03_user_daily_summaries
+Revises: 20261019_02_hot_query_indexes
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "20261019_03_user_daily_summaries"
+down_revision: str | None = "20261019_02_hot_query_indexes"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_daily_summaries",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "user_id", sa.Integer(), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        ),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("kills", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("accrued_ban", sa.Numeric(18, 8), nullable=False, server_default="0"),
+        sa.Column("accrual_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("paid_ban", sa.Numeric(18, 8), nullable=False, server_default="0"),
+        sa.Column("payout_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.UniqueConstraint("user_id", "day", name="uq_summary_user_day"),
+    )
+    op.create_index(
+        "ix_summary_user_totals",
+        "user_daily_summaries",
+        ["user_id", "kills", "accrued_ban", "paid_ban"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_summary_user_totals", table_name="user_daily_summaries")
+    op.drop_table("user_daily_summaries")
@@ -0,0 +1,26 @@
+"""Money columns follow P2S_MONEY_STORAGE (Numeric(18, 8) or BigInteger 1e-8 units).
+
+Revision ID: 20261019_04_money_storage
+Revises: 20261019_03_user_daily_summaries
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+from src.models.base import Base
+from src.models.types import STORAGE_DECIMAL, convert_money_columns
+
+revision: str = "20261019_04_money_storage"
+down_revision: str | None = "20261019_03_user_daily_summaries"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # No-op unless P2S_MONEY_STORAGE=integer; idempotent. Processes pin the stored type.
+    convert_money_columns(op.get_bind(), Base.metadata)
+
+
+def downgrade() -> None:
+    convert_money_columns(op.get_bind(), Base.metadata, STORAGE_DECIMAL)
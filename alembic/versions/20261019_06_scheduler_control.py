@@ -0,0 +1,47 @@
+"""Add scheduler_commands and scheduler_heartbeat for the scheduler control channel.
+
+Revision ID: 20261019_06_scheduler_control
+Revises: 20261019_05_scheduler_lease
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "20261019_06_scheduler_control"
+down_revision: str | None = "20261019_05_scheduler_lease"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_commands",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("action", sa.String(32), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False, server_default="pending"),
+        sa.Column("requested_by", sa.String(255), nullable=True),
+        sa.Column("claimed_by", sa.String(255), nullable=True),
+        sa.Column("progress", sa.Text(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_scheduler_commands_status", "scheduler_commands", ["status", "id"])
+    op.create_table(
+        "scheduler_heartbeat",
+        sa.Column("name", sa.String(64), primary_key=True),
+        sa.Column("holder", sa.String(255), nullable=False),
+        sa.Column("data", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_heartbeat")
+    op.drop_index("ix_scheduler_commands_status", table_name="scheduler_commands")
+    op.drop_table("scheduler_commands")
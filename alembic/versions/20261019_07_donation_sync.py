@@ -0,0 +1,35 @@
+"""Add donation_ledger.block_hash and donation_sync_cursor for incremental chain sync.
+
+Revision ID: 20261019_07_donation_sync
+Revises: 20261019_06_scheduler_control
+Create Date: 2026-10-19
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "20261019_07_donation_sync"
+down_revision: str | None = "20261019_06_scheduler_control"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column("donation_ledger", sa.Column("block_hash", sa.String(64), nullable=True))
+    op.create_index("uq_donation_block_hash", "donation_ledger", ["block_hash"], unique=True)
+    op.create_table(
+        "donation_sync_cursor",
+        sa.Column("account", sa.String(128), primary_key=True),
+        sa.Column("block_hash", sa.String(64), nullable=False),
+        sa.Column("height", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("donation_sync_cursor")
+    op.drop_index("uq_donation_block_hash", table_name="donation_ledger")
+    op.drop_column("donation_ledger", "block_hash")
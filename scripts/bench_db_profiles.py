@@ -0,0 +1,144 @@
+"""Read/write concurrency benchmark for the SQLite engine profiles.
+
+One writer thread mimics settlement: each transaction updates every accrual
+row (more pages than the page cache holds, so a rollback-journal writer must
+take the exclusive lock) and then keeps the transaction open for a few
+milliseconds. Reader threads run short primary-key lookups like the /me routes.
+The same workload runs once per profile against a fresh database file and
+reports reader latency and throughput.
+
+    python scripts/bench_db_profiles.py [--seconds 3] [--readers 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.lib.db import PROFILES, make_engine, make_read_engine
+
+ROWS = 100_000
+WRITE_HOLD_SECONDS = 0.05
+WRITE_PAUSE_SECONDS = 0.05
+
+
+@dataclass
+class BenchResult:
+    profile: str
+    reads: int
+    read_errors: int
+    writes: int
+    read_p95_ms: float
+    read_median_ms: float
+    read_max_ms: float
+
+    def line(self) -> str:
+        return (
+            f"{self.profile:<11} reads={self.reads:<6} errors={self.read_errors:<4} "
+            f"writes={self.writes:<4} read_p95={self.read_p95_ms:8.2f}ms "
+            f"read_median={self.read_median_ms:6.2f}ms read_max={self.read_max_ms:8.2f}ms"
+        )
+
+
+def _p95(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)] if ordered else 0.0
+
+
+def run_profile(profile: str, db_path: Path, seconds: float, readers: int) -> BenchResult:
+    writer = make_engine(f"sqlite:///{db_path}", profile)
+    with writer.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE accruals (id INTEGER PRIMARY KEY, user_id INT, kills INT, memo TEXT)"
+            )
+        )
+        conn.execute(
+            text("INSERT INTO accruals (user_id, kills, memo) VALUES (:u, 0, :m)"),
+            [{"u": i % 50, "m": "x" * 64} for i in range(ROWS)],
+        )
+    # The split reader only exists where the profile can serve it (WAL).
+    reader = make_read_engine(writer, replica_url="")
+    read_engine = reader or writer
+
+    stop = threading.Event()
+    latencies: list[float] = []
+    counts = {"errors": 0, "writes": 0}
+    lock = threading.Lock()
+
+    def write_loop() -> None:
+        while not stop.is_set():
+            with writer.begin() as conn:
+                conn.execute(text("UPDATE accruals SET kills = kills + 1"))
+                time.sleep(WRITE_HOLD_SECONDS)  # slow settlement work inside the txn
+            counts["writes"] += 1
+            time.sleep(WRITE_PAUSE_SECONDS)
+
+    def read_loop() -> None:
+        n = 0
+        while not stop.is_set():
+            n += 7919
+            start = time.perf_counter()
+            try:
+                with read_engine.connect() as conn:
+                    conn.execute(
+                        text("SELECT kills FROM accruals WHERE id = :id"), {"id": n % ROWS + 1}
+                    ).scalar()
+            except OperationalError:
+                with lock:
+                    counts["errors"] += 1
+                continue
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=write_loop)] + [
+        threading.Thread(target=read_loop) for _ in range(readers)
+    ]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+    writer.dispose()
+    if reader is not None:
+        reader.dispose()
+    return BenchResult(
+        profile=profile,
+        reads=len(latencies),
+        read_errors=counts["errors"],
+        writes=counts["writes"],
+        read_p95_ms=_p95(latencies),
+        read_median_ms=statistics.median(latencies) if latencies else 0.0,
+        read_max_ms=max(latencies, default=0.0),
+    )
+
+
+def run(seconds: float = 3.0, readers: int = 4) -> dict[str, BenchResult]:
+    results: dict[str, BenchResult] = {}
+    with tempfile.TemporaryDirectory(prefix="p2s_bench_") as tmp:
+        for name in PROFILES:
+            results[name] = run_profile(name, Path(tmp) / f"{name}.db", seconds, readers)
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+    for result in run(args.seconds, args.readers).values():
+        print(result.line())
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
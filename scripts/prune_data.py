@@ -1,36 +1,61 @@
-"""T070: Data retention pruning placeholder.
+"""Data retention: summarize, archive and delete rows older than the retention window.
 
-Intended to prune old accrual, payout, and audit rows based on retention policy.
-Currently a no-op with logging scaffolding.
+Settled accruals and their sent payouts are folded into ``user_daily_summaries``
+(so leaderboards and totals stay exact), old ``verification_records`` (except
+each user's latest) and ``admin_audit`` rows are archived as gzip NDJSON under
+``P2S_ARCHIVE_DIR`` and deleted in bounded batches.
+See ``src.services.domain.retention_service``.
+
+    python scripts/prune_data.py [--days 90] [--batch-size 500] [--dry-run]
+
+The scheduler runs the same job when ``P2S_RETENTION_DAYS`` is set.
 """
 
 from __future__ import annotations
 
-from datetime import UTC, datetime, timedelta
+import argparse
+import json
+from dataclasses import replace
 
-from src.lib.config import get_config
 from src.lib.db import make_engine, make_session_factory
 from src.lib.observability import get_logger
 from src.models import models  # noqa: F401
 from src.models.base import Base
+from src.models.types import pin_money_storage
+from src.services.domain.retention_service import RetentionPolicy, RetentionReport, run_retention
 
 LOG = get_logger(__name__)
 
 
-def prune(retention_days: int = 90) -> None:  # pragma: no cover (placeholder)
-    cfg = get_config()
-    engine = make_engine(cfg.database_url)
+def prune(
+    retention_days: int | None = None,
+    *,
+    dry_run: bool = False,
+    batch_size: int | None = None,
+) -> RetentionReport:
+    engine = make_engine()  # DATABASE_URL
+    pin_money_storage(engine, Base.metadata)
     Base.metadata.create_all(bind=engine)
-    session_factory = make_session_factory(engine)
-    session = session_factory()
+    policy = RetentionPolicy.from_env(retention_days)
+    if batch_size:
+        policy = replace(policy, batch_size=batch_size)
+    session = make_session_factory(engine)()
     try:
-        cutoff = datetime.now(UTC) - timedelta(days=retention_days)
-        LOG.info("prune_start", cutoff=str(cutoff.date()))
-        # TODO: Implement deletion logic for RewardAccrual, Payout, AdminAudit older than cutoff
-        LOG.info("prune_complete", deleted_counts={})
+        return run_retention(session, policy, dry_run=dry_run)
     finally:
         session.close()
+        engine.dispose()
+
+
+def main() -> None:  # pragma: no cover - CLI wrapper
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=None, help="retention window (days)")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--dry-run", action="store_true", help="report counts only")
+    args = parser.parse_args()
+    report = prune(args.days, dry_run=args.dry_run, batch_size=args.batch_size)
+    print(json.dumps(report.as_dict(), indent=2))
 
 
 if __name__ == "__main__":  # pragma: no cover
-    prune()
+    main()
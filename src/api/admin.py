@@ -3,6 +3,7 @@ import os
 import time as _time
 from collections.abc import Generator
 from datetime import UTC, datetime
+from decimal import Decimal
 from pathlib import Path
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
@@ -11,10 +12,22 @@ from prometheus_client import Counter
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from src.api.deps import get_db, get_read_db
+from src.lib import events
 from src.lib.admin_audit import AdminAuditPayload, record_admin_audit
 from src.lib.auth import issue_admin_session, session_secret, verify_admin_session, verify_session
-from src.lib.crypto import decrypt_value, encrypt_value, validate_banano_seed
+from src.lib.crypto import encrypt_value, validate_banano_seed
 from src.lib.observability import get_logger
+from src.lib.pagination import InvalidCursorError, decode_cursor, keyset_after, next_cursor
+from src.lib.runtime_overrides import get_runtime_overrides
+from src.lib.scheduler_control import (
+    ACTION_RELOAD,
+    ACTION_SETTLE,
+    ACTION_TRIGGER,
+    ControlChannel,
+    configure_control_channel,
+    get_control_channel,
+)
 from src.models.models import (
     AbuseFlag,
     AdminAudit,
@@ -25,8 +38,15 @@ from src.models.models import (
     User,
     VerificationRecord,
 )
-from src.services.banano_client import BananoClient, seed_to_address
+from src.services.banano_client import BananoClient
+from src.services.domain.retention_service import summary_grand_totals
 from src.services.fortnite_service import FortniteService, seed_kill_baseline
+from src.services.operator_identity import (
+    get_operator_identity,
+    invalidate_operator_identity,
+    load_operator_seed,
+    resolve_operator_account,
+)
 from src.services.yunite_service import YuniteService
 
 router = APIRouter(prefix="/admin")
@@ -46,15 +66,6 @@ ADMIN_PAYOUT_RETRY_TOTAL = Counter(
 )
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 def _require_admin(request: Request) -> None:
     token = request.cookies.get("p2s_admin")
     email = verify_admin_session(token, session_secret()) if token else None
@@ -66,7 +77,7 @@ def _require_admin(request: Request) -> None:
 def admin_login(
     request: Request,
     email: str = Body(None, embed=True),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     # Check if user is logged in via Discord and has an allowed username
     token = request.cookies.get("p2s_session")
@@ -134,7 +145,7 @@ def admin_reverify(
     request: Request,
     discord_id: str = Body(..., embed=True),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     user = db.query(User).filter(User.discord_user_id == discord_id).one_or_none()
     if not user:
@@ -198,7 +209,7 @@ def admin_payouts_retry(
     request: Request,
     payout_id: int = Body(..., embed=True),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     payout = db.query(Payout).filter(Payout.id == payout_id).one_or_none()
     if not payout:
@@ -216,18 +227,10 @@ def admin_payouts_retry(
     integrations = getattr(cfg_obj, "integrations", None)
     if integrations is None:
         raise HTTPException(status_code=500, detail="Config not loaded")
-    # Load operator seed for bananopie signing.
-    # `.first()` with order_by(id desc) survives any duplicate-row drift
-    # (e.g. from an out-of-sync alembic_version that allowed two inserts
-    # before the UNIQUE index was added). Cleanup endpoint exists at
-    # /admin/config/operator-seed/dedupe.
-    seed_row = (
-        db.query(SecureConfig)
-        .filter(SecureConfig.key == "operator_seed")
-        .order_by(SecureConfig.id.desc())
-        .first()
-    )
-    seed = decrypt_value(seed_row.encrypted_value) if seed_row else None
+    # Load operator seed for bananopie signing (cached; newest row wins, so
+    # duplicate-row drift doesn't crash this path — cleanup endpoint exists at
+    # /admin/config/operator-seed/dedupe).
+    seed = load_operator_seed(db)
     if not seed:
         return JSONResponse(
             {
@@ -273,6 +276,7 @@ def admin_payouts_retry(
         ),
     )
     db.commit()
+    events.publish(events.TOPIC_SETTLEMENT, payout_id=payout_id, retried=True)
     return JSONResponse(
         {
             "status": payout.status,
@@ -291,24 +295,41 @@ def admin_audit_query(  # noqa: PLR0913 - explicit filter params acceptable here
     target_type: str | None = None,
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
-    """Query admin audit events with optional filters."""
+    """Query admin audit events with optional filters.
+
+    Page with ``cursor`` (the previous response's ``next_cursor``); ``offset``
+    is kept for older clients.
+    """
     limit = min(max(limit, 1), 200)
-    stmt = select(AdminAudit).order_by(AdminAudit.created_at.desc()).offset(offset).limit(limit)
+    stmt = select(AdminAudit).order_by(AdminAudit.created_at.desc(), AdminAudit.id.desc())
+    if cursor is not None:
+        try:
+            stmt = stmt.where(
+                keyset_after(AdminAudit.created_at, AdminAudit.id, decode_cursor(cursor))
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    elif offset:
+        stmt = stmt.offset(offset)
+    stmt = stmt.limit(limit + 1)
     if action:
         stmt = stmt.filter(AdminAudit.action == action)
     if actor_email:
         stmt = stmt.filter(AdminAudit.actor_email == actor_email)
     if target_type:
         stmt = stmt.filter(AdminAudit.target_type == target_type)
-    rows = db.execute(stmt).scalars().all()
+    rows, next_token = next_cursor(list(db.execute(stmt).scalars().all()), limit)
     return JSONResponse(
         {
             "count": len(rows),
             "limit": limit,
             "offset": offset,
+            "has_more": next_token is not None,
+            "next_cursor": next_token,
             "events": [
                 {
                     "id": r.id,
@@ -331,7 +352,7 @@ def admin_audit_query(  # noqa: PLR0913 - explicit filter params acceptable here
 def admin_stats(
     request: Request,
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_read_db),  # noqa: B008
 ) -> JSONResponse:
     """Aggregate system statistics for dashboards (fast COUNT/SUM queries)."""
     user_count = db.query(func.count(User.id)).scalar() or 0
@@ -354,6 +375,10 @@ def admin_stats(
         or 0
     )
     accruals_sum = db.query(func.coalesce(func.sum(RewardAccrual.amount_ban), 0)).scalar() or 0
+    # Pruned history is rolled up in user_daily_summaries
+    archived = summary_grand_totals(db)
+    payouts_sent_sum = Decimal(str(payouts_sent_sum)) + archived.paid_ban
+    accruals_sum = Decimal(str(accruals_sum)) + archived.accrued_ban
     accruals_pending = (
         db.query(func.coalesce(func.sum(RewardAccrual.amount_ban), 0))
         .filter(RewardAccrual.settled.is_(False))
@@ -370,20 +395,8 @@ def admin_stats(
 
     operator_balance: float | None = None
     operator_pending: float | None = None
-    operator_account = os.getenv("P2S_OPERATOR_ACCOUNT", "")
-
-    # If no env var, try to derive from stored seed (dedupe-safe)
-    if not operator_account:
-        seed_config = (
-            db.query(SecureConfig)
-            .filter(SecureConfig.key == "operator_seed")
-            .order_by(SecureConfig.id.desc())
-            .first()
-        )
-        if seed_config:
-            decrypted = decrypt_value(seed_config.encrypted_value)
-            if decrypted:
-                operator_account = seed_to_address(decrypted) or ""
+    # Env var first, else derived from the stored seed (cached)
+    operator_account = resolve_operator_account(db) or ""
 
     if integrations and operator_account:
         try:
@@ -399,19 +412,9 @@ def admin_stats(
     ban_per_kill = payout_cfg.payout_amount_ban_per_kill if payout_cfg else 0
     daily_cap = payout_cfg.daily_payout_cap if payout_cfg else 0
     weekly_cap = payout_cfg.weekly_payout_cap if payout_cfg else 0
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH as _SCP
-
-    if _SCP.exists():
-        try:
-            _ovr = json.loads(_SCP.read_text()).get("payout", {})
-            if "ban_per_kill" in _ovr:
-                ban_per_kill = float(_ovr["ban_per_kill"])
-            if "daily_kill_cap" in _ovr:
-                daily_cap = int(_ovr["daily_kill_cap"])
-            if "weekly_kill_cap" in _ovr:
-                weekly_cap = int(_ovr["weekly_kill_cap"])
-        except Exception:
-            pass
+    overrides = get_runtime_overrides().snapshot()
+    ban_per_kill = overrides.rate(ban_per_kill)
+    daily_cap, weekly_cap = overrides.caps(daily_cap, weekly_cap)
     scheduler_minutes = payout_cfg.scheduler_minutes if payout_cfg else 0
 
     return JSONResponse(
@@ -477,7 +480,7 @@ def admin_set_operator_seed(
     request: Request,
     seed: str = Body(..., embed=True),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Securely store the operator wallet seed (encrypted at rest).
 
@@ -539,6 +542,9 @@ def admin_set_operator_seed(
     )
 
     db.commit()
+    # Drop the cached identity here; the reload command does the same in the scheduler.
+    invalidate_operator_identity()
+    _control_channel(request).submit(ACTION_RELOAD, requested_by=admin_email or "unknown")
     log.info("operator_seed_set", admin=admin_email)
 
     return JSONResponse({"success": True, "message": "Operator seed saved securely"})
@@ -547,45 +553,37 @@ def admin_set_operator_seed(
 @router.get("/config/operator-seed/status")
 def admin_get_operator_seed_status(
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Check if operator seed is configured and derive the address."""
-    existing = (
-        db.query(SecureConfig)
-        .filter(SecureConfig.key == "operator_seed")
-        .order_by(SecureConfig.id.desc())
-        .first()
-    )
-    if existing:
-        # Verify it's decryptable and derive address
-        decrypted = decrypt_value(existing.encrypted_value)
-        derived_address = None
-        if decrypted:
-            derived_address = seed_to_address(decrypted)
+    identity = get_operator_identity(db)
+    if identity is not None:
+        # Decryptable means configured; the address is derived from the seed
         return JSONResponse(
             {
-                "configured": decrypted is not None,
-                "address": derived_address,
-                "set_by": existing.set_by,
-                "updated_at": existing.updated_at.isoformat() if existing.updated_at else None,
+                "configured": identity.configured,
+                "address": identity.address,
+                "set_by": identity.set_by,
+                "updated_at": identity.updated_at.isoformat() if identity.updated_at else None,
             }
         )
     return JSONResponse({"configured": False, "address": None, "set_by": None, "updated_at": None})
 
 
 @router.post("/donations/rebuild")
-def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
+def admin_rebuild_donations(
     request: Request,
     force: bool = Body(False, embed=True),
     dry_run: bool = Body(False, embed=True),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Rebuild donation_ledger by reading the operator's chain history.
 
-    Pulls every `receive` block from Banano RPC `account_history`, groups
-    by sender, and inserts one `DonationLedger` row per receive block with
-    `source="rebuild"`. Real `sender_address` and timestamps are preserved.
+    Streams `account_history` page by page, groups receives by sender, and
+    bulk-inserts one `DonationLedger` row per receive block with
+    `source="rebuild"`, keyed by block hash (blocks already recorded, e.g. by
+    the scheduler's donation sync, are skipped). Real `sender_address` is kept.
 
     Modes:
       * dry_run=true (default false): scan only, report counts + total.
@@ -596,15 +594,10 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
     cycle picks up the boosted multiplier automatically via
     get_current_milestone() in src/jobs/accrual.py.
     """
-    import os
     from collections import defaultdict
-    from decimal import Decimal as _Dec
-
-    import httpx
 
-    from src.lib.crypto import decrypt_value
-    from src.models.models import DonationLedger, SecureConfig
-    from src.services.banano_client import seed_to_address
+    from src.jobs.donation_sync import block_amount_ban, insert_receive_blocks, iter_history_pages
+    from src.models.models import DonationLedger
     from src.services.domain.donation_service import (
         get_current_milestone,
         get_next_milestone,
@@ -615,18 +608,7 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
     admin_email = verify_admin_session(token, session_secret()) if token else "unknown"
 
     # Resolve operator address: env var first, then derive from stored seed.
-    operator_account = os.getenv("P2S_OPERATOR_ACCOUNT", "") or None
-    if not operator_account:
-        seed_row = (
-            db.query(SecureConfig)
-            .filter(SecureConfig.key == "operator_seed")
-            .order_by(SecureConfig.id.desc())
-            .first()
-        )
-        if seed_row:
-            decrypted = decrypt_value(seed_row.encrypted_value)
-            if decrypted:
-                operator_account = seed_to_address(decrypted)
+    operator_account = resolve_operator_account(db)
     if not operator_account:
         return JSONResponse(
             {"status": "error", "detail": "operator_account not resolvable"},
@@ -647,7 +629,7 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
             status_code=409,
         )
 
-    # Pull full history from configured Banano RPC.
+    # Stream the history page by page from the configured Banano RPC.
     app_state = getattr(request.app, "state", None)
     cfg_obj = getattr(app_state, "config", None)
     integrations = getattr(cfg_obj, "integrations", None)
@@ -656,31 +638,41 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
         or os.getenv("BANANO_NODE_RPC")
         or "https://kaliumapi.appditto.com/api"
     )
+    banano = BananoClient(node_url=rpc_url, dry_run=False)
+
+    # Wipe + replay (rows are only written when not a dry run)
+    if existing_rebuild_count > 0 and force and not dry_run:
+        db.query(DonationLedger).filter(DonationLedger.source == "rebuild").delete()
+        db.flush()
+
+    blocks_scanned = receive_blocks = send_blocks = inserted = 0
+    total_recv_ban = total_send_ban = 0.0
+    by_sender: dict[str, list[float]] = defaultdict(lambda: [0.0, 0])
     try:
-        r = httpx.post(
-            rpc_url,
-            json={"action": "account_history", "account": operator_account, "count": 10000},
-            timeout=30.0,
-        )
-        history = r.json().get("history", []) or []
+        for page in iter_history_pages(banano, operator_account):
+            blocks_scanned += len(page)
+            for h in page:
+                amt = float(block_amount_ban(h))
+                if h.get("type") == "send":
+                    send_blocks += 1
+                    total_send_ban += amt
+                elif h.get("type") == "receive":
+                    receive_blocks += 1
+                    total_recv_ban += amt
+                    addr = h.get("account", "")
+                    by_sender[addr][0] += amt
+                    by_sender[addr][1] += 1
+            if not dry_run:
+                # Receive blocks the chain sync already recorded are skipped by hash.
+                inserted += len(insert_receive_blocks(db, page, source="rebuild"))
     except Exception as exc:
+        db.rollback()
         return JSONResponse(
             {"status": "error", "detail": f"RPC fetch failed: {exc!s}"},
             status_code=502,
         )
 
-    receives = [h for h in history if h.get("type") == "receive"]
-    sends = [h for h in history if h.get("type") == "send"]
-    total_recv_ban = sum(float(h.get("amount_decimal", 0) or 0) for h in receives)
-    total_send_ban = sum(float(h.get("amount_decimal", 0) or 0) for h in sends)
-
     # Aggregate by sender for the leaderboard response.
-    by_sender: dict[str, list[float]] = defaultdict(lambda: [0.0, 0])
-    for h in receives:
-        addr = h.get("account", "")
-        amt = float(h.get("amount_decimal", 0) or 0)
-        by_sender[addr][0] += amt
-        by_sender[addr][1] += 1
     top_donors = [
         {
             "sender_address": addr,
@@ -695,9 +687,9 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
             {
                 "status": "dry_run",
                 "operator_account": operator_account,
-                "blocks_scanned": len(history),
-                "receive_blocks": len(receives),
-                "send_blocks": len(sends),
+                "blocks_scanned": blocks_scanned,
+                "receive_blocks": receive_blocks,
+                "send_blocks": send_blocks,
                 "total_received_ban": round(total_recv_ban, 4),
                 "total_sent_ban": round(total_send_ban, 4),
                 "distinct_senders": len(by_sender),
@@ -705,24 +697,6 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
             }
         )
 
-    # Wipe + replay
-    if existing_rebuild_count > 0 and force:
-        db.query(DonationLedger).filter(DonationLedger.source == "rebuild").delete()
-        db.flush()
-    inserted = 0
-    for h in receives:
-        amt_dec = _Dec(str(h.get("amount_decimal", "0") or "0"))
-        if amt_dec <= 0:
-            continue
-        entry = DonationLedger(
-            amount_ban=amt_dec,
-            blocks_received=1,
-            source="rebuild",
-            note=f"hash:{h.get('hash', '?')[:16]} h:{h.get('height', '?')}",
-            sender_address=h.get("account") or None,
-        )
-        db.add(entry)
-        inserted += 1
     record_admin_audit(
         db,
         AdminAuditPayload(
@@ -735,6 +709,7 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
         ),
     )
     db.commit()
+    events.publish(events.TOPIC_DONATION, source="rebuild", inserted=inserted)
 
     total = get_total_donated(db)
     cur = get_current_milestone(total)
@@ -780,7 +755,7 @@ def admin_rebuild_donations(  # noqa: PLR0915 - end-to-end pipeline kept inline
 @router.post("/db/dedupe")
 def admin_dedupe_db(
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Cleanup helper: collapse duplicate rows on tables whose UNIQUE
     indexes drifted because of the 2026-06-27 alembic migration replay.
@@ -846,6 +821,7 @@ def admin_dedupe_db(
             summary["accruals_removed"] += 1
 
     db.commit()
+    events.publish(events.TOPIC_SETTLEMENT, **summary)
     log.warning("admin_db_dedupe", **summary)
     return JSONResponse({"deduped": True, **summary})
 
@@ -853,7 +829,7 @@ def admin_dedupe_db(
 @router.post("/config/operator-seed/dedupe")
 def admin_dedupe_operator_seed(
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Cleanup helper: collapse duplicate operator_seed rows.
 
@@ -877,20 +853,24 @@ def admin_dedupe_operator_seed(
         db.delete(stale)
         removed += 1
     db.commit()
+    invalidate_operator_identity()
     log.warning("operator_seed_dedupe_admin", kept_id=kept_id, removed=removed)
     return JSONResponse({"deduped": True, "kept": kept_id, "removed": removed})
 
 
 @router.get("/scheduler/status")
 def admin_scheduler_status(
+    request: Request,
     _: None = Depends(_require_admin),
 ) -> JSONResponse:
-    """Read the scheduler heartbeat file to report if the background process is alive."""
-    hb_path = Path(os.getenv("P2S_HEARTBEAT_FILE", "/tmp/scheduler_heartbeat.json"))
-    if not hb_path.exists():
-        return JSONResponse({"alive": False, "detail": "no heartbeat file"})
+    """Report if the scheduler is alive from its latest heartbeat (channel, then file)."""
     try:
-        data = json.loads(hb_path.read_text())
+        data = _control_channel(request).last_heartbeat()
+        if data is None:
+            hb_path = Path(os.getenv("P2S_HEARTBEAT_FILE", "/tmp/scheduler_heartbeat.json"))
+            if not hb_path.exists():
+                return JSONResponse({"alive": False, "detail": "no heartbeat file"})
+            data = json.loads(hb_path.read_text())
         age = _time.time() - data.get("ts", 0)
         interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
         alive = age < interval * 2  # allow up to 2x the interval before declaring dead
@@ -953,50 +933,62 @@ async def admin_logs_tail(
     )
 
 
+def _control_channel(request: Request) -> ControlChannel:
+    channel = get_control_channel()
+    if channel is None:  # app built without the scheduler lifespan (tests, tooling)
+        channel = configure_control_channel(request.app.state.session_factory)
+    return channel
+
+
+def _admin_email(request: Request) -> str:
+    token = request.cookies.get("p2s_admin")
+    return (verify_admin_session(token, session_secret()) if token else None) or "unknown"
+
+
+def _queue_scheduler_command(request: Request, action: str, detail: str) -> JSONResponse:
+    command = _control_channel(request).submit(action, requested_by=_admin_email(request))
+    log.info("admin_scheduler_command_queued", command_id=command.id, action=action)
+    return JSONResponse(
+        {"status": "queued", **command.as_dict(), "detail": detail}, status_code=202
+    )
+
+
 @router.post("/scheduler/trigger")
 def admin_trigger_scheduler(
     request: Request,
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
 ) -> JSONResponse:
-    """Run one accrual+settlement cycle synchronously (admin only, works in production)."""
-    from src.jobs.__main__ import _build_scheduler_components, _run_once
+    """Queue one accrual+settlement cycle for the scheduler leader (admin only).
 
-    try:
-        cfg, fortnite, accrual_cfg = _build_scheduler_components()
-        _run_once(db, cfg, fortnite, accrual_cfg)
-        db.commit()
-        return JSONResponse({"status": "ok", "detail": "Scheduler cycle completed"})
-    except Exception as exc:
-        log.error("admin_scheduler_trigger_error", error=str(exc))
-        return JSONResponse({"status": "error", "detail": str(exc)}, status_code=500)
+    Returns 202 with a ``command_id``; poll ``/admin/scheduler/commands/{id}``.
+    """
+    return _queue_scheduler_command(request, ACTION_TRIGGER, "Scheduler cycle queued")
 
 
 @router.post("/scheduler/settle")
 def admin_trigger_settlement(
     request: Request,
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
 ) -> JSONResponse:
-    """Run settlement only — pay out unsettled accruals (admin only)."""
-    from src.jobs.__main__ import _build_scheduler_components
-    from src.jobs.settlement import run_settlement
+    """Queue settlement only — pay out unsettled accruals (admin only).
 
-    try:
-        cfg, _fortnite, _accrual_cfg = _build_scheduler_components()
-        counters = run_settlement(db, cfg)
-        db.commit()
-        return JSONResponse(
-            {
-                "status": "ok",
-                "candidates": counters["candidates"],
-                "payouts": counters["payouts"],
-                "accruals_settled": counters["accruals_settled"],
-            }
-        )
-    except Exception as exc:
-        log.error("admin_settlement_trigger_error", error=str(exc))
-        return JSONResponse({"status": "error", "detail": str(exc)}, status_code=500)
+    Returns 202 with a ``command_id``; the settlement counters land in
+    ``progress.settlement`` of ``/admin/scheduler/commands/{id}``.
+    """
+    return _queue_scheduler_command(request, ACTION_SETTLE, "Settlement queued")
+
+
+@router.get("/scheduler/commands/{command_id}")
+def admin_scheduler_command(
+    command_id: int,
+    request: Request,
+    _: None = Depends(_require_admin),
+) -> JSONResponse:
+    """Status and per-phase progress of a queued scheduler command."""
+    command = _control_channel(request).get(command_id)
+    if command is None:
+        raise HTTPException(status_code=404, detail="Command not found")
+    return JSONResponse(command.as_dict())
 
 
 @router.get("/scheduler/config")
@@ -1004,23 +996,8 @@ def admin_get_scheduler_config(
     _: None = Depends(_require_admin),
 ) -> JSONResponse:
     """Return current scheduler interval overrides."""
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH
-
     default_interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
-    result: dict[str, object] = {
-        "accrual_interval_seconds": default_interval,
-        "settlement_interval_seconds": default_interval,
-    }
-    if SCHEDULER_CONFIG_PATH.exists():
-        try:
-            data = json.loads(SCHEDULER_CONFIG_PATH.read_text())
-            if "accrual_interval_seconds" in data:
-                result["accrual_interval_seconds"] = int(data["accrual_interval_seconds"])
-            if "settlement_interval_seconds" in data:
-                result["settlement_interval_seconds"] = int(data["settlement_interval_seconds"])
-        except Exception:
-            pass
-    return JSONResponse(result)
+    return JSONResponse(get_runtime_overrides().snapshot().intervals(default_interval))
 
 
 @router.post("/scheduler/config")
@@ -1029,29 +1006,20 @@ def admin_set_scheduler_config(
     accrual_interval_seconds: int | None = Body(None),
     settlement_interval_seconds: int | None = Body(None),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Update scheduler intervals on the fly. Min 30 seconds."""
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH
 
-    # Read existing overrides
-    current: dict[str, int] = {}
-    if SCHEDULER_CONFIG_PATH.exists():
-        try:
-            current = json.loads(SCHEDULER_CONFIG_PATH.read_text())
-        except Exception:
-            pass
+    def _apply(current: dict[str, object]) -> None:
+        if accrual_interval_seconds is not None:
+            current["accrual_interval_seconds"] = max(30, accrual_interval_seconds)
+        if settlement_interval_seconds is not None:
+            current["settlement_interval_seconds"] = max(30, settlement_interval_seconds)
 
     default_interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
-    if accrual_interval_seconds is not None:
-        current["accrual_interval_seconds"] = max(30, accrual_interval_seconds)
-    if settlement_interval_seconds is not None:
-        current["settlement_interval_seconds"] = max(30, settlement_interval_seconds)
+    intervals = get_runtime_overrides().update(_apply).intervals(default_interval)
 
-    SCHEDULER_CONFIG_PATH.write_text(json.dumps(current))
-
-    token = request.cookies.get("p2s_admin")
-    admin_email = verify_admin_session(token, session_secret()) if token else "unknown"
+    admin_email = _admin_email(request)
     record_admin_audit(
         db,
         AdminAuditPayload(
@@ -1059,22 +1027,16 @@ def admin_set_scheduler_config(
             actor_email=admin_email,
             target_type="scheduler",
             target_id="intervals",
-            summary=f"accrual={current.get('accrual_interval_seconds', default_interval)}s, "
-            f"settlement={current.get('settlement_interval_seconds', default_interval)}s",
+            summary=f"accrual={intervals['accrual_interval_seconds']}s, "
+            f"settlement={intervals['settlement_interval_seconds']}s",
         ),
     )
     db.commit()
-    log.info("scheduler_config_updated", **current)
+    log.info("scheduler_config_updated", **intervals)
+    # Tell the scheduler now rather than on its next override refresh.
+    _control_channel(request).submit(ACTION_RELOAD, requested_by=admin_email)
 
-    return JSONResponse(
-        {
-            "status": "ok",
-            "accrual_interval_seconds": current.get("accrual_interval_seconds", default_interval),
-            "settlement_interval_seconds": current.get(
-                "settlement_interval_seconds", default_interval
-            ),
-        }
-    )
+    return JSONResponse({"status": "ok", **intervals})
 
 
 @router.get("/payout/config")
@@ -1082,7 +1044,6 @@ def admin_get_payout_config(
     _: None = Depends(_require_admin),
 ) -> JSONResponse:
     """Return current payout configuration (overrides merged with defaults)."""
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH
     from src.lib.config import get_config
 
     payout_cfg = get_config().payout
@@ -1090,28 +1051,14 @@ def admin_get_payout_config(
     daily_kill_cap = payout_cfg.daily_payout_cap if payout_cfg else 0
     weekly_kill_cap = payout_cfg.weekly_payout_cap if payout_cfg else 0
 
-    has_overrides = False
-    if SCHEDULER_CONFIG_PATH.exists():
-        try:
-            ovr = json.loads(SCHEDULER_CONFIG_PATH.read_text()).get("payout", {})
-            if "ban_per_kill" in ovr:
-                ban_per_kill = float(ovr["ban_per_kill"])
-                has_overrides = True
-            if "daily_kill_cap" in ovr:
-                daily_kill_cap = int(ovr["daily_kill_cap"])
-                has_overrides = True
-            if "weekly_kill_cap" in ovr:
-                weekly_kill_cap = int(ovr["weekly_kill_cap"])
-                has_overrides = True
-        except Exception:
-            pass
-
+    overrides = get_runtime_overrides().snapshot()
+    daily_kill_cap, weekly_kill_cap = overrides.caps(daily_kill_cap, weekly_kill_cap)
     return JSONResponse(
         {
-            "ban_per_kill": float(ban_per_kill),
+            "ban_per_kill": float(overrides.rate(ban_per_kill)),
             "daily_kill_cap": daily_kill_cap,
             "weekly_kill_cap": weekly_kill_cap,
-            "has_overrides": has_overrides,
+            "has_overrides": overrides.has_payout_overrides,
         }
     )
 
@@ -1123,11 +1070,9 @@ def admin_set_payout_config(
     daily_kill_cap: int | None = Body(None),
     weekly_kill_cap: int | None = Body(None),
     _: None = Depends(_require_admin),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Update payout configuration on the fly."""
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH
-
     # Validate
     if ban_per_kill is not None and ban_per_kill <= 0:
         raise HTTPException(400, "ban_per_kill must be positive")
@@ -1136,26 +1081,21 @@ def admin_set_payout_config(
     if weekly_kill_cap is not None and weekly_kill_cap < 0:
         raise HTTPException(400, "weekly_kill_cap must be non-negative")
 
-    # Read existing config file
-    current: dict[str, object] = {}
-    if SCHEDULER_CONFIG_PATH.exists():
-        try:
-            current = json.loads(SCHEDULER_CONFIG_PATH.read_text())
-        except Exception:
-            pass
-
     payout: dict[str, object] = {}
-    raw_payout = current.get("payout")
-    if isinstance(raw_payout, dict):
-        payout = raw_payout
-    if ban_per_kill is not None:
-        payout["ban_per_kill"] = ban_per_kill
-    if daily_kill_cap is not None:
-        payout["daily_kill_cap"] = daily_kill_cap
-    if weekly_kill_cap is not None:
-        payout["weekly_kill_cap"] = weekly_kill_cap
-    current["payout"] = payout
-    SCHEDULER_CONFIG_PATH.write_text(json.dumps(current))
+
+    def _apply(current: dict[str, object]) -> None:
+        raw_payout = current.get("payout")
+        if isinstance(raw_payout, dict):
+            payout.update(raw_payout)
+        if ban_per_kill is not None:
+            payout["ban_per_kill"] = ban_per_kill
+        if daily_kill_cap is not None:
+            payout["daily_kill_cap"] = daily_kill_cap
+        if weekly_kill_cap is not None:
+            payout["weekly_kill_cap"] = weekly_kill_cap
+        current["payout"] = payout
+
+    get_runtime_overrides().update(_apply)
 
     # Audit
     token = request.cookies.get("p2s_admin")
@@ -1173,6 +1113,7 @@ def admin_set_payout_config(
         ),
     )
     db.commit()
+    events.publish(events.TOPIC_CONFIG, section="payout")
     log.info("payout_config_updated", **payout)
 
     return JSONResponse({"status": "ok", **payout})
@@ -26,6 +26,9 @@ def _ensure_schema_columns(engine: Any, log: Any) -> None:
     """
     from sqlalchemy import text
 
+    from src.lib.schema_registry import refresh_schema, schema_for
+
+    schema = schema_for(engine)
     additions = [
         ("payouts", "idempotency_key", "VARCHAR(128)"),
         ("payouts", "attempt_count", "INTEGER DEFAULT 1"),
@@ -43,9 +46,12 @@ def _ensure_schema_columns(engine: Any, log: Any) -> None:
         ("users", "solana_wallet_address", "VARCHAR(64)"),
         ("users", "jpmt_balance", "INTEGER DEFAULT 0"),
         ("users", "jpmt_verified_at", "DATETIME"),
+        ("donation_ledger", "block_hash", "VARCHAR(64)"),
     ]
     with engine.connect() as conn:
         for table, col, col_type in additions:
+            if not schema.has_table(table) or schema.has_column(table, col):
+                continue
             try:
                 conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {col} {col_type}"))
                 conn.commit()
@@ -53,9 +59,63 @@ def _ensure_schema_columns(engine: Any, log: Any) -> None:
             except Exception:
                 pass  # Column already exists
 
+    # Indexes that create_all() skips on tables that already exist
+    indexes = [
+        ("ix_accrual_user_created_id", "reward_accruals", "user_id, created_at, id"),
+        ("ix_payout_user_created_id", "payouts", "user_id, created_at, id"),
+        ("ix_admin_audit_created_id", "admin_audit", "created_at, id"),
+        ("ix_accrual_settled_user", "reward_accruals", "settled, user_id, kills, amount_ban"),
+        ("ix_accrual_payout", "reward_accruals", "payout_id, user_id, kills, amount_ban"),
+        ("ix_payout_status_created", "payouts", "status, created_at, amount_ban"),
+        ("ix_accrual_created", "reward_accruals", "created_at"),
+        ("ix_payout_created", "payouts", "created_at"),
+        ("ix_donation_sender", "donation_ledger", "sender_address, amount_ban"),
+        ("uq_donation_block_hash", "donation_ledger", "block_hash"),
+    ]
+    # Indexes the migrations drop because one of the above supersedes them
+    superseded = [
+        "ix_accrual_user_created",  # -> ix_accrual_user_created_id
+        "ix_payout_user_created",  # -> ix_payout_user_created_id
+        "ix_accrual_settled",  # -> ix_accrual_settled_user
+    ]
+    with engine.connect() as conn:
+        for name, table, cols in indexes:
+            kind = "UNIQUE INDEX" if name.startswith("uq_") else "INDEX"
+            try:
+                conn.execute(text(f"CREATE {kind} IF NOT EXISTS {name} ON {table} ({cols})"))
+                conn.commit()
+            except Exception as exc:
+                log.warning("schema_index_failed", index=name, error=str(exc))
+        for name in superseded:
+            try:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+                conn.commit()
+            except Exception as exc:
+                log.warning("schema_index_drop_failed", index=name, error=str(exc))
+    refresh_schema(engine)
+
+
+def _pin_money_storage(engine: Any, log: Any) -> None:
+    """Pin ``engine`` to the stored money column type; conversion is left to the migration."""
+    from src.models.base import Base
+    from src.models.types import money_storage, pin_money_storage
+
+    mode = pin_money_storage(engine, Base.metadata)
+    if mode != money_storage():
+        log.warning(
+            "money_storage_mismatch",
+            stored=mode,
+            configured=money_storage(),
+            hint="run migration 20261019_04_money_storage to convert",
+        )
+
 
 def _init_db(app: FastAPI, log: Any) -> None:
-    from src.lib.db import make_engine, make_session_factory  # local import
+    from src.lib.db import (  # local import
+        make_engine,
+        make_read_engine,
+        make_session_factory,
+    )
     from src.models.base import Base
 
     db_url = (
@@ -65,9 +125,18 @@ def _init_db(app: FastAPI, log: Any) -> None:
     from src.models import models  # noqa: F401  # pylint: disable=unused-import
 
     engine = make_engine(db_url)
+    _pin_money_storage(engine, log)  # before create_all, so new tables match the stored type
     session_factory = make_session_factory(engine)
     app.state.engine = engine
     app.state.session_factory = session_factory
+    # Public GETs and admin stats read through a replica / query_only SQLite pool
+    read_engine = make_read_engine(engine)
+    if read_engine is not None:
+        _pin_money_storage(read_engine, log)
+    app.state.read_engine = read_engine
+    app.state.read_session_factory = (
+        make_session_factory(read_engine) if read_engine is not None else session_factory
+    )
 
     # Optional SQLAlchemy tracing instrumentation
     try:  # pragma: no cover - instrumentation best-effort
@@ -95,8 +164,16 @@ def _init_db(app: FastAPI, log: Any) -> None:
             log.info("alembic_upgrade_start", url=db_url or "default")
             alembic_command.upgrade(cfg, "head")
             log.info("alembic_upgrade_complete")
+            from src.lib.schema_registry import refresh_schema
+
+            refresh_schema(engine)
         except Exception as mig_exc:  # pragma: no cover
             log.warning("alembic_upgrade_failed", error=str(mig_exc))
+        # The money migration may have rewritten the columns: re-pin, or refuse to serve
+        # with an engine that already compiled the old representation.
+        _pin_money_storage(engine, log)
+        if read_engine is not None:
+            _pin_money_storage(read_engine, log)
 
 
 def _register_metrics(app: FastAPI) -> None:
@@ -166,15 +243,36 @@ def create_app() -> FastAPI:  # noqa: PLR0915 - acceptable aggregated startup lo
         # scheduler thread can broadcast lines into SSE subscribers.
         import asyncio as _asyncio
 
+        from src.lib.live_stream import attach_event_loop as _attach_stream_loop
         from src.lib.log_buffer import attach_event_loop as _attach_loop
 
         _attach_loop(_asyncio.get_event_loop())
+        _attach_stream_loop(_asyncio.get_event_loop())
         session_factory = getattr(app.state, "session_factory", None)
         if session_factory is None:
             _log.error("scheduler_skipped", reason="no session_factory available")
             yield
             return
 
+        from src.jobs.lease import make_scheduler_lease
+        from src.lib.scheduler_control import configure_control_channel
+
+        # Every worker/replica runs the loop; the lease lets one of them lead.
+        lease = make_scheduler_lease(session_factory)
+        # Admin actions are queued here and claimed by whichever replica leads.
+        configure_control_channel(session_factory)
+        # Non-leader workers learn about phases the leader ran from its heartbeat.
+        from src.lib.http_cache import (
+            read_heartbeat,
+            start_schedule_refresher,
+            stop_schedule_refresher,
+        )
+        from src.lib.live_stream import start_scheduler_relay, stop_scheduler_relay
+
+        start_scheduler_relay(read_heartbeat)
+        # Cache-Control max-age reads the schedule from memory, never on the event loop.
+        start_schedule_refresher()
+
         def _run_scheduler() -> None:
             from src.jobs.__main__ import (
                 HeartbeatInfo,
@@ -201,7 +299,7 @@ def create_app() -> FastAPI:  # noqa: PLR0915 - acceptable aggregated startup lo
                     settlement_interval=overrides["settlement_interval_seconds"],
                     dry_run=cfg.dry_run,
                 )
-                state = _LoopState()
+                state = _LoopState(lease=lease)
                 state.last_settlement_ts = (
                     time.time() - overrides["settlement_interval_seconds"] / 2
                 )
@@ -214,6 +312,10 @@ def create_app() -> FastAPI:  # noqa: PLR0915 - acceptable aggregated startup lo
         thread.start()
         _log.info("scheduler_thread_launched")
         yield
+        stop_scheduler_relay()
+        stop_schedule_refresher()
+        if lease is not None:
+            lease.release()  # hand leadership over without waiting out the TTL
 
     app = FastAPI(title="Pay2Slay API", version="0.1.0", lifespan=_lifespan)
     # Add correlation/trace middleware early
@@ -283,10 +385,12 @@ def create_app() -> FastAPI:  # noqa: PLR0915 - acceptable aggregated startup lo
 
     from .admin import router as admin_router
     from .auth import router as auth_router
+    from .bootstrap import router as bootstrap_router
     from .config import router as config_router
     from .demo import router as demo_router
     from .donations import router as donations_router
     from .leaderboard import router as leaderboard_router
+    from .stream import router as stream_router
     from .user import router as user_router
 
     app.include_router(auth_router)
@@ -296,6 +400,8 @@ def create_app() -> FastAPI:  # noqa: PLR0915 - acceptable aggregated startup lo
     app.include_router(demo_router)
     app.include_router(leaderboard_router)
     app.include_router(donations_router)
+    app.include_router(stream_router)
+    app.include_router(bootstrap_router)
 
     _register_health(app)
     _register_metrics(app)
@@ -1,15 +1,16 @@
-from collections.abc import Generator
 from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
 
+from src.api.deps import SESSION_COOKIE, get_db, get_identity_cache
 from src.lib.auth import (
     consume_oauth_state,
     issue_oauth_state,
     issue_session,
     session_secret,
+    verify_session_claims,
 )
 from src.models.models import User, VerificationRecord
 from src.services.discord_auth_service import DiscordAuthService
@@ -19,15 +20,6 @@ from src.services.yunite_service import YuniteService
 router = APIRouter()
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 @router.get("/auth/discord/login")
 def discord_login(request: Request) -> RedirectResponse:
     """Redirect the user to Discord's OAuth authorization page."""
@@ -50,7 +42,7 @@ def discord_callback(
     request: Request,
     state: str = Query(..., description="OAuth state"),
     code: str = Query(..., description="OAuth authorization code"),
-    db: Session = Depends(_get_db),  # noqa: B008 - FastAPI dependency
+    db: Session = Depends(get_db),  # noqa: B008 - FastAPI dependency
 ) -> RedirectResponse:
     if not state or not code:
         raise HTTPException(status_code=400, detail="Missing state or code")
@@ -133,3 +125,16 @@ def discord_callback(
     resp = RedirectResponse(url="/", status_code=302)
     resp.set_cookie("p2s_session", token, httponly=True, samesite="lax")
     return resp
+
+
+@router.post("/auth/logout")
+def logout(request: Request) -> JSONResponse:
+    """End the session: clear cookies and revoke the token in the identity cache."""
+    token = request.cookies.get(SESSION_COOKIE)
+    claims = verify_session_claims(token, session_secret()) if token else None
+    if token and claims:
+        get_identity_cache().revoke(token, claims[1])
+    resp = JSONResponse({"logged_out": True})
+    resp.delete_cookie(SESSION_COOKIE)
+    resp.delete_cookie("p2s_admin")
+    return resp
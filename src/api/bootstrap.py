@@ -0,0 +1,85 @@
+"""Aggregated dashboard bootstrap — one round trip for a cold page load.
+
+Combines what ``static/app.js`` used to fetch separately (`/me/status`,
+`/config/product`, `/api/leaderboard`, `/api/feed`, `/api/donations`,
+`/hodl/boosted`, `/api/scheduler/countdown`, donate address) using one DB
+session and one cap-status memo. The public part is cached like the
+individual endpoints; only the caller's ``me`` section and the countdown
+are computed per request.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+
+from src.api.config import _build_product_config
+from src.api.deps import get_read_db, resolve_identity
+from src.api.leaderboard import (
+    _build_feed,
+    _build_leaderboard,
+    _CapStatusMemo,
+    _countdown_payload,
+    _get_cap_config,
+    _operator_address,
+)
+from src.api.user import _build_hodl_boosted, _build_me_status
+from src.lib.http_cache import read_schedule
+from src.lib.response_cache import ROUTE_BOOTSTRAP, cached_body
+from src.models.models import User
+from src.services.domain.donation_service import get_donation_status
+
+router = APIRouter()
+
+# Match the page sizes static/app.js requests.
+LEADERBOARD_LIMIT = 50
+FEED_LIMIT = 30
+
+
+def _build_public(db: Session, cap_status: _CapStatusMemo) -> dict[str, Any]:
+    return {
+        "config": _build_product_config(),
+        "leaderboard": _build_leaderboard(db, cap_status, LEADERBOARD_LIMIT, 0),
+        "feed": _build_feed(db, cap_status, FEED_LIMIT),
+        "donations": get_donation_status(db),
+        "hodl_boosted": _build_hodl_boosted(db),
+        # Balance needs node RPC (and receives pending blocks); the client
+        # fetches /api/donate-info for it off the critical path.
+        "donate_info": {"address": _operator_address(db) or None},
+    }
+
+
+def _session_user(request: Request, db: Session) -> User | None:
+    identity = resolve_identity(request, db)
+    return db.get(User, identity.user_id) if identity else None
+
+
+@router.get("/api/bootstrap")
+def bootstrap(
+    request: Request,
+    db: Session = Depends(get_read_db),  # noqa: B008
+) -> Response:
+    """Everything the dashboard needs on first paint, in one response.
+
+    ``me`` is null for anonymous visitors. Sections have the same shape as
+    the standalone endpoints they replace.
+    """
+    cap_status = _CapStatusMemo(db, _get_cap_config(request))
+    public = cached_body(ROUTE_BOOTSTRAP, "", lambda: _build_public(db, cap_status))
+    user = _session_user(request, db)
+    me = _build_me_status(db, user, cap_status) if user else None
+    personal = json.dumps(
+        {"me": me, "countdown": _countdown_payload(read_schedule())},
+        default=str,
+        separators=(",", ":"),
+    ).encode()
+    # Splice the cached public object into the per-request one: `{..personal..,..public..}`.
+    body = personal[:-1] + b"," + public[1:]
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"Cache-Control": "private, no-cache"},
+    )
@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from typing import Any
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
 
 from src.lib.config import get_config
-from src.lib.promo import get_active_promo, promo_to_dict
+from src.lib.promo import promo_to_dict
+from src.lib.response_cache import ROUTE_CONFIG_PRODUCT, cached_json
+from src.lib.runtime_overrides import get_runtime_overrides
 from src.services.yunite_service import YuniteService
 
 router = APIRouter()
 
 
 @router.get("/config/product")
-def get_product_config() -> JSONResponse:
+def get_product_config(request: Request) -> Response:
+    return cached_json(ROUTE_CONFIG_PRODUCT, "", _build_product_config, request)
+
+
+def _build_product_config() -> dict[str, Any]:
     cfg = get_config()
     product = cfg.product
     integrations = cfg.integrations
@@ -19,20 +27,18 @@ def get_product_config() -> JSONResponse:
     feature_flags = dict(product.feature_flags)
     feature_flags["dry_run_banner"] = integrations.dry_run
     # Active promo
-    promo = get_active_promo()
+    promo = get_runtime_overrides().snapshot().promo
     promo_data = promo_to_dict(promo) if promo else None
-    return JSONResponse(
-        {
-            "app_name": product.app_name,
-            "org_name": product.org_name,
-            "banner_url": product.banner_url,
-            "media_kit_url": product.media_kit_url,
-            "default_locale": product.default_locale,
-            "discord_invite_url": product.discord_invite_url,
-            "feature_flags": feature_flags,
-            "promo": promo_data,
-        }
-    )
+    return {
+        "app_name": product.app_name,
+        "org_name": product.org_name,
+        "banner_url": product.banner_url,
+        "media_kit_url": product.media_kit_url,
+        "default_locale": product.default_locale,
+        "discord_invite_url": product.discord_invite_url,
+        "feature_flags": feature_flags,
+        "promo": promo_data,
+    }
 
 
 @router.get("/debug/yunite")
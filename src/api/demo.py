@@ -8,7 +8,6 @@ from __future__ import annotations
 import hashlib
 import random
 import time
-from collections.abc import Generator
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 
@@ -16,6 +15,8 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
+from src.api.deps import get_db, get_identity_cache
+from src.lib import events
 from src.lib.auth import issue_session, session_secret
 from src.models.models import (
     AdminUser,
@@ -35,15 +36,6 @@ _DEMO_USERS = [
 ]
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 def _require_demo_mode(request: Request) -> None:
     """Demo endpoints are available when DEMO_MODE=1 or dry_run=true."""
     import os
@@ -167,7 +159,7 @@ def _seed_payouts(db: Session, user: User) -> tuple[int, int]:
 def demo_login(
     request: Request,
     _: None = Depends(_require_demo_mode),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Simulate Discord OAuth login in dry-run mode."""
     discord_user_id = "demo_user_001"
@@ -218,7 +210,7 @@ def demo_login(
 def demo_seed(
     request: Request,
     _: None = Depends(_require_demo_mode),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Seed the database with realistic demo data for demonstrations."""
     users, created_users = _upsert_demo_users(db)
@@ -231,6 +223,7 @@ def demo_seed(
         db.add(AdminUser(email="admin@example.org", is_active=True))
 
     db.commit()
+    events.publish(events.TOPIC_SETTLEMENT, source="demo_seed")
     return JSONResponse(
         {
             "summary": f"{created_users} users, {created_accruals} accruals, {created_payouts} payouts",
@@ -245,7 +238,7 @@ def demo_seed(
 def demo_run_scheduler(
     request: Request,
     _: None = Depends(_require_demo_mode),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Run one accrual+settlement cycle inline (dry-run only)."""
     now = datetime.now(UTC)
@@ -277,6 +270,7 @@ def demo_run_scheduler(
 
     settled = _settle_users(db, users, now, epoch_min)
     db.commit()
+    events.publish(events.TOPIC_SETTLEMENT, source="demo_run_scheduler")
     return JSONResponse(
         {
             "summary": f"Accrued {accrued} records, settled {settled} payouts",
@@ -329,7 +323,7 @@ def _settle_users(db: Session, users: list[User], now: datetime, epoch_min: int)
 def demo_clear(
     request: Request,
     _: None = Depends(_require_demo_mode),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Clear all demo data (users starting with 'demo_' and their related records)."""
     demo_ids = [d[0] for d in _DEMO_USERS]
@@ -365,6 +359,8 @@ def demo_clear(
     )
 
     db.commit()
+    get_identity_cache().clear()  # cached sessions point at deleted user ids
+    events.publish(events.TOPIC_SETTLEMENT, source="demo_clear")
 
     return JSONResponse(
         {
@@ -0,0 +1,223 @@
+"""Shared FastAPI dependencies: DB sessions and the signed-in user's identity.
+
+``run_db`` lets ``async def`` handlers run the existing sync ORM code on the
+read engine in the threadpool, so the event loop never blocks on a query.
+
+``current_identity`` turns the ``p2s_session`` cookie into a compact
+``SessionIdentity`` (primary key + Discord id) once per request. Verified
+tokens are remembered in a small TTL + LRU cache so repeat calls from the SPA
+skip the HMAC check and the ``users`` lookup by Discord id; entries never
+outlive the token's own expiry and are dropped on logout and reverify.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final, TypeVar
+
+from fastapi import Depends, HTTPException, Request
+from prometheus_client import Counter
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from src.lib.auth import session_secret, verify_session_claims
+from src.models.models import User
+
+if TYPE_CHECKING:
+    from sqlalchemy.orm import sessionmaker
+
+T = TypeVar("T")
+
+SESSION_COOKIE: Final[str] = "p2s_session"
+_DEFAULT_TTL_SECONDS: Final[float] = 60.0
+_DEFAULT_MAX_ENTRIES: Final[int] = 4096
+
+IDENTITY_LOOKUPS = Counter(
+    "identity_cache_lookups_total", "Session identity resolutions", ["result"]
+)
+
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    session_factory = request.app.state.session_factory
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def get_read_db(request: Request) -> Generator[Session, None, None]:
+    """Session on the read engine (replica / query_only SQLite); never write through it."""
+    state = request.app.state
+    session_factory = getattr(state, "read_session_factory", None) or state.session_factory
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def _run_in_session(session_factory: sessionmaker[Session], work: Callable[[Session], T]) -> T:
+    session = session_factory()
+    try:
+        return work(session)
+    finally:
+        session.close()
+
+
+async def run_db(request: Request, work: Callable[[Session], T]) -> T:
+    """Run read-only ``work(session)`` for an ``async def`` handler on the read engine."""
+    state = request.app.state
+    session_factory = getattr(state, "read_session_factory", None) or state.session_factory
+    return await run_in_threadpool(_run_in_session, session_factory, work)
+
+
+@dataclass(frozen=True)
+class SessionIdentity:
+    user_id: int
+    discord_user_id: str
+
+
+class IdentityCache:
+    """token -> (identity, expires_at), bounded LRU; revoked tokens stay denied until expiry."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[SessionIdentity, float]] = OrderedDict()
+        self._revoked: OrderedDict[str, float] = OrderedDict()
+
+    def get(self, token: str) -> SessionIdentity | None:
+        now = self._clock()
+        with self._lock:
+            hit = self._entries.get(token)
+            if hit is None:
+                return None
+            identity, expires_at = hit
+            if expires_at <= now:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return identity
+
+    def put(self, token: str, identity: SessionIdentity, token_exp: float) -> None:
+        expires_at = min(self._clock() + self._ttl, token_exp)
+        with self._lock:
+            self._entries[token] = (identity, expires_at)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        with self._lock:
+            return token in self._revoked
+
+    def revoke(self, token: str, token_exp: float) -> None:
+        """Forget ``token`` and reject it in this process until it expires."""
+        now = self._clock()
+        with self._lock:
+            self._entries.pop(token, None)
+            self._revoked[token] = token_exp
+            for tok, exp in list(self._revoked.items()):
+                if exp <= now or len(self._revoked) > self._max:
+                    del self._revoked[tok]
+
+    def invalidate_user(self, discord_user_id: str) -> None:
+        with self._lock:
+            stale = [
+                t for t, (i, _) in self._entries.items() if i.discord_user_id == discord_user_id
+            ]
+            for tok in stale:
+                del self._entries[tok]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Token -> identity cache shared by every request; logout and reverify evict from it.
+class _State:
+    cache: IdentityCache | None = None
+
+
+def get_identity_cache() -> IdentityCache:
+    if _State.cache is None:
+        _State.cache = IdentityCache(
+            ttl_seconds=float(os.getenv("P2S_IDENTITY_CACHE_TTL", str(_DEFAULT_TTL_SECONDS))),
+            max_entries=int(os.getenv("P2S_IDENTITY_CACHE_MAX_ENTRIES", str(_DEFAULT_MAX_ENTRIES))),
+        )
+    return _State.cache
+
+
+def resolve_identity(request: Request, db: Session) -> SessionIdentity | None:
+    """Identity for the request's session cookie, or None when anonymous/invalid."""
+    token = request.cookies.get(SESSION_COOKIE)
+    if not token:
+        return None
+    cache = get_identity_cache()
+    identity = cache.get(token)
+    if identity is not None:
+        IDENTITY_LOOKUPS.labels(result="hit").inc()
+        return identity
+    claims = verify_session_claims(token, session_secret())
+    if claims is None or cache.is_revoked(token):
+        IDENTITY_LOOKUPS.labels(result="invalid").inc()
+        return None
+    uid, exp = claims
+    user_id = db.query(User.id).filter(User.discord_user_id == uid).scalar()
+    if user_id is None:
+        IDENTITY_LOOKUPS.labels(result="unknown_user").inc()
+        return None
+    identity = SessionIdentity(user_id=user_id, discord_user_id=uid)
+    cache.put(token, identity, exp)
+    IDENTITY_LOOKUPS.labels(result="miss").inc()
+    return identity
+
+
+def current_identity(
+    request: Request,
+    db: Session = Depends(get_db),  # noqa: B008
+) -> SessionIdentity:
+    """Dependency: the signed-in user's identity, or 401."""
+    identity = resolve_identity(request, db)
+    if identity is None:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return identity
+
+
+def current_user(
+    identity: SessionIdentity = Depends(current_identity),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
+) -> User:
+    """Dependency: the signed-in ``User`` row (primary-key lookup), or 401."""
+    user = db.get(User, identity.user_id)
+    if user is None:
+        get_identity_cache().invalidate_user(identity.discord_user_id)
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    return user
+
+
+__all__ = [
+    "SESSION_COOKIE",
+    "IdentityCache",
+    "SessionIdentity",
+    "current_identity",
+    "current_user",
+    "get_db",
+    "get_identity_cache",
+    "get_read_db",
+    "resolve_identity",
+    "run_db",
+]
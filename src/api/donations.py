@@ -3,35 +3,26 @@
 from __future__ import annotations
 
 import traceback
-from collections.abc import Generator
 
-from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, Response
 
+from src.api.deps import run_db
 from src.lib.observability import get_logger
+from src.lib.response_cache import ROUTE_DONATIONS, cached_json_async
 from src.services.domain.donation_service import get_donation_status
 
 router = APIRouter()
 _log = get_logger(__name__)
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 @router.get("/api/donations")
-def donations(
-    db: Session = Depends(_get_db),  # noqa: B008
-) -> JSONResponse:
+async def donations(request: Request) -> Response:
     """Public endpoint returning donation progress, milestones, and current multiplier."""
     try:
-        return JSONResponse(get_donation_status(db))
+        return await cached_json_async(
+            ROUTE_DONATIONS, "", lambda: run_db(request, get_donation_status), request
+        )
     except Exception:
         _log.exception("donations_endpoint_error")
         tb = traceback.format_exc()
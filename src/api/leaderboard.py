@@ -1,18 +1,25 @@
-import json
-import os
 import time as _time
-from collections.abc import Generator
 from datetime import UTC, datetime, timedelta
-from pathlib import Path
 from typing import Any
 
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.api.deps import get_db, run_db
+from src.lib.http_cache import (
+    SchedulerSchedule,
+    cache_headers,
+    etag_matches,
+    not_modified,
+    read_schedule,
+)
+from src.lib.response_cache import ROUTE_FEED, ROUTE_LEADERBOARD, cached_json_async
+from src.lib.runtime_overrides import get_runtime_overrides
 from src.models.models import Payout, RewardAccrual, User
 from src.services.domain.hodl_boost_service import get_tier_for_balance
+from src.services.domain.retention_service import summary_totals_subquery, user_summary_totals
 
 router = APIRouter()
 
@@ -24,28 +31,8 @@ def _get_cap_config(request: Request) -> tuple[int, int]:
     payout_cfg = getattr(cfg_obj, "payout", None)
     daily_cap = payout_cfg.daily_payout_cap if payout_cfg else 100
     weekly_cap = payout_cfg.weekly_payout_cap if payout_cfg else 500
-    # Apply runtime overrides if present
-    from src.jobs.__main__ import SCHEDULER_CONFIG_PATH as _SCP
-
-    if _SCP.exists():
-        try:
-            _ovr = json.loads(_SCP.read_text()).get("payout", {})
-            if "daily_kill_cap" in _ovr:
-                daily_cap = int(_ovr["daily_kill_cap"])
-            if "weekly_kill_cap" in _ovr:
-                weekly_cap = int(_ovr["weekly_kill_cap"])
-        except Exception:
-            pass
-    # Apply active promo cap overrides (takes precedence if higher)
-    from src.lib.promo import get_active_promo
-
-    promo = get_active_promo()
-    if promo:
-        if promo.daily_cap is not None:
-            daily_cap = max(daily_cap, promo.daily_cap)
-        if promo.weekly_cap is not None:
-            weekly_cap = max(weekly_cap, promo.weekly_cap)
-    return daily_cap, weekly_cap
+    # Runtime overrides, then active promo caps (takes precedence if higher)
+    return get_runtime_overrides().snapshot().effective_caps(daily_cap, weekly_cap)
 
 
 def _compute_cap_status(
@@ -124,6 +111,10 @@ def _compute_cap_status(
         .scalar()
         or 0
     )
+    # Pruned history is rolled up in user_daily_summaries (see retention_service)
+    archived = user_summary_totals(db, user_id)
+    total_accrued += float(archived.accrued_ban)
+    total_paid += float(archived.paid_ban)
     underpaid_ban = round(max(total_accrued - total_paid - unsettled_ban - orphan_ban, 0), 8)
 
     daily_at_cap = int(day_kills_paid) >= daily_cap
@@ -150,25 +141,47 @@ def _compute_cap_status(
     }
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
+class _CapStatusMemo:
+    """Per-build memo: each user's cap status is computed at most once.
+
+    The leaderboard, feed and ``/me/status`` sections of ``/api/bootstrap``
+    share one instance so overlapping users cost a single set of queries.
+    """
+
+    def __init__(self, db: Session, caps: tuple[int, int]) -> None:
+        self.db = db
+        self.daily_cap, self.weekly_cap = caps
+        self._by_user: dict[int, dict[str, Any]] = {}
+
+    def __call__(self, user_id: int) -> dict[str, Any]:
+        status = self._by_user.get(user_id)
+        if status is None:
+            status = _compute_cap_status(self.db, user_id, self.daily_cap, self.weekly_cap)
+            self._by_user[user_id] = status
+        return status
 
 
 @router.get("/api/leaderboard")
-def leaderboard(
+async def leaderboard(
     request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
     limit: int = 50,
     offset: int = 0,
-) -> JSONResponse:
+) -> Response:
     """Public leaderboard showing all players, kills, and payouts. No auth required."""
     limit = min(max(limit, 1), 100)
-    daily_cap, weekly_cap = _get_cap_config(request)
+    offset = max(offset, 0)
+
+    def build(db: Session) -> dict[str, Any]:
+        return _build_leaderboard(db, _CapStatusMemo(db, _get_cap_config(request)), limit, offset)
+
+    return await cached_json_async(
+        ROUTE_LEADERBOARD, f"{limit}:{offset}", lambda: run_db(request, build), request
+    )
+
+
+def _build_leaderboard(
+    db: Session, cap_status: _CapStatusMemo, limit: int, offset: int
+) -> dict[str, Any]:
 
     accrual_sub = (
         db.query(
@@ -190,18 +203,29 @@ def leaderboard(
         .subquery()
     )
 
+    summary_sub = summary_totals_subquery(db)
+    total_kills = func.coalesce(accrual_sub.c.total_kills, 0) + func.coalesce(
+        summary_sub.c.kills, 0
+    )
+
     rows = (
         db.query(
             User.id,
             User.discord_username,
             User.jpmt_balance,
-            func.coalesce(accrual_sub.c.total_kills, 0).label("total_kills"),
-            func.coalesce(accrual_sub.c.total_accrued, 0).label("total_accrued"),
-            func.coalesce(payout_sub.c.total_paid, 0).label("total_paid"),
+            total_kills.label("total_kills"),
+            (
+                func.coalesce(accrual_sub.c.total_accrued, 0)
+                + func.coalesce(summary_sub.c.accrued_ban, 0)
+            ).label("total_accrued"),
+            (
+                func.coalesce(payout_sub.c.total_paid, 0) + func.coalesce(summary_sub.c.paid_ban, 0)
+            ).label("total_paid"),
         )
         .outerjoin(accrual_sub, accrual_sub.c.user_id == User.id)
         .outerjoin(payout_sub, payout_sub.c.user_id == User.id)
-        .order_by(func.coalesce(accrual_sub.c.total_kills, 0).desc())
+        .outerjoin(summary_sub, summary_sub.c.user_id == User.id)
+        .order_by(total_kills.desc())
         .offset(offset)
         .limit(limit)
         .all()
@@ -211,7 +235,7 @@ def leaderboard(
 
     players = []
     for r in rows:
-        cap = _compute_cap_status(db, r.id, daily_cap, weekly_cap)
+        cap = cap_status(r.id)
         players.append(
             {
                 "discord_username": r.discord_username or "Unknown",
@@ -223,27 +247,27 @@ def leaderboard(
             }
         )
 
-    return JSONResponse(
-        {
-            "players": players,
-            "total": total_users,
-            "limit": limit,
-            "offset": offset,
-            "caps": {"daily": daily_cap, "weekly": weekly_cap},
-        }
-    )
+    return {
+        "players": players,
+        "total": total_users,
+        "limit": limit,
+        "offset": offset,
+        "caps": {"daily": cap_status.daily_cap, "weekly": cap_status.weekly_cap},
+    }
 
 
 @router.get("/api/feed")
-def activity_feed(
-    request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
-    limit: int = 30,
-) -> JSONResponse:
+async def activity_feed(request: Request, limit: int = 30) -> Response:
     """Public activity feed — recent accruals and payouts across all players."""
     limit = min(max(limit, 1), 100)
-    daily_cap, weekly_cap = _get_cap_config(request)
 
+    def build(db: Session) -> dict[str, Any]:
+        return _build_feed(db, _CapStatusMemo(db, _get_cap_config(request)), limit)
+
+    return await cached_json_async(ROUTE_FEED, str(limit), lambda: run_db(request, build), request)
+
+
+def _build_feed(db: Session, cap_status: _CapStatusMemo, limit: int) -> dict[str, Any]:
     accruals = (
         db.query(
             User.id.label("user_id"),
@@ -276,66 +300,48 @@ def activity_feed(
         .all()
     )
 
-    # Build cap cache for users in the accrual list
-    _cap_cache: dict[int, dict[str, Any]] = {}
-    for a in accruals:
-        if a.user_id not in _cap_cache:
-            _cap_cache[a.user_id] = _compute_cap_status(db, a.user_id, daily_cap, weekly_cap)
-
-    return JSONResponse(
-        {
-            "accruals": [
-                {
-                    "discord_username": a.discord_username or "Unknown",
-                    "kills": a.kills,
-                    "amount_ban": float(a.amount_ban),
-                    "settled": a.settled,
-                    "created_at": a.created_at.isoformat() if a.created_at else None,
-                    "jpmt_badge": get_tier_for_balance(a.jpmt_balance or 0).badge,
-                    "user_at_cap": _cap_cache.get(a.user_id, {}).get("at_cap", False),
-                }
-                for a in accruals
-            ],
-            "payouts": [
-                {
-                    "discord_username": p.discord_username or "Unknown",
-                    "amount_ban": float(p.amount_ban),
-                    "status": p.status,
-                    "tx_hash": p.tx_hash,
-                    "error_detail": p.error_detail,
-                    "created_at": p.created_at.isoformat() if p.created_at else None,
-                    "jpmt_badge": get_tier_for_balance(p.jpmt_balance or 0).badge,
-                }
-                for p in payouts
-            ],
-        }
-    )
+    return {
+        "accruals": [
+            {
+                "discord_username": a.discord_username or "Unknown",
+                "kills": a.kills,
+                "amount_ban": float(a.amount_ban),
+                "settled": a.settled,
+                "created_at": a.created_at.isoformat() if a.created_at else None,
+                "jpmt_badge": get_tier_for_balance(a.jpmt_balance or 0).badge,
+                "user_at_cap": cap_status(a.user_id)["at_cap"],
+            }
+            for a in accruals
+        ],
+        "payouts": [
+            {
+                "discord_username": p.discord_username or "Unknown",
+                "amount_ban": float(p.amount_ban),
+                "status": p.status,
+                "tx_hash": p.tx_hash,
+                "error_detail": p.error_detail,
+                "created_at": p.created_at.isoformat() if p.created_at else None,
+                "jpmt_badge": get_tier_for_balance(p.jpmt_balance or 0).badge,
+            }
+            for p in payouts
+        ],
+    }
+
+
+def _operator_address(db: Session) -> str:
+    """Operator donation address: P2S_OPERATOR_ACCOUNT, else derived from the stored seed."""
+    from src.services.operator_identity import resolve_operator_account
+
+    return resolve_operator_account(db) or ""
 
 
 @router.get("/api/donate-info")
 def donate_info(
     request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
 ) -> JSONResponse:
     """Public endpoint returning operator wallet address and balance for donations."""
-    operator_account = os.getenv("P2S_OPERATOR_ACCOUNT", "")
-
-    # If no env var, try to derive from stored seed
-    if not operator_account:
-        from src.lib.crypto import decrypt_value
-        from src.models.models import SecureConfig
-        from src.services.banano_client import seed_to_address
-
-        seed_config = (
-            db.query(SecureConfig)
-            .filter(SecureConfig.key == "operator_seed")
-            .order_by(SecureConfig.id.desc())
-            .first()
-        )
-        if seed_config:
-            decrypted = decrypt_value(seed_config.encrypted_value)
-            if decrypted:
-                operator_account = seed_to_address(decrypted) or ""
+    operator_account = _operator_address(db)
 
     if not operator_account:
         return JSONResponse({"address": None, "balance": None, "pending": None})
@@ -350,18 +356,9 @@ def donate_info(
             from src.services.banano_client import BananoClient
 
             # Load operator seed so we can auto-receive pending donations
-            seed_hex: str | None = None
-            from src.lib.crypto import decrypt_value as _dv
-            from src.models.models import SecureConfig
-
-            _seed_row = (
-                db.query(SecureConfig)
-                .filter(SecureConfig.key == "operator_seed")
-                .order_by(SecureConfig.id.desc())
-                .first()
-            )
-            if _seed_row:
-                seed_hex = _dv(_seed_row.encrypted_value)
+            from src.services.operator_identity import load_operator_seed
+
+            seed_hex = load_operator_seed(db)
 
             banano = BananoClient(
                 node_url=integrations.node_rpc,
@@ -377,12 +374,19 @@ def donate_info(
 
             balance, pending = banano.account_balance(operator_account)
 
-            # Record individual donations with sender addresses
-            if received_blocks and pending_blocks:
+            # Record individual donations with sender addresses (the chain sync records
+            # them from account history instead when enabled)
+            from src.jobs.donation_sync import donation_sync_enabled
+
+            if received_blocks and pending_blocks and not donation_sync_enabled():
                 from decimal import Decimal
 
-                from src.services.domain.donation_service import record_donation
+                from src.services.domain.donation_service import (
+                    announce_donations,
+                    record_donation,
+                )
 
+                recorded: list[dict[str, object]] = []
                 for block in pending_blocks:
                     amount = Decimal(str(block["amount_ban"]))
                     if amount > 0:
@@ -393,7 +397,11 @@ def donate_info(
                             source="donate-info",
                             sender_address=block.get("sender"),
                         )
+                        recorded.append(
+                            {"amount_ban": float(amount), "sender_address": block.get("sender")}
+                        )
                 db.commit()
+                announce_donations(db, recorded, source="donate-info")
         except Exception:
             pass
 
@@ -401,35 +409,34 @@ def donate_info(
 
 
 @router.get("/api/scheduler/countdown")
-def scheduler_countdown() -> JSONResponse:
-    """Public endpoint returning seconds until next accrual and settlement cycles."""
-    hb_path = Path(os.getenv("P2S_HEARTBEAT_FILE", "/tmp/scheduler_heartbeat.json"))
-    empty = {
-        "next_accrual_in": None,
-        "next_settlement_in": None,
-        "accrual_interval_seconds": None,
-        "settlement_interval_seconds": None,
+async def scheduler_countdown(request: Request) -> Response:
+    """Public endpoint returning seconds until next accrual and settlement cycles.
+
+    The ETag tracks the heartbeat schedule rather than the body, so clients
+    that tick the countdown locally get a 304 until a cycle actually runs.
+    """
+    schedule = read_schedule()
+    if schedule is None:
+        return JSONResponse(_countdown_payload(None))
+    etag = schedule.version
+    max_age = schedule.next_cycle_in(_time.time())
+    if etag_matches(request, etag):
+        return not_modified(etag, max_age)
+    return JSONResponse(_countdown_payload(schedule), headers=cache_headers(etag, max_age))
+
+
+def _countdown_payload(schedule: SchedulerSchedule | None) -> dict[str, Any]:
+    if schedule is None:
+        return {
+            "next_accrual_in": None,
+            "next_settlement_in": None,
+            "accrual_interval_seconds": None,
+            "settlement_interval_seconds": None,
+        }
+    now = _time.time()
+    return {
+        "next_accrual_in": schedule.next_accrual_in(now),
+        "next_settlement_in": schedule.next_settlement_in(now),
+        "accrual_interval_seconds": schedule.accrual_interval,
+        "settlement_interval_seconds": schedule.settlement_interval,
     }
-    if not hb_path.exists():
-        return JSONResponse(empty)
-    try:
-        data = json.loads(hb_path.read_text())
-        now = _time.time()
-        default_interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
-
-        accrual_interval = data.get("accrual_interval_seconds") or default_interval
-        settlement_interval = data.get("settlement_interval_seconds") or default_interval
-
-        last_accrual = data.get("last_accrual_ts") or data.get("ts", 0)
-        last_settlement = data.get("last_settlement_ts") or data.get("ts", 0)
-
-        return JSONResponse(
-            {
-                "next_accrual_in": max(0, int(last_accrual + accrual_interval - now)),
-                "next_settlement_in": max(0, int(last_settlement + settlement_interval - now)),
-                "accrual_interval_seconds": accrual_interval,
-                "settlement_interval_seconds": settlement_interval,
-            }
-        )
-    except Exception:
-        return JSONResponse(empty)
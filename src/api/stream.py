@@ -0,0 +1,44 @@
+"""Public live activity stream (SSE) — replaces feed/leaderboard polling."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from fastapi import APIRouter, Header, Query
+from fastapi.responses import StreamingResponse
+
+from src.lib.live_stream import stream
+
+router = APIRouter()
+
+
+@router.get("/api/stream")
+async def activity_stream(
+    last_event_id: str | None = Header(None, alias="Last-Event-ID"),
+    since: int | None = Query(None, ge=0, description="Replay events after this id"),
+) -> StreamingResponse:
+    """Server-Sent Events: accrual, payout, donation and milestone events as they commit.
+
+    Browser usage:
+        const es = new EventSource('/api/stream');
+        es.addEventListener('accrual', (e) => prependAccruals(JSON.parse(e.data)));
+
+    ``resync`` means events were missed; the client should refetch full state.
+    """
+    resume = since
+    if resume is None and last_event_id and last_event_id.isdigit():
+        resume = int(last_event_id)
+
+    async def _gen() -> AsyncIterator[bytes]:
+        async for frame in stream(last_event_id=resume):
+            yield frame.encode()
+
+    return StreamingResponse(
+        _gen(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # disable nginx buffering on Akash ingress
+            "Connection": "keep-alive",
+        },
+    )
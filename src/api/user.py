@@ -1,23 +1,40 @@
 import base64
 import time
-from collections.abc import Generator
 from datetime import UTC, datetime
 from decimal import Decimal
+from typing import Any
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from nacl.exceptions import BadSignatureError
 from nacl.signing import VerifyKey
 from sqlalchemy.orm import Session
 
-from src.lib.auth import session_secret, verify_session
+from src.api.deps import (
+    SessionIdentity,
+    current_identity,
+    current_user,
+    get_db,
+    get_identity_cache,
+    run_db,
+)
+from src.api.leaderboard import _CapStatusMemo, _get_cap_config
 from src.lib.observability import get_logger
+from src.lib.pagination import InvalidCursorError, decode_cursor, keyset_after, next_cursor
+from src.lib.response_cache import (
+    ROUTE_HODL_BOOSTED,
+    ROUTE_HODL_TIERS,
+    cached_json,
+    cached_json_async,
+)
 from src.models.models import Payout, RewardAccrual, User, VerificationRecord, WalletLink
 from src.services.domain.hodl_boost_service import (
-    fetch_spl_token_balance,
+    SolanaRpcError,
+    get_solana_client,
     get_tier_for_balance,
     tiers_as_dicts,
 )
+from src.services.domain.retention_service import user_summary_totals
 
 log = get_logger("api.user")
 
@@ -28,20 +45,11 @@ BANANO_ADDR_MAX_LEN = 120
 router = APIRouter()
 
 
-def _get_db(request: Request) -> Generator[Session, None, None]:
-    session_factory = request.app.state.session_factory
-    session = session_factory()
-    try:
-        yield session
-    finally:
-        session.close()
-
-
 @router.post("/link/wallet")
 def link_wallet(
     request: Request,
     banano_address: str = Body(..., embed=True),
-    db: Session = Depends(_get_db),  # noqa: B008 - FastAPI dependency
+    db: Session = Depends(get_db),  # noqa: B008 - FastAPI dependency
 ) -> JSONResponse:
     # rudimentary validation: must start with 'ban_'
     if not isinstance(banano_address, str) or not banano_address.startswith("ban_"):
@@ -51,24 +59,19 @@ def link_wallet(
         BANANO_ADDR_MIN_LEN <= len(banano_address) <= BANANO_ADDR_MAX_LEN
     ):
         raise HTTPException(status_code=400, detail="Invalid Banano address")
-    # Identify user from session cookie
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+    # Address is validated before auth so malformed input is a 400 either way
+    identity = current_identity(request, db)
     # Upsert primary wallet link
+    user_id = identity.user_id
     existing = (
         db.query(WalletLink)
-        .filter(WalletLink.user_id == user.id, WalletLink.address == banano_address)
+        .filter(WalletLink.user_id == user_id, WalletLink.address == banano_address)
         .one_or_none()
     )
     if existing:
         wl = existing
     else:
-        wl = WalletLink(user_id=user.id, address=banano_address, is_primary=True, verified=True)
+        wl = WalletLink(user_id=user_id, address=banano_address, is_primary=True, verified=True)
         db.add(wl)
     db.commit()
     return JSONResponse({"linked": True, "address": banano_address})
@@ -117,12 +120,13 @@ def _base58_decode(s: str) -> bytes:
 
 
 @router.post("/me/verify-solana")
-def verify_solana_wallet(
+def verify_solana_wallet(  # noqa: PLR0913, PLR0917 - body fields + dependencies
     request: Request,
     solana_address: str = Body(..., embed=True),
     signature: str = Body(..., embed=True),
     message: str = Body(..., embed=True),
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
+    user: User = Depends(current_user),  # noqa: B008
 ) -> JSONResponse:
     """Link a Solana wallet and verify $JPMT token holdings for HODL boost.
 
@@ -161,14 +165,6 @@ def verify_solana_wallet(
             status_code=400, detail="Invalid wallet signature — could not verify ownership"
         )
 
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-
     # Get HODL boost config
     app_state = getattr(getattr(request, "app", None), "state", None)
     cfg_obj = getattr(app_state, "config", None)
@@ -180,8 +176,14 @@ def verify_solana_wallet(
     token_ca = payout_cfg.hodl_boost_token_ca
     rpc_url = payout_cfg.hodl_boost_solana_rpc
 
-    # Fetch on-chain balance
-    balance = fetch_spl_token_balance(solana_address, token_ca, rpc_url)
+    # Fetch on-chain balance (fails fast while the shared RPC circuit is open)
+    try:
+        balance = get_solana_client(rpc_url).token_balance(solana_address, token_ca)
+    except SolanaRpcError as exc:
+        log.warning("verify_solana_rpc_unavailable", error=str(exc))
+        raise HTTPException(
+            status_code=503, detail="Solana RPC unavailable, try again shortly"
+        ) from exc
 
     # Update user record
     user.solana_wallet_address = solana_address
@@ -203,16 +205,20 @@ def verify_solana_wallet(
 
 
 @router.get("/hodl/tiers")
-def hodl_tiers() -> JSONResponse:
+async def hodl_tiers(request: Request) -> Response:
     """Public endpoint returning all HODL boost tiers."""
-    return JSONResponse({"tiers": tiers_as_dicts()})
+    return cached_json(ROUTE_HODL_TIERS, "", lambda: {"tiers": tiers_as_dicts()}, request)
 
 
 @router.get("/hodl/boosted")
-def hodl_boosted(
-    db: Session = Depends(_get_db),  # noqa: B008
-) -> JSONResponse:
+async def hodl_boosted(request: Request) -> Response:
     """Public endpoint returning all users with an active HODL boost (balance > 0)."""
+    return await cached_json_async(
+        ROUTE_HODL_BOOSTED, "", lambda: run_db(request, _build_hodl_boosted), request
+    )
+
+
+def _build_hodl_boosted(db: Session) -> dict[str, Any]:
     users = db.query(User).filter(User.jpmt_balance > 0).order_by(User.jpmt_balance.desc()).all()
     result = []
     for u in users:
@@ -228,21 +234,15 @@ def hodl_boosted(
                 "verified_at": u.jpmt_verified_at.isoformat() if u.jpmt_verified_at else None,
             }
         )
-    return JSONResponse({"boosted_users": result, "total": len(result)})
+    return {"boosted_users": result, "total": len(result)}
 
 
 @router.post("/me/reverify")
 def me_reverify(
     request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
+    user: User = Depends(current_user),  # noqa: B008
 ) -> JSONResponse:
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
     # Access app integrations config
     app_state = getattr(getattr(request, "app", None), "state", None)
     cfg_obj = getattr(app_state, "config", None)
@@ -282,6 +282,7 @@ def me_reverify(
     )
     db.add(vr)
     db.commit()
+    get_identity_cache().invalidate_user(user.discord_user_id)
     return JSONResponse(
         {
             "status": "accepted",
@@ -292,16 +293,18 @@ def me_reverify(
 
 
 @router.get("/me/status")
-def me_status(request: Request, db: Session = Depends(_get_db)) -> JSONResponse:  # noqa: B008
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+def me_status(
+    request: Request,
+    db: Session = Depends(get_db),  # noqa: B008
+    user: User = Depends(current_user),  # noqa: B008
+) -> JSONResponse:
+    return JSONResponse(_build_me_status(db, user, _CapStatusMemo(db, _get_cap_config(request))))
+
+
+def _build_me_status(db: Session, user: User, cap_status: _CapStatusMemo) -> dict[str, Any]:
     # compute accrued rewards sum
     total_accrued = sum(Decimal(a.amount_ban) for a in user.accruals)
+    total_accrued += user_summary_totals(db, user.id).accrued_ban  # pruned history
     # latest verification timestamp
     latest_ver = (
         db.query(VerificationRecord)
@@ -327,50 +330,42 @@ def me_status(request: Request, db: Session = Depends(_get_db)) -> JSONResponse:
     solana_addr = getattr(user, "solana_wallet_address", None)
     jpmt_verified = getattr(user, "jpmt_verified_at", None)
 
-    # Kill cap status
-    from src.api.leaderboard import _compute_cap_status, _get_cap_config
-
-    daily_cap, weekly_cap = _get_cap_config(request)
-    cap_status = _compute_cap_status(db, user.id, daily_cap, weekly_cap)
-
-    return JSONResponse(
-        {
-            "discord_username": user.discord_username,
-            "linked": bool(user.wallet_links),
-            "wallet_address": wallet_address,
-            "last_verified_at": last_verified_at,
-            "last_verified_status": last_verified_status,
-            "last_verified_source": last_verified_source,
-            "accrued_rewards_ban": float(total_accrued),
-            "solana_wallet": solana_addr,
-            "jpmt_balance": jpmt_balance,
-            "jpmt_tier": tier.name,
-            "jpmt_badge": tier.badge,
-            "jpmt_multiplier": tier.multiplier,
-            "jpmt_verified_at": jpmt_verified.isoformat() if jpmt_verified else None,
-            "cap_status": cap_status,
-        }
-    )
+    return {
+        "discord_username": user.discord_username,
+        "linked": bool(user.wallet_links),
+        "wallet_address": wallet_address,
+        "last_verified_at": last_verified_at,
+        "last_verified_status": last_verified_status,
+        "last_verified_source": last_verified_source,
+        "accrued_rewards_ban": float(total_accrued),
+        "solana_wallet": solana_addr,
+        "jpmt_balance": jpmt_balance,
+        "jpmt_tier": tier.name,
+        "jpmt_badge": tier.badge,
+        "jpmt_multiplier": tier.multiplier,
+        "jpmt_verified_at": jpmt_verified.isoformat() if jpmt_verified else None,
+        # Kill cap status
+        "cap_status": cap_status(user.id),
+    }
 
 
 @router.get("/me/payouts")
 def me_payouts(  # noqa: PLR0913 - explicit filter params acceptable for clarity
-    request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
+    db: Session = Depends(get_db),  # noqa: B008
     limit: int = 20,
     offset: int = 0,
     status: str | None = None,
     sort: str = "-created_at",
+    cursor: str | None = None,
+    identity: SessionIdentity = Depends(current_identity),  # noqa: B008
 ) -> JSONResponse:
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
+    """Caller's payouts, newest first by default.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` for keyset paging
+    (default sort only); ``offset`` still works for compatibility.
+    """
     try:
-        q = db.query(Payout).filter(Payout.user_id == user.id)
+        q = db.query(Payout).filter(Payout.user_id == identity.user_id)
         if status:
             q = q.filter(Payout.status == status)
         # sorting
@@ -379,10 +374,19 @@ def me_payouts(  # noqa: PLR0913 - explicit filter params acceptable for clarity
         is_desc = sort.startswith("-")
         field = sort.lstrip("-")
         col = getattr(Payout, field)
-        q = q.order_by(col.desc() if is_desc else col.asc())
+        q = q.order_by(col.desc() if is_desc else col.asc(), Payout.id.desc())
+        keyset = sort == "-created_at"
+        if cursor is not None:
+            if not keyset:
+                raise HTTPException(status_code=400, detail="cursor requires sort=-created_at")
+            try:
+                q = q.filter(keyset_after(Payout.created_at, Payout.id, decode_cursor(cursor)))
+            except InvalidCursorError as exc:
+                raise HTTPException(status_code=400, detail=str(exc)) from exc
+        elif offset:
+            q = q.offset(offset)
         capped_limit = min(limit, 100)
-        q = q.offset(offset).limit(capped_limit)
-        rows = q.all()
+        rows, next_token = next_cursor(q.limit(capped_limit + 1).all(), capped_limit)
         return JSONResponse(
             {
                 "payouts": [
@@ -398,37 +402,42 @@ def me_payouts(  # noqa: PLR0913 - explicit filter params acceptable for clarity
                 "count": len(rows),
                 "limit": capped_limit,
                 "offset": offset,
-                "has_more": len(rows) >= capped_limit,
+                "has_more": next_token is not None,
+                "next_cursor": next_token if keyset else None,
             }
         )
     except HTTPException:
         raise
     except Exception as exc:
-        log.error("me_payouts_error", error=str(exc), user_id=user.id)
+        log.error("me_payouts_error", error=str(exc), user_id=identity.user_id)
         raise HTTPException(status_code=500, detail=f"Failed to load payouts: {exc}") from exc
 
 
 @router.get("/me/accruals")
-def me_accruals(
-    request: Request,
-    db: Session = Depends(_get_db),  # noqa: B008
+def me_accruals(  # noqa: PLR0913, PLR0917 - explicit filter params acceptable for clarity
+    db: Session = Depends(get_db),  # noqa: B008
     limit: int = 50,
     offset: int = 0,
     settled: bool | None = None,
+    cursor: str | None = None,
+    identity: SessionIdentity = Depends(current_identity),  # noqa: B008
 ) -> JSONResponse:
-    token = request.cookies.get("p2s_session") if request else None
-    uid = verify_session(token, session_secret()) if token else None
-    if not uid:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    user = db.query(User).filter(User.discord_user_id == uid).one_or_none()
-    if not user:
-        raise HTTPException(status_code=401, detail="Unauthorized")
-    q = db.query(RewardAccrual).filter(RewardAccrual.user_id == user.id)
+    """Caller's accruals, newest first; ``cursor`` (from ``next_cursor``) or ``offset``."""
+    q = db.query(RewardAccrual).filter(RewardAccrual.user_id == identity.user_id)
     if settled is not None:
         q = q.filter(RewardAccrual.settled.is_(settled))
+    q = q.order_by(RewardAccrual.created_at.desc(), RewardAccrual.id.desc())
+    if cursor is not None:
+        try:
+            q = q.filter(
+                keyset_after(RewardAccrual.created_at, RewardAccrual.id, decode_cursor(cursor))
+            )
+        except InvalidCursorError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    elif offset:
+        q = q.offset(offset)
     capped_limit = min(limit, 200)
-    q = q.order_by(RewardAccrual.created_at.desc()).offset(offset).limit(capped_limit)
-    rows = q.all()
+    rows, next_token = next_cursor(q.limit(capped_limit + 1).all(), capped_limit)
     return JSONResponse(
         {
             "accruals": [
@@ -445,6 +454,7 @@ def me_accruals(
             "count": len(rows),
             "limit": capped_limit,
             "offset": offset,
-            "has_more": len(rows) >= capped_limit,
+            "has_more": next_token is not None,
+            "next_cursor": next_token,
         }
     )
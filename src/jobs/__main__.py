@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import argparse
 import json
 import os
 import random
+import socket
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -11,27 +14,46 @@ from dotenv import load_dotenv
 from prometheus_client import Counter, start_http_server
 
 HEARTBEAT_PATH = Path(os.getenv("P2S_HEARTBEAT_FILE", "/tmp/scheduler_heartbeat.json"))
-SCHEDULER_CONFIG_PATH = Path(
-    os.getenv("P2S_SCHEDULER_CONFIG_FILE", "/data/scheduler_overrides.json")
-)
 
 load_dotenv()
-from sqlalchemy import create_engine  # noqa: E402
 from sqlalchemy.orm import Session, sessionmaker  # noqa: E402
 
 from src.lib.config import get_config  # noqa: E402
+from src.lib.db import make_engine  # noqa: E402
 from src.lib.observability import get_logger, get_tracer  # noqa: E402
+from src.lib.runtime_overrides import get_runtime_overrides  # noqa: E402
+from src.lib.scheduler_control import (  # noqa: E402
+    ACTION_PHASES,
+    ACTION_RELOAD,
+    Command,
+    CommandProgress,
+    ControlChannel,
+    configure_control_channel,
+    get_control_channel,
+)
+from src.models.base import Base  # noqa: E402
+from src.models.types import pin_money_storage  # noqa: E402
 from src.services.fortnite_service import FortniteService  # noqa: E402
+from src.services.operator_identity import invalidate_operator_identity  # noqa: E402
 
-from .accrual import AccrualJobConfig, run_accrual  # noqa: E402
+from .accrual import AccrualJobConfig, ShardSpec, run_accrual  # noqa: E402
+from .donation_sync import donation_sync_enabled, run_donation_sync  # noqa: E402
 from .hodl_scan import run_hodl_scan  # noqa: E402
+from .lease import LeaderLease, make_scheduler_lease  # noqa: E402
+from .phases import Phase, PhaseRuntime  # noqa: E402
 from .settlement import SchedulerConfig, run_settlement  # noqa: E402
+from .sharding import run_sharded_accrual  # noqa: E402
 
 log = get_logger("jobs.main")
 JOB_ERRORS = Counter("scheduler_errors_total", "Unhandled errors in main scheduler loop")
 
 
-def _build_scheduler_components() -> tuple[SchedulerConfig, FortniteService, AccrualJobConfig]:
+def _build_scheduler_components(
+    shard: ShardSpec | None = None,
+) -> tuple[SchedulerConfig, FortniteService, AccrualJobConfig]:
+    """Build scheduler config; ``shard`` (or ``P2S_ACCRUAL_SHARD``) limits accrual to one slice."""
+    if shard is None and os.getenv("P2S_ACCRUAL_SHARD"):
+        shard = ShardSpec.parse(os.environ["P2S_ACCRUAL_SHARD"])
     interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
     min_balance = float(os.getenv("P2S_MIN_OPERATOR_BALANCE_BAN", "50"))
     dry_run = os.getenv("P2S_DRY_RUN", "true").lower() in ("1", "true", "yes")
@@ -42,9 +64,7 @@ def _build_scheduler_components() -> tuple[SchedulerConfig, FortniteService, Acc
     daily_cap = payout_cfg.daily_payout_cap
     weekly_cap = payout_cfg.weekly_payout_cap
     # Apply active promo cap overrides
-    from src.lib.promo import get_active_promo
-
-    promo = get_active_promo()
+    promo = get_runtime_overrides().snapshot().promo
     if promo:
         if promo.daily_cap is not None:
             daily_cap = max(daily_cap, promo.daily_cap)
@@ -60,106 +80,36 @@ def _build_scheduler_components() -> tuple[SchedulerConfig, FortniteService, Acc
         operator_account=operator_account,
         node_url=integrations.node_rpc,
     )
+    per_minute = int(integrations.rate_limits.get("fortnite_per_minute", 60))
+    if shard is not None:
+        per_minute = max(per_minute // shard.count, 1)  # this instance's share of the quota
     fortnite = FortniteService(
         api_key=integrations.fortnite_api_key,
         base_url=getattr(integrations, "fortnite_base_url", "https://fortnite.example.api/v1"),
-        per_minute_limit=int(integrations.rate_limits.get("fortnite_per_minute", 60)),
+        per_minute_limit=per_minute,
+        dry_run=integrations.dry_run,
+    )
+    accrual_cfg = AccrualJobConfig(
+        batch_size=None,
         dry_run=integrations.dry_run,
+        shard=shard,
+        shards=1 if shard is not None else int(os.getenv("P2S_ACCRUAL_SHARDS", "1")),
     )
-    accrual_cfg = AccrualJobConfig(batch_size=None, dry_run=integrations.dry_run)
     return cfg, fortnite, accrual_cfg
 
 
-def _run_once(
-    session: Session,
-    scheduler_cfg: SchedulerConfig,
-    fortnite: FortniteService,
-    accrual_cfg: AccrualJobConfig,
-    tracer_name: str = "scheduler",
-) -> None:
-    tracer = get_tracer(tracer_name)
-    cfg = scheduler_cfg
-    try:
-        with tracer.start_as_current_span(
-            "accrual_cycle",
-            attributes={
-                "scheduler.interval_sec": cfg.interval_seconds,
-                "scheduler.dry_run": cfg.dry_run,
-                "fortnite.base_url": fortnite.base_url,
-            },
-        ):
-            accrual_res = run_accrual(session, fortnite, accrual_cfg)
-            log.info("accrual_cycle", **accrual_res)
-    except Exception as exc:  # pragma: no cover
-        JOB_ERRORS.inc()
-        log.error("accrual_cycle_error", error=str(exc))
-    _run_hodl_scan_phase(session)
-    try:
-        from src.services.banano_client import BananoClient
-
-        banano = BananoClient(node_url=cfg.node_url, dry_run=cfg.dry_run)
-        with tracer.start_as_current_span(
-            "operator_balance_check",
-            attributes={
-                "banano.node_url": cfg.node_url,
-                "banano.min_balance": cfg.min_operator_balance_ban,
-                "scheduler.dry_run": cfg.dry_run,
-            },
-        ):
-            has_balance = banano.has_min_balance(cfg.min_operator_balance_ban, cfg.operator_account)
-        if not has_balance:
-            log.warning("settlement_skipped_low_balance")
-            return
-        with tracer.start_as_current_span(
-            "settlement_cycle",
-            attributes={
-                "banano.min_balance": cfg.min_operator_balance_ban,
-                "scheduler.interval_sec": cfg.interval_seconds,
-            },
-        ):
-            run_settlement(session, cfg)
-    except Exception as exc:  # pragma: no cover
-        JOB_ERRORS.inc()
-        log.error("settlement_cycle_error", error=str(exc))
-
-
 def _read_scheduler_overrides(default_interval: int) -> dict[str, int]:
-    """Read admin-set interval overrides from the shared config file."""
-    result = {
-        "accrual_interval_seconds": default_interval,
-        "settlement_interval_seconds": default_interval,
-    }
-    if not SCHEDULER_CONFIG_PATH.exists():
-        return result
-    try:
-        data = json.loads(SCHEDULER_CONFIG_PATH.read_text())
-        if "accrual_interval_seconds" in data:
-            result["accrual_interval_seconds"] = max(30, int(data["accrual_interval_seconds"]))
-        if "settlement_interval_seconds" in data:
-            result["settlement_interval_seconds"] = max(
-                30, int(data["settlement_interval_seconds"])
-            )
-    except Exception:
-        pass
-    return result
+    """Admin-set interval overrides (in-memory snapshot of the shared config file)."""
+    return get_runtime_overrides().snapshot().intervals(default_interval)
 
 
 def _read_payout_overrides() -> dict[str, float | int] | None:
-    """Read admin-set payout config overrides from the shared config file.
+    """Admin-set payout config overrides from the shared config file.
 
     Returns dict with optional keys: ban_per_kill, daily_kill_cap, weekly_kill_cap.
     Returns None if no overrides exist.
     """
-    if not SCHEDULER_CONFIG_PATH.exists():
-        return None
-    try:
-        data = json.loads(SCHEDULER_CONFIG_PATH.read_text())
-        payout = data.get("payout")
-        if isinstance(payout, dict):
-            return payout
-    except Exception:
-        pass
-    return None
+    return get_runtime_overrides().snapshot().payout
 
 
 @dataclass
@@ -175,11 +125,12 @@ class HeartbeatInfo:
 
 
 def _write_heartbeat(hb: HeartbeatInfo) -> None:
-    """Write scheduler heartbeat to a shared file the API can read."""
+    """Publish the scheduler heartbeat (control channel, plus the shared file)."""
     try:
         data: dict[str, object] = {
             "ts": time.time(),
             "status": hb.status,
+            "host": socket.gethostname(),
             "pid": os.getpid(),
             "accrual_interval_seconds": hb.accrual_interval,
             "settlement_interval_seconds": hb.settlement_interval,
@@ -189,21 +140,57 @@ def _write_heartbeat(hb: HeartbeatInfo) -> None:
         }
         if hb.error:
             data["error"] = hb.error[:500]
+        channel = get_control_channel()
+        if channel is not None:
+            channel.beat(data)
         HEARTBEAT_PATH.write_text(json.dumps(data))
     except Exception:
         pass  # best-effort
 
 
-def _run_hodl_scan_phase(session: Session) -> None:
+def _run_hodl_scan_phase(session: Session) -> dict[str, int]:
     """Run the HODL balance scan phase."""
     tracer = get_tracer("scheduler")
     try:
         with tracer.start_as_current_span("hodl_scan_cycle"):
             scan_res = run_hodl_scan(session)
             log.info("hodl_scan_cycle", **scan_res)
+            return scan_res
     except Exception as exc:  # pragma: no cover
         JOB_ERRORS.inc()
         log.error("hodl_scan_cycle_error", error=str(exc))
+        raise
+
+
+def _run_economics_reconcile(session: Session) -> None:
+    """Re-sum donation / payout totals so the economics snapshot cannot drift."""
+    try:
+        from src.services.domain.donation_service import get_economics
+
+        econ = get_economics().reconcile(session)
+        log.info(
+            "economics_reconciled",
+            total_donated=float(econ.total_donated),
+            total_paid_out=float(econ.total_paid_out),
+            sustainability=econ.sustainability_factor,
+        )
+    except Exception as exc:  # pragma: no cover
+        JOB_ERRORS.inc()
+        log.error("economics_reconcile_error", error=str(exc))
+
+
+def _run_retention(session: Session, *, fence: Callable[[], object] | None = None) -> None:
+    """Summarize + archive rows past the retention window (scripts/prune_data.py)."""
+    try:
+        if fence is not None:
+            fence()
+        from src.services.domain.retention_service import RetentionPolicy, run_retention
+
+        run_retention(session, RetentionPolicy.from_env())
+    except Exception as exc:  # pragma: no cover
+        session.rollback()
+        JOB_ERRORS.inc()
+        log.error("retention_error", error=str(exc))
 
 
 def _run_accrual_only(
@@ -211,8 +198,13 @@ def _run_accrual_only(
     scheduler_cfg: SchedulerConfig,
     fortnite: FortniteService,
     accrual_cfg: AccrualJobConfig,
-) -> None:
-    """Run only the accrual phase."""
+    *,
+    lease: LeaderLease | None = None,
+) -> dict[str, int] | None:
+    """Run only the accrual phase (fanned out to worker processes when ``shards > 1``)."""
+    if accrual_cfg.shards < 1:
+        return None  # accrual runs in separate ``--shard i/N`` instances
+    fence = lease.fence if lease is not None else None
     tracer = get_tracer("scheduler")
     try:
         with tracer.start_as_current_span(
@@ -223,21 +215,31 @@ def _run_accrual_only(
                 "fortnite.base_url": fortnite.base_url,
             },
         ):
-            accrual_res = run_accrual(session, fortnite, accrual_cfg)
+            if accrual_cfg.shards > 1:
+                db_url = session.get_bind().engine.url.render_as_string(hide_password=False)
+                accrual_res = run_sharded_accrual(db_url, fortnite, accrual_cfg, lease=lease)
+            else:
+                accrual_res = run_accrual(session, fortnite, accrual_cfg, fence=fence)
             log.info("accrual_cycle", **accrual_res)
+            return accrual_res
     except Exception as exc:  # pragma: no cover
         JOB_ERRORS.inc()
         log.error("accrual_cycle_error", error=str(exc))
+        raise
 
 
-def _run_settlement_only(
+def _run_donation_receive(
     session: Session,
     scheduler_cfg: SchedulerConfig,
-) -> None:
-    """Run only the settlement phase."""
+    *,
+    fence: Callable[[], object] | None = None,
+) -> dict[str, int]:
+    """Receive pending blocks into the operator account and record them as donations."""
     tracer = get_tracer("scheduler")
     cfg = scheduler_cfg
     try:
+        if fence is not None:
+            fence()  # receiving blocks is leader-only
         from src.services.banano_client import BananoClient
 
         seed_hex = None
@@ -260,13 +262,18 @@ def _run_settlement_only(
             if received:
                 log.info("operator_received_pending", blocks=received)
 
-        # Record individual donations with sender addresses
-        if received and pending_blocks:
+        # Record individual donations with sender addresses (the chain sync records
+        # them from account history instead when enabled)
+        if received and pending_blocks and not donation_sync_enabled():
             try:
                 from decimal import Decimal
 
-                from src.services.domain.donation_service import record_donation
+                from src.services.domain.donation_service import (
+                    announce_donations,
+                    record_donation,
+                )
 
+                recorded: list[dict[str, object]] = []
                 for block in pending_blocks:
                     amount = Decimal(str(block["amount_ban"]))
                     if amount > 0:
@@ -277,7 +284,11 @@ def _run_settlement_only(
                             source="scheduler",
                             sender_address=block.get("sender"),
                         )
+                        recorded.append(
+                            {"amount_ban": float(amount), "sender_address": block.get("sender")}
+                        )
                 session.commit()
+                announce_donations(session, recorded, source="scheduler")
                 log.info(
                     "donations_recorded",
                     count=len(pending_blocks),
@@ -285,6 +296,56 @@ def _run_settlement_only(
                 )
             except Exception as exc:
                 log.warning("donation_record_failed", error=str(exc))
+        return {"blocks_received": int(received or 0)}
+    except Exception as exc:  # pragma: no cover
+        JOB_ERRORS.inc()
+        log.error("donation_receive_error", error=str(exc))
+        raise
+
+
+def _run_donation_sync(
+    session: Session,
+    scheduler_cfg: SchedulerConfig,
+    *,
+    fence: Callable[[], object] | None = None,
+) -> dict[str, int]:
+    """Record receive blocks added to the operator account since the last sync."""
+    from src.services.banano_client import BananoClient
+
+    cfg = scheduler_cfg
+    try:
+        banano = BananoClient(node_url=cfg.node_url, dry_run=cfg.dry_run)
+        return run_donation_sync(
+            session,
+            banano,
+            cfg.operator_account or "",
+            page_size=int(os.getenv("P2S_DONATION_SYNC_PAGE_SIZE", "500")),
+            fence=fence,
+        )
+    except Exception as exc:  # pragma: no cover
+        JOB_ERRORS.inc()
+        log.error("donation_sync_error", error=str(exc))
+        raise
+
+
+def _run_settlement_only(
+    session: Session,
+    scheduler_cfg: SchedulerConfig,
+    *,
+    fence: Callable[[], object] | None = None,
+) -> dict[str, int] | None:
+    """Run only the settlement phase (operator balance check, then payouts).
+
+    Returns the settlement counters, or ``None`` when skipped for low balance.
+    """
+    tracer = get_tracer("scheduler")
+    cfg = scheduler_cfg
+    try:
+        if fence is not None:
+            fence()  # sending blocks is leader-only
+        from src.services.banano_client import BananoClient
+
+        banano = BananoClient(node_url=cfg.node_url, dry_run=cfg.dry_run)
         with tracer.start_as_current_span(
             "operator_balance_check",
             attributes={
@@ -296,7 +357,7 @@ def _run_settlement_only(
             has_balance = banano.has_min_balance(cfg.min_operator_balance_ban, cfg.operator_account)
         if not has_balance:
             log.warning("settlement_skipped_low_balance")
-            return
+            return None
         with tracer.start_as_current_span(
             "settlement_cycle",
             attributes={
@@ -304,10 +365,11 @@ def _run_settlement_only(
                 "scheduler.interval_sec": cfg.interval_seconds,
             },
         ):
-            run_settlement(session, cfg)
+            return run_settlement(session, cfg, fence=fence)
     except Exception as exc:  # pragma: no cover
         JOB_ERRORS.inc()
         log.error("settlement_cycle_error", error=str(exc))
+        raise
 
 
 @dataclass
@@ -316,90 +378,253 @@ class _LoopState:
 
     last_accrual_ts: float = 0.0
     last_settlement_ts: float = 0.0
-    backoff: float = 1.0
+    # Leader lease shared by all scheduler processes (None: always lead)
+    lease: LeaderLease | None = None
+    # ``--shard i/N`` instance: accrual only, no HODL scan / settlement / heartbeat
+    accrual_only: bool = False
+    # Built on the first tick (see ``_build_phase_runtime``)
+    runtime: PhaseRuntime | None = None
+
+
+# Default per-phase timeouts (``P2S_<PHASE>_TIMEOUT_SECONDS`` overrides)
+_PHASE_TIMEOUTS: dict[str, float] = {
+    "accrual": 900.0,
+    "hodl_scan": 300.0,
+    "donation_receive": 120.0,
+    "donation_sync": 300.0,
+    "settlement": 600.0,
+    "retention": 3600.0,
+}
+
+
+def _phase(
+    name: str,
+    run: Callable[[Session], object],
+    interval: Callable[[], float],
+    *,
+    after: tuple[str, ...] = (),
+) -> Phase:
+    """Build a phase with ``P2S_<PHASE>_TIMEOUT_SECONDS`` / ``P2S_<PHASE>_CONCURRENCY`` applied."""
+    prefix = f"P2S_{name.upper()}"
+    return Phase(
+        name,
+        run,
+        interval,
+        timeout_seconds=float(os.getenv(f"{prefix}_TIMEOUT_SECONDS", str(_PHASE_TIMEOUTS[name]))),
+        concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", "1")),
+        after=after,
+    )
 
 
-def _scheduler_loop(
+def _env_interval(name: str, default: Callable[[], float]) -> Callable[[], float]:
+    """``P2S_<PHASE>_INTERVAL_SECONDS`` if set, else ``default()`` (read every tick)."""
+    env = f"P2S_{name.upper()}_INTERVAL_SECONDS"
+    return lambda: float(os.getenv(env) or default())
+
+
+def _effective_cfg(cfg: SchedulerConfig) -> SchedulerConfig:
+    """Apply payout config overrides (admin-editable at runtime)."""
+    payout_ovr = _read_payout_overrides()
+    if not payout_ovr:
+        return cfg
+    return SchedulerConfig(
+        min_operator_balance_ban=cfg.min_operator_balance_ban,
+        batch_size=cfg.batch_size,
+        daily_cap=int(payout_ovr.get("daily_kill_cap", cfg.daily_cap)),
+        weekly_cap=int(payout_ovr.get("weekly_kill_cap", cfg.weekly_cap)),
+        dry_run=cfg.dry_run,
+        interval_seconds=cfg.interval_seconds,
+        operator_account=cfg.operator_account,
+        node_url=cfg.node_url,
+    )
+
+
+def _build_phase_runtime(
     session_local: sessionmaker[Session],
     cfg: SchedulerConfig,
     fortnite: FortniteService,
     accrual_cfg: AccrualJobConfig,
     state: _LoopState,
-) -> None:  # pragma: no cover
-    """Run one tick of the scheduler loop (hot-reloads intervals)."""
-    overrides = _read_scheduler_overrides(cfg.interval_seconds)
-    accrual_iv = overrides["accrual_interval_seconds"]
-    settlement_iv = overrides["settlement_interval_seconds"]
-
-    now = time.time()
-    run_accrual_now = (now - state.last_accrual_ts) >= accrual_iv
-    run_settle_now = (now - state.last_settlement_ts) >= settlement_iv
-
-    if not run_accrual_now and not run_settle_now:
-        next_a = state.last_accrual_ts + accrual_iv - now
-        next_s = state.last_settlement_ts + settlement_iv - now
-        time.sleep(max(1, min(next_a, next_s)))
-        return
+) -> PhaseRuntime:
+    """Scheduler phases, each on its own cadence, session, timeout and concurrency.
 
-    # Apply payout config overrides (admin-editable at runtime)
-    payout_ovr = _read_payout_overrides()
-    effective_cfg = cfg
-    if payout_ovr:
-        effective_cfg = SchedulerConfig(
-            min_operator_balance_ban=cfg.min_operator_balance_ban,
-            batch_size=cfg.batch_size,
-            daily_cap=int(payout_ovr.get("daily_kill_cap", cfg.daily_cap)),
-            weekly_cap=int(payout_ovr.get("weekly_kill_cap", cfg.weekly_cap)),
-            dry_run=cfg.dry_run,
-            interval_seconds=cfg.interval_seconds,
-            operator_account=cfg.operator_account,
-            node_url=cfg.node_url,
-        )
+    Donation receive runs before settlement (the balance check should see the
+    received blocks) and before the donation sync (which records them from
+    account history), and retention never overlaps settlement.
+    """
+    lease = state.lease
+    fence = lease.fence if lease is not None else None
+
+    def accrual_iv() -> int:
+        return _read_scheduler_overrides(cfg.interval_seconds)["accrual_interval_seconds"]
+
+    def settlement_iv() -> int:
+        return _read_scheduler_overrides(cfg.interval_seconds)["settlement_interval_seconds"]
+
+    def accrual(session: Session) -> dict[str, int] | None:
+        return _run_accrual_only(session, _effective_cfg(cfg), fortnite, accrual_cfg, lease=lease)
+
+    def settlement(session: Session) -> dict[str, int]:
+        counters = _run_settlement_only(session, _effective_cfg(cfg), fence=fence)
+        _run_economics_reconcile(session)
+        return counters if counters is not None else {"skipped_low_balance": 1}
+
+    phases = [_phase("accrual", accrual, accrual_iv)]
+    if not state.accrual_only:
+        phases += [
+            _phase("hodl_scan", _run_hodl_scan_phase, _env_interval("hodl_scan", accrual_iv)),
+            _phase(
+                "donation_receive",
+                lambda session: _run_donation_receive(session, cfg, fence=fence),
+                _env_interval("donation_receive", settlement_iv),
+            ),
+            _phase("settlement", settlement, settlement_iv, after=("donation_receive",)),
+        ]
+        if donation_sync_enabled():
+            phases.append(
+                _phase(
+                    "donation_sync",
+                    lambda session: _run_donation_sync(session, cfg, fence=fence),
+                    _env_interval("donation_sync", settlement_iv),
+                    after=("donation_receive",),
+                )
+            )
+        if os.getenv("P2S_RETENTION_DAYS"):
+            phases.append(
+                _phase(
+                    "retention",
+                    lambda session: _run_retention(session, fence=fence),
+                    _env_interval("retention", lambda: 86400.0),
+                    after=("settlement",),
+                )
+            )
 
-    session: Session = session_local()
-    try:
-        if run_accrual_now:
-            _run_accrual_only(session, effective_cfg, fortnite, accrual_cfg)
-            _run_hodl_scan_phase(session)
-            state.last_accrual_ts = time.time()
-        if run_settle_now:
-            _run_settlement_only(session, effective_cfg)
-            state.last_settlement_ts = time.time()
+    def on_done(name: str, error: str | None) -> None:
+        now = time.time()
+        if name == "accrual":
+            state.last_accrual_ts = now
+        elif name == "settlement":
+            state.last_settlement_ts = now
+        if state.accrual_only:
+            return
         _write_heartbeat(
             HeartbeatInfo(
-                accrual_interval=accrual_iv,
-                settlement_interval=settlement_iv,
+                status="error" if error else "ok",
+                error=error,
+                accrual_interval=accrual_iv(),
+                settlement_interval=settlement_iv(),
                 last_accrual_ts=state.last_accrual_ts,
                 last_settlement_ts=state.last_settlement_ts,
             )
         )
-        state.backoff = 1.0
+
+    channel = get_control_channel()
+    wake = channel.wake if channel is not None else None
+    runtime = PhaseRuntime(session_local, phases, on_done=on_done, wake=wake)
+    runtime.seed("accrual", state.last_accrual_ts)
+    if not state.accrual_only:
+        runtime.seed("settlement", state.last_settlement_ts)
+        runtime.seed("donation_receive", state.last_settlement_ts)
+    return runtime
+
+
+def _dispatch_command(runtime: PhaseRuntime, channel: ControlChannel, command: Command) -> None:
+    """Start the phases an admin command asks for; progress is written back as they finish."""
+    phases = [p for p in ACTION_PHASES.get(command.action, ()) if p in runtime.phases]
+    progress = CommandProgress(channel, command, phases)
+    log.info("scheduler_command_started", command_id=command.id, action=command.action)
+    if command.action == ACTION_RELOAD:
+        get_runtime_overrides().invalidate()  # interval changes apply on this tick
+        invalidate_operator_identity()  # a new operator seed is read on the next run
+        return
+    if not phases:
+        progress.fail(f"this scheduler does not run {command.action!r} phases")
+        return
+    for name in phases:
+        runtime.run_now(name, progress.waiter(name))
+
+
+def _claim_commands(
+    runtime: PhaseRuntime, channel: ControlChannel, state: _LoopState
+) -> list[Command]:
+    """Claim queued admin commands and start their phases.
+
+    ``--shard`` instances never claim: they run one accrual slice only, so a
+    settle/trigger/reload they picked up would fail or run partially. Commands
+    stay queued for the main scheduler leader.
+    """
+    if state.accrual_only:
+        return []
+    lease = state.lease
+    holder = lease.holder if lease is not None else channel.holder
+    claimed = channel.claim(holder)
+    for command in claimed:
+        _dispatch_command(runtime, channel, command)
+    return claimed
+
+
+def _scheduler_loop(
+    session_local: sessionmaker[Session],
+    cfg: SchedulerConfig,
+    fortnite: FortniteService,
+    accrual_cfg: AccrualJobConfig,
+    state: _LoopState,
+) -> None:  # pragma: no cover
+    """Run one tick of the scheduler loop (hot-reloads intervals).
+
+    With a lease, only the current leader starts phases and claims admin
+    commands; followers just poll for leadership every ``lease.renew_seconds``.
+    Runs already in flight fence on the lease themselves, so they stop once
+    leadership moves.
+    """
+    lease = state.lease
+    if lease is not None and not lease.acquire():
+        time.sleep(lease.renew_seconds)
+        return
+    if state.runtime is None:
+        state.runtime = _build_phase_runtime(session_local, cfg, fortnite, accrual_cfg, state)
+    runtime = state.runtime
+    channel = get_control_channel()
+    # Anything that sets ``wake`` from here on (a command, a finished phase) cuts the wait short.
+    runtime.wake.clear()
+    try:
+        if channel is not None:
+            _claim_commands(runtime, channel, state)
+        next_due = runtime.tick()
     except Exception as exc:
         JOB_ERRORS.inc()
-        log.error("scheduler_loop_error", error=str(exc), backoff=state.backoff)
-        _write_heartbeat(
-            HeartbeatInfo(
-                status="error",
-                error=str(exc),
-                accrual_interval=accrual_iv,
-                settlement_interval=settlement_iv,
-                last_accrual_ts=state.last_accrual_ts,
-                last_settlement_ts=state.last_settlement_ts,
-            )
-        )
-        time.sleep(state.backoff)
-        state.backoff = min(state.backoff * 2, 60.0)
-    finally:
-        session.close()
+        log.error("scheduler_loop_error", error=str(exc))
+        next_due = 1.0
+    # Wake up in time to renew the lease and to poll a cross-process channel
+    max_sleep = lease.renew_seconds if lease is not None else float("inf")
+    if channel is not None and not state.accrual_only:
+        max_sleep = min(max_sleep, channel.poll_seconds)
+    runtime.wait(min(next_due, max_sleep))
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m src.jobs", description="Pay2Slay scheduler")
+    parser.add_argument(
+        "--shard",
+        type=ShardSpec.parse,
+        default=None,
+        metavar="i/N",
+        help="run accrual only, for users with id %% N == i (see P2S_ACCRUAL_SHARDS=0)",
+    )
+    return parser.parse_args(argv)
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     metrics_port = int(os.getenv("P2S_METRICS_PORT", "8001"))
     db_url = os.getenv("DATABASE_URL", "sqlite:///pay2slay.db")
     start_http_server(metrics_port)
-    engine = create_engine(db_url)
+    engine = make_engine(db_url)  # same SQLite pragmas as the API process
+    pin_money_storage(engine, Base.metadata)  # read amounts in the type they are stored in
     session_local = sessionmaker(bind=engine)
-    cfg, fortnite, accrual_cfg = _build_scheduler_components()
+    configure_control_channel(session_local)
+    cfg, fortnite, accrual_cfg = _build_scheduler_components(args.shard)
+    shard = accrual_cfg.shard
     overrides = _read_scheduler_overrides(cfg.interval_seconds)
     _write_heartbeat(
         HeartbeatInfo(
@@ -413,13 +638,20 @@ def main() -> None:
         accrual_interval=overrides["accrual_interval_seconds"],
         settlement_interval=overrides["settlement_interval_seconds"],
         dry_run=cfg.dry_run,
+        shard=str(shard) if shard else None,
+        accrual_shards=accrual_cfg.shards,
     )
     jitter = float(os.getenv("P2S_START_JITTER_SEC", "0"))
     if jitter > 0:
         sleep_for = random.uniform(0, jitter)
         log.info("startup_jitter", sleep_for=round(sleep_for, 3))
         time.sleep(sleep_for)
-    state = _LoopState()
+    if shard is not None:
+        # One live instance per slice; the leader runs everything else.
+        lease_name = f"accrual-shard-{shard.index}-of-{shard.count}"
+        state = _LoopState(lease=make_scheduler_lease(session_local, lease_name), accrual_only=True)
+    else:
+        state = _LoopState(lease=make_scheduler_lease(session_local))
     # Offset settlement by half the interval so accruals get settled
     # mid-cycle (~10 min) instead of waiting a full cycle (~20 min).
     state.last_settlement_ts = time.time() - overrides["settlement_interval_seconds"] / 2
@@ -13,26 +13,58 @@ Design goals:
 
 from __future__ import annotations
 
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
 
 from prometheus_client import Counter
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from src.lib import events
 from src.lib.config import get_config
 from src.lib.observability import get_tracer
+from src.lib.runtime_overrides import get_runtime_overrides
 from src.models.models import User, WalletLink
 from src.services.domain.abuse_analytics_service import AbuseAnalyticsService
 from src.services.domain.accrual_service import AccrualService
+from src.services.domain.hodl_boost_service import get_tier_for_balance
 from src.services.fortnite_service import FortniteService
 
 
+@dataclass(frozen=True)
+class ShardSpec:
+    """Slice ``index`` of ``count``: the users with ``User.id % count == index``."""
+
+    index: int
+    count: int
+
+    def __post_init__(self) -> None:
+        if self.count < 1 or not 0 <= self.index < self.count:
+            raise ValueError(f"invalid shard {self.index}/{self.count}")
+
+    @classmethod
+    def parse(cls, value: str) -> ShardSpec:
+        """Parse ``"i/N"`` (as given to ``python -m src.jobs --shard``)."""
+        index, sep, count = value.partition("/")
+        if not sep:
+            raise ValueError(f"shard must look like i/N, got {value!r}")
+        return cls(int(index), int(count))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
 @dataclass
 class AccrualJobConfig:
     batch_size: int | None = None  # max users per run; None = all
     dry_run: bool = True
     require_verified_wallet: bool = True
+    # Only accrue this slice of users (a ``--shard i/N`` process or pool worker)
+    shard: ShardSpec | None = None
+    # Worker processes the scheduler fans accrual out to (0: ``--shard`` instances do it)
+    shards: int = 1
 
 
 # Prometheus counters
@@ -55,49 +87,71 @@ def _eligible_users(session: Session, cfg: AccrualJobConfig) -> Iterable[User]:
             .where(WalletLink.verified.is_(True))
             .distinct()
         )
+    if cfg.shard is not None and cfg.shard.count > 1:
+        q = q.where(User.id % cfg.shard.count == cfg.shard.index)
     if cfg.batch_size:
         q = q.limit(cfg.batch_size)
     return session.execute(q).scalars()
 
 
 def run_accrual(
-    session: Session, fortnite: FortniteService, cfg: AccrualJobConfig
+    session: Session,
+    fortnite: FortniteService,
+    cfg: AccrualJobConfig,
+    *,
+    fence: Callable[[], object] | None = None,
 ) -> dict[str, int]:
-    """Execute one accrual batch.
+    """Execute one accrual batch (``fence`` runs before each user, see ``run_settlement``).
 
     Returns counters: users_considered, accruals_created, zero_delta, total_kills.
     """
+    counters, created_rows = accrue_users(session, fortnite, cfg, fence=fence)
+    record_accrual_run(counters, created_rows)
+    return counters
+
+
+def record_accrual_run(counters: dict[str, int], created_rows: list[dict[str, Any]]) -> None:
+    """Feed one run's counters into the Prometheus metrics and the live event feed.
+
+    The sharded coordinator calls this once with the merged shard results, so
+    metrics and SSE subscribers live in the scheduler process either way.
+    """
+    METRIC_ACCRUAL_USERS.inc(float(counters["users_considered"]))
+    METRIC_ACCRUAL_CREATED.inc(float(counters["accruals_created"]))
+    METRIC_ACCRUAL_ZERO.inc(float(counters["zero_delta"]))
+    METRIC_ACCRUAL_KILLS.inc(float(counters["total_kills"]))
+    if counters["accruals_created"]:
+        events.publish(events.TOPIC_ACCRUAL, **counters, accruals=created_rows)
+
+
+def accrue_users(
+    session: Session,
+    fortnite: FortniteService,
+    cfg: AccrualJobConfig,
+    *,
+    fence: Callable[[], object] | None = None,
+) -> tuple[dict[str, int], list[dict[str, Any]]]:
+    """Accrue the eligible users and commit; returns (counters, event rows) unpublished."""
     app_cfg = get_config()
     ban_per_kill = app_cfg.payout.payout_amount_ban_per_kill
 
     # Check for admin runtime override
-    from src.jobs.__main__ import _read_payout_overrides
-
-    payout_ovr = _read_payout_overrides()
-    if payout_ovr and "ban_per_kill" in payout_ovr:
-        ban_per_kill = float(payout_ovr["ban_per_kill"])
+    overrides = get_runtime_overrides().snapshot()
+    ban_per_kill = overrides.rate(ban_per_kill)
 
     # Apply donation milestone multiplier
-    from src.services.domain.donation_service import (
-        get_current_milestone,
-        get_sustainability_factor,
-        get_total_donated,
-    )
+    from src.services.domain.donation_service import get_economics
 
-    total_donated = get_total_donated(session)
-    milestone = get_current_milestone(total_donated)
+    econ = get_economics().snapshot(session)
+    milestone = econ.milestone
     if milestone.payout_multiplier != 1.0:
         ban_per_kill *= milestone.payout_multiplier
 
     # Apply sustainability factor (donate-to-leach ratio)
-    seed_fund = app_cfg.payout.seed_fund_ban
-    sustainability = get_sustainability_factor(session, seed_fund)
-    ban_per_kill *= sustainability
+    ban_per_kill *= econ.sustainability_factor
 
     # Apply active promo multiplier (if any)
-    from src.lib.promo import get_active_promo
-
-    promo = get_active_promo()
+    promo = overrides.promo
     if promo:
         ban_per_kill *= promo.multiplier
 
@@ -116,7 +170,10 @@ def run_accrual(
     tracer = get_tracer("accrual_job")
     kill_rate_threshold = int(app_cfg.integrations.abuse_heuristics.get("kill_rate_per_min", 0))
     analytics = AbuseAnalyticsService(session, kill_rate_threshold=kill_rate_threshold)
+    created_rows: list[dict[str, Any]] = []
     for user in _eligible_users(session, cfg):
+        if fence is not None:
+            fence()
         counters["users_considered"] += 1
         with tracer.start_as_current_span(
             "accrue_user", attributes={"user.id": user.id, "user.discord_id": user.discord_user_id}
@@ -131,6 +188,17 @@ def run_accrual(
         # res is not None here; update counters and metrics per user
         if res.created:
             counters["accruals_created"] += 1
+            if len(created_rows) < events.MAX_EVENT_ROWS:
+                created_rows.append(
+                    {
+                        "discord_username": user.discord_username or "Unknown",
+                        "kills": res.kills_delta,
+                        "amount_ban": float(res.amount_ban),
+                        "settled": False,
+                        "created_at": datetime.now(UTC).isoformat(),
+                        "jpmt_badge": get_tier_for_balance(user.jpmt_balance or 0).badge,
+                    }
+                )
         counters["total_kills"] += res.kills_delta
         region = getattr(user, "region_code", None)
         analytics.capture_region_kill(region, res.kills_delta)
@@ -138,11 +206,7 @@ def run_accrual(
         analytics.evaluate_kill_spike(user.id, recent_window_min=15)
 
     session.commit()
-    METRIC_ACCRUAL_USERS.inc(float(counters["users_considered"]))
-    METRIC_ACCRUAL_CREATED.inc(float(counters["accruals_created"]))
-    METRIC_ACCRUAL_ZERO.inc(float(counters["zero_delta"]))
-    METRIC_ACCRUAL_KILLS.inc(float(counters["total_kills"]))
-    return counters
+    return counters, created_rows
 
 
-__all__ = ["AccrualJobConfig", "run_accrual"]
+__all__ = ["AccrualJobConfig", "ShardSpec", "accrue_users", "record_accrual_run", "run_accrual"]
@@ -0,0 +1,184 @@
+"""Incremental donation sync from the operator account's chain history.
+
+``run_donation_sync`` pages through ``account_history`` oldest first, starting
+just after the block stored in ``donation_sync_cursor``, and bulk-inserts every
+``receive`` block as a ``DonationLedger`` row (``source="chain_sync"``) keyed by
+its unique block hash. The cursor is committed with each page, so an
+interrupted sync resumes where it stopped and history is never replayed. A run
+reads at most ``MAX_PAGES_PER_RUN`` pages; the next scheduler run carries on.
+
+First run: with an empty ledger the whole history is backfilled. If donations
+were already recorded another way (scheduler receive, rebuild, manual), the
+cursor is baselined at the current frontier instead so they are not counted
+twice.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from decimal import ROUND_DOWN, Decimal
+from typing import Any
+
+from prometheus_client import Counter
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from src.lib.observability import get_logger
+from src.models.models import DonationLedger, DonationSyncCursor
+from src.models.types import BAN_QUANTUM
+from src.services.banano_client import BananoClient
+from src.services.domain.donation_service import announce_donations
+
+log = get_logger("jobs.donation_sync")
+
+SOURCE_CHAIN_SYNC = "chain_sync"
+_RAW_PER_BAN = Decimal(10**29)
+# Bounds one run; the cursor lets the next scheduler run continue a long backfill.
+MAX_PAGES_PER_RUN = 20
+
+METRIC_SYNC_BLOCKS = Counter(
+    "donation_sync_blocks_total", "Operator account blocks read by the donation sync"
+)
+METRIC_SYNC_INSERTED = Counter(
+    "donation_sync_inserted_total", "Receive blocks recorded as donations by the donation sync"
+)
+
+
+def donation_sync_enabled() -> bool:
+    """``P2S_DONATION_SYNC`` (default on): the chain sync is the one writer of received blocks.
+
+    While it is on, code that receives pending blocks (scheduler receive,
+    ``/api/donate-info``) must not record them too: a receivable entry carries
+    the *send* block's hash, the sync keys on the operator's *receive* block
+    hash, so ``uq_donation_block_hash`` cannot dedup the two rows.
+    """
+    return os.getenv("P2S_DONATION_SYNC", "1").lower() not in {"0", "false", "no", "off"}
+
+
+def block_amount_ban(block: dict[str, Any]) -> Decimal:
+    """BAN amount of a history block (``amount_decimal`` when the node adds it, else raw)."""
+    if block.get("amount_decimal"):
+        amount = Decimal(str(block["amount_decimal"]))
+    else:
+        amount = Decimal(int(block.get("amount") or 0)) / _RAW_PER_BAN
+    return amount.quantize(BAN_QUANTUM, rounding=ROUND_DOWN)
+
+
+def insert_receive_blocks(
+    session: Session, blocks: list[dict[str, Any]], *, source: str
+) -> list[dict[str, Any]]:
+    """Bulk-insert the receive blocks not in the ledger yet; returns the inserted rows."""
+    rows: dict[str, dict[str, Any]] = {}
+    for block in blocks:
+        block_hash = block.get("hash")
+        if block.get("type") != "receive" or not block_hash:
+            continue
+        amount = block_amount_ban(block)
+        if amount <= 0:
+            continue
+        rows[block_hash] = {
+            "amount_ban": amount,
+            "blocks_received": 1,
+            "source": source,
+            "sender_address": block.get("account") or None,
+            "block_hash": block_hash,
+        }
+    if not rows:
+        return []
+    seen = set(
+        session.scalars(
+            select(DonationLedger.block_hash).where(DonationLedger.block_hash.in_(list(rows)))
+        )
+    )
+    new = [row for block_hash, row in rows.items() if block_hash not in seen]
+    if new:
+        session.execute(insert(DonationLedger), new)
+    return new
+
+
+def iter_history_pages(
+    banano: BananoClient, account: str, *, head: str | None = None, page_size: int = 500
+) -> Iterator[list[dict[str, Any]]]:
+    """Stream ``account_history`` oldest first, one page at a time, after ``head``."""
+    while True:
+        page = banano.account_history(account, head=head, count=page_size)
+        if page:
+            yield page
+        if len(page) < page_size:
+            return
+        head = page[-1]["hash"]
+
+
+def _advance(session: Session, account: str, block: dict[str, Any]) -> None:
+    cursor = session.get(DonationSyncCursor, account)
+    if cursor is None:
+        cursor = DonationSyncCursor(account=account)
+        session.add(cursor)
+    cursor.block_hash = block["hash"]
+    cursor.height = int(block.get("height") or 0)
+    cursor.updated_at = datetime.now(UTC).replace(tzinfo=None)
+
+
+def run_donation_sync(
+    session: Session,
+    banano: BananoClient,
+    account: str,
+    *,
+    page_size: int = 500,
+    fence: Callable[[], object] | None = None,
+) -> dict[str, int]:
+    """Record receive blocks added to ``account`` since the last sync.
+
+    Returns counters: pages, blocks_scanned, donations_inserted, baselined.
+    """
+    counters = {"pages": 0, "blocks_scanned": 0, "donations_inserted": 0, "baselined": 0}
+    if banano.dry_run or not account:
+        return counters
+    cursor = session.get(DonationSyncCursor, account)
+    if cursor is None and session.scalar(select(DonationLedger.id).limit(1)) is not None:
+        newest = banano.account_history(account, count=1, reverse=False)
+        if newest:
+            _advance(session, account, newest[0])
+            session.commit()
+            counters["baselined"] = 1
+            log.info("donation_sync_baselined", height=newest[0].get("height"))
+        return counters
+
+    recorded: list[dict[str, Any]] = []
+    head = cursor.block_hash if cursor is not None else None
+    for page in iter_history_pages(banano, account, head=head, page_size=page_size):
+        if fence is not None:
+            fence()  # writes ledger rows: leader only
+        recorded += insert_receive_blocks(session, page, source=SOURCE_CHAIN_SYNC)
+        _advance(session, account, page[-1])
+        session.commit()
+        counters["pages"] += 1
+        counters["blocks_scanned"] += len(page)
+        if counters["pages"] >= MAX_PAGES_PER_RUN:
+            break
+    counters["donations_inserted"] = len(recorded)
+    METRIC_SYNC_BLOCKS.inc(counters["blocks_scanned"])
+    METRIC_SYNC_INSERTED.inc(counters["donations_inserted"])
+    announce_donations(
+        session,
+        [
+            {"amount_ban": float(r["amount_ban"]), "sender_address": r["sender_address"]}
+            for r in recorded
+        ],
+        source=SOURCE_CHAIN_SYNC,
+    )
+    log.info("donation_sync_complete", **counters)
+    return counters
+
+
+__all__ = [
+    "MAX_PAGES_PER_RUN",
+    "SOURCE_CHAIN_SYNC",
+    "block_amount_ban",
+    "donation_sync_enabled",
+    "insert_receive_blocks",
+    "iter_history_pages",
+    "run_donation_sync",
+]
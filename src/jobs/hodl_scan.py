@@ -1,23 +1,30 @@
 """Periodic HODL balance scanner (runs in the scheduler loop).
 
-Iterates users who have a Solana wallet linked and re-fetches their
-on-chain $JPMT balance, updating jpmt_balance and jpmt_verified_at so
-the boost tier stays current without requiring manual re-verification.
+Re-fetches the on-chain $JPMT balance of users with a linked Solana wallet
+so the boost tier stays current without manual re-verification. Only wallets
+whose ``jpmt_verified_at`` is older than ``hodl_scan_stale_seconds`` are
+rescanned (oldest first), their lookups go out as JSON-RPC batches of
+``hodl_scan_rpc_batch_size`` calls, sent concurrently through the shared
+``SolanaRpcClient`` (pooled, deadline-bounded, circuit-broken), and results
+are written in one bulk UPDATE.
+A failed lookup keeps the previous balance and is retried next scan.
 """
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 
 from prometheus_client import Counter
-from sqlalchemy import select
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session
 
+from src.lib import events
 from src.lib.config import PayoutConfig, get_config
 from src.lib.observability import get_logger, get_tracer
 from src.models.models import User
 from src.services.domain.hodl_boost_service import (
-    fetch_spl_token_balance,
+    SolanaRpcClient,
+    get_solana_client,
     get_tier_for_balance,
 )
 
@@ -27,20 +34,35 @@ METRIC_HODL_SCANNED = Counter("hodl_scan_users_total", "Users scanned for HODL b
 METRIC_HODL_UPDATED = Counter("hodl_scan_updated_total", "Users whose HODL balance changed")
 
 
-def _hodl_eligible_users(session: Session, batch_size: int | None = None) -> list[User]:
-    """Return users that have a Solana wallet address set."""
-    q = select(User).where(User.solana_wallet_address.is_not(None))
+def _hodl_eligible_users(
+    session: Session, stale_before: datetime, batch_size: int | None = None
+) -> list[tuple[int, str, int]]:
+    """Return (id, wallet, balance) for linked wallets last verified before ``stale_before``."""
+    q = (
+        select(User.id, User.solana_wallet_address, User.jpmt_balance)
+        .where(
+            User.solana_wallet_address.is_not(None),
+            or_(User.jpmt_verified_at.is_(None), User.jpmt_verified_at < stale_before),
+        )
+        .order_by(User.jpmt_verified_at.is_not(None), User.jpmt_verified_at, User.id)
+    )
     if batch_size:
         q = q.limit(batch_size)
-    return list(session.execute(q).scalars())
+    return [
+        (r.id, r.solana_wallet_address, r.jpmt_balance or 0)
+        for r in session.execute(q)
+        if r.solana_wallet_address
+    ]
 
 
 def run_hodl_scan(
     session: Session,
     payout_cfg: PayoutConfig | None = None,
     batch_size: int | None = None,
+    *,
+    rpc: SolanaRpcClient | None = None,
 ) -> dict[str, int]:
-    """Scan all linked Solana wallets and refresh $JPMT balances.
+    """Refresh $JPMT balances of linked Solana wallets that are due for a rescan.
 
     Returns counters: users_scanned, users_updated, errors.
     """
@@ -58,44 +80,51 @@ def run_hodl_scan(
         log.warning("hodl_scan_skipped", reason="no_token_ca")
         return {"users_scanned": 0, "users_updated": 0, "errors": 0}
 
-    users = _hodl_eligible_users(session, batch_size)
+    now = datetime.now(UTC).replace(tzinfo=None)
+    stale_before = now - timedelta(seconds=payout_cfg.hodl_scan_stale_seconds)
+    users = _hodl_eligible_users(session, stale_before, batch_size)
     tracer = get_tracer("hodl_scan")
 
-    counters = {"users_scanned": 0, "users_updated": 0, "errors": 0}
-
-    for user in users:
-        counters["users_scanned"] += 1
-        wallet = user.solana_wallet_address
-        if not wallet:
-            continue
-        try:
-            with tracer.start_as_current_span(
-                "hodl_balance_check",
-                attributes={"user.id": user.id, "wallet": wallet[:8] + "..."},
-            ):
-                balance = fetch_spl_token_balance(wallet, token_ca, rpc_url)
-                old_balance = user.jpmt_balance or 0
-                if balance != old_balance:
-                    tier = get_tier_for_balance(balance)
-                    user.jpmt_balance = balance
-                    user.jpmt_verified_at = datetime.now(UTC)
-                    counters["users_updated"] += 1
-                    log.info(
-                        "hodl_balance_updated",
-                        user_id=user.id,
-                        old_balance=old_balance,
-                        new_balance=balance,
-                        tier=tier.name,
-                        multiplier=tier.multiplier,
-                    )
-        except Exception as exc:
+    counters = {"users_scanned": len(users), "users_updated": 0, "errors": 0}
+    with tracer.start_as_current_span(
+        "hodl_balance_batch",
+        attributes={"wallets": len(users), "rpc.batch_size": payout_cfg.hodl_scan_rpc_batch_size},
+    ):
+        balances = (rpc or get_solana_client(rpc_url)).token_balances(
+            sorted({wallet for _, wallet, _ in users}),
+            token_ca,
+            batch_size=payout_cfg.hodl_scan_rpc_batch_size,
+        )
+
+    rows: list[dict[str, object]] = []
+    for user_id, wallet, old_balance in users:
+        balance = balances.get(wallet)
+        if balance is None:
             counters["errors"] += 1
-            log.warning("hodl_scan_user_error", user_id=user.id, error=str(exc))
-
+            continue
+        rows.append({"id": user_id, "jpmt_balance": balance, "jpmt_verified_at": now})
+        if balance != old_balance:
+            tier = get_tier_for_balance(balance)
+            counters["users_updated"] += 1
+            log.info(
+                "hodl_balance_updated",
+                user_id=user_id,
+                old_balance=old_balance,
+                new_balance=balance,
+                tier=tier.name,
+                multiplier=tier.multiplier,
+            )
+    if rows:
+        # ORM bulk UPDATE by primary key: one executemany instead of a flush per user.
+        session.execute(update(User), rows)
     session.commit()
     METRIC_HODL_SCANNED.inc(float(counters["users_scanned"]))
     METRIC_HODL_UPDATED.inc(float(counters["users_updated"]))
+    if counters["errors"]:
+        log.warning("hodl_scan_lookup_errors", errors=counters["errors"])
     log.info("hodl_scan_complete", **counters)
+    if counters["users_updated"]:
+        events.publish(events.TOPIC_HODL, **counters)
     return counters
 
 
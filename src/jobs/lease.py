@@ -0,0 +1,248 @@
+"""DB-backed leader lease so only one process runs the scheduler phases.
+
+Every API worker starts the scheduler thread (and ``python -m src.jobs`` may run
+too); each tick first calls ``LeaderLease.acquire()``. The ``scheduler_lease``
+row is claimed with one conditional UPDATE (we already hold it, or it has
+expired), falling back to an INSERT for the very first holder, so exactly one
+process wins on SQLite and Postgres alike. Followers only serve API traffic and
+retry every ``renew_seconds``; when the leader dies its lease lapses after
+``ttl_seconds`` and a follower takes over with a higher fencing token.
+
+Long phases call ``fence()`` before irreversible work (each payout, each user's
+accrual). It renews the lease at most every ``renew_seconds`` and raises
+``LeaseLostError`` once another holder has taken over, so a stalled ex-leader
+stops instead of racing the new one.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any, Final, cast
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import CursorResult, Table, case, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.lib.observability import get_logger
+from src.models.models import SchedulerLease
+
+log = get_logger("jobs.lease")
+
+LEASE_SCHEDULER: Final[str] = "scheduler"
+_DEFAULT_TTL_SECONDS: Final[float] = 90.0
+
+LEASE_TRANSITIONS = Counter(
+    "scheduler_lease_transitions_total", "Scheduler leadership changes in this process", ["to"]
+)
+IS_LEADER = Gauge("scheduler_is_leader", "1 while this process holds the scheduler lease")
+
+
+class LeaseLostError(RuntimeError):
+    """Another process holds the lease; the current phase must stop."""
+
+
+def default_holder_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def _ts(epoch: float) -> datetime:
+    # Stored naive UTC like every other timestamp column.
+    return datetime.fromtimestamp(epoch, UTC).replace(tzinfo=None)
+
+
+def _rowcount(result: Any) -> int:
+    return cast(CursorResult[Any], result).rowcount
+
+
+class LeaderLease:
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        name: str = LEASE_SCHEDULER,
+        *,
+        holder: str | None = None,
+        ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.session_factory = session_factory
+        self.name = name
+        self.holder = holder or default_holder_id()
+        self.ttl_seconds = ttl_seconds
+        self.renew_seconds = ttl_seconds / 3
+        self.token: int | None = None
+        self._clock = clock
+        self._renewed_at = 0.0
+        self._table_ready = False
+
+    @property
+    def is_leader(self) -> bool:
+        return self.token is not None and self._clock() - self._renewed_at < self.ttl_seconds
+
+    def acquire(self) -> bool:
+        """Take or renew the lease; False when another live holder has it."""
+        now = self._clock()
+        token: int | None = None
+        session = self.session_factory()
+        try:
+            self._ensure_table(session)
+            if self._claim(session, now) or self._insert(session, now):
+                token = session.scalar(
+                    select(SchedulerLease.fencing_token).where(SchedulerLease.name == self.name)
+                )
+            session.commit()
+        except SQLAlchemyError as exc:
+            session.rollback()
+            log.warning("lease_acquire_failed", lease=self.name, error=str(exc))
+            token = None
+        finally:
+            session.close()
+        self._set_token(token, now)
+        return token is not None
+
+    def fence(self) -> int:
+        """Fencing check before irreversible work; returns the current token."""
+        if self.token is not None and self._clock() - self._renewed_at < self.renew_seconds:
+            return self.token
+        now = self._clock()
+        token = self.token
+        renewed = False
+        if token is not None:
+            session = self.session_factory()
+            try:
+                result = session.execute(
+                    update(SchedulerLease)
+                    .where(
+                        SchedulerLease.name == self.name,
+                        SchedulerLease.holder == self.holder,
+                        SchedulerLease.fencing_token == token,
+                        SchedulerLease.expires_at > _ts(now),
+                    )
+                    .values(expires_at=_ts(now + self.ttl_seconds), renewed_at=_ts(now))
+                )
+                renewed = _rowcount(result) == 1
+                session.commit()
+            except SQLAlchemyError as exc:
+                session.rollback()
+                log.warning("lease_renew_failed", lease=self.name, error=str(exc))
+            finally:
+                session.close()
+        if not renewed:
+            self._set_token(None, now)
+            raise LeaseLostError(f"lease {self.name!r} lost by {self.holder}")
+        self._renewed_at = now
+        assert token is not None
+        return token
+
+    def adopt(self, token: int) -> None:
+        """Continue a lease this holder already won elsewhere (e.g. in a pool worker).
+
+        The next ``fence()`` checks ``token`` against the row instead of trusting it.
+        """
+        self.token = token
+        self._renewed_at = self._clock() - self.renew_seconds
+
+    def release(self) -> None:
+        """Expire our lease now so a follower can take over without waiting out the TTL."""
+        if self.token is None:
+            return
+        session = self.session_factory()
+        try:
+            session.execute(
+                update(SchedulerLease)
+                .where(SchedulerLease.name == self.name, SchedulerLease.holder == self.holder)
+                .values(expires_at=_ts(self._clock()))
+            )
+            session.commit()
+        except SQLAlchemyError as exc:  # pragma: no cover - best effort on shutdown
+            session.rollback()
+            log.warning("lease_release_failed", lease=self.name, error=str(exc))
+        finally:
+            session.close()
+        self._set_token(None, self._clock())
+
+    def _ensure_table(self, session: Session) -> None:
+        # The standalone scheduler never runs create_all; make sure the row can exist.
+        if not self._table_ready:
+            cast(Table, SchedulerLease.__table__).create(session.connection(), checkfirst=True)
+            self._table_ready = True
+
+    def _claim(self, session: Session, now: float) -> bool:
+        ours = SchedulerLease.holder == self.holder
+        result = session.execute(
+            update(SchedulerLease)
+            .where(
+                SchedulerLease.name == self.name,
+                or_(ours, SchedulerLease.expires_at <= _ts(now)),
+            )
+            .values(
+                holder=self.holder,
+                fencing_token=case(
+                    (ours, SchedulerLease.fencing_token), else_=SchedulerLease.fencing_token + 1
+                ),
+                acquired_at=case((ours, SchedulerLease.acquired_at), else_=_ts(now)),
+                expires_at=_ts(now + self.ttl_seconds),
+                renewed_at=_ts(now),
+            )
+        )
+        return _rowcount(result) == 1
+
+    def _insert(self, session: Session, now: float) -> bool:
+        try:
+            with session.begin_nested():
+                session.execute(
+                    insert(SchedulerLease).values(
+                        name=self.name,
+                        holder=self.holder,
+                        fencing_token=1,
+                        acquired_at=_ts(now),
+                        expires_at=_ts(now + self.ttl_seconds),
+                        renewed_at=_ts(now),
+                    )
+                )
+        except IntegrityError:
+            return False  # another process holds it
+        return True
+
+    def _set_token(self, token: int | None, now: float) -> None:
+        if token != self.token:
+            LEASE_TRANSITIONS.labels(to="leader" if token is not None else "follower").inc()
+            log.info(
+                "lease_leader" if token is not None else "lease_follower",
+                lease=self.name,
+                holder=self.holder,
+                fencing_token=token,
+            )
+        self.token = token
+        IS_LEADER.set(1 if token is not None else 0)
+        if token is not None:
+            self._renewed_at = now
+
+
+def lease_enabled() -> bool:
+    return os.getenv("P2S_SCHEDULER_LEASE", "1").lower() not in ("0", "false", "no", "off")
+
+
+def make_scheduler_lease(
+    session_factory: sessionmaker[Session], name: str = LEASE_SCHEDULER
+) -> LeaderLease | None:
+    """Lease for the scheduler loop (``None`` when ``P2S_SCHEDULER_LEASE=0``)."""
+    if not lease_enabled():
+        return None
+    ttl = float(os.getenv("P2S_SCHEDULER_LEASE_TTL", str(_DEFAULT_TTL_SECONDS)))
+    return LeaderLease(session_factory, name, ttl_seconds=ttl)
+
+
+__all__ = [
+    "LEASE_SCHEDULER",
+    "LeaderLease",
+    "LeaseLostError",
+    "default_holder_id",
+    "lease_enabled",
+    "make_scheduler_lease",
+]
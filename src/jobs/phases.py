@@ -0,0 +1,236 @@
+"""Phase runtime: scheduler phases on independent cadences.
+
+The scheduler used to run accrual, the HODL scan and settlement back to back on
+one session, so a slow Solana RPC or Banano node pushed every other phase late.
+``PhaseRuntime`` instead starts each ``Phase`` on its own interval in a worker
+thread with its own session:
+
+- ``interval`` is re-read every tick, so admin overrides still hot-reload;
+- ``concurrency`` caps overlapping runs of the same phase (default 1, never overlap);
+- ``timeout_seconds`` marks a run overdue: it is logged and counted, stops
+  blocking dependents, but keeps its concurrency slot until it really returns
+  (threads cannot be killed, and phase bodies fence on the lease themselves);
+- ``after`` orders phases: a phase never starts while one of its dependencies
+  is running, and when both are due the dependency goes first (e.g. donations
+  are received before settlement checks the operator balance).
+
+The scheduler loop clears ``wake``, calls ``tick()`` after winning the lease
+and then ``wait()``s until the next phase is due, a running one finishes, or
+someone sets ``wake`` (the control channel does on every admin command).
+``run_now()`` makes a phase due immediately and reports that run's outcome.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.lib.observability import get_logger
+
+log = get_logger("jobs.phases")
+
+_IDLE_WAKEUP_SECONDS = 60.0
+
+PHASE_RUNS = Counter("scheduler_phase_runs_total", "Scheduler phase runs started", ["phase"])
+PHASE_ERRORS = Counter(
+    "scheduler_phase_errors_total", "Scheduler phase runs that raised", ["phase"]
+)
+PHASE_TIMEOUTS = Counter(
+    "scheduler_phase_timeouts_total", "Scheduler phase runs that overran their timeout", ["phase"]
+)
+PHASE_RUNNING = Gauge("scheduler_phase_running", "Scheduler phase runs in flight", ["phase"])
+PHASE_DURATION = Histogram(
+    "scheduler_phase_duration_seconds", "Wall time of scheduler phase runs", ["phase"]
+)
+
+
+@dataclass
+class Phase:
+    name: str
+    run: Callable[[Session], object]
+    interval: Callable[[], float]
+    timeout_seconds: float = 600.0
+    concurrency: int = 1
+    after: tuple[str, ...] = ()
+
+
+# Called with (phase return value, error text) when a requested run finishes.
+Waiter = Callable[[object, str | None], None]
+
+
+@dataclass
+class _Run:
+    future: Future[None]
+    deadline: float
+    timed_out: bool = False
+    waiters: list[Waiter] = field(default_factory=list)
+
+
+@dataclass
+class _PhaseState:
+    last_started: float = 0.0
+    forced: bool = False
+    waiters: list[Waiter] = field(default_factory=list)
+    runs: list[_Run] = field(default_factory=list)
+
+    def blocking(self) -> bool:
+        return any(not r.timed_out for r in self.runs)
+
+
+class PhaseRuntime:
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        phases: Iterable[Phase],
+        *,
+        on_done: Callable[[str, str | None], None] | None = None,
+        wake: threading.Event | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.phases = {p.name: p for p in phases}
+        for phase in self.phases.values():
+            unknown = set(phase.after) - self.phases.keys()
+            if unknown:
+                raise ValueError(f"phase {phase.name!r} depends on unknown {sorted(unknown)}")
+        # Dependencies first; raises graphlib.CycleError (a ValueError) on cycles.
+        graph = {p.name: set(p.after) for p in self.phases.values()}
+        self._order = list(TopologicalSorter(graph).static_order())
+        self._state = {name: _PhaseState() for name in self.phases}
+        self._session_factory = session_factory
+        self._on_done = on_done
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.wake = wake or threading.Event()
+
+    def seed(self, name: str, last_started: float) -> None:
+        """Pretend ``name`` last started at ``last_started`` (staggers first runs)."""
+        self._state[name].last_started = last_started
+
+    def run_now(self, name: str, on_done: Waiter | None = None) -> None:
+        """Make ``name`` due now; ``on_done`` fires when the run started for it finishes."""
+        with self._lock:
+            state = self._state[name]
+            state.forced = True
+            if on_done is not None:
+                state.waiters.append(on_done)
+        self.wake.set()
+
+    def running(self) -> dict[str, int]:
+        """Runs still in flight per phase (timed-out ones included)."""
+        with self._lock:
+            return {
+                name: sum(not r.future.done() for r in st.runs) for name, st in self._state.items()
+            }
+
+    def tick(self) -> float:
+        """Start every phase that is due and allowed to; returns seconds until the next is due."""
+        now = self._clock()
+        with self._lock:
+            self._reap(now)
+            due = {
+                name
+                for name, phase in self.phases.items()
+                if self._state[name].forced
+                or now - self._state[name].last_started >= phase.interval()
+            }
+            waiting: set[str] = set()  # due, but held back by a dependency
+            for name in self._order:
+                if name not in due:
+                    continue
+                if self._deps_busy(name, waiting):
+                    waiting.add(name)
+                elif len(self._state[name].runs) < max(self.phases[name].concurrency, 1):
+                    self._start(self.phases[name], now)
+                    due.discard(name)
+            # Phases still due are blocked by a running run, whose completion wakes us.
+            return self._next_wakeup(now, blocked=due)
+
+    def wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, waking early once ``wake`` is set."""
+        self.wake.wait(max(timeout, 0.0))
+
+    def _deps_busy(self, name: str, waiting: set[str]) -> bool:
+        return any(dep in waiting or self._state[dep].blocking() for dep in self.phases[name].after)
+
+    def _start(self, phase: Phase, now: float) -> None:
+        state = self._state[phase.name]
+        state.last_started = now
+        run = _Run(Future(), deadline=now + phase.timeout_seconds, waiters=state.waiters)
+        state.forced, state.waiters = False, []
+        # Daemon threads (not an executor) so a stuck run never blocks process exit.
+        threading.Thread(
+            target=self._execute, args=(phase, run), daemon=True, name=f"phase-{phase.name}"
+        ).start()
+        state.runs.append(run)
+        PHASE_RUNS.labels(phase=phase.name).inc()
+        PHASE_RUNNING.labels(phase=phase.name).set(len(state.runs))
+
+    def _reap(self, now: float) -> None:
+        for name, state in self._state.items():
+            for run in state.runs:
+                if not run.timed_out and not run.future.done() and now >= run.deadline:
+                    run.timed_out = True
+                    PHASE_TIMEOUTS.labels(phase=name).inc()
+                    log.warning("phase_timeout", phase=name)
+            state.runs = [r for r in state.runs if not r.future.done()]
+            PHASE_RUNNING.labels(phase=name).set(len(state.runs))
+
+    def _next_wakeup(self, now: float, *, blocked: set[str]) -> float:
+        waits = [
+            self._state[name].last_started + phase.interval() - now
+            for name, phase in self.phases.items()
+            if name not in blocked
+        ]
+        waits += [
+            r.deadline - now for st in self._state.values() for r in st.runs if not r.timed_out
+        ]
+        return max(min(waits, default=_IDLE_WAKEUP_SECONDS), 0.0)
+
+    def _execute(self, phase: Phase, run: _Run) -> None:
+        started = time.monotonic()
+        result: object = None
+        error: str | None = None
+        session = self._session_factory()
+        try:
+            result = phase.run(session)
+        except Exception as exc:
+            error = str(exc)
+            session.rollback()
+            PHASE_ERRORS.labels(phase=phase.name).inc()
+            log.error("phase_error", phase=phase.name, error=error)
+        finally:
+            session.close()
+            PHASE_DURATION.labels(phase=phase.name).observe(time.monotonic() - started)
+            for waiter in run.waiters:
+                self._notify(phase.name, waiter, result, error)
+            if self._on_done is not None:
+                on_done = self._on_done
+                self._notify(phase.name, lambda _r, e: on_done(phase.name, e), result, error)
+            run.future.set_result(None)
+            self.wake.set()
+
+    @staticmethod
+    def _notify(name: str, waiter: Waiter, result: object, error: str | None) -> None:
+        try:
+            waiter(result, error)
+        except Exception as exc:  # pragma: no cover - callbacks are best effort
+            log.warning("phase_callback_failed", phase=name, error=str(exc))
+
+
+__all__ = [
+    "PHASE_DURATION",
+    "PHASE_ERRORS",
+    "PHASE_RUNNING",
+    "PHASE_RUNS",
+    "PHASE_TIMEOUTS",
+    "Phase",
+    "PhaseRuntime",
+    "Waiter",
+]
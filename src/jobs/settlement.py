@@ -5,13 +5,18 @@ import threading
 import types
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
 
 from prometheus_client import Counter
 from sqlalchemy.orm import Session
 
+from src.lib import events
 from src.lib.observability import get_logger
 from src.services.banano_client import BananoClient
 from src.services.domain.abuse_analytics_service import AbuseAnalyticsService
+from src.services.domain.hodl_boost_service import get_tier_for_balance
 from src.services.domain.payout_service import PayoutService
 from src.services.domain.settlement_service import SettlementService
 
@@ -39,6 +44,7 @@ def repair_orphaned_accruals(session: Session) -> int:
     if count:
         session.commit()
         _settle_log.info("repaired_orphaned_accruals", count=count)
+        events.publish(events.TOPIC_SETTLEMENT, repaired_orphans=count)
     return count
 
 
@@ -54,8 +60,6 @@ def repair_underpaid_accruals(session: Session) -> int:
     detach the newest accruals until the remaining sum <= payout amount_ban and
     mark them unsettled so the next cycle pays them properly.
     """
-    from decimal import Decimal
-
     from sqlalchemy import func
 
     from src.models.models import Payout, RewardAccrual
@@ -97,6 +101,7 @@ def repair_underpaid_accruals(session: Session) -> int:
     if total_freed:
         session.commit()
         _settle_log.info("repaired_underpaid_accruals", accruals_freed=total_freed)
+        events.publish(events.TOPIC_SETTLEMENT, repaired_underpaid=total_freed)
     return total_freed
 
 
@@ -115,29 +120,28 @@ class SchedulerConfig:
 def _load_operator_seed(session: Session) -> str | None:
     """Load the operator wallet seed from SecureConfig (encrypted at rest).
 
-    Uses order_by(id desc).first() instead of one_or_none() so duplicate
-    rows (from alembic drift or pre-UNIQUE-index inserts) don't crash
-    settlement with MultipleResultsFound.
+    Served from the process-wide operator identity cache, which reads the
+    newest row (duplicate rows from alembic drift or pre-UNIQUE-index
+    inserts don't crash settlement with MultipleResultsFound) and decrypts
+    it once.
     """
-    from src.lib.crypto import decrypt_value
-    from src.models.models import SecureConfig
-
-    row = (
-        session.query(SecureConfig)
-        .filter(SecureConfig.key == "operator_seed")
-        .order_by(SecureConfig.id.desc())
-        .first()
-    )
-    if not row:
-        return None
-    return decrypt_value(row.encrypted_value)
+    from src.services.operator_identity import load_operator_seed
+
+    return load_operator_seed(session)
 
 
-def run_settlement(session: Session, cfg: SchedulerConfig) -> dict[str, int]:
+def run_settlement(
+    session: Session, cfg: SchedulerConfig, *, fence: Callable[[], object] | None = None
+) -> dict[str, int]:
     """Select candidates and create payouts; returns simple counters.
 
+    ``fence`` (the scheduler lease's ``fence``) runs before each payout and
+    raises once this process is no longer the leader.
+
     Note: caps and operator balance checks to be fleshed out in later tasks.
     """
+    if fence is not None:
+        fence()
     # Repair any accruals orphaned by the old settle-all-even-when-capped bug
     repair_orphaned_accruals(session)
     # Repair accruals linked to underpaid payouts (cap-ratio-scaled)
@@ -152,6 +156,8 @@ def run_settlement(session: Session, cfg: SchedulerConfig) -> dict[str, int]:
     candidates = settlement.select_candidates(limit=cfg.batch_size)
     counters["candidates"] = len(candidates)
     analytics = AbuseAnalyticsService()
+    payout_rows: list[dict[str, Any]] = []
+    paid_out = Decimal("0")
     for cand in candidates:
         payable_amt = (
             cand.payable_amount_ban
@@ -177,10 +183,25 @@ def run_settlement(session: Session, cfg: SchedulerConfig) -> dict[str, int]:
             kills_budget -= a.kills
         if not accruals:
             continue
+        if fence is not None:
+            fence()
         res = payout_svc.create_payout(cand.user, payable_amt, accruals)
         if res:
             counters["payouts"] += 1
             counters["accruals_settled"] += len(accruals)
+            if res.status == "sent":
+                paid_out += Decimal(str(res.amount_ban))
+            if len(payout_rows) < events.MAX_EVENT_ROWS:
+                payout_rows.append(
+                    {
+                        "discord_username": cand.user.discord_username or "Unknown",
+                        "amount_ban": float(res.amount_ban),
+                        "status": res.status,
+                        "tx_hash": res.tx_hash,
+                        "created_at": datetime.now(UTC).isoformat(),
+                        "jpmt_badge": get_tier_for_balance(cand.user.jpmt_balance or 0).badge,
+                    }
+                )
             # Record payout by region (user.region_code may be None)
             region = getattr(cand.user, "region_code", None)
             analytics.record_payout(region)
@@ -189,6 +210,13 @@ def run_settlement(session: Session, cfg: SchedulerConfig) -> dict[str, int]:
     METRIC_CANDIDATES.inc(float(counters["candidates"]))
     METRIC_PAYOUTS.inc(float(counters["payouts"]))
     METRIC_ACCRUALS_SETTLED.inc(float(counters["accruals_settled"]))
+    if counters["payouts"]:
+        events.publish(
+            events.TOPIC_SETTLEMENT,
+            **counters,
+            paid_out_ban=float(paid_out),
+            payouts=payout_rows,
+        )
     return counters
 
 
@@ -0,0 +1,138 @@
+"""Sharded accrual: fan one accrual run out over worker processes by user id.
+
+A single process is bound by its GIL and one DB session, so with
+``P2S_ACCRUAL_SHARDS=N`` (N > 1) the scheduler leader spawns N workers per run.
+Worker ``i`` accrues the users with ``User.id % N == i`` through its own engine
+and its own ``FortniteService`` holding ``1/N`` of the per-minute budget. The
+coordinator merges the returned counters and event rows and records them once
+(``record_accrual_run``), so the existing ``accrual_*_total`` metrics and the
+live feed look the same as an unsharded run.
+
+Workers fence against the leader's lease row (same holder and token), so a
+deposed leader's workers stop too. To spread shards across hosts instead, run
+``python -m src.jobs --shard i/N`` per slice and set ``P2S_ACCRUAL_SHARDS=0``
+on the leader; each instance then exports its own counters for Prometheus to sum.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from dataclasses import dataclass, replace
+from typing import Any
+
+from src.lib import events
+from src.lib.db import make_engine, make_session_factory
+from src.lib.observability import get_logger
+from src.models.base import Base
+from src.models.types import pin_money_storage
+from src.services.fortnite_service import FortniteService
+
+from .accrual import AccrualJobConfig, ShardSpec, accrue_users, record_accrual_run
+from .lease import LeaderLease
+
+log = get_logger("jobs.sharding")
+
+_COUNTER_KEYS = ("users_considered", "accruals_created", "zero_delta", "total_kills")
+
+
+@dataclass(frozen=True)
+class ShardTask:
+    """Everything a spawned worker needs (picklable; no live engine or service)."""
+
+    db_url: str
+    accrual_cfg: AccrualJobConfig
+    fortnite_kwargs: dict[str, Any]
+    lease_name: str | None = None
+    lease_holder: str | None = None
+    lease_token: int | None = None
+    lease_ttl_seconds: float = 90.0
+
+
+def run_shard(task: ShardTask) -> tuple[dict[str, int], list[dict[str, Any]]]:
+    """Worker entry point: accrue one shard and return its unpublished results."""
+    engine = make_engine(task.db_url)
+    try:
+        pin_money_storage(engine, Base.metadata)
+        factory = make_session_factory(engine)
+        fence = None
+        if task.lease_token is not None and task.lease_name is not None:
+            lease = LeaderLease(
+                factory,
+                task.lease_name,
+                holder=task.lease_holder,
+                ttl_seconds=task.lease_ttl_seconds,
+            )
+            lease.adopt(task.lease_token)
+            fence = lease.fence
+        with factory() as session:
+            fortnite = FortniteService(**task.fortnite_kwargs)
+            return accrue_users(session, fortnite, task.accrual_cfg, fence=fence)
+    finally:
+        engine.dispose()
+
+
+def shard_tasks(
+    db_url: str,
+    fortnite: FortniteService,
+    cfg: AccrualJobConfig,
+    *,
+    lease: LeaderLease | None = None,
+) -> list[ShardTask]:
+    shards = max(cfg.shards, 1)
+    fortnite_kwargs = fortnite.shard_kwargs(shards)
+    lease_kwargs: dict[str, Any] = {}
+    if lease is not None:
+        lease_kwargs = {
+            "lease_name": lease.name,
+            "lease_holder": lease.holder,
+            "lease_token": lease.fence(),
+            "lease_ttl_seconds": lease.ttl_seconds,
+        }
+    return [
+        ShardTask(
+            db_url=db_url,
+            accrual_cfg=replace(cfg, shard=ShardSpec(i, shards), shards=1),
+            fortnite_kwargs=fortnite_kwargs,
+            **lease_kwargs,
+        )
+        for i in range(shards)
+    ]
+
+
+def merge_shard_results(
+    results: list[tuple[dict[str, int], list[dict[str, Any]]]],
+) -> tuple[dict[str, int], list[dict[str, Any]]]:
+    counters = dict.fromkeys(_COUNTER_KEYS, 0)
+    rows: list[dict[str, Any]] = []
+    for shard_counters, shard_rows in results:
+        for key in _COUNTER_KEYS:
+            counters[key] += shard_counters.get(key, 0)
+        rows.extend(shard_rows)
+    return counters, rows[: events.MAX_EVENT_ROWS]
+
+
+def run_sharded_accrual(
+    db_url: str,
+    fortnite: FortniteService,
+    cfg: AccrualJobConfig,
+    *,
+    lease: LeaderLease | None = None,
+) -> dict[str, int]:
+    """Run one accrual pass over ``cfg.shards`` spawned workers; returns merged counters."""
+    tasks = shard_tasks(db_url, fortnite, cfg, lease=lease)
+    # spawn, not fork: the API process has live threads and pooled connections.
+    with multiprocessing.get_context("spawn").Pool(processes=len(tasks)) as pool:
+        results = pool.map(run_shard, tasks)
+    counters, rows = merge_shard_results(results)
+    record_accrual_run(counters, rows)
+    log.info("sharded_accrual", shards=len(tasks), **counters)
+    return counters
+
+
+__all__ = [
+    "ShardTask",
+    "merge_shard_results",
+    "run_shard",
+    "run_sharded_accrual",
+    "shard_tasks",
+]
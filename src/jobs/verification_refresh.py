@@ -5,37 +5,56 @@ or whose last verification record is stale. This helps converge late Yunite
 syncs or users who linked Discord after initial registration.
 
 Design:
-- Select up to batch_size users with epic_account_id IS NULL.
-- For each, call YuniteService.get_epic_id_for_discord; if found, update user
-  and insert a VerificationRecord row.
-- Commit once at end for efficiency (small batch) or per user if needed later.
+- Select up to batch_size users (all when None) with epic_account_id IS NULL,
+  or every user with ``include_linked`` to re-verify the whole user base.
+- Resolve them with YuniteService.get_epic_ids_for_discord_many, one request
+  per YUNITE_MAX_BATCH users; a failed chunk is logged and skipped.
+- Users whose Epic ID is new or changed are updated (kill baseline re-seeded)
+  and VerificationRecord rows are inserted in bulk; commit once at the end.
+- A linked user Yunite no longer reports keeps its Epic ID (no unlink on a
+  transient Yunite gap).
 """
 
 from __future__ import annotations
 
-from collections.abc import Iterable
 from dataclasses import dataclass
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, update
 from sqlalchemy.orm import Session
 
 from src.lib.config import get_config
+from src.lib.observability import get_logger
 from src.models.models import User, VerificationRecord
 from src.services.fortnite_service import FortniteService, seed_kill_baseline
-from src.services.yunite_service import YuniteService
+from src.services.yunite_service import YUNITE_MAX_BATCH, YuniteService
+
+log = get_logger("jobs.verification_refresh")
 
 
 @dataclass
 class VerificationRefreshConfig:
     batch_size: int | None = 50
     dry_run: bool = True
+    include_linked: bool = False  # re-check users that already have an Epic ID
+
+
+@dataclass(frozen=True)
+class _Candidate:
+    id: int
+    discord_user_id: str
+    discord_guild_member: bool
+    epic_account_id: str | None
 
 
-def _candidate_users(session: Session, cfg: VerificationRefreshConfig) -> Iterable[User]:
-    q = select(User).where(User.epic_account_id.is_(None))
+def _candidate_users(session: Session, cfg: VerificationRefreshConfig) -> list[_Candidate]:
+    q = select(
+        User.id, User.discord_user_id, User.discord_guild_member, User.epic_account_id
+    ).order_by(User.id)
+    if not cfg.include_linked:
+        q = q.where(User.epic_account_id.is_(None))
     if cfg.batch_size:
         q = q.limit(cfg.batch_size)
-    return session.execute(q).scalars()
+    return [_Candidate(*row) for row in session.execute(q)]
 
 
 def run_verification_refresh(session: Session, cfg: VerificationRefreshConfig) -> dict[str, int]:
@@ -53,26 +72,47 @@ def run_verification_refresh(session: Session, cfg: VerificationRefreshConfig) -
         per_minute_limit=int(integrations.rate_limits.get("fortnite_per_min", 60)),
         dry_run=integrations.dry_run,
     )
-    counters = {"candidates": 0, "updated": 0}
-    for user in _candidate_users(session, cfg):
-        counters["candidates"] += 1
-        epic_id = yunite.get_epic_id_for_discord(user.discord_user_id)
-        if not epic_id:
+    candidates = _candidate_users(session, cfg)
+    counters = {"candidates": len(candidates), "updated": 0, "yunite_requests": 0, "errors": 0}
+    user_rows: list[dict[str, object]] = []
+    records: list[dict[str, object]] = []
+    for start in range(0, len(candidates), YUNITE_MAX_BATCH):
+        chunk = candidates[start : start + YUNITE_MAX_BATCH]
+        counters["yunite_requests"] += 1
+        try:
+            links = yunite.get_epic_ids_for_discord_many([c.discord_user_id for c in chunk])
+        except Exception as exc:
+            counters["errors"] += 1
+            log.warning("verification_refresh_chunk_failed", users=len(chunk), error=str(exc))
             continue
-        user.epic_account_id = epic_id
-        user.last_settled_kill_count = seed_kill_baseline(fortnite, epic_id)
-        vr = VerificationRecord(
-            user_id=user.id,
-            discord_user_id=user.discord_user_id,
-            discord_guild_member=user.discord_guild_member,
-            epic_account_id=epic_id,
-            source="verification_refresh",
-            status="ok",
-            detail=None,
-        )
-        session.add(vr)
-        counters["updated"] += 1
+        for cand in chunk:
+            epic_id = links.get(cand.discord_user_id)
+            if not epic_id or epic_id == cand.epic_account_id:
+                continue
+            user_rows.append(
+                {
+                    "id": cand.id,
+                    "epic_account_id": epic_id,
+                    "last_settled_kill_count": seed_kill_baseline(fortnite, epic_id),
+                }
+            )
+            records.append(
+                {
+                    "user_id": cand.id,
+                    "discord_user_id": cand.discord_user_id,
+                    "discord_guild_member": cand.discord_guild_member,
+                    "epic_account_id": epic_id,
+                    "source": "verification_refresh",
+                    "status": "ok",
+                    "detail": None,
+                }
+            )
+    if user_rows:
+        session.execute(update(User), user_rows)
+        session.execute(insert(VerificationRecord), records)
+    counters["updated"] = len(user_rows)
     session.commit()
+    log.info("verification_refresh_complete", **counters)
     return counters
 
 
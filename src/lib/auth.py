@@ -37,7 +37,8 @@ def issue_session(discord_user_id: str, secret: str, ttl_seconds: int = 86400) -
     return f"{_b64url(body)}.{_b64url(sig)}"
 
 
-def verify_session(token: str, secret: str) -> str | None:
+def verify_session_claims(token: str, secret: str) -> tuple[str, int] | None:
+    """Verify a user session token; returns ``(uid, exp)`` or None."""
     try:
         body_b64, sig_b64 = token.split(".", 1)
         body = _b64url_decode(body_b64)
@@ -49,14 +50,20 @@ def verify_session(token: str, secret: str) -> str | None:
         if not isinstance(raw, dict):
             return None
         payload: dict[str, Any] = raw  # narrow type for mypy
-        if payload.get("exp", 0) < int(time.time()):
+        exp = int(payload.get("exp", 0))
+        if exp < int(time.time()):
             return None
         uid = payload.get("uid")
-        return str(uid) if uid is not None else None
+        return (str(uid), exp) if uid is not None else None
     except Exception:
         return None
 
 
+def verify_session(token: str, secret: str) -> str | None:
+    claims = verify_session_claims(token, secret)
+    return claims[0] if claims else None
+
+
 def session_secret() -> str:
     return os.getenv("SESSION_SECRET", "dev-secret")
 
@@ -136,6 +143,7 @@ __all__ = [
     "verify_admin_session",
     "verify_oauth_state",
     "verify_session",
+    "verify_session_claims",
 ]
 
 
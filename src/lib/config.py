@@ -59,6 +59,12 @@ class PayoutConfig(BaseModel):
     hodl_boost_solana_rpc: str = Field(
         "https://api.mainnet-beta.solana.com", description="Solana RPC endpoint"
     )
+    hodl_scan_stale_seconds: int = Field(
+        3600, ge=0, description="Rescan a wallet once its balance is older than this"
+    )
+    hodl_scan_rpc_batch_size: int = Field(
+        100, ge=1, description="getTokenAccountsByOwner calls per JSON-RPC batch request"
+    )
 
 
 class IntegrationsConfig(BaseModel):
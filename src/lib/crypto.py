@@ -8,6 +8,7 @@ from __future__ import annotations
 import base64
 import hashlib
 import os
+from functools import lru_cache
 
 from cryptography.fernet import Fernet, InvalidToken
 
@@ -22,10 +23,15 @@ def _get_fernet_key(secret: str) -> bytes:
     return base64.urlsafe_b64encode(key_bytes)
 
 
+@lru_cache(maxsize=4)
+def _fernet_for(secret: str) -> Fernet:
+    """Fernet for one secret, built once (key derivation is not free per call)."""
+    return Fernet(_get_fernet_key(secret))
+
+
 def _get_fernet() -> Fernet:
     """Get Fernet instance using SESSION_SECRET."""
-    secret = os.getenv("SESSION_SECRET", "dev-secret")
-    return Fernet(_get_fernet_key(secret))
+    return _fernet_for(os.getenv("SESSION_SECRET", "dev-secret"))
 
 
 def encrypt_value(plaintext: str) -> str:
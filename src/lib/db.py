@@ -3,19 +3,130 @@ from __future__ import annotations
 import os
 from collections.abc import Generator
 from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Final
 
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine, make_url
 from sqlalchemy.orm import Session, sessionmaker
 
 DEFAULT_DB_URL = "sqlite:///./pay2slay.db"
 
 
-def make_engine(db_url: str | None = None) -> Engine:
-    url = db_url if db_url is not None else os.getenv("DATABASE_URL", DEFAULT_DB_URL)
+@dataclass(frozen=True)
+class EngineProfile:
+    """Connection tuning applied by ``make_engine``.
+
+    ``sqlite_pragmas`` run on every new DBAPI connection (SQLite only); pool
+    settings apply to pooled backends (file SQLite, Postgres).
+    """
+
+    name: str
+    sqlite_pragmas: tuple[tuple[str, str], ...] = ()
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_pre_ping: bool = False
+
+
+# Driver defaults only (the behaviour before profiles existed).
+PROFILE_COMPAT: Final = EngineProfile(name="compat")
+# WAL lets readers proceed during settlement writes; NORMAL sync is durable in
+# WAL mode up to the last checkpoint; busy_timeout absorbs short lock waits
+# instead of raising "database is locked".
+PROFILE_PRODUCTION: Final = EngineProfile(
+    name="production",
+    sqlite_pragmas=(
+        ("journal_mode", "WAL"),
+        ("busy_timeout", "5000"),
+        ("synchronous", "NORMAL"),
+        ("mmap_size", str(256 * 1024 * 1024)),
+        ("cache_size", "-16384"),  # KiB per connection
+        ("temp_store", "MEMORY"),
+    ),
+    pool_size=8,
+    max_overflow=8,
+    pool_pre_ping=True,
+)
+PROFILES: Final[dict[str, EngineProfile]] = {
+    p.name: p for p in (PROFILE_COMPAT, PROFILE_PRODUCTION)
+}
+DEFAULT_PROFILE: Final[str] = PROFILE_PRODUCTION.name
+
+
+def get_profile(name: str | None = None) -> EngineProfile:
+    """Profile by name, defaulting to ``P2S_DB_PROFILE`` (``production``)."""
+    key = name or os.getenv("P2S_DB_PROFILE") or DEFAULT_PROFILE
+    try:
+        return PROFILES[key]
+    except KeyError:
+        raise ValueError(
+            f"unknown DB profile {key!r}; expected one of {sorted(PROFILES)}"
+        ) from None
+
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: tuple[tuple[str, str], ...]) -> None:
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_conn: object, _record: object) -> None:
+        cursor = dbapi_conn.cursor()  # type: ignore[attr-defined]
+        for pragma, value in pragmas:
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        cursor.close()
+
+
+def _is_memory_sqlite(url: URL) -> bool:
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def make_engine(
+    db_url: str | None = None,
+    profile: EngineProfile | str | None = None,
+    *,
+    read_only: bool = False,
+) -> Engine:
+    url = make_url(db_url if db_url is not None else os.getenv("DATABASE_URL", DEFAULT_DB_URL))
+    prof = profile if isinstance(profile, EngineProfile) else get_profile(profile)
+    sqlite = url.get_backend_name() == "sqlite"
     # SQLite needs check_same_thread=False for multi-threaded access (uvicorn workers)
-    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
-    return create_engine(url, echo=False, future=True, connect_args=connect_args)
+    connect_args = {"check_same_thread": False} if sqlite else {}
+    pool_args: dict[str, object] = {}
+    if not _is_memory_sqlite(url):  # in-memory SQLite uses a singleton pool
+        pool_args = {
+            "pool_size": prof.pool_size,
+            "max_overflow": prof.max_overflow,
+            "pool_timeout": prof.pool_timeout,
+            "pool_pre_ping": prof.pool_pre_ping,
+        }
+    engine = create_engine(url, echo=False, future=True, connect_args=connect_args, **pool_args)
+    if sqlite:
+        pragmas = prof.sqlite_pragmas + ((("query_only", "ON"),) if read_only else ())
+        if pragmas:
+            _apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def make_read_engine(writer: Engine, replica_url: str | None = None) -> Engine | None:
+    """Engine for read-only traffic, or None when reads should share ``writer``.
+
+    Postgres: ``replica_url`` (default ``DATABASE_READ_URL``) points at a
+    streaming replica. SQLite file databases whose writer runs in WAL mode
+    (the ``production`` profile) get their own pool of ``query_only``
+    connections, so readers never wait on the settlement transaction's lock.
+    The journal mode is left as the writer's profile set it: under ``compat``
+    (rollback journal) a separate reader would only add lock contention, so
+    reads share the writer. In-memory SQLite has no second connection to the
+    same data and keeps using the writer.
+    """
+    url = replica_url if replica_url is not None else os.getenv("DATABASE_READ_URL")
+    if url:
+        return make_engine(url, read_only=True)
+    if _is_memory_sqlite(writer.url) or writer.url.get_backend_name() != "sqlite":
+        return None
+    with writer.connect() as conn:
+        journal_mode = conn.execute(text("PRAGMA journal_mode")).scalar()
+    if str(journal_mode).lower() != "wal":
+        return None
+    return make_engine(writer.url.render_as_string(hide_password=False), read_only=True)
 
 
 def make_session_factory(engine: Engine) -> sessionmaker[Session]:
@@ -0,0 +1,109 @@
+"""In-process domain event bus.
+
+Scheduler phases publish an event after they commit (new accruals, sent
+payouts, recorded donations, refreshed HODL balances). API-side consumers
+such as the response cache subscribe so they can react without polling
+the database.
+
+Handlers run synchronously on the publishing thread (usually the
+scheduler thread), so they must be cheap. A failing handler is logged and
+skipped; it never propagates into the phase that published the event.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any, Final
+
+from .observability import get_logger
+
+log = get_logger("events")
+
+TOPIC_ACCRUAL: Final[str] = "accrual"
+TOPIC_SETTLEMENT: Final[str] = "settlement"
+TOPIC_DONATION: Final[str] = "donation"
+TOPIC_MILESTONE: Final[str] = "milestone"
+TOPIC_HODL: Final[str] = "hodl"
+TOPIC_CONFIG: Final[str] = "config"
+
+# Events carry at most this many row summaries (for live-stream clients).
+MAX_EVENT_ROWS: Final[int] = 50
+
+# Subscribing to this pseudo-topic receives every event.
+ALL_TOPICS: Final[str] = "*"
+
+
+@dataclass(frozen=True)
+class Event:
+    topic: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+
+
+Handler = Callable[[Event], None]
+
+
+class _EventBus:
+    """Thread-safe topic -> handlers registry."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[str, list[Handler]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, handler: Handler) -> Callable[[], None]:
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+
+        def _unsubscribe() -> None:
+            with self._lock:
+                handlers = self._handlers.get(topic, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+
+        return _unsubscribe
+
+    def publish(self, event: Event) -> None:
+        with self._lock:
+            handlers = [*self._handlers.get(event.topic, []), *self._handlers.get(ALL_TOPICS, [])]
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as exc:  # pragma: no cover - defensive
+                log.warning("event_handler_failed", topic=event.topic, error=str(exc))
+
+
+_BUS = _EventBus()
+
+
+def subscribe(topic: str, handler: Handler) -> Callable[[], None]:
+    """Register ``handler`` for ``topic``; returns an unsubscribe callable."""
+    return _BUS.subscribe(topic, handler)
+
+
+def publish(topic: str, **payload: Any) -> Event:
+    """Publish an event to every subscriber of ``topic`` (and of ``*``).
+
+    Call this only after the transaction that produced the change has
+    committed, so subscribers that re-read the database see the new rows.
+    """
+    event = Event(topic=topic, payload=payload)
+    _BUS.publish(event)
+    return event
+
+
+__all__ = [
+    "ALL_TOPICS",
+    "MAX_EVENT_ROWS",
+    "TOPIC_ACCRUAL",
+    "TOPIC_CONFIG",
+    "TOPIC_DONATION",
+    "TOPIC_HODL",
+    "TOPIC_MILESTONE",
+    "TOPIC_SETTLEMENT",
+    "Event",
+    "publish",
+    "subscribe",
+]
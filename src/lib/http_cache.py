@@ -0,0 +1,199 @@
+"""Conditional-GET helpers (ETag / If-None-Match / Cache-Control).
+
+Public dashboard data only changes when the scheduler runs, so responses
+carry a validator plus a ``max-age`` that never reaches past the next
+scheduled accrual or settlement cycle. Clients that already hold the
+current version get an empty 304 instead of the full JSON body.
+
+The schedule is derived from the scheduler heartbeat. Reading that means a DB
+query (control channel) or a file read, and async handlers call
+``max_age_until_next_cycle`` on the event loop, cache hits included. So the API
+lifespan starts a refresher thread, and request paths only read the copy it
+keeps in memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from fastapi import Request, Response
+
+from src.lib.scheduler_control import get_control_channel
+
+from .observability import get_logger
+
+_REFRESH_SECONDS: Final[float] = 2.0
+
+log = get_logger("lib.http_cache")
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong validator for an exact response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak validator for bodies that are semantically (not byte-) equal per version."""
+    raw = "|".join(str(p) for p in parts).encode()
+    return 'W/"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    return tag.removeprefix("W/").strip()
+
+
+def etag_matches(request: Request | None, etag: str) -> bool:
+    """True when the request's If-None-Match covers ``etag`` (weak comparison, RFC 9110)."""
+    if request is None:
+        return False
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    wanted = _opaque(etag)
+    return any(_opaque(candidate) == wanted for candidate in header.split(","))
+
+
+def cache_headers(etag: str, max_age: int) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max(max_age, 0)}, must-revalidate",
+    }
+
+
+def not_modified(etag: str, max_age: int) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, max_age))
+
+
+@dataclass(frozen=True)
+class SchedulerSchedule:
+    """Scheduler timing as published in the heartbeat file."""
+
+    accrual_interval: int
+    settlement_interval: int
+    last_accrual_ts: float
+    last_settlement_ts: float
+
+    def next_accrual_in(self, now: float) -> int:
+        return max(0, int(self.last_accrual_ts + self.accrual_interval - now))
+
+    def next_settlement_in(self, now: float) -> int:
+        return max(0, int(self.last_settlement_ts + self.settlement_interval - now))
+
+    def next_cycle_in(self, now: float) -> int:
+        return min(self.next_accrual_in(now), self.next_settlement_in(now))
+
+    @property
+    def version(self) -> str:
+        return weak_etag(
+            self.accrual_interval,
+            self.settlement_interval,
+            self.last_accrual_ts,
+            self.last_settlement_ts,
+        )
+
+
+def _heartbeat_path() -> Path:
+    return Path(os.getenv("P2S_HEARTBEAT_FILE", "/tmp/scheduler_heartbeat.json"))
+
+
+def read_heartbeat() -> dict[str, Any] | None:
+    """Latest heartbeat: the scheduler control channel first, then the heartbeat file."""
+    channel = get_control_channel()
+    data = channel.last_heartbeat() if channel is not None else None
+    if data is not None:
+        return data
+    hb_path = _heartbeat_path()
+    if not hb_path.exists():
+        return None
+    loaded: dict[str, Any] = json.loads(hb_path.read_text())
+    return loaded
+
+
+# Heartbeat copy served to request handlers while the refresher thread runs.
+class _State:
+    heartbeat: dict[str, Any] | None = None
+    stop: threading.Event | None = None
+
+
+def refresh_heartbeat() -> dict[str, Any] | None:
+    """Re-read the heartbeat into the in-memory copy (blocking; off the event loop)."""
+    try:
+        _State.heartbeat = read_heartbeat()
+    except Exception as exc:  # keep serving the previous copy
+        log.warning("heartbeat_refresh_failed", error=str(exc))
+    return _State.heartbeat
+
+
+def start_schedule_refresher(interval: float | None = None) -> None:
+    """Keep the heartbeat copy fresh from a daemon thread (API lifespan)."""
+    stop_schedule_refresher()
+    every = interval or float(os.getenv("P2S_SCHEDULE_REFRESH_SECONDS", str(_REFRESH_SECONDS)))
+    stop = _State.stop = threading.Event()
+    refresh_heartbeat()
+
+    def _run() -> None:
+        while not stop.wait(every):
+            refresh_heartbeat()
+
+    threading.Thread(target=_run, daemon=True, name="schedule-refresher").start()
+
+
+def stop_schedule_refresher() -> None:
+    if _State.stop is not None:
+        _State.stop.set()
+        _State.stop = None
+
+
+def _current_heartbeat() -> dict[str, Any] | None:
+    # Without the refresher (tools, tests without the lifespan) read directly.
+    return _State.heartbeat if _State.stop is not None else read_heartbeat()
+
+
+def read_schedule() -> SchedulerSchedule | None:
+    """Parse the scheduler heartbeat; None when absent or unreadable."""
+    try:
+        data = _current_heartbeat()
+        if data is None:
+            return None
+        default_interval = int(os.getenv("P2S_INTERVAL_SECONDS", "1200"))
+        return SchedulerSchedule(
+            accrual_interval=int(data.get("accrual_interval_seconds") or default_interval),
+            settlement_interval=int(data.get("settlement_interval_seconds") or default_interval),
+            last_accrual_ts=float(data.get("last_accrual_ts") or data.get("ts", 0)),
+            last_settlement_ts=float(data.get("last_settlement_ts") or data.get("ts", 0)),
+        )
+    except Exception:
+        return None
+
+
+def max_age_until_next_cycle(ceiling: float) -> int:
+    """Seconds a client may reuse a response: until the next scheduler cycle, capped by ``ceiling``."""
+    schedule = read_schedule()
+    if schedule is None:
+        return int(ceiling)
+    return int(min(ceiling, schedule.next_cycle_in(time.time())))
+
+
+__all__ = [
+    "SchedulerSchedule",
+    "cache_headers",
+    "etag_matches",
+    "max_age_until_next_cycle",
+    "not_modified",
+    "read_heartbeat",
+    "read_schedule",
+    "refresh_heartbeat",
+    "start_schedule_refresher",
+    "stop_schedule_refresher",
+    "strong_etag",
+    "weak_etag",
+]
@@ -0,0 +1,276 @@
+"""Public live activity stream (Server-Sent Events fan-out).
+
+Mirrors ``log_buffer._RingBuffer``: a bounded replay ring plus one bounded
+asyncio.Queue per subscriber, with the API event loop attached at startup
+so the scheduler thread can hand frames over safely.
+
+Each domain event (see ``src.lib.events``) is rendered into an SSE frame
+exactly once and handed to the loop with a single ``call_soon_threadsafe``;
+the fan-out to every subscriber then happens on the loop. Thousands of
+open dashboards cost one render per scheduler commit, not one query each.
+
+A subscriber that falls behind (queue full) has its backlog dropped and
+receives a ``resync`` event telling the client to refetch full state.
+
+Event ids are ``epoch + n`` with a random per-process epoch, so a
+``Last-Event-ID`` issued by another worker, or by this one before a restart,
+is recognised as foreign and answered with ``resync`` rather than an empty
+(or wrong) replay.
+
+Domain events only exist in the process whose scheduler committed them. In
+every other worker/replica (and with a standalone ``python -m src.jobs``),
+``_SchedulerRelay`` watches the scheduler heartbeat, which is rewritten after
+every phase, and re-emits each new beat as a ``refresh`` event.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import secrets
+import socket
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Final
+
+from prometheus_client import Counter, Gauge
+
+from . import events
+from .observability import get_logger
+
+_DEFAULT_REPLAY: Final[int] = 256
+_DEFAULT_QUEUE_SIZE: Final[int] = 256
+_KEEPALIVE_SECONDS: Final[float] = 15.0
+# Ids of one process stay inside [epoch, epoch + 2**32); epochs are random multiples of that.
+_EPOCH_SPAN: Final[int] = 2**32
+_RELAY_SECONDS: Final[float] = 5.0
+
+# Domain topic -> SSE event name sent to browsers.
+SSE_EVENT_NAMES: Final[dict[str, str]] = {
+    events.TOPIC_ACCRUAL: "accrual",
+    events.TOPIC_SETTLEMENT: "payout",
+    events.TOPIC_DONATION: "donation",
+    events.TOPIC_MILESTONE: "milestone",
+    events.TOPIC_HODL: "refresh",
+    events.TOPIC_CONFIG: "refresh",
+}
+
+RESYNC_FRAME: Final[str] = "event: resync\ndata: {}\n\n"
+KEEPALIVE_FRAME: Final[str] = ": keepalive\n\n"
+
+STREAM_SUBSCRIBERS = Gauge("live_stream_subscribers", "Open /api/stream connections")
+STREAM_EVENTS = Counter("live_stream_events_total", "Events broadcast on /api/stream", ["event"])
+STREAM_DROPPED = Counter(
+    "live_stream_subscriber_overflow_total", "Subscribers resynced after their queue filled"
+)
+
+log = get_logger("lib.live_stream")
+
+
+class _Broadcaster:
+    """Replay ring + per-subscriber bounded queues; broadcast is safe from any thread."""
+
+    def __init__(self, replay: int = _DEFAULT_REPLAY, queue_size: int = _DEFAULT_QUEUE_SIZE):
+        self._ring: deque[tuple[int, str]] = deque(maxlen=replay)
+        self._lock = threading.Lock()
+        self.epoch = (secrets.randbits(20) + 1) * _EPOCH_SPAN
+        self._next_id = self.epoch + 1
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[str]] = set()
+        self._sub_lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def set_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def publish(self, name: str, data: dict[str, Any]) -> int:
+        """Render one SSE frame, remember it for replay and fan it out."""
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            frame = f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data, default=str)}\n\n"
+            self._ring.append((event_id, frame))
+        STREAM_EVENTS.labels(event=name).inc()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._fan_out, frame)
+            except RuntimeError:
+                # Loop closed (shutdown); nobody is listening anymore.
+                pass
+        return event_id
+
+    def replay_since(self, last_id: int) -> list[str] | None:
+        """Frames newer than ``last_id``; None when it is older than the ring or not ours."""
+        with self._lock:
+            if not self.epoch < last_id < self._next_id:
+                return None  # another worker's id, or one from before a restart
+            if last_id >= self._ring[-1][0]:
+                return []
+            if last_id < self._ring[0][0] - 1:
+                return None
+            return [frame for eid, frame in self._ring if eid > last_id]
+
+    def _fan_out(self, frame: str) -> None:
+        """Runs on the event loop: push ``frame`` into every subscriber queue."""
+        with self._sub_lock:
+            subs = list(self._subscribers)
+        for q in subs:
+            try:
+                q.put_nowait(frame)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog and ask it to refetch.
+                while not q.empty():
+                    q.get_nowait()
+                q.put_nowait(RESYNC_FRAME)
+                STREAM_DROPPED.inc()
+
+    def subscribe(self) -> asyncio.Queue[str]:
+        q: asyncio.Queue[str] = asyncio.Queue(maxsize=self._queue_size)
+        with self._sub_lock:
+            self._subscribers.add(q)
+            STREAM_SUBSCRIBERS.set(len(self._subscribers))
+        return q
+
+    def unsubscribe(self, q: asyncio.Queue[str]) -> None:
+        with self._sub_lock:
+            self._subscribers.discard(q)
+            STREAM_SUBSCRIBERS.set(len(self._subscribers))
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._sub_lock:
+            return len(self._subscribers)
+
+
+def _on_event(event: events.Event) -> None:
+    name = SSE_EVENT_NAMES.get(event.topic)
+    if name is not None:
+        get_broadcaster().publish(name, {**event.payload, "ts": event.ts})
+
+
+def local_origin() -> tuple[str, int]:
+    """(host, pid) of this process, as the scheduler heartbeat records it."""
+    return (socket.gethostname(), os.getpid())
+
+
+class _SchedulerRelay:
+    """Turns heartbeats from a scheduler in another process into ``refresh`` events."""
+
+    def __init__(
+        self,
+        read_heartbeat: Callable[[], dict[str, Any] | None],
+        interval: float = _RELAY_SECONDS,
+        origin: tuple[str, int] | None = None,
+    ) -> None:
+        self._read = read_heartbeat
+        self._interval = interval
+        self._origin = origin or local_origin()
+        self._last_ts: float | None = None
+        self._stop = threading.Event()
+
+    def poll_once(self) -> bool:
+        """Publish ``refresh`` if a foreign scheduler beat since the last poll."""
+        data = self._read()
+        if not data:
+            return False
+        ts = float(data.get("ts") or 0.0)
+        last, self._last_ts = self._last_ts, ts
+        if last is None or ts <= last:
+            return False
+        if (data.get("host"), data.get("pid")) == self._origin:
+            return False  # the scheduler runs here and already published its events
+        get_broadcaster().publish("refresh", {"source": "scheduler", "ts": ts})
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            if get_broadcaster().subscriber_count == 0:
+                continue
+            try:
+                self.poll_once()
+            except Exception as exc:  # next poll retries
+                log.warning("live_stream_relay_failed", error=str(exc))
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True, name="live-stream-relay").start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+# Broadcaster wired to the bus on first use, plus the relay started by the API lifespan.
+class _State:
+    broadcaster: _Broadcaster | None = None
+    unsubscribe: Callable[[], None] | None = None
+    relay: _SchedulerRelay | None = None
+
+
+def get_broadcaster() -> _Broadcaster:
+    """Return the process-wide broadcaster, wiring it to the event bus on first use."""
+    if _State.broadcaster is None:
+        _State.broadcaster = _Broadcaster()
+        _State.unsubscribe = events.subscribe(events.ALL_TOPICS, _on_event)
+    return _State.broadcaster
+
+
+def attach_event_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Call from FastAPI startup so scheduler-thread events reach subscribers."""
+    get_broadcaster().set_loop(loop)
+
+
+def start_scheduler_relay(read_heartbeat: Callable[[], dict[str, Any] | None]) -> None:
+    """Relay scheduler heartbeats from other processes to this process's subscribers."""
+    stop_scheduler_relay()
+    _State.relay = _SchedulerRelay(
+        read_heartbeat, float(os.getenv("P2S_STREAM_RELAY_SECONDS", str(_RELAY_SECONDS)))
+    )
+    _State.relay.start()
+
+
+def stop_scheduler_relay() -> None:
+    if _State.relay is not None:
+        _State.relay.stop()
+        _State.relay = None
+
+
+async def stream(
+    last_event_id: int | None = None, keepalive: float = _KEEPALIVE_SECONDS
+) -> AsyncIterator[str]:
+    """Yield SSE frames: missed events since ``last_event_id``, then live ones.
+
+    Subscribes before replaying so nothing published in between is lost
+    (a duplicate is harmless: clients dedupe on the SSE id).
+    """
+    broadcaster = get_broadcaster()
+    queue = broadcaster.subscribe()
+    try:
+        if last_event_id is not None:
+            missed = broadcaster.replay_since(last_event_id)
+            if missed is None:
+                yield RESYNC_FRAME
+            else:
+                for frame in missed:
+                    yield frame
+        while True:
+            try:
+                yield await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except TimeoutError:
+                yield KEEPALIVE_FRAME
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+__all__ = [
+    "KEEPALIVE_FRAME",
+    "RESYNC_FRAME",
+    "SSE_EVENT_NAMES",
+    "attach_event_loop",
+    "get_broadcaster",
+    "local_origin",
+    "start_scheduler_relay",
+    "stop_scheduler_relay",
+    "stream",
+]
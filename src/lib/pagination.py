@@ -0,0 +1,99 @@
+"""Keyset (cursor) pagination helpers for newest-first history endpoints.
+
+Pages are ordered by ``(created_at DESC, id DESC)`` and continue strictly
+after the last row of the previous page, so with a matching composite index
+``(…, created_at, id)`` every page is an index range scan of ``limit`` rows
+regardless of depth — unlike ``OFFSET`` which reads and discards all earlier
+rows. Cursors are opaque to clients: base64url of ``[created_at, id]``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import DateTime, String, and_, literal, or_
+from sqlalchemy.engine import Dialect
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client-supplied cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime | None, row_id: int) -> str:
+    raw = json.dumps([created_at.isoformat() if created_at else None, row_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime | None, int]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_raw, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        created_at = datetime.fromisoformat(created_raw) if created_raw else None
+        if not isinstance(row_id, int):
+            raise TypeError("cursor id must be an integer")
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as exc:
+        raise InvalidCursorError("invalid cursor") from exc
+    return created_at, row_id
+
+
+class _CursorTimestamp(TypeDecorator[datetime]):
+    """Bind type for cursor timestamps that matches SQLite's text storage.
+
+    SQLite keeps DATETIME as text: rows written via ``server_default`` look
+    like ``2026-01-01 12:00:00`` while ORM-written rows carry ``.000000``.
+    Both denote the same instant, so ``low`` binds the short form and
+    ``high`` the long one; other dialects bind the datetime unchanged.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def __init__(self, high: bool = False) -> None:
+        super().__init__()
+        self.high = high
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime())
+
+    def process_bind_param(self, value: datetime | None, dialect: Dialect) -> Any:
+        if value is None or dialect.name != "sqlite":
+            return value
+        if self.high:
+            return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+        return value.isoformat(sep=" ")
+
+
+def keyset_after(created_col: Any, id_col: Any, cursor: tuple[datetime | None, int]) -> Any:
+    """WHERE clause selecting rows strictly after ``cursor`` in newest-first order.
+
+    Shaped as a range on ``created_at`` plus an ``id`` bound so the planner
+    can seek the ``(…, created_at, id)`` index directly.
+    """
+    created_at, row_id = cursor
+    if created_at is None:
+        return and_(created_col.is_(None), id_col < row_id)
+    low = literal(created_at, _CursorTimestamp())
+    high = literal(created_at, _CursorTimestamp(high=True))
+    return or_(
+        created_col < low,
+        and_(created_col >= low, created_col <= high, id_col < row_id),
+    )
+
+
+def next_cursor(rows: list[Any], limit: int) -> tuple[list[Any], str | None]:
+    """Trim a ``limit + 1`` fetch to ``limit`` rows and return the next-page cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.created_at, last.id)
+
+
+__all__ = ["InvalidCursorError", "decode_cursor", "encode_cursor", "keyset_after", "next_cursor"]
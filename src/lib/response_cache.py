@@ -0,0 +1,362 @@
+"""Read-through cache for rendered public JSON responses.
+
+The public dashboard endpoints (leaderboard, feed, donations, HODL lists,
+product config) only change when the scheduler commits, yet every browser
+tab polls them. This module keeps the rendered JSON body per (route, key)
+so repeat polls are served from memory without opening a DB connection.
+
+Freshness is event driven: the scheduler publishes on ``src.lib.events``
+after each commit and the cache drops the routes affected by that topic.
+Per-route TTLs are only a safety net for writes made outside this process
+(e.g. a separate ``python -m src.jobs`` scheduler).
+
+Bounded by entry count and total body bytes with LRU eviction, so memory
+stays flat regardless of how many distinct query strings clients send.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Final
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from prometheus_client import Counter, Gauge
+
+from . import events
+from .http_cache import cache_headers, etag_matches, max_age_until_next_cycle, strong_etag
+
+ROUTE_LEADERBOARD: Final[str] = "leaderboard"
+ROUTE_FEED: Final[str] = "feed"
+ROUTE_DONATIONS: Final[str] = "donations"
+ROUTE_HODL_BOOSTED: Final[str] = "hodl_boosted"
+ROUTE_HODL_TIERS: Final[str] = "hodl_tiers"
+ROUTE_CONFIG_PRODUCT: Final[str] = "config_product"
+# Public half of /api/bootstrap (every section above in one body).
+ROUTE_BOOTSTRAP: Final[str] = "bootstrap"
+
+# Seconds an entry may be served without an invalidating event.
+DEFAULT_TTLS: Final[dict[str, float]] = {
+    ROUTE_LEADERBOARD: 30.0,
+    ROUTE_FEED: 15.0,
+    ROUTE_DONATIONS: 60.0,
+    ROUTE_HODL_BOOSTED: 60.0,
+    ROUTE_HODL_TIERS: 3600.0,
+    ROUTE_CONFIG_PRODUCT: 60.0,
+    ROUTE_BOOTSTRAP: 15.0,
+}
+
+# Which cached routes each scheduler/admin event makes stale.
+INVALIDATION_MAP: Final[dict[str, tuple[str, ...]]] = {
+    events.TOPIC_ACCRUAL: (ROUTE_LEADERBOARD, ROUTE_FEED, ROUTE_BOOTSTRAP),
+    events.TOPIC_SETTLEMENT: (ROUTE_LEADERBOARD, ROUTE_FEED, ROUTE_DONATIONS, ROUTE_BOOTSTRAP),
+    events.TOPIC_DONATION: (ROUTE_DONATIONS, ROUTE_BOOTSTRAP),
+    events.TOPIC_MILESTONE: (ROUTE_DONATIONS, ROUTE_BOOTSTRAP),
+    events.TOPIC_HODL: (ROUTE_HODL_BOOSTED, ROUTE_LEADERBOARD, ROUTE_FEED, ROUTE_BOOTSTRAP),
+    events.TOPIC_CONFIG: (
+        ROUTE_LEADERBOARD,
+        ROUTE_FEED,
+        ROUTE_DONATIONS,
+        ROUTE_CONFIG_PRODUCT,
+        ROUTE_BOOTSTRAP,
+    ),
+}
+
+_DEFAULT_MAX_ENTRIES: Final[int] = 512
+_DEFAULT_MAX_BYTES: Final[int] = 16 * 1024 * 1024
+
+CACHE_REQUESTS = Counter(
+    "response_cache_requests_total", "Response cache lookups", ["route", "result"]
+)
+CACHE_HIT_RATIO = Gauge(
+    "response_cache_hit_ratio", "Lifetime hit ratio of the response cache", ["route"]
+)
+CACHE_ENTRIES = Gauge("response_cache_entries", "Entries currently held in the response cache")
+CACHE_BYTES = Gauge("response_cache_bytes", "Body bytes currently held in the response cache")
+CACHE_EVICTIONS = Counter("response_cache_evictions_total", "Response cache evictions", ["reason"])
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU of rendered response bodies with per-route TTLs."""
+
+    def __init__(
+        self,
+        ttls: Mapping[str, float] | None = None,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+        max_bytes: int = _DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._max_entries = max(max_entries, 1)
+        self._max_bytes = max(max_bytes, 1)
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._bytes = 0
+        # Bumped on invalidation so a slow miss can't repopulate stale data.
+        self._generations: dict[str, int] = {}
+        self._hits: dict[str, int] = {}
+        self._misses: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def ttl_for(self, route: str) -> float:
+        return self._ttls.get(route, 0.0)
+
+    def generation(self, route: str) -> int:
+        with self._lock:
+            return self._generations.get(route, 0)
+
+    def get(self, route: str, key: str) -> bytes | None:
+        entry = self.get_entry(route, key)
+        return entry.body if entry is not None else None
+
+    def get_entry(self, route: str, key: str) -> _Entry | None:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get((route, key))
+            if entry is not None and entry.expires_at <= now:
+                self._drop_unlocked((route, key))
+                CACHE_EVICTIONS.labels(reason="expired").inc()
+                entry = None
+            if entry is None:
+                self._record_unlocked(route, hit=False)
+                return None
+            self._entries.move_to_end((route, key))
+            self._record_unlocked(route, hit=True)
+            return entry
+
+    def put(
+        self,
+        route: str,
+        key: str,
+        body: bytes,
+        generation: int | None = None,
+        etag: str | None = None,
+    ) -> bool:
+        """Store ``body``; skipped when the route was invalidated since ``generation``."""
+        ttl = self.ttl_for(route)
+        if ttl <= 0 or len(body) > self._max_bytes:
+            return False
+        with self._lock:
+            if generation is not None and generation != self._generations.get(route, 0):
+                return False
+            self._drop_unlocked((route, key))
+            self._entries[(route, key)] = _Entry(
+                body=body,
+                etag=etag or strong_etag(body),
+                expires_at=self._clock() + ttl,
+            )
+            self._bytes += len(body)
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop_unlocked(oldest)
+                CACHE_EVICTIONS.labels(reason="lru").inc()
+            self._export_size_unlocked()
+        return True
+
+    def invalidate(self, routes: Iterable[str] | None = None) -> int:
+        """Drop every entry of ``routes`` (all routes when None); returns count dropped."""
+        with self._lock:
+            if routes is None:
+                targets = {route for route, _key in self._entries} | set(self._generations)
+            else:
+                targets = set(routes)
+            for route in targets:
+                self._generations[route] = self._generations.get(route, 0) + 1
+            stale = [k for k in self._entries if k[0] in targets]
+            for k in stale:
+                self._drop_unlocked(k)
+            if stale:
+                CACHE_EVICTIONS.labels(reason="invalidated").inc(len(stale))
+            self._export_size_unlocked()
+            return len(stale)
+
+    def on_event(self, event: events.Event) -> None:
+        routes = INVALIDATION_MAP.get(event.topic)
+        if routes:
+            self.invalidate(routes)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            routes = sorted(set(self._hits) | set(self._misses))
+            per_route = {
+                r: {
+                    "hits": self._hits.get(r, 0),
+                    "misses": self._misses.get(r, 0),
+                    "hit_ratio": _ratio(self._hits.get(r, 0), self._misses.get(r, 0)),
+                }
+                for r in routes
+            }
+            hits = sum(self._hits.values())
+            misses = sum(self._misses.values())
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": _ratio(hits, misses),
+                "routes": per_route,
+            }
+
+    def _drop_unlocked(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry.body)
+
+    def _record_unlocked(self, route: str, hit: bool) -> None:
+        bucket = self._hits if hit else self._misses
+        bucket[route] = bucket.get(route, 0) + 1
+        try:
+            CACHE_REQUESTS.labels(route=route, result="hit" if hit else "miss").inc()
+            CACHE_HIT_RATIO.labels(route=route).set(
+                _ratio(self._hits.get(route, 0), self._misses.get(route, 0))
+            )
+        except Exception:  # pragma: no cover - metrics should never break
+            pass
+
+    def _export_size_unlocked(self) -> None:
+        try:
+            CACHE_ENTRIES.set(len(self._entries))
+            CACHE_BYTES.set(self._bytes)
+        except Exception:  # pragma: no cover
+            pass
+
+
+def _ratio(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
+
+
+def _ttls_from_env() -> dict[str, float]:
+    ttls = dict(DEFAULT_TTLS)
+    for route in ttls:
+        raw = os.getenv(f"P2S_RESPONSE_CACHE_TTL_{route.upper()}")
+        if raw:
+            try:
+                ttls[route] = float(raw)
+            except ValueError:
+                pass
+    return ttls
+
+
+# Process-wide cache, subscribed to every bus topic on first use; ``unsubscribe`` detaches it.
+class _State:
+    cache: ResponseCache | None = None
+    unsubscribe: Callable[[], None] | None = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Return the process-wide cache, creating and wiring it on first use.
+
+    ``P2S_RESPONSE_CACHE=0`` disables caching (every TTL becomes zero).
+    """
+    if _State.cache is None:
+        enabled = os.getenv("P2S_RESPONSE_CACHE", "1").lower() not in ("0", "false", "no", "off")
+        cache = ResponseCache(
+            ttls=_ttls_from_env() if enabled else {},
+            max_entries=int(os.getenv("P2S_RESPONSE_CACHE_MAX_ENTRIES", str(_DEFAULT_MAX_ENTRIES))),
+            max_bytes=int(os.getenv("P2S_RESPONSE_CACHE_MAX_BYTES", str(_DEFAULT_MAX_BYTES))),
+        )
+        _State.unsubscribe = events.subscribe(events.ALL_TOPICS, cache.on_event)
+        _State.cache = cache
+    return _State.cache
+
+
+def cached_body(route: str, key: str, build: Callable[[], Any]) -> bytes:
+    """Rendered JSON bytes for ``route``/``key``, building and caching on a miss."""
+    cache = get_response_cache()
+    entry = cache.get_entry(route, key)
+    if entry is not None:
+        return entry.body
+    generation = cache.generation(route)
+    body = bytes(JSONResponse(build()).body)
+    cache.put(route, key, body, generation=generation)
+    return body
+
+
+def cached_json(
+    route: str, key: str, build: Callable[[], Any], request: Request | None = None
+) -> Response:
+    """Serve ``route``/``key`` from the cache, calling ``build`` on a miss.
+
+    ``build`` returns the JSON-serialisable payload; it is rendered once and
+    the bytes (plus their ETag) are what get cached, so hits skip
+    serialisation as well. When ``request`` carries a matching
+    ``If-None-Match`` the reply is an empty 304.
+    """
+    cache = get_response_cache()
+    entry = cache.get_entry(route, key)
+    if entry is not None:
+        return _reply(cache, route, entry.body, entry.etag, "HIT", request)
+    generation = cache.generation(route)
+    return _store_and_reply(cache, route, key, build(), generation, request)
+
+
+async def cached_json_async(
+    route: str, key: str, build: Callable[[], Awaitable[Any]], request: Request | None = None
+) -> Response:
+    """``cached_json`` for ``async def`` handlers: hits never leave the event loop."""
+    cache = get_response_cache()
+    entry = cache.get_entry(route, key)
+    if entry is not None:
+        return _reply(cache, route, entry.body, entry.etag, "HIT", request)
+    generation = cache.generation(route)
+    return _store_and_reply(cache, route, key, await build(), generation, request)
+
+
+def _store_and_reply(  # noqa: PLR0913, PLR0917 - shared tail of both cached_json variants
+    cache: ResponseCache,
+    route: str,
+    key: str,
+    payload: Any,
+    generation: int,
+    request: Request | None,
+) -> Response:
+    body = bytes(JSONResponse(payload).body)
+    etag = strong_etag(body)
+    cache.put(route, key, body, generation=generation, etag=etag)
+    return _reply(cache, route, body, etag, "MISS", request)
+
+
+def _reply(  # noqa: PLR0913, PLR0917
+    cache: ResponseCache,
+    route: str,
+    body: bytes,
+    etag: str,
+    status: str,
+    request: Request | None,
+) -> Response:
+    headers = cache_headers(etag, max_age_until_next_cycle(cache.ttl_for(route)))
+    headers["X-Cache"] = status
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+__all__ = [
+    "DEFAULT_TTLS",
+    "INVALIDATION_MAP",
+    "ROUTE_BOOTSTRAP",
+    "ROUTE_CONFIG_PRODUCT",
+    "ROUTE_DONATIONS",
+    "ROUTE_FEED",
+    "ROUTE_HODL_BOOSTED",
+    "ROUTE_HODL_TIERS",
+    "ROUTE_LEADERBOARD",
+    "ResponseCache",
+    "cached_body",
+    "cached_json",
+    "cached_json_async",
+    "get_response_cache",
+]
@@ -0,0 +1,248 @@
+"""Admin runtime overrides (scheduler intervals, payout rate and caps) kept in memory.
+
+The admin panel persists overrides to ``SCHEDULER_CONFIG_PATH`` — a JSON file
+shared with a standalone scheduler process. Readers (cap checks on every
+leaderboard/feed/status request, every scheduler tick) used to stat, read and
+parse it each call. ``RuntimeOverrides`` holds one parsed, immutable
+``OverridesSnapshot`` instead and re-reads the file only when its
+``(mtime_ns, inode, size)`` stamp changes. The stamp itself is checked at most
+every ``P2S_OVERRIDES_CHECK_SECONDS`` (default 2s), and writes made through
+``update()`` reload immediately. The active promo is resolved once per UTC day.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, replace
+from datetime import UTC, date, datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Final
+
+from prometheus_client import Counter
+
+from .observability import get_logger
+from .promo import Promo, get_active_promo
+
+SCHEDULER_CONFIG_PATH = Path(
+    os.getenv("P2S_SCHEDULER_CONFIG_FILE", "/data/scheduler_overrides.json")
+)
+
+MIN_INTERVAL_SECONDS: Final[int] = 30
+_DEFAULT_CHECK_SECONDS: Final[float] = 2.0
+
+OVERRIDES_RELOADS = Counter(
+    "runtime_overrides_reloads_total", "Times the overrides file was re-read", ["reason"]
+)
+
+log = get_logger("lib.runtime_overrides")
+
+_Stamp = tuple[int, int, int]
+
+
+def _opt(value: Any, cast: Callable[[Any], Any]) -> Any:
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class OverridesSnapshot:
+    """Parsed overrides at one file version; ``None`` means "not overridden"."""
+
+    data: Mapping[str, Any]
+    accrual_interval_seconds: int | None = None
+    settlement_interval_seconds: int | None = None
+    ban_per_kill: float | None = None
+    daily_kill_cap: int | None = None
+    weekly_kill_cap: int | None = None
+    promo: Promo | None = None
+    promo_day: date | None = None
+    version: int = 0
+
+    @classmethod
+    def parse(cls, data: Mapping[str, Any], version: int = 0) -> OverridesSnapshot:
+        raw_payout = data.get("payout")
+        payout: Mapping[str, Any] = raw_payout if isinstance(raw_payout, dict) else {}
+        return cls(
+            data=MappingProxyType(dict(data)),
+            accrual_interval_seconds=_opt(data.get("accrual_interval_seconds"), int),
+            settlement_interval_seconds=_opt(data.get("settlement_interval_seconds"), int),
+            ban_per_kill=_opt(payout.get("ban_per_kill"), float),
+            daily_kill_cap=_opt(payout.get("daily_kill_cap"), int),
+            weekly_kill_cap=_opt(payout.get("weekly_kill_cap"), int),
+            version=version,
+        )
+
+    @property
+    def payout(self) -> dict[str, float | int] | None:
+        """Payout overrides as stored (``ban_per_kill``/``daily_kill_cap``/``weekly_kill_cap``)."""
+        raw = self.data.get("payout")
+        return dict(raw) if isinstance(raw, dict) else None
+
+    @property
+    def has_payout_overrides(self) -> bool:
+        return any(
+            v is not None for v in (self.ban_per_kill, self.daily_kill_cap, self.weekly_kill_cap)
+        )
+
+    def intervals(self, default_interval: int) -> dict[str, int]:
+        """Scheduler intervals with admin overrides applied (floored at 30s)."""
+        accrual = self.accrual_interval_seconds
+        settlement = self.settlement_interval_seconds
+        return {
+            "accrual_interval_seconds": default_interval
+            if accrual is None
+            else max(MIN_INTERVAL_SECONDS, accrual),
+            "settlement_interval_seconds": default_interval
+            if settlement is None
+            else max(MIN_INTERVAL_SECONDS, settlement),
+        }
+
+    def rate(self, default_ban_per_kill: float) -> float:
+        return default_ban_per_kill if self.ban_per_kill is None else self.ban_per_kill
+
+    def caps(self, daily_cap: int, weekly_cap: int) -> tuple[int, int]:
+        """Kill caps with admin overrides applied (no promo)."""
+        return (
+            daily_cap if self.daily_kill_cap is None else self.daily_kill_cap,
+            weekly_cap if self.weekly_kill_cap is None else self.weekly_kill_cap,
+        )
+
+    def effective_caps(self, daily_cap: int, weekly_cap: int) -> tuple[int, int]:
+        """Kill caps after overrides, raised to the active promo's caps if higher."""
+        daily, weekly = self.caps(daily_cap, weekly_cap)
+        if self.promo is not None:
+            if self.promo.daily_cap is not None:
+                daily = max(daily, self.promo.daily_cap)
+            if self.promo.weekly_cap is not None:
+                weekly = max(weekly, self.promo.weekly_cap)
+        return daily, weekly
+
+
+class RuntimeOverrides:
+    """Caches ``OverridesSnapshot`` for one overrides file; safe across threads."""
+
+    def __init__(
+        self,
+        path: Path,
+        check_interval: float = _DEFAULT_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], date] = lambda: datetime.now(UTC).date(),
+    ) -> None:
+        self.path = path
+        self._check_interval = check_interval
+        self._clock = clock
+        self._today = today
+        self._lock = threading.Lock()
+        self._snapshot: OverridesSnapshot | None = None
+        self._stamp: _Stamp | None = None
+        self._next_check = 0.0
+        self._version = 0
+
+    def _stat(self) -> _Stamp | None:
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_ino, st.st_size)
+
+    def _read(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            log.warning("runtime_overrides_unreadable", path=str(self.path), error=str(exc))
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _load(self, stamp: _Stamp | None, reason: str) -> OverridesSnapshot:
+        self._version += 1
+        self._stamp = stamp
+        self._snapshot = OverridesSnapshot.parse(self._read(), version=self._version)
+        OVERRIDES_RELOADS.labels(reason=reason).inc()
+        return self._snapshot
+
+    def _refresh(self, now: float) -> OverridesSnapshot:
+        """Re-stat if the check interval elapsed; caller holds ``_lock``."""
+        if self._snapshot is not None and now < self._next_check:
+            return self._snapshot
+        self._next_check = now + self._check_interval
+        stamp = self._stat()
+        if self._snapshot is None:
+            return self._load(stamp, "initial")
+        if stamp != self._stamp:
+            return self._load(stamp, "changed")
+        return self._snapshot
+
+    def snapshot(self) -> OverridesSnapshot:
+        """Current overrides; touches the filesystem at most once per check interval."""
+        snap = self._snapshot
+        now = self._clock()
+        if snap is None or now >= self._next_check:
+            with self._lock:
+                snap = self._refresh(now)
+        today = self._today()
+        if snap.promo_day != today:
+            promo = get_active_promo(datetime(today.year, today.month, today.day, tzinfo=UTC))
+            snap = replace(snap, promo=promo, promo_day=today)
+            with self._lock:
+                if self._snapshot is not None and self._snapshot.version == snap.version:
+                    self._snapshot = snap
+        return snap
+
+    def invalidate(self) -> None:
+        """Force the next ``snapshot()`` to re-stat (and re-read if changed)."""
+        with self._lock:
+            self._next_check = 0.0
+            self._stamp = None
+
+    def update(self, mutate: Callable[[dict[str, object]], None]) -> OverridesSnapshot:
+        """Read-modify-write the overrides file atomically, then reload.
+
+        ``mutate`` edits the freshly read dict in place. The file is replaced
+        via rename so a concurrent reader never sees a partial document.
+        """
+        with self._lock:
+            current = self._read()
+            mutate(current)
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            tmp.write_text(json.dumps(current))
+            os.replace(tmp, self.path)
+            self._next_check = self._clock() + self._check_interval
+            self._load(self._stat(), "write")
+        return self.snapshot()
+
+
+# One snapshot of SCHEDULER_CONFIG_PATH per process, shared by the API and scheduler loop.
+class _State:
+    overrides: RuntimeOverrides | None = None
+
+
+def get_runtime_overrides() -> RuntimeOverrides:
+    """Process-wide overrides for ``SCHEDULER_CONFIG_PATH``."""
+    if _State.overrides is None:
+        _State.overrides = RuntimeOverrides(
+            SCHEDULER_CONFIG_PATH,
+            check_interval=float(
+                os.getenv("P2S_OVERRIDES_CHECK_SECONDS", str(_DEFAULT_CHECK_SECONDS))
+            ),
+        )
+    return _State.overrides
+
+
+__all__ = [
+    "MIN_INTERVAL_SECONDS",
+    "SCHEDULER_CONFIG_PATH",
+    "OverridesSnapshot",
+    "RuntimeOverrides",
+    "get_runtime_overrides",
+]
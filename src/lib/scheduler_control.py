@@ -0,0 +1,458 @@
+"""Scheduler control channel: admin commands in, heartbeat and progress out.
+
+Admin actions (run a cycle, settle now, intervals changed) used to either run
+synchronously inside the HTTP request or wait for the scheduler to notice a
+changed JSON file. They are now queued as ``Command``s that the scheduler
+leader claims at the top of its loop; submitting sets ``channel.wake`` so a
+co-located scheduler reacts at once instead of finishing its sleep. Progress
+(per-phase results) is written back to the command, and the leader publishes
+its heartbeat through the same channel.
+
+Two transports (``P2S_SCHEDULER_CONTROL``):
+
+- ``db`` (default): ``scheduler_commands`` / ``scheduler_heartbeat`` tables,
+  for API workers and ``python -m src.jobs`` in separate processes or hosts.
+  A scheduler in another process picks commands up within
+  ``P2S_SCHEDULER_CONTROL_POLL_SECONDS`` (default 2s). A command left
+  ``running`` by a claimer that died or lost the lease is failed by the next
+  leader once it has made no progress for the lease TTL
+  (``P2S_SCHEDULER_LEASE_TTL``), so the admin who queued it gets an answer.
+- ``local``: an in-process queue for a single API process that runs the
+  scheduler thread itself; no DB round trips.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime, timedelta
+from typing import Any, Final, cast
+
+from sqlalchemy import CursorResult, Table, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.models.models import SchedulerCommand, SchedulerHeartbeat
+
+from .observability import get_logger
+
+log = get_logger("lib.scheduler_control")
+
+ACTION_TRIGGER: Final[str] = "trigger"
+ACTION_ACCRUE: Final[str] = "accrue"
+ACTION_SETTLE: Final[str] = "settle"
+ACTION_RELOAD: Final[str] = "reload"
+# Action -> scheduler phases it runs (``reload`` only re-reads admin overrides).
+ACTION_PHASES: Final[dict[str, tuple[str, ...]]] = {
+    ACTION_TRIGGER: ("accrual", "hodl_scan", "donation_receive", "donation_sync", "settlement"),
+    ACTION_ACCRUE: ("accrual",),
+    ACTION_SETTLE: ("settlement",),
+    ACTION_RELOAD: (),
+}
+
+STATUS_PENDING: Final[str] = "pending"
+STATUS_RUNNING: Final[str] = "running"
+STATUS_DONE: Final[str] = "done"
+STATUS_ERROR: Final[str] = "error"
+
+_HEARTBEAT_NAME: Final[str] = "scheduler"
+_HEARTBEAT_CACHE_SECONDS: Final[float] = 2.0
+_CLAIM_BATCH: Final[int] = 20
+# Matches the scheduler lease TTL: past it, a different claimer has lost the lease.
+_DEFAULT_STALE_SECONDS: Final[float] = 90.0
+
+
+def _utcnow() -> datetime:
+    return datetime.now(UTC).replace(tzinfo=None)
+
+
+def _holder() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Command:
+    id: int
+    action: str
+    status: str = STATUS_PENDING
+    requested_by: str | None = None
+    claimed_by: str | None = None
+    progress: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+    created_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (STATUS_DONE, STATUS_ERROR)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "command_id": self.id,
+            "action": self.action,
+            "status": self.status,
+            "requested_by": self.requested_by,
+            "claimed_by": self.claimed_by,
+            "progress": self.progress,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ControlChannel(ABC):
+    """Transport-neutral interface; ``wake`` is shared with the scheduler's phase runtime."""
+
+    kind = "base"
+    poll_seconds = float("inf")  # how long a waiting scheduler may go without re-checking
+
+    def __init__(self) -> None:
+        self.wake = threading.Event()
+        self.holder = _holder()
+
+    def submit(self, action: str, *, requested_by: str | None = None) -> Command:
+        if action not in ACTION_PHASES:
+            raise ValueError(f"unknown scheduler action {action!r}")
+        command = self._insert(action, requested_by)
+        self.wake.set()
+        log.info("scheduler_command_queued", command_id=command.id, action=action)
+        return command
+
+    @abstractmethod
+    def claim(self, holder: str) -> list[Command]:
+        """Take pending commands for ``holder`` (oldest first), marking them running."""
+
+    @abstractmethod
+    def update(self, command: Command) -> None:
+        """Persist ``status`` / ``progress`` / ``error`` of a claimed command."""
+
+    @abstractmethod
+    def get(self, command_id: int) -> Command | None:
+        """Current state of a command, or ``None`` if unknown."""
+
+    @abstractmethod
+    def beat(self, data: dict[str, Any]) -> None:
+        """Publish the scheduler heartbeat."""
+
+    @abstractmethod
+    def last_heartbeat(self) -> dict[str, Any] | None:
+        """Most recent heartbeat published through this transport."""
+
+    @abstractmethod
+    def _insert(self, action: str, requested_by: str | None) -> Command:
+        """Store a new pending command."""
+
+
+class LocalControlChannel(ControlChannel):
+    kind = "local"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending: deque[int] = deque()
+        self._commands: dict[int, Command] = {}
+        self._next_id = 1
+        self._heartbeat: dict[str, Any] | None = None
+
+    def _insert(self, action: str, requested_by: str | None) -> Command:
+        with self._lock:
+            command = Command(
+                id=self._next_id, action=action, requested_by=requested_by, created_at=_utcnow()
+            )
+            self._next_id += 1
+            self._commands[command.id] = command
+            self._pending.append(command.id)
+        return command
+
+    def claim(self, holder: str) -> list[Command]:
+        with self._lock:
+            claimed = [self._commands[i] for i in self._pending]
+            self._pending.clear()
+            for command in claimed:
+                command.status, command.claimed_by = STATUS_RUNNING, holder
+        return claimed
+
+    def update(self, command: Command) -> None:
+        with self._lock:
+            if command.finished and command.finished_at is None:
+                command.finished_at = _utcnow()
+            self._commands[command.id] = command
+
+    def get(self, command_id: int) -> Command | None:
+        with self._lock:
+            command = self._commands.get(command_id)
+            # Copy: the scheduler thread keeps mutating the original.
+            return replace(command, progress=dict(command.progress)) if command else None
+
+    def beat(self, data: dict[str, Any]) -> None:
+        self._heartbeat = dict(data)
+
+    def last_heartbeat(self) -> dict[str, Any] | None:
+        return self._heartbeat
+
+
+class DbControlChannel(ControlChannel):
+    kind = "db"
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        *,
+        poll_seconds: float = 2.0,
+        stale_seconds: float = _DEFAULT_STALE_SECONDS,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.stale_seconds = stale_seconds
+        self._tables_ready = False
+        self._heartbeat_cache: tuple[float, dict[str, Any] | None] = (0.0, None)
+
+    def _session(self) -> Session:
+        session = self.session_factory()
+        if not self._tables_ready:
+            # The standalone scheduler never runs create_all.
+            for model in (SchedulerCommand, SchedulerHeartbeat):
+                cast(Table, model.__table__).create(session.connection(), checkfirst=True)
+            session.commit()
+            self._tables_ready = True
+        return session
+
+    @staticmethod
+    def _to_command(row: SchedulerCommand) -> Command:
+        return Command(
+            id=row.id,
+            action=row.action,
+            status=row.status,
+            requested_by=row.requested_by,
+            claimed_by=row.claimed_by,
+            progress=json.loads(row.progress) if row.progress else {},
+            error=row.error,
+            created_at=row.created_at,
+            finished_at=row.finished_at,
+        )
+
+    def _insert(self, action: str, requested_by: str | None) -> Command:
+        with self._session() as session:
+            row = SchedulerCommand(action=action, status=STATUS_PENDING, requested_by=requested_by)
+            session.add(row)
+            session.commit()
+            return self._to_command(row)
+
+    def _fail_abandoned(self, session: Session, holder: str) -> None:
+        """Fail ``running`` commands of another claimer with no progress for ``stale_seconds``.
+
+        ``updated_at`` is stamped on claim and on every progress update, and
+        only the lease holder claims, so such a claimer died or lost the lease
+        mid-run. The command is failed rather than re-run: a settle may
+        already have sent payouts before the claimer stopped.
+        """
+        now = _utcnow()
+        abandoned = session.execute(
+            select(SchedulerCommand.id, SchedulerCommand.claimed_by).where(
+                SchedulerCommand.status == STATUS_RUNNING,
+                SchedulerCommand.claimed_by != holder,
+                SchedulerCommand.updated_at < now - timedelta(seconds=self.stale_seconds),
+            )
+        ).all()
+        for command_id, claimed_by in abandoned:
+            session.execute(
+                update(SchedulerCommand)
+                .where(
+                    SchedulerCommand.id == command_id,
+                    SchedulerCommand.status == STATUS_RUNNING,
+                )
+                .values(
+                    status=STATUS_ERROR,
+                    error=f"abandoned: {claimed_by} stopped before finishing",
+                    finished_at=now,
+                    updated_at=now,
+                )
+            )
+            log.warning("scheduler_command_abandoned", command_id=command_id, claimed_by=claimed_by)
+
+    def claim(self, holder: str) -> list[Command]:
+        claimed: list[Command] = []
+        with self._session() as session:
+            self._fail_abandoned(session, holder)
+            ids = session.scalars(
+                select(SchedulerCommand.id)
+                .where(SchedulerCommand.status == STATUS_PENDING)
+                .order_by(SchedulerCommand.id)
+                .limit(_CLAIM_BATCH)
+            ).all()
+            for command_id in ids:
+                # Conditional flip so two claimers can never both take a command.
+                result = session.execute(
+                    update(SchedulerCommand)
+                    .where(
+                        SchedulerCommand.id == command_id,
+                        SchedulerCommand.status == STATUS_PENDING,
+                    )
+                    .values(status=STATUS_RUNNING, claimed_by=holder, updated_at=_utcnow())
+                )
+                if cast(CursorResult[Any], result).rowcount == 1:
+                    row = session.get(SchedulerCommand, command_id, populate_existing=True)
+                    if row is not None:
+                        claimed.append(self._to_command(row))
+            session.commit()
+        return claimed
+
+    def update(self, command: Command) -> None:
+        values: dict[str, Any] = {
+            "status": command.status,
+            "progress": json.dumps(command.progress, default=str),
+            "error": command.error,
+            "updated_at": _utcnow(),  # liveness for _fail_abandoned
+        }
+        if command.finished:
+            command.finished_at = command.finished_at or _utcnow()
+            values["finished_at"] = command.finished_at
+        with self._session() as session:
+            # A command already failed as abandoned keeps that outcome.
+            session.execute(
+                update(SchedulerCommand)
+                .where(
+                    SchedulerCommand.id == command.id,
+                    SchedulerCommand.status == STATUS_RUNNING,
+                )
+                .values(**values)
+            )
+            session.commit()
+
+    def get(self, command_id: int) -> Command | None:
+        with self._session() as session:
+            row = session.get(SchedulerCommand, command_id)
+            return self._to_command(row) if row is not None else None
+
+    def beat(self, data: dict[str, Any]) -> None:
+        payload = json.dumps(data, default=str)
+        now = _utcnow()
+        with self._session() as session:
+            result = session.execute(
+                update(SchedulerHeartbeat)
+                .where(SchedulerHeartbeat.name == _HEARTBEAT_NAME)
+                .values(holder=self.holder, data=payload, updated_at=now)
+            )
+            if cast(CursorResult[Any], result).rowcount == 0:
+                try:
+                    with session.begin_nested():
+                        session.execute(
+                            insert(SchedulerHeartbeat).values(
+                                name=_HEARTBEAT_NAME,
+                                holder=self.holder,
+                                data=payload,
+                                updated_at=now,
+                            )
+                        )
+                except IntegrityError:
+                    pass  # another process inserted it first; next beat updates
+            session.commit()
+        self._heartbeat_cache = (time.monotonic(), dict(data))
+
+    def last_heartbeat(self) -> dict[str, Any] | None:
+        # Public routes derive Cache-Control from this; keep it off the DB hot path.
+        fetched_at, cached = self._heartbeat_cache
+        if time.monotonic() - fetched_at < _HEARTBEAT_CACHE_SECONDS:
+            return cached
+        with self._session() as session:
+            raw = session.scalar(
+                select(SchedulerHeartbeat.data).where(SchedulerHeartbeat.name == _HEARTBEAT_NAME)
+            )
+        data = json.loads(raw) if raw else None
+        self._heartbeat_cache = (time.monotonic(), data)
+        return data
+
+
+class CommandProgress:
+    """Collects per-phase outcomes for one claimed command and finishes it at the end."""
+
+    def __init__(self, channel: ControlChannel, command: Command, phases: Sequence[str]) -> None:
+        self.channel = channel
+        self.command = command
+        self._lock = threading.Lock()
+        command.progress = dict.fromkeys(phases, "queued")
+        if not phases:
+            command.status = STATUS_DONE
+        channel.update(command)
+
+    def waiter(self, phase: str) -> Callable[[object, str | None], None]:
+        return lambda result, error: self._finish(phase, result, error)
+
+    def fail(self, error: str) -> None:
+        with self._lock:
+            self.command.status, self.command.error = STATUS_ERROR, error
+            self.channel.update(self.command)
+
+    def _finish(self, phase: str, result: object, error: str | None) -> None:
+        entry: dict[str, Any] = {"status": "error" if error else "ok"}
+        if error:
+            entry["error"] = error
+        elif isinstance(result, dict):
+            entry.update(result)
+        with self._lock:
+            command = self.command
+            command.progress[phase] = entry
+            if all(isinstance(v, dict) for v in command.progress.values()):
+                errors = [
+                    f"{name}: {v['error']}" for name, v in command.progress.items() if "error" in v
+                ]
+                command.status = STATUS_ERROR if errors else STATUS_DONE
+                command.error = "; ".join(errors) or None
+            self.channel.update(command)
+
+
+class _State:
+    channel: ControlChannel | None = None
+
+
+def configure_control_channel(session_factory: sessionmaker[Session]) -> ControlChannel:
+    """Install the process-wide channel from ``P2S_SCHEDULER_CONTROL`` (``db`` or ``local``)."""
+    mode = os.getenv("P2S_SCHEDULER_CONTROL", "db").strip().lower()
+    if mode == "local":
+        channel: ControlChannel = LocalControlChannel()
+    elif mode == "db":
+        poll = float(os.getenv("P2S_SCHEDULER_CONTROL_POLL_SECONDS", "2"))
+        stale = float(os.getenv("P2S_SCHEDULER_LEASE_TTL", str(_DEFAULT_STALE_SECONDS)))
+        channel = DbControlChannel(session_factory, poll_seconds=poll, stale_seconds=stale)
+    else:
+        raise ValueError("P2S_SCHEDULER_CONTROL must be 'db' or 'local'")
+    _State.channel = channel
+    return channel
+
+
+def get_control_channel() -> ControlChannel | None:
+    return _State.channel
+
+
+def set_control_channel(channel: ControlChannel | None) -> None:
+    """Swap the process-wide channel (tests)."""
+    _State.channel = channel
+
+
+__all__ = [
+    "ACTION_ACCRUE",
+    "ACTION_PHASES",
+    "ACTION_RELOAD",
+    "ACTION_SETTLE",
+    "ACTION_TRIGGER",
+    "STATUS_DONE",
+    "STATUS_ERROR",
+    "STATUS_PENDING",
+    "STATUS_RUNNING",
+    "Command",
+    "CommandProgress",
+    "ControlChannel",
+    "DbControlChannel",
+    "LocalControlChannel",
+    "configure_control_channel",
+    "get_control_channel",
+    "set_control_channel",
+]
@@ -0,0 +1,80 @@
+"""Per-engine cache of which tables and columns exist.
+
+Code that must tolerate older databases (e.g. ``donation_ledger`` missing
+before its migration ran) used to reflect the catalog on every call — a
+``pg_catalog`` query on Postgres, a ``sqlite_master`` scan on SQLite. The
+registry probes each engine once (at startup, again after migrations or
+schema patches via ``refresh``) and answers from memory afterwards.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Any
+
+from prometheus_client import Counter
+from sqlalchemy import inspect
+from sqlalchemy.engine import Engine
+
+SCHEMA_PROBES = Counter("schema_registry_probes_total", "Catalog reflections by the registry")
+
+
+@dataclass(frozen=True)
+class SchemaCapabilities:
+    """Tables and their column names as observed by the last probe."""
+
+    tables: frozenset[str]
+    columns: dict[str, frozenset[str]]
+
+    def has_table(self, table: str) -> bool:
+        return table in self.tables
+
+    def has_column(self, table: str, column: str) -> bool:
+        return column in self.columns.get(table, frozenset())
+
+
+class _Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_engine: weakref.WeakKeyDictionary[Engine, SchemaCapabilities] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get(self, engine: Engine) -> SchemaCapabilities:
+        caps = self._by_engine.get(engine)
+        if caps is None:
+            caps = self.refresh(engine)
+        return caps
+
+    def refresh(self, engine: Engine) -> SchemaCapabilities:
+        insp = inspect(engine)
+        tables = frozenset(insp.get_table_names())
+        columns = {t: frozenset(c["name"] for c in insp.get_columns(t)) for t in tables}
+        caps = SchemaCapabilities(tables=tables, columns=columns)
+        SCHEMA_PROBES.inc()
+        with self._lock:
+            self._by_engine[engine] = caps
+        return caps
+
+
+_registry = _Registry()
+
+
+def _engine_of(bind: Any) -> Engine:
+    # Session.get_bind() may hand back a Connection; key on its Engine.
+    return bind if isinstance(bind, Engine) else bind.engine
+
+
+def schema_for(bind: Any) -> SchemaCapabilities:
+    """Cached capabilities for ``bind`` (Engine or Connection); probes on first use."""
+    return _registry.get(_engine_of(bind))
+
+
+def refresh_schema(bind: Any) -> SchemaCapabilities:
+    """Re-probe after DDL (create_all, migrations, column patches)."""
+    return _registry.refresh(_engine_of(bind))
+
+
+__all__ = ["SchemaCapabilities", "refresh_schema", "schema_for"]
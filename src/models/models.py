@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 
-from sqlalchemy import BigInteger, Boolean, ForeignKey, Index, Numeric, String, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
+from .types import Money
 
 
 class User(Base, TimestampMixin):
@@ -88,8 +98,14 @@ class VerificationRecord(Base, TimestampMixin):
 class RewardAccrual(Base, TimestampMixin):
     __tablename__ = "reward_accruals"
     __table_args__ = (
-        Index("ix_accrual_user_created", "user_id", "created_at"),
-        Index("ix_accrual_settled", "settled"),
+        # Keyset pagination on (created_at, id) per user (see src.lib.pagination)
+        Index("ix_accrual_user_created_id", "user_id", "created_at", "id"),
+        # Covering: settlement candidates and per-user unsettled totals
+        Index("ix_accrual_settled_user", "settled", "user_id", "kills", "amount_ban"),
+        # Payout join (cap windows, underpaid repair)
+        Index("ix_accrual_payout", "payout_id", "user_id", "kills", "amount_ban"),
+        # Activity feed: newest accruals across all users
+        Index("ix_accrual_created", "created_at"),
         # Idempotency: at most one accrual per user per epoch_minute
         UniqueConstraint("user_id", "epoch_minute", name="uq_accrual_user_epoch"),
     )
@@ -99,7 +115,7 @@ class RewardAccrual(Base, TimestampMixin):
     # count of kills accrued since last cursor for user
     kills: Mapped[int] = mapped_column()
     # snapshot value = kills * payout_per_kill at time of accrual (BAN)
-    amount_ban: Mapped[Decimal] = mapped_column(Numeric(18, 8, asdecimal=True))
+    amount_ban: Mapped[Decimal] = mapped_column(Money())
     epoch_minute: Mapped[int] = mapped_column(BigInteger)  # aggregation slot or cursor minute
 
     settled: Mapped[bool] = mapped_column(default=False)
@@ -114,14 +130,17 @@ class Payout(Base, TimestampMixin):
     __tablename__ = "payouts"
     __table_args__ = (
         Index("ix_payout_tx", "tx_hash", unique=True),
-        Index("ix_payout_user_created", "user_id", "created_at"),
+        Index("ix_payout_user_created_id", "user_id", "created_at", "id"),
+        # Covering: sent totals and status + time-window filters
+        Index("ix_payout_status_created", "status", "created_at", "amount_ban"),
+        Index("ix_payout_created", "created_at"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     address: Mapped[str] = mapped_column(String(70))
     # Sum of included accruals (BAN)
-    amount_ban: Mapped[Decimal] = mapped_column(Numeric(18, 8, asdecimal=True))
+    amount_ban: Mapped[Decimal] = mapped_column(Money())
     # Blockchain fields
     tx_hash: Mapped[str | None] = mapped_column(String(128))
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending/sent/failed
@@ -137,8 +156,35 @@ class Payout(Base, TimestampMixin):
     accruals: Mapped[list[RewardAccrual]] = relationship(back_populates="payout")
 
 
+class UserDailySummary(Base, TimestampMixin):
+    """Per-user, per-day rollup of accruals and sent payouts removed by retention.
+
+    ``scripts/prune_data.py`` folds archived rows in here so all-time totals
+    (leaderboard, ``/me/status``, economics) stay exact after the raw rows go.
+    Accrual columns are bucketed by the accrual's ``created_at`` day, payout
+    columns by the payout's.
+    """
+
+    __tablename__ = "user_daily_summaries"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_summary_user_day"),
+        # Covering: per-user all-time totals
+        Index("ix_summary_user_totals", "user_id", "kills", "accrued_ban", "paid_ban"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    day: Mapped[date] = mapped_column(Date)
+    kills: Mapped[int] = mapped_column(default=0)
+    accrued_ban: Mapped[Decimal] = mapped_column(Money(), default=0)
+    accrual_count: Mapped[int] = mapped_column(default=0)
+    paid_ban: Mapped[Decimal] = mapped_column(Money(), default=0)
+    payout_count: Mapped[int] = mapped_column(default=0)
+
+
 class AdminAudit(Base, TimestampMixin):
     __tablename__ = "admin_audit"
+    __table_args__ = (Index("ix_admin_audit_created_id", "created_at", "id"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     action: Mapped[str] = mapped_column(String(64), index=True)
@@ -183,10 +229,77 @@ class DonationLedger(Base, TimestampMixin):
     """
 
     __tablename__ = "donation_ledger"
+    __table_args__ = (
+        # Covering: donor leaderboard groups by sender
+        Index("ix_donation_sender", "sender_address", "amount_ban"),
+        # One row per chain receive block (NULL for manual / legacy rows)
+        Index("uq_donation_block_hash", "block_hash", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    amount_ban: Mapped[Decimal] = mapped_column(Numeric(18, 8, asdecimal=True))
+    amount_ban: Mapped[Decimal] = mapped_column(Money())
     blocks_received: Mapped[int] = mapped_column(default=0)
-    source: Mapped[str] = mapped_column(String(32), default="receive")  # receive / manual / seed
+    # receive / manual / seed / rebuild / chain_sync
+    source: Mapped[str] = mapped_column(String(32), default="receive")
     note: Mapped[str | None] = mapped_column(String(255))
     sender_address: Mapped[str | None] = mapped_column(String(128))
+    block_hash: Mapped[str | None] = mapped_column(String(64))
+
+
+class DonationSyncCursor(Base):
+    """Last operator-account block processed by the donation sync (``src.jobs.donation_sync``)."""
+
+    __tablename__ = "donation_sync_cursor"
+
+    account: Mapped[str] = mapped_column(String(128), primary_key=True)
+    block_hash: Mapped[str] = mapped_column(String(64))
+    height: Mapped[int] = mapped_column(BigInteger)
+    updated_at: Mapped[datetime] = mapped_column()
+
+
+class SchedulerLease(Base):
+    """Leader-election lease: one row per lease name (see ``src.jobs.lease``).
+
+    ``fencing_token`` increases every time a different holder takes the lease,
+    so work stamped with an older token is recognisably stale.
+    """
+
+    __tablename__ = "scheduler_lease"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255))
+    fencing_token: Mapped[int] = mapped_column(BigInteger, default=1)
+    expires_at: Mapped[datetime] = mapped_column()
+    acquired_at: Mapped[datetime] = mapped_column()
+    renewed_at: Mapped[datetime] = mapped_column()
+
+
+class SchedulerCommand(Base, TimestampMixin):
+    """Admin request queued for the scheduler leader (see ``src.lib.scheduler_control``).
+
+    ``status`` moves pending -> running -> done/error; ``progress`` is a JSON
+    object of phase name -> ``"queued"`` or that run's result (``status``, counters).
+    """
+
+    __tablename__ = "scheduler_commands"
+    __table_args__ = (Index("ix_scheduler_commands_status", "status", "id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    action: Mapped[str] = mapped_column(String(32))
+    status: Mapped[str] = mapped_column(String(16), default="pending")
+    requested_by: Mapped[str | None] = mapped_column(String(255))
+    claimed_by: Mapped[str | None] = mapped_column(String(255))
+    progress: Mapped[str | None] = mapped_column(Text)
+    error: Mapped[str | None] = mapped_column(Text)
+    finished_at: Mapped[datetime | None] = mapped_column()
+
+
+class SchedulerHeartbeat(Base):
+    """Latest heartbeat published by the scheduler leader (one row per scheduler name)."""
+
+    __tablename__ = "scheduler_heartbeat"
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255))
+    data: Mapped[str] = mapped_column(Text)
+    updated_at: Mapped[datetime] = mapped_column()
@@ -0,0 +1,195 @@
+"""Column types shared by the models.
+
+``Money`` holds BAN amounts. By default it is ``Numeric(18, 8)``, as before.
+With ``P2S_MONEY_STORAGE=integer`` it is a ``BigInteger`` count of 1e-8 BAN
+units instead, so SQLite ``SUM`` / ``GROUP BY`` run as native integer math
+rather than over REAL/TEXT. The ORM and SQL expressions still see ``Decimal``:
+values are scaled once at bind/result time, and literals compared against a
+money column are coerced to units too.
+
+The stored column type is authoritative: ``pin_money_storage`` inspects the
+money columns when an engine is opened and pins that engine's dialect to the
+representation it finds, so a process whose ``P2S_MONEY_STORAGE`` disagrees
+with the database still reads the right amounts. ``P2S_MONEY_STORAGE`` only
+picks the type for columns that do not exist yet and the target of
+``convert_money_columns``, which runs solely from the
+``20261019_04_money_storage`` migration.
+"""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any, Final
+
+from sqlalchemy import BigInteger, Integer, MetaData, Numeric, inspect
+from sqlalchemy.engine import Connection, Dialect, Engine
+from sqlalchemy.types import TypeDecorator, TypeEngine
+
+MONEY_SCALE: Final[int] = 8
+MONEY_PRECISION: Final[int] = 18
+UNITS_PER_BAN: Final[int] = 10**MONEY_SCALE
+BAN_QUANTUM: Final[Decimal] = Decimal(1).scaleb(-MONEY_SCALE)  # 0.00000001
+
+STORAGE_DECIMAL: Final[str] = "decimal"
+STORAGE_INTEGER: Final[str] = "integer"
+_STORAGE_MODES: Final[frozenset[str]] = frozenset({STORAGE_DECIMAL, STORAGE_INTEGER})
+_DIALECT_ATTR: Final[str] = "_p2s_money_storage"
+
+
+def money_storage() -> str:
+    """Configured storage mode (``P2S_MONEY_STORAGE``, default ``decimal``)."""
+    mode = (os.getenv("P2S_MONEY_STORAGE") or STORAGE_DECIMAL).strip().lower()
+    if mode not in _STORAGE_MODES:
+        raise ValueError(f"P2S_MONEY_STORAGE must be one of {sorted(_STORAGE_MODES)}")
+    return mode
+
+
+def dialect_money_storage(dialect: Dialect) -> str:
+    """Storage mode pinned to ``dialect`` (the configured mode if never pinned)."""
+    mode: str | None = dialect.__dict__.get(_DIALECT_ATTR)
+    if mode is None:
+        mode = money_storage()
+        setattr(dialect, _DIALECT_ATTR, mode)
+    return mode
+
+
+def to_units(value: Decimal | float | int | str) -> int:
+    """BAN -> integer 1e-8 units (rounded half-even to the column scale)."""
+    amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    return int(amount.quantize(BAN_QUANTUM).scaleb(MONEY_SCALE))
+
+
+def from_units(units: int) -> Decimal:
+    return Decimal(units).scaleb(-MONEY_SCALE)
+
+
+class Money(TypeDecorator[Decimal]):
+    impl = Numeric(MONEY_PRECISION, MONEY_SCALE, asdecimal=True)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect_money_storage(dialect) == STORAGE_INTEGER:
+            return dialect.type_descriptor(BigInteger())
+        return dialect.type_descriptor(Numeric(MONEY_PRECISION, MONEY_SCALE, asdecimal=True))
+
+    # Processors are overridden directly (rather than process_bind_param /
+    # process_result_value) so decimal mode keeps Numeric's own fast path.
+    def bind_processor(self, dialect: Dialect) -> Callable[[Any], Any] | None:
+        if dialect_money_storage(dialect) == STORAGE_INTEGER:
+            return lambda value: None if value is None else to_units(value)
+        return super().bind_processor(dialect)
+
+    def result_processor(self, dialect: Dialect, coltype: object) -> Callable[[Any], Any] | None:
+        if dialect_money_storage(dialect) == STORAGE_INTEGER:
+            return lambda value: None if value is None else from_units(int(value))
+        return super().result_processor(dialect, coltype)
+
+
+def money_columns(metadata: MetaData) -> list[tuple[str, str]]:
+    return [
+        (table.name, column.name)
+        for table in metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, Money)
+    ]
+
+
+def stored_money_storage(connection: Connection, metadata: MetaData) -> str | None:
+    """Mode the existing money columns are stored in; ``None`` before any exist."""
+    insp = inspect(connection)
+    tables = set(insp.get_table_names())
+    modes: set[str] = set()
+    for table, column in money_columns(metadata):
+        if table not in tables:
+            continue
+        current = next(c["type"] for c in insp.get_columns(table) if c["name"] == column)
+        modes.add(STORAGE_INTEGER if isinstance(current, Integer) else STORAGE_DECIMAL)
+    if len(modes) > 1:
+        raise RuntimeError("money columns mix integer and decimal storage; re-run the migration")
+    return modes.pop() if modes else None
+
+
+def pin_money_storage(engine: Engine, metadata: MetaData) -> str:
+    """Pin ``engine``'s dialect to the stored money representation and return it.
+
+    Call before the engine runs any ORM statement. With no money columns yet,
+    the configured ``P2S_MONEY_STORAGE`` is used (and the columns get created
+    in it).
+    """
+    configured = money_storage()
+    with engine.connect() as conn:
+        mode = stored_money_storage(conn, metadata) or configured
+    pinned = engine.dialect.__dict__.get(_DIALECT_ATTR)
+    if pinned is not None and pinned != mode:
+        raise RuntimeError(
+            f"money columns are stored as {mode} but this engine already uses {pinned}; restart"
+        )
+    setattr(engine.dialect, _DIALECT_ATTR, mode)
+    return mode
+
+
+def convert_money_columns(
+    connection: Connection, metadata: MetaData, mode: str | None = None
+) -> list[str]:
+    """Rewrite money columns to ``mode`` (default ``P2S_MONEY_STORAGE``); returns converted names.
+
+    Columns already in the target representation (or tables not created yet)
+    are skipped, so the migration is idempotent. Only migrations call this:
+    running engines stay pinned to the type they found at startup.
+    """
+    from alembic.operations import Operations
+    from alembic.runtime.migration import MigrationContext
+
+    target_mode = mode or money_storage()
+    to_integer = target_mode == STORAGE_INTEGER
+    insp = inspect(connection)
+    tables = set(insp.get_table_names())
+    op = Operations(MigrationContext.configure(connection))
+    postgres = connection.dialect.name == "postgresql"
+    converted: list[str] = []
+    for table, column in money_columns(metadata):
+        if table not in tables:
+            continue
+        current = next(c["type"] for c in insp.get_columns(table) if c["name"] == column)
+        if isinstance(current, Integer) == to_integer:
+            continue
+        target: TypeEngine[Any] = (
+            BigInteger() if to_integer else Numeric(MONEY_PRECISION, MONEY_SCALE)
+        )
+        if postgres:
+            using = (
+                f"round({column} * {UNITS_PER_BAN})::bigint"
+                if to_integer
+                else f"({column}::numeric / {UNITS_PER_BAN})::numeric(18, 8)"
+            )
+            op.alter_column(table, column, type_=target, postgresql_using=using)
+        else:
+            # SQLite cannot ALTER a column type: rescale in place, then rebuild.
+            if to_integer:
+                op.execute(f"UPDATE {table} SET {column} = ROUND({column} * {UNITS_PER_BAN})")
+            with op.batch_alter_table(table) as batch:
+                batch.alter_column(column, type_=target)
+            if not to_integer:
+                op.execute(f"UPDATE {table} SET {column} = {column} / {UNITS_PER_BAN}.0")
+        converted.append(f"{table}.{column}")
+    setattr(connection.dialect, _DIALECT_ATTR, target_mode)
+    return converted
+
+
+__all__ = [
+    "BAN_QUANTUM",
+    "STORAGE_DECIMAL",
+    "STORAGE_INTEGER",
+    "UNITS_PER_BAN",
+    "Money",
+    "convert_money_columns",
+    "dialect_money_storage",
+    "from_units",
+    "money_columns",
+    "money_storage",
+    "pin_money_storage",
+    "stored_money_storage",
+    "to_units",
+]
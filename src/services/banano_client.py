@@ -1,13 +1,31 @@
 from __future__ import annotations
 
 import hashlib
+import os
+import threading
+import time
+from dataclasses import dataclass
 from decimal import ROUND_DOWN, Decimal
-from typing import Any
+from typing import Any, ClassVar
 
 import httpx
+from prometheus_client import Counter, Histogram
 
 _DRYRUN_BALANCE_BAN = 100.0  # Dry-run dummy balance (BAN)
 
+# Node-side cap on hashes/accounts per bulk action we are willing to send in one request
+BANANO_MAX_BATCH = 500
+
+BANANO_RPC_LATENCY = Histogram(
+    "banano_rpc_latency_seconds", "Latency of Banano node RPC calls", ["action"]
+)
+BANANO_RPC_ERRORS = Counter(
+    "banano_rpc_errors_total", "Failed Banano node RPC calls", ["action", "kind"]
+)
+
+# Actions that may legitimately run long: server-side work generation, long history pages
+_SLOW_ACTIONS = frozenset({"process", "work_generate", "account_history"})
+
 # Banano address encoding alphabet (same as Nano)
 _B32_ALPHABET = "13456789abcdefghijkmnopqrstuwxyz"
 
@@ -16,17 +34,10 @@ _SEED_HEX_LEN = 64
 
 
 def _bytes_to_b32(data: bytes) -> str:
-    """Convert bytes to Nano/Banano base32 encoding."""
-    # Pad to 5-bit boundaries
-    bits = bin(int.from_bytes(data, "big"))[2:].zfill(len(data) * 8)
-    # Pad bits to multiple of 5
-    while len(bits) % 5:
-        bits = "0" + bits
-    result = ""
-    for i in range(0, len(bits), 5):
-        chunk = int(bits[i : i + 5], 2)
-        result += _B32_ALPHABET[chunk]
-    return result
+    """Convert bytes to Nano/Banano base32 encoding (leading bits zero-padded to 5)."""
+    value = int.from_bytes(data, "big")
+    chars = -(-len(data) * 8 // 5)
+    return "".join(_B32_ALPHABET[(value >> (5 * i)) & 31] for i in range(chars - 1, -1, -1))
 
 
 def _blake2b_checksum(pubkey: bytes) -> bytes:
@@ -35,12 +46,8 @@ def _blake2b_checksum(pubkey: bytes) -> bytes:
     return h.digest()[::-1]  # Reversed
 
 
-def seed_to_address(seed_hex: str, index: int = 0) -> str | None:
-    """Derive a Banano address from a 64-char hex seed.
-
-    Uses Blake2b to derive private key, then Ed25519-Blake2b to get public key.
-    Returns ban_... address or None if derivation fails.
-    """
+def seed_to_public_key(seed_hex: str, index: int = 0) -> bytes | None:
+    """Derive the Ed25519-Blake2b public key for ``index`` of a 64-char hex seed."""
     try:
         # Validate seed format
         if len(seed_hex) != _SEED_HEX_LEN:
@@ -55,38 +62,157 @@ def seed_to_address(seed_hex: str, index: int = 0) -> str | None:
         import ed25519_blake2b
 
         signing_key = ed25519_blake2b.SigningKey(private_key)
-        public_key = signing_key.get_verifying_key().to_bytes()
+        return bytes(signing_key.get_verifying_key().to_bytes())
+    except Exception:
+        return None
 
-        # Encode public key to address
-        # Banano address: ban_ + 52 chars (4-bit padding + 256-bit pubkey) + 8 chars checksum
-        pubkey_with_padding = b"\x00\x00\x00" + public_key  # 3 bytes padding for 259 bits
-        encoded = _bytes_to_b32(pubkey_with_padding)
-        # Take last 52 chars (skip padding encoding artifacts)
-        encoded = encoded[-52:]
 
-        # Checksum
-        checksum = _blake2b_checksum(public_key)
-        checksum_encoded = _bytes_to_b32(checksum)[-8:]
+def public_key_to_address(public_key: bytes) -> str:
+    """Encode a 32-byte public key as a ``ban_...`` address."""
+    # Banano address: ban_ + 52 chars (4-bit padding + 256-bit pubkey) + 8 chars checksum
+    pubkey_with_padding = b"\x00\x00\x00" + public_key  # 3 bytes padding for 259 bits
+    encoded = _bytes_to_b32(pubkey_with_padding)
+    # Take last 52 chars (skip padding encoding artifacts)
+    encoded = encoded[-52:]
 
-        return f"ban_{encoded}{checksum_encoded}"
-    except Exception:
-        return None
+    # Checksum
+    checksum = _blake2b_checksum(public_key)
+    checksum_encoded = _bytes_to_b32(checksum)[-8:]
+
+    return f"ban_{encoded}{checksum_encoded}"
+
+
+def seed_to_address(seed_hex: str, index: int = 0) -> str | None:
+    """Derive a Banano address from a 64-char hex seed.
+
+    Uses Blake2b to derive private key, then Ed25519-Blake2b to get public key.
+    Returns ban_... address or None if derivation fails.
+    """
+    public_key = seed_to_public_key(seed_hex, index)
+    return public_key_to_address(public_key) if public_key is not None else None
+
+
+@dataclass(frozen=True)
+class BananoRpcPolicy:
+    """Timeouts and pool size for ``BananoRpc``."""
+
+    timeout_seconds: float = 10.0
+    slow_timeout_seconds: float = 60.0  # ``_SLOW_ACTIONS``
+    max_connections: int = 8
+
+    @classmethod
+    def from_env(cls) -> BananoRpcPolicy:
+        return cls(
+            timeout_seconds=float(os.getenv("P2S_BANANO_RPC_TIMEOUT_SECONDS", "10")),
+            slow_timeout_seconds=float(os.getenv("P2S_BANANO_RPC_SLOW_TIMEOUT_SECONDS", "60")),
+            max_connections=max(int(os.getenv("P2S_BANANO_RPC_CONNECTIONS", "8")), 1),
+        )
+
+    def timeout_for(self, action: str) -> float:
+        return self.slow_timeout_seconds if action in _SLOW_ACTIONS else self.timeout_seconds
+
+
+class BananoRpc:
+    """Pooled keep-alive transport to one Banano node, shared by every ``BananoClient``.
+
+    Each call gets its action's timeout and is recorded in
+    ``banano_rpc_latency_seconds`` / ``banano_rpc_errors_total`` by action.
+    Transport and HTTP errors are raised; node errors (an ``error`` key in the
+    reply) are counted and returned for the caller to interpret.
+    """
+
+    def __init__(
+        self,
+        node_url: str,
+        policy: BananoRpcPolicy | None = None,
+        *,
+        client: httpx.Client | None = None,
+    ) -> None:
+        self.node_url = node_url
+        self.policy = policy or BananoRpcPolicy()
+        slots = max(self.policy.max_connections, 1)
+        self._http = client or httpx.Client(
+            timeout=self.policy.timeout_seconds,
+            limits=httpx.Limits(max_connections=slots, max_keepalive_connections=slots),
+        )
+
+    def call(self, payload: dict[str, Any]) -> dict[str, Any]:
+        action = str(payload.get("action", "unknown"))
+        start = time.perf_counter()
+        try:
+            resp = self._http.post(
+                self.node_url, json=payload, timeout=self.policy.timeout_for(action)
+            )
+            resp.raise_for_status()
+            data = resp.json() or {}
+        except (httpx.HTTPError, ValueError):
+            BANANO_RPC_ERRORS.labels(action=action, kind="http").inc()
+            raise
+        finally:
+            BANANO_RPC_LATENCY.labels(action=action).observe(time.perf_counter() - start)
+        if isinstance(data, dict) and "error" in data:
+            BANANO_RPC_ERRORS.labels(action=action, kind="node").inc()
+        return data
+
+    def close(self) -> None:
+        self._http.close()
+
+
+class _State:
+    rpcs: ClassVar[dict[str, BananoRpc]] = {}
+    lock = threading.Lock()
+
+
+def get_banano_rpc(node_url: str) -> BananoRpc:
+    """Process-wide transport per node URL, so API requests and scheduler phases share a pool."""
+    with _State.lock:
+        rpc = _State.rpcs.get(node_url)
+        if rpc is None:
+            rpc = _State.rpcs[node_url] = BananoRpc(node_url, BananoRpcPolicy.from_env())
+        return rpc
 
 
 class BananoClient:
-    def __init__(self, node_url: str, dry_run: bool = True, seed: str | None = None) -> None:
+    def __init__(
+        self,
+        node_url: str,
+        dry_run: bool = True,
+        seed: str | None = None,
+        *,
+        rpc: BananoRpc | None = None,
+    ) -> None:
         self.node_url = node_url
         self.dry_run = dry_run
         self._seed = seed
-        self.http = None if dry_run else httpx.Client(timeout=10)
+        # Cheap to construct: the HTTP pool lives in the shared ``BananoRpc``
+        self.rpc = None if dry_run else (rpc or get_banano_rpc(node_url))
         # Scale: 10^29 raw = 1 BAN
         self._raw_per_ban = 10**29
 
     def _post(self, payload: dict[str, Any]) -> dict[str, Any]:
-        assert not self.dry_run and self.http is not None
-        resp = self.http.post(self.node_url, json=payload)
-        resp.raise_for_status()
-        return resp.json() or {}
+        assert not self.dry_run and self.rpc is not None
+        return self.rpc.call(payload)
+
+    def _node_call(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """bananopie ``RPC.call`` semantics (raise on node error) over the shared pool."""
+        data = self._post(payload)
+        if "error" in data:
+            raise RuntimeError(f"Node response: {data['error']}")
+        return data
+
+    def _wallet(self, block_info: dict[str, dict[str, Any]] | None = None) -> Any:
+        """bananopie ``Wallet`` for the operator seed whose RPC goes through ``self.rpc``.
+
+        ``block_info`` answers ``get_block_info`` for prefetched hashes locally.
+        """
+        from bananopie import RPC, Wallet
+
+        rpc = RPC(self.node_url)
+        rpc.call = self._node_call
+        if block_info:
+            fetch = rpc.get_block_info
+            rpc.get_block_info = lambda h: block_info.get(h) or fetch(h)
+        return Wallet(rpc, seed=self._seed, index=0)
 
     def ban_to_raw(self, amount_ban: float | Decimal) -> str:
         """Convert BAN (Decimal or float) to raw integer units (as string).
@@ -120,6 +246,46 @@ class BananoClient:
         pending = self.raw_to_ban(data.get("pending", "0"))
         return (bal, pending)
 
+    def accounts_balances(self, accounts: list[str]) -> dict[str, tuple[float, float]]:
+        """(balance_ban, pending_ban) for many accounts, one RPC per ``BANANO_MAX_BATCH``."""
+        if self.dry_run:
+            return dict.fromkeys(accounts, (_DRYRUN_BALANCE_BAN, 0.0))
+        result: dict[str, tuple[float, float]] = {}
+        for i in range(0, len(accounts), BANANO_MAX_BATCH):
+            chunk = accounts[i : i + BANANO_MAX_BATCH]
+            balances = self._post({"action": "accounts_balances", "accounts": chunk}).get(
+                "balances"
+            )
+            if not isinstance(balances, dict):
+                continue
+            for account, info in balances.items():
+                if isinstance(info, dict):
+                    pending = info.get("pending") or info.get("receivable") or "0"
+                    result[account] = (
+                        self.raw_to_ban(info.get("balance", "0")),
+                        self.raw_to_ban(pending),
+                    )
+        return result
+
+    def blocks_info(self, hashes: list[str]) -> dict[str, dict[str, Any]]:
+        """``block_info`` for many hashes, one RPC per ``BANANO_MAX_BATCH``; unknown ones omitted."""
+        if self.dry_run or not hashes:
+            return {}
+        result: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(hashes), BANANO_MAX_BATCH):
+            data = self._post(
+                {
+                    "action": "blocks_info",
+                    "hashes": hashes[i : i + BANANO_MAX_BATCH],
+                    "json_block": "true",
+                    "include_not_found": "true",
+                }
+            )
+            blocks = data.get("blocks")
+            if isinstance(blocks, dict):
+                result.update((h, b) for h, b in blocks.items() if isinstance(b, dict))
+        return result
+
     def send(
         self,
         source_wallet: str,
@@ -130,10 +296,7 @@ class BananoClient:
         if self.dry_run:
             return "dryrun-tx"
         if self._seed:
-            from bananopie import RPC, Wallet
-
-            rpc = RPC(self.node_url)
-            wallet = Wallet(rpc, seed=self._seed, index=0)
+            wallet = self._wallet()
             # bananopie expects whole BAN (it calls whole_to_raw internally)
             ban_str = (
                 str(amount_ban) if amount_ban is not None else str(self.raw_to_ban(amount_raw))
@@ -170,24 +333,52 @@ class BananoClient:
     def receive_all_pending(self, account: str | None = None) -> int:
         """Pocket all receivable (pending) blocks for the operator wallet.
 
-        Uses bananopie Wallet.receive_all() when a seed is available.
-        Returns the number of blocks received, or 0 on dry-run / error.
+        Same as bananopie's Wallet.receive_all() (up to 20 blocks), except the
+        sent blocks are looked up with one ``blocks_info`` call instead of one
+        ``block_info`` per block. Returns the number of blocks received, or 0
+        on dry-run; on error, the blocks received before it.
         """
         if self.dry_run:
             return 0
         if not self._seed or not account:
             return 0
+        received = 0
         try:
-            from bananopie import RPC, Wallet
-
-            rpc = RPC(self.node_url)
-            wallet = Wallet(rpc, seed=self._seed, index=0)
-            result = wallet.receive_all()
-            if isinstance(result, list):
-                return len(result)
-            return 1 if result else 0
+            hashes = list(self._wallet().get_receivable(count=20).get("blocks") or [])
+            if not hashes:
+                return 0
+            wallet = self._wallet(block_info=self.blocks_info(hashes))
+            for block_hash in hashes:
+                wallet.receive_specific(block_hash)
+                received += 1
         except Exception:
-            return 0
+            return received
+        return received
+
+    def account_history(
+        self,
+        account: str,
+        *,
+        head: str | None = None,
+        count: int = 500,
+        reverse: bool = True,
+    ) -> list[dict[str, Any]]:
+        """One page of ``account_history``.
+
+        With ``reverse`` (default) blocks come oldest first, starting just after
+        ``head`` or at the open block; otherwise newest first. A page shorter
+        than ``count`` is the last one. Dry-run returns an empty list.
+        """
+        if self.dry_run:
+            return []
+        payload: dict[str, Any] = {"action": "account_history", "account": account}
+        payload["count"] = str(count)
+        if reverse:
+            payload["reverse"] = "true"
+        if head:
+            payload.update(head=head, offset="1")  # skip head itself: already processed
+        history = self._post(payload).get("history") or []  # nodes send "" when empty
+        return history if isinstance(history, list) else []
 
     def get_receivable_blocks(self, account: str, count: int = 100) -> list[dict[str, Any]]:
         """List pending/receivable blocks with sender and amount info.
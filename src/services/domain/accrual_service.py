@@ -8,6 +8,7 @@ from math import floor
 from sqlalchemy.orm import Session
 
 from ...models.models import RewardAccrual, User
+from ...models.types import BAN_QUANTUM
 from ..fortnite_service import FortniteService
 from .hodl_boost_service import get_multiplier_for_balance
 
@@ -67,11 +68,9 @@ class AccrualService:
         hodl_mult = get_multiplier_for_balance(jpmt_balance)
         if hodl_mult != 1.0:
             per_kill = (per_kill * Decimal(str(hodl_mult))).quantize(
-                Decimal("0.00000001"), rounding=ROUND_DOWN
+                BAN_QUANTUM, rounding=ROUND_DOWN
             )
-        amount = (Decimal(delta_kills) * per_kill).quantize(
-            Decimal("0.00000001"), rounding=ROUND_DOWN
-        )
+        amount = (Decimal(delta_kills) * per_kill).quantize(BAN_QUANTUM, rounding=ROUND_DOWN)
         # .first() with order_by so duplicate accrual rows (from migration
         # drift) don't crash with MultipleResultsFound. Newest wins.
         existing = (
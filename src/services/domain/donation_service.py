@@ -2,17 +2,32 @@
 
 Defines milestone tiers, sustainability factor (donate-to-leach ratio),
 and helpers for recording donations and querying faucet health.
+
+``get_economics().snapshot(session)`` returns the current
+``EconomicsSnapshot`` without touching the database in steady state: the
+running donated / paid-out totals are advanced by the donation and
+settlement events published after each commit, and fully re-summed
+(reconciled) every ``P2S_ECONOMICS_RECONCILE_SECONDS`` or when an event
+without an amount (rebuild, dedupe, demo reset) makes the deltas unknowable.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from decimal import Decimal
 
-from sqlalchemy import func, inspect
+from prometheus_client import Counter
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from src.lib import events
+from src.lib.schema_registry import schema_for
 from src.models.models import DonationLedger, Payout
+from src.services.domain.retention_service import summary_grand_totals
 
 
 @dataclass(frozen=True)
@@ -108,10 +123,8 @@ _SUSTAINABILITY_MAX = 2.0
 
 
 def _table_exists(session: Session, table_name: str) -> bool:
-    """Check if a table exists in the current database."""
-    bind = session.get_bind()
-    insp = inspect(bind)
-    return table_name in insp.get_table_names()
+    """Check if a table exists in the current database (cached per engine)."""
+    return schema_for(session.get_bind()).has_table(table_name)
 
 
 def get_total_donated(session: Session) -> Decimal:
@@ -129,7 +142,15 @@ def get_total_paid_out(session: Session) -> Decimal:
         .filter(Payout.status == "sent")
         .scalar()
     )
-    return Decimal(str(total))
+    return Decimal(str(total)) + summary_grand_totals(session).paid_ban
+
+
+def _sustainability(seed_fund: float, donated: float, paid: float) -> float:
+    inflow = seed_fund + donated
+    if paid <= 0:
+        return _SUSTAINABILITY_MAX  # no payouts yet → generous startup
+    ratio = inflow / paid
+    return max(_SUSTAINABILITY_MIN, min(_SUSTAINABILITY_MAX, ratio))
 
 
 def get_sustainability_factor(session: Session, seed_fund: float = 0) -> float:
@@ -144,11 +165,7 @@ def get_sustainability_factor(session: Session, seed_fund: float = 0) -> float:
     """
     donated = float(get_total_donated(session))
     paid = float(get_total_paid_out(session))
-    inflow = seed_fund + donated
-    if paid <= 0:
-        return _SUSTAINABILITY_MAX  # no payouts yet → generous startup
-    ratio = inflow / paid
-    return max(_SUSTAINABILITY_MIN, min(_SUSTAINABILITY_MAX, ratio))
+    return _sustainability(seed_fund, donated, paid)
 
 
 def get_current_milestone(total_donated: Decimal) -> Milestone:
@@ -170,6 +187,144 @@ def get_next_milestone(total_donated: Decimal) -> Milestone | None:
     return None
 
 
+_DEFAULT_RECONCILE_SECONDS = 300.0
+
+ECONOMICS_RECONCILES = Counter(
+    "economics_reconcile_total",
+    "Full re-sums of donation/payout totals",
+    ["result"],  # initial | match | drift | invalidated
+)
+
+
+@dataclass(frozen=True)
+class EconomicsSnapshot:
+    """Faucet economics at one point in time; derived fields are precomputed."""
+
+    seed_fund: float
+    base_rate: float
+    total_donated: Decimal
+    total_paid_out: Decimal
+    reconciled_at: float
+    milestone: Milestone = field(init=False)
+    next_milestone: Milestone | None = field(init=False)
+    sustainability_factor: float = field(init=False)
+    effective_rate: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        milestone = get_current_milestone(self.total_donated)
+        sustainability = _sustainability(
+            self.seed_fund, float(self.total_donated), float(self.total_paid_out)
+        )
+        object.__setattr__(self, "milestone", milestone)
+        object.__setattr__(self, "next_milestone", get_next_milestone(self.total_donated))
+        object.__setattr__(self, "sustainability_factor", sustainability)
+        object.__setattr__(
+            self,
+            "effective_rate",
+            round(self.base_rate * milestone.payout_multiplier * sustainability, 4),
+        )
+
+    def advanced(self, donated: Decimal, paid_out: Decimal) -> EconomicsSnapshot:
+        return EconomicsSnapshot(
+            seed_fund=self.seed_fund,
+            base_rate=self.base_rate,
+            total_donated=self.total_donated + donated,
+            total_paid_out=self.total_paid_out + paid_out,
+            reconciled_at=self.reconciled_at,
+        )
+
+
+class EconomicsCache:
+    """Running donation / payout totals, re-summed only on reconcile."""
+
+    def __init__(
+        self,
+        reconcile_seconds: float = _DEFAULT_RECONCILE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._reconcile_seconds = reconcile_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot: EconomicsSnapshot | None = None
+        self._dirty = False
+
+    def snapshot(self, session: Session) -> EconomicsSnapshot:
+        """Current economics; hits the database only when a reconcile is due."""
+        snap = self._snapshot
+        if (
+            snap is None
+            or self._dirty
+            or self._clock() - snap.reconciled_at >= self._reconcile_seconds
+        ):
+            return self.reconcile(session)
+        return snap
+
+    def reconcile(self, session: Session) -> EconomicsSnapshot:
+        """Re-sum the ledgers and replace the running totals."""
+        from src.lib.config import get_config
+
+        payout_cfg = get_config().payout
+        fresh = EconomicsSnapshot(
+            seed_fund=payout_cfg.seed_fund_ban,
+            base_rate=payout_cfg.payout_amount_ban_per_kill,
+            total_donated=get_total_donated(session),
+            total_paid_out=get_total_paid_out(session),
+            reconciled_at=self._clock(),
+        )
+        with self._lock:
+            prev, dirty = self._snapshot, self._dirty
+            self._snapshot, self._dirty = fresh, False
+        if prev is None:
+            result = "initial"
+        elif dirty:
+            result = "invalidated"
+        elif (prev.total_donated, prev.total_paid_out) == (
+            fresh.total_donated,
+            fresh.total_paid_out,
+        ):
+            result = "match"
+        else:
+            result = "drift"
+        ECONOMICS_RECONCILES.labels(result=result).inc()
+        return fresh
+
+    def apply(self, donated: Decimal = Decimal("0"), paid_out: Decimal = Decimal("0")) -> None:
+        """Advance the running totals by committed amounts."""
+        with self._lock:
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.advanced(donated, paid_out)
+
+    def invalidate(self) -> None:
+        """Force the next ``snapshot()`` to reconcile."""
+        self._dirty = True
+
+    def on_event(self, event: events.Event) -> None:
+        if event.topic == events.TOPIC_DONATION and "donated_ban" in event.payload:
+            self.apply(donated=Decimal(str(event.payload["donated_ban"])))
+        elif event.topic == events.TOPIC_SETTLEMENT and "paid_out_ban" in event.payload:
+            self.apply(paid_out=Decimal(str(event.payload["paid_out_ban"])))
+        elif event.topic in (events.TOPIC_DONATION, events.TOPIC_SETTLEMENT):
+            self.invalidate()
+
+
+# Economics snapshot built on first use, then kept current by donation/settlement events.
+class _State:
+    economics: EconomicsCache | None = None
+
+
+def get_economics() -> EconomicsCache:
+    """Process-wide economics cache, wired to the event bus on first use."""
+    if _State.economics is None:
+        _State.economics = EconomicsCache(
+            reconcile_seconds=float(
+                os.getenv("P2S_ECONOMICS_RECONCILE_SECONDS", str(_DEFAULT_RECONCILE_SECONDS))
+            )
+        )
+        events.subscribe(events.TOPIC_DONATION, _State.economics.on_event)
+        events.subscribe(events.TOPIC_SETTLEMENT, _State.economics.on_event)
+    return _State.economics
+
+
 def record_donation(  # noqa: PLR0913
     session: Session,
     amount_ban: Decimal,
@@ -195,6 +350,37 @@ def record_donation(  # noqa: PLR0913
     return entry
 
 
+def announce_donations(session: Session, donations: list[dict[str, object]], source: str) -> None:
+    """Publish committed donations, plus a milestone event if one was crossed.
+
+    Call after ``session.commit()``; ``donations`` holds ``amount_ban`` and
+    ``sender_address`` for each recorded entry.
+    """
+    if not donations:
+        return
+    total = get_total_donated(session)
+    added = sum((Decimal(str(d.get("amount_ban") or 0)) for d in donations), Decimal("0"))
+    before = get_current_milestone(total - added)
+    after = get_current_milestone(total)
+    events.publish(
+        events.TOPIC_DONATION,
+        source=source,
+        donated_ban=float(added),
+        donations=donations[: events.MAX_EVENT_ROWS],
+        total_donated=float(total),
+        current_milestone=after.name,
+    )
+    if after.threshold > before.threshold:
+        events.publish(
+            events.TOPIC_MILESTONE,
+            name=after.name,
+            emoji=after.emoji,
+            description=after.description,
+            threshold=after.threshold,
+            payout_multiplier=after.payout_multiplier,
+        )
+
+
 def get_donation_leaderboard(session: Session, limit: int = 50) -> list[dict[str, object]]:
     """Return top donors grouped by sender_address, ordered by total donated."""
     if not _table_exists(session, "donation_ledger"):
@@ -230,19 +416,16 @@ def get_donation_status(session: Session) -> dict[str, object]:
     """Build the full donation status dict for the API, including faucet economics."""
     from src.lib.config import get_config
 
-    app_cfg = get_config()
-    payout_cfg = app_cfg.payout
-    seed_fund = payout_cfg.seed_fund_ban
-    base_rate = payout_cfg.payout_amount_ban_per_kill
-
-    total = get_total_donated(session)
-    total_paid = get_total_paid_out(session)
-    current = get_current_milestone(total)
-    nxt = get_next_milestone(total)
-    total_f = float(total)
-    total_paid_f = float(total_paid)
-    sustainability = get_sustainability_factor(session, seed_fund)
-    effective_rate = round(base_rate * current.payout_multiplier * sustainability, 4)
+    payout_cfg = get_config().payout
+    econ = get_economics().snapshot(session)
+    seed_fund = econ.seed_fund
+    base_rate = econ.base_rate
+    current = econ.milestone
+    nxt = econ.next_milestone
+    total_f = float(econ.total_donated)
+    total_paid_f = float(econ.total_paid_out)
+    sustainability = econ.sustainability_factor
+    effective_rate = econ.effective_rate
 
     milestones_list = []
     for m in MILESTONES:
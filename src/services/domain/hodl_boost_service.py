@@ -1,14 +1,22 @@
 """HODL boost service for Solana SPL token holders.
 
-Defines HODL tiers with payout multipliers and provides helpers
-to query on-chain token balances and compute boost levels.
+Defines HODL tiers with payout multipliers, computes boost levels, and
+queries on-chain token balances through a shared ``SolanaRpcClient``.
 """
 
 from __future__ import annotations
 
+import os
+import random
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import Any, ClassVar
 
 import httpx
+from prometheus_client import Counter, Gauge
 
 from src.lib.observability import get_logger
 
@@ -110,20 +118,12 @@ def tiers_as_dicts() -> list[dict[str, object]]:
     ]
 
 
-def fetch_spl_token_balance(
-    wallet_address: str,
-    token_mint: str,
-    rpc_url: str = "https://api.mainnet-beta.solana.com",
-    timeout: float = 10.0,
-) -> int:
-    """Query Solana RPC for the SPL token balance of a wallet.
-
-    Returns the integer token amount (UI amount, accounting for decimals).
-    Returns 0 on any error (network, bad address, no token account, etc.).
-    """
-    payload = {
+def _token_accounts_request(
+    request_id: int, wallet_address: str, token_mint: str
+) -> dict[str, Any]:
+    return {
         "jsonrpc": "2.0",
-        "id": 1,
+        "id": request_id,
         "method": "getTokenAccountsByOwner",
         "params": [
             wallet_address,
@@ -131,30 +131,199 @@ def fetch_spl_token_balance(
             {"encoding": "jsonParsed"},
         ],
     }
-    try:
-        with httpx.Client(timeout=timeout) as client:
-            resp = client.post(rpc_url, json=payload)
-            data = resp.json()
-        accounts = data.get("result", {}).get("value", [])
-        total = 0
-        for acct in accounts:
-            info = acct.get("account", {}).get("data", {}).get("parsed", {}).get("info", {})
-            token_amount = info.get("tokenAmount", {})
-            # uiAmount is the human-readable value (already divided by decimals)
-            ui_amount = token_amount.get("uiAmount")
-            if ui_amount is not None:
-                total += int(ui_amount)
-        log.info(
-            "spl_balance_fetched",
-            wallet=wallet_address[:8] + "...",
-            mint=token_mint[:8] + "...",
-            balance=total,
+
+
+def _sum_ui_amounts(result: dict[str, Any]) -> int:
+    """Total whole-token balance over the token accounts in a getTokenAccountsByOwner result."""
+    total = 0
+    for acct in result.get("value", []):
+        info = acct.get("account", {}).get("data", {}).get("parsed", {}).get("info", {})
+        token_amount = info.get("tokenAmount", {})
+        # uiAmount is the human-readable value (already divided by decimals)
+        ui_amount = token_amount.get("uiAmount")
+        if ui_amount is not None:
+            total += int(ui_amount)
+    return total
+
+
+SOLANA_RPC_CALLS = Counter("solana_rpc_calls_total", "Solana JSON-RPC POSTs by outcome", ["result"])
+SOLANA_RPC_CIRCUIT_OPEN = Gauge(
+    "solana_rpc_circuit_open", "1 while the Solana RPC circuit breaker is open"
+)
+
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class SolanaRpcError(RuntimeError):
+    """A Solana RPC call failed after retries, ran out of time, or the circuit is open."""
+
+
+@dataclass(frozen=True)
+class SolanaRpcPolicy:
+    """Limits for ``SolanaRpcClient``; the defaults suit the public mainnet endpoint."""
+
+    deadline_seconds: float = 8.0  # whole call, retries included
+    max_concurrency: int = 4
+    max_retries: int = 2
+    backoff_base: float = 0.25
+    failure_threshold: int = 5  # consecutive failed calls before the circuit opens
+    reset_seconds: float = 30.0  # open -> half-open (one trial call)
+
+    @classmethod
+    def from_env(cls) -> SolanaRpcPolicy:
+        return cls(
+            deadline_seconds=float(os.getenv("P2S_SOLANA_RPC_DEADLINE_SECONDS", "8")),
+            max_concurrency=max(int(os.getenv("P2S_SOLANA_RPC_CONCURRENCY", "4")), 1),
         )
-        return total
-    except Exception as exc:
-        log.warning(
-            "spl_balance_fetch_failed",
-            wallet=wallet_address[:8] + "...",
-            error=str(exc),
+
+
+class SolanaRpcClient:
+    """Shared Solana JSON-RPC client for the HODL scan and ``/me/verify-solana``.
+
+    One pooled ``httpx.Client`` (keep-alive) serves every call. At most
+    ``max_concurrency`` POSTs are in flight, each call has a deadline that
+    covers its jittered retries, and after ``failure_threshold`` failed calls
+    in a row the circuit opens: calls fail fast for ``reset_seconds`` instead
+    of each waiting out a timeout against a degraded endpoint.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        policy: SolanaRpcPolicy | None = None,
+        *,
+        client: httpx.Client | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rpc_url = rpc_url
+        self.policy = policy or SolanaRpcPolicy()
+        slots = max(self.policy.max_concurrency, 1)
+        self._http = client or httpx.Client(
+            timeout=self.policy.deadline_seconds,
+            limits=httpx.Limits(max_connections=slots, max_keepalive_connections=slots),
         )
-        return 0
+        self._slots = threading.BoundedSemaphore(slots)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+
+    # --- circuit breaker ---
+    @property
+    def circuit_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if self._clock() - self._opened_at < self.policy.reset_seconds or self._trial_in_flight:
+                SOLANA_RPC_CALLS.labels(result="rejected").inc()
+                raise SolanaRpcError("Solana RPC circuit open")
+            self._trial_in_flight = True  # half-open: let this one call probe
+
+    def _record(self, ok: bool) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+            if ok:
+                self._failures, self._opened_at = 0, None
+            else:
+                self._failures += 1
+                if self._opened_at is not None or self._failures >= self.policy.failure_threshold:
+                    self._opened_at = self._clock()
+                    log.warning("solana_rpc_circuit_open", failures=self._failures)
+            SOLANA_RPC_CIRCUIT_OPEN.set(1 if self._opened_at is not None else 0)
+
+    # --- calls ---
+    def call(self, payload: dict[str, Any] | list[dict[str, Any]]) -> Any:
+        """POST one JSON-RPC request or batch and return the decoded reply."""
+        self._admit()
+        deadline = self._clock() + self.policy.deadline_seconds
+        error = "no attempt"
+        for attempt in range(self.policy.max_retries + 1):
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            try:
+                with self._slots:
+                    resp = self._http.post(self.rpc_url, json=payload, timeout=remaining)
+                if resp.status_code not in _RETRYABLE_STATUS:
+                    resp.raise_for_status()
+                    reply = resp.json()
+                    SOLANA_RPC_CALLS.labels(result="ok").inc()
+                    self._record(ok=True)
+                    return reply
+                error = f"HTTP {resp.status_code}"
+            except httpx.HTTPStatusError as exc:  # 4xx: retrying will not help
+                error = str(exc)
+                break
+            except (httpx.HTTPError, ValueError) as exc:
+                error = str(exc) or type(exc).__name__
+            SOLANA_RPC_CALLS.labels(result="retry").inc()
+            if attempt < self.policy.max_retries:
+                sleep_for = self.policy.backoff_base * (2**attempt) * (0.5 + random.random())
+                time.sleep(max(min(sleep_for, deadline - self._clock()), 0.0))
+        SOLANA_RPC_CALLS.labels(result="error").inc()
+        self._record(ok=False)
+        raise SolanaRpcError(f"Solana RPC failed: {error}")
+
+    def token_balance(self, wallet_address: str, token_mint: str) -> int:
+        """Whole-token balance of one wallet; raises ``SolanaRpcError`` when unknown."""
+        reply = self.call(_token_accounts_request(1, wallet_address, token_mint))
+        result = reply.get("result") if isinstance(reply, dict) else None
+        if not isinstance(result, dict):
+            raise SolanaRpcError(f"Solana RPC error: {str(reply)[:200]}")
+        return _sum_ui_amounts(result)
+
+    def token_balances(
+        self, wallet_addresses: list[str], token_mint: str, *, batch_size: int = 100
+    ) -> dict[str, int | None]:
+        """Balances for many wallets via concurrent JSON-RPC batch requests.
+
+        Wallets whose lookup failed map to ``None`` so callers keep the old value.
+        """
+        step = max(batch_size, 1)
+        chunks = [wallet_addresses[i : i + step] for i in range(0, len(wallet_addresses), step)]
+        balances: dict[str, int | None] = {}
+        if not chunks:
+            return balances
+        workers = min(len(chunks), self.policy.max_concurrency)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="solana-rpc") as pool:
+            for part in pool.map(lambda c: self._batch_balances(c, token_mint), chunks):
+                balances.update(part)
+        return balances
+
+    def _batch_balances(self, chunk: list[str], token_mint: str) -> dict[str, int | None]:
+        payload = [_token_accounts_request(i, w, token_mint) for i, w in enumerate(chunk)]
+        try:
+            replies = self.call(payload)
+            if not isinstance(replies, list):  # whole batch rejected
+                raise SolanaRpcError(str(replies.get("error", replies))[:200])
+        except SolanaRpcError as exc:
+            log.warning("spl_balance_batch_failed", wallets=len(chunk), error=str(exc))
+            return dict.fromkeys(chunk, None)
+        by_id = {r.get("id"): r for r in replies if isinstance(r, dict)}
+        balances: dict[str, int | None] = {}
+        for i, wallet in enumerate(chunk):
+            result = by_id.get(i, {}).get("result")
+            balances[wallet] = _sum_ui_amounts(result) if isinstance(result, dict) else None
+        return balances
+
+    def close(self) -> None:
+        self._http.close()
+
+
+class _State:
+    clients: ClassVar[dict[str, SolanaRpcClient]] = {}
+    lock = threading.Lock()
+
+
+def get_solana_client(rpc_url: str) -> SolanaRpcClient:
+    """Process-wide client per endpoint, so the scan and the API share pool and breaker."""
+    with _State.lock:
+        client = _State.clients.get(rpc_url)
+        if client is None:
+            client = _State.clients[rpc_url] = SolanaRpcClient(rpc_url, SolanaRpcPolicy.from_env())
+        return client
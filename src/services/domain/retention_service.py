@@ -0,0 +1,384 @@
+"""Data retention: roll old rows into daily summaries, archive them, delete in batches.
+
+Eligible rows (all older than the retention cutoff):
+
+* sent payouts whose linked accruals are all old too and not underpaid
+  (``repair_underpaid_accruals`` must see those first); the payout and its
+  accruals are removed together so no live accrual is left pointing at a
+  deleted payout (``ondelete=SET NULL`` would turn it into an "orphan" that
+  ``repair_orphaned_accruals`` pays again)
+* ``verification_records`` except each user's latest record (``/me/status``)
+* ``admin_audit``
+
+Accrual and payout amounts are folded into ``user_daily_summaries`` in the same
+transaction as the delete, so all-time totals read through
+``user_summary_totals`` / ``summary_totals_subquery`` stay exact. Raw rows are
+appended to gzip NDJSON files under the archive directory before each batch's
+delete commits (at-least-once: a failed commit can leave a row archived twice).
+
+Each batch is its own short transaction, optionally followed by a pause, so
+the writer lock is never held for long.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import time
+from collections import defaultdict
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Final, cast
+
+from sqlalchemy import Subquery, Table, and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.lib.observability import get_logger
+
+from ...models.models import AdminAudit, Payout, RewardAccrual, UserDailySummary, VerificationRecord
+
+log = get_logger(__name__)
+
+# Cap windows look back 7 days over raw accrual/payout rows; never prune inside them.
+MIN_RETENTION_DAYS: Final[int] = 8
+DEFAULT_RETENTION_DAYS: Final[int] = 90
+DEFAULT_BATCH_SIZE: Final[int] = 500
+DEFAULT_ARCHIVE_DIR: Final[str] = "archive"
+
+_payouts = cast(Table, Payout.__table__)
+_accruals = cast(Table, RewardAccrual.__table__)
+_verifications = cast(Table, VerificationRecord.__table__)
+_audit = cast(Table, AdminAudit.__table__)
+
+
+@dataclass(frozen=True)
+class SummaryTotals:
+    kills: int = 0
+    accrued_ban: Decimal = Decimal("0")
+    paid_ban: Decimal = Decimal("0")
+
+
+def summary_totals_subquery(db: Session) -> Subquery:
+    """Per-user (user_id, kills, accrued_ban, paid_ban) over archived history."""
+    return (
+        db.query(
+            UserDailySummary.user_id,
+            func.sum(UserDailySummary.kills).label("kills"),
+            func.sum(UserDailySummary.accrued_ban).label("accrued_ban"),
+            func.sum(UserDailySummary.paid_ban).label("paid_ban"),
+        )
+        .group_by(UserDailySummary.user_id)
+        .subquery()
+    )
+
+
+def _totals(db: Session, *criteria: ColumnElement[bool]) -> SummaryTotals:
+    kills, accrued, paid = (
+        db.query(
+            func.coalesce(func.sum(UserDailySummary.kills), 0),
+            func.coalesce(func.sum(UserDailySummary.accrued_ban), 0),
+            func.coalesce(func.sum(UserDailySummary.paid_ban), 0),
+        )
+        .filter(*criteria)
+        .one()
+    )
+    return SummaryTotals(int(kills), Decimal(str(accrued)), Decimal(str(paid)))
+
+
+def user_summary_totals(db: Session, user_id: int) -> SummaryTotals:
+    """Archived totals for one user (add to live accrual / payout sums)."""
+    return _totals(db, UserDailySummary.user_id == user_id)
+
+
+def summary_grand_totals(db: Session) -> SummaryTotals:
+    """Archived totals across all users."""
+    return _totals(db)
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    retention_days: int = DEFAULT_RETENTION_DAYS
+    batch_size: int = DEFAULT_BATCH_SIZE
+    pause_seconds: float = 0.0
+    archive_dir: Path = Path(DEFAULT_ARCHIVE_DIR)
+
+    def __post_init__(self) -> None:
+        if self.retention_days < MIN_RETENTION_DAYS:
+            raise ValueError(f"retention_days must be >= {MIN_RETENTION_DAYS}")
+        if self.batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+
+    @classmethod
+    def from_env(cls, retention_days: int | None = None) -> RetentionPolicy:
+        days = retention_days or int(os.getenv("P2S_RETENTION_DAYS", str(DEFAULT_RETENTION_DAYS)))
+        return cls(
+            retention_days=days,
+            batch_size=int(os.getenv("P2S_RETENTION_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))),
+            pause_seconds=float(os.getenv("P2S_RETENTION_PAUSE_SECONDS", "0")),
+            archive_dir=Path(os.getenv("P2S_ARCHIVE_DIR", DEFAULT_ARCHIVE_DIR)),
+        )
+
+
+@dataclass
+class RetentionReport:
+    cutoff: datetime
+    dry_run: bool
+    archived: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    summary_rows: int = 0
+    batches: int = 0
+    files: set[str] = field(default_factory=set)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "cutoff": self.cutoff.isoformat(),
+            "dry_run": self.dry_run,
+            "archived": dict(self.archived),
+            "summary_rows": self.summary_rows,
+            "batches": self.batches,
+            "files": sorted(self.files),
+        }
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime | date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"not JSON serializable: {type(value).__name__}")
+
+
+class NdjsonArchive:
+    """Appends rows to ``<root>/<table>/<run_id>.ndjson.gz`` (one gzip member per batch)."""
+
+    def __init__(self, root: Path, run_id: str) -> None:
+        self.root = root
+        self.run_id = run_id
+
+    def write(self, table: str, rows: Sequence[Mapping[Any, Any]]) -> Path:
+        path = self.root / table / f"{self.run_id}.ndjson.gz"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as fh:
+            for row in rows:
+                fh.write(json.dumps(dict(row), default=_json_default, sort_keys=True) + "\n")
+        return path
+
+
+def _day(value: datetime) -> date:
+    return value.date()
+
+
+@dataclass
+class _Bucket:
+    kills: int = 0
+    accrued_ban: Decimal = Decimal("0")
+    accrual_count: int = 0
+    paid_ban: Decimal = Decimal("0")
+    payout_count: int = 0
+
+
+class RetentionJob:
+    def __init__(
+        self,
+        session: Session,
+        policy: RetentionPolicy,
+        *,
+        now: Callable[[], datetime] = lambda: datetime.now(UTC),
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.session = session
+        self.policy = policy
+        # Timestamps are stored naive UTC (server_default=now()).
+        self.cutoff = (now() - timedelta(days=policy.retention_days)).replace(tzinfo=None)
+        self._sleep = sleep
+        self._archive = NdjsonArchive(policy.archive_dir, now().strftime("%Y%m%dT%H%M%SZ"))
+
+    # --- eligibility -------------------------------------------------------
+
+    def _payout_filter(self) -> ColumnElement[bool]:
+        linked = _accruals.c.payout_id == _payouts.c.id
+        linked_sum = select(func.coalesce(func.sum(_accruals.c.amount_ban), 0)).where(linked)
+        newest_linked = select(func.max(_accruals.c.created_at)).where(linked)
+        return and_(
+            _payouts.c.status == "sent",
+            _payouts.c.created_at < self.cutoff,
+            linked_sum.scalar_subquery() <= _payouts.c.amount_ban,
+            or_(
+                newest_linked.scalar_subquery().is_(None),
+                newest_linked.scalar_subquery() < self.cutoff,
+            ),
+        )
+
+    def _verification_filter(self) -> ColumnElement[bool]:
+        latest = select(func.max(_verifications.c.id)).group_by(_verifications.c.user_id)
+        return and_(_verifications.c.created_at < self.cutoff, _verifications.c.id.not_in(latest))
+
+    def _audit_filter(self) -> ColumnElement[bool]:
+        return _audit.c.created_at < self.cutoff
+
+    # --- run ---------------------------------------------------------------
+
+    def run(self, dry_run: bool = False) -> RetentionReport:
+        report = RetentionReport(cutoff=self.cutoff, dry_run=dry_run)
+        log.info("retention_start", cutoff=self.cutoff.isoformat(), dry_run=dry_run)
+        if dry_run:
+            self._count(report)
+        else:
+            self._drain(report, self._payout_batch)
+            self._drain(
+                report, lambda r: self._plain_batch(r, _verifications, self._verification_filter())
+            )
+            self._drain(report, lambda r: self._plain_batch(r, _audit, self._audit_filter()))
+        log.info("retention_complete", **report.as_dict())
+        return report
+
+    def _count(self, report: RetentionReport) -> None:
+        db = self.session
+        payout_ids = select(_payouts.c.id).where(self._payout_filter())
+        report.archived["payouts"] = (
+            db.scalar(select(func.count()).select_from(payout_ids.subquery())) or 0
+        )
+        report.archived["reward_accruals"] = (
+            db.scalar(
+                select(func.count())
+                .select_from(_accruals)
+                .where(_accruals.c.payout_id.in_(payout_ids))
+            )
+            or 0
+        )
+        for table, criteria in (
+            (_verifications, self._verification_filter()),
+            (_audit, self._audit_filter()),
+        ):
+            report.archived[table.name] = (
+                db.scalar(select(func.count()).select_from(table).where(criteria)) or 0
+            )
+
+    def _drain(self, report: RetentionReport, batch: Callable[[RetentionReport], int]) -> None:
+        while batch(report):
+            report.batches += 1
+            if self.policy.pause_seconds:
+                self._sleep(self.policy.pause_seconds)
+
+    def _write(
+        self, report: RetentionReport, table: str, rows: Sequence[Mapping[Any, Any]]
+    ) -> None:
+        if rows:
+            report.files.add(str(self._archive.write(table, rows)))
+            report.archived[table] += len(rows)
+
+    def _payout_batch(self, report: RetentionReport) -> int:
+        db = self.session
+        ids = list(
+            db.scalars(
+                select(_payouts.c.id)
+                .where(self._payout_filter())
+                .order_by(_payouts.c.id)
+                .limit(self.policy.batch_size)
+            )
+        )
+        if not ids:
+            return 0
+        payouts = db.execute(select(_payouts).where(_payouts.c.id.in_(ids))).mappings().all()
+        accruals = (
+            db.execute(select(_accruals).where(_accruals.c.payout_id.in_(ids))).mappings().all()
+        )
+        buckets: dict[tuple[int, date], _Bucket] = defaultdict(_Bucket)
+        for a in accruals:
+            b = buckets[(a["user_id"], _day(a["created_at"]))]
+            b.kills += int(a["kills"])
+            b.accrued_ban += Decimal(str(a["amount_ban"]))
+            b.accrual_count += 1
+        for p in payouts:
+            b = buckets[(p["user_id"], _day(p["created_at"]))]
+            b.paid_ban += Decimal(str(p["amount_ban"]))
+            b.payout_count += 1
+        try:
+            report.summary_rows += self._merge_summaries(buckets)
+            self._write(report, "reward_accruals", accruals)
+            self._write(report, "payouts", payouts)
+            db.execute(delete(_accruals).where(_accruals.c.id.in_([a["id"] for a in accruals])))
+            db.execute(delete(_payouts).where(_payouts.c.id.in_(ids)))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(ids)
+
+    def _merge_summaries(self, buckets: Mapping[tuple[int, date], _Bucket]) -> int:
+        db = self.session
+        existing = {
+            (s.user_id, s.day): s
+            for s in db.scalars(
+                select(UserDailySummary).where(
+                    UserDailySummary.user_id.in_({k[0] for k in buckets}),
+                    UserDailySummary.day.in_({k[1] for k in buckets}),
+                )
+            )
+        }
+        for (user_id, day), b in buckets.items():
+            row = existing.get((user_id, day))
+            if row is None:
+                row = UserDailySummary(
+                    user_id=user_id,
+                    day=day,
+                    kills=0,
+                    accrued_ban=Decimal("0"),
+                    accrual_count=0,
+                    paid_ban=Decimal("0"),
+                    payout_count=0,
+                )
+                db.add(row)
+            row.kills += b.kills
+            row.accrued_ban = Decimal(str(row.accrued_ban)) + b.accrued_ban
+            row.accrual_count += b.accrual_count
+            row.paid_ban = Decimal(str(row.paid_ban)) + b.paid_ban
+            row.payout_count += b.payout_count
+        return len(buckets)
+
+    def _plain_batch(
+        self, report: RetentionReport, table: Table, criteria: ColumnElement[bool]
+    ) -> int:
+        db = self.session
+        rows = (
+            db.execute(
+                select(table).where(criteria).order_by(table.c.id).limit(self.policy.batch_size)
+            )
+            .mappings()
+            .all()
+        )
+        if not rows:
+            return 0
+        try:
+            self._write(report, table.name, rows)
+            db.execute(delete(table).where(table.c.id.in_([r["id"] for r in rows])))
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return len(rows)
+
+
+def run_retention(
+    session: Session, policy: RetentionPolicy, *, dry_run: bool = False
+) -> RetentionReport:
+    """Apply ``policy`` once; with ``dry_run`` only count what would be archived."""
+    return RetentionJob(session, policy).run(dry_run=dry_run)
+
+
+__all__ = [
+    "MIN_RETENTION_DAYS",
+    "NdjsonArchive",
+    "RetentionJob",
+    "RetentionPolicy",
+    "RetentionReport",
+    "SummaryTotals",
+    "run_retention",
+    "summary_grand_totals",
+    "summary_totals_subquery",
+    "user_summary_totals",
+]
@@ -9,6 +9,7 @@ from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from ...models.models import RewardAccrual, User
+from ...models.types import BAN_QUANTUM
 
 
 @dataclass
@@ -107,8 +108,8 @@ class SettlementService:
 
         # Scale BAN proportionally if capped below total
         if allowed_kills < candidate.total_kills and candidate.total_kills > 0:
-            ratio = Decimal(str(allowed_kills)) / Decimal(str(candidate.total_kills))
-            payable_ban = (candidate.total_amount_ban * ratio).quantize(Decimal("0.00000001"))
+            ratio = Decimal(allowed_kills) / Decimal(candidate.total_kills)
+            payable_ban = (candidate.total_amount_ban * ratio).quantize(BAN_QUANTUM)
         else:
             payable_ban = candidate.total_amount_ban
 
@@ -78,6 +78,26 @@ class FortniteService:
         self._concurrency_limit = max(concurrency_limit, 1)
         self._in_flight = 0
 
+    def shard_kwargs(self, shards: int) -> dict[str, Any]:
+        """Constructor kwargs for one of ``shards`` services that split this rate budget.
+
+        Sharded accrual builds one service per worker process from these, so the
+        workers together stay within the configured per-minute quota.
+        """
+        shards = max(shards, 1)
+        return {
+            "api_key": self.api_key,
+            "base_url": self.base_url,
+            "per_minute_limit": max(self.per_minute_limit // shards, 1),
+            "dry_run": self._dry_run,
+            "max_retries": self._max_retries,
+            "backoff_base": self._backoff_base,
+            "auth_header_name": self._auth_header_name,
+            "auth_scheme": self._auth_scheme,
+            "concurrency_limit": max(self._concurrency_limit // shards, 1),
+            "adaptive": self._adaptive,
+        }
+
     # --- Rate limiting helpers ---
     def _refill(self) -> None:
         now = time.monotonic()
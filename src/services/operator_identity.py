@@ -0,0 +1,188 @@
+"""Operator wallet identity (seed, public key, address) kept in memory.
+
+The operator seed lives encrypted in ``SecureConfig``. Donate info, admin
+stats, donation rebuild, payout retry and every settlement/receive run used to
+query it, Fernet-decrypt it and often derive the address (Ed25519-Blake2b) on
+each call. ``OperatorIdentityCache`` does that once and serves the decrypted
+``OperatorIdentity`` from memory.
+
+The cache is dropped in-process when ``/admin/config/operator-seed`` writes a
+new seed (the scheduler drops its own on the reload command that write
+queues). As a backstop the newest row's ciphertext is compared at most every
+``P2S_OPERATOR_IDENTITY_CHECK_SECONDS`` (default 60s), and re-decrypted only
+if it changed. A missing or undecryptable seed is never cached, so a seed
+configured elsewhere is picked up on the next call.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Final
+
+from prometheus_client import Counter
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from src.lib.crypto import decrypt_value
+from src.lib.observability import get_logger
+from src.models.models import SecureConfig
+
+from .banano_client import public_key_to_address, seed_to_public_key
+
+OPERATOR_SEED_KEY: Final[str] = "operator_seed"
+_DEFAULT_CHECK_SECONDS: Final[float] = 60.0
+
+IDENTITY_LOADS = Counter(
+    "operator_identity_loads_total", "Times the operator seed was decrypted", ["reason"]
+)
+
+log = get_logger("services.operator_identity")
+
+
+@dataclass(frozen=True)
+class OperatorIdentity:
+    """Decrypted operator seed and what derives from it; ``seed`` is None if undecryptable."""
+
+    seed: str | None
+    public_key: str | None = None  # hex
+    address: str | None = None
+    set_by: str | None = None
+    updated_at: datetime | None = None
+    ciphertext: str = ""
+
+    @property
+    def configured(self) -> bool:
+        return self.seed is not None
+
+    @classmethod
+    def from_row(cls, row: SecureConfig) -> OperatorIdentity:
+        seed = decrypt_value(row.encrypted_value)
+        public_key = seed_to_public_key(seed) if seed else None
+        return cls(
+            seed=seed,
+            public_key=public_key.hex() if public_key is not None else None,
+            address=public_key_to_address(public_key) if public_key is not None else None,
+            set_by=row.set_by,
+            updated_at=row.updated_at,
+            ciphertext=row.encrypted_value,
+        )
+
+
+def _newest_seed_row(session: Session) -> SecureConfig | None:
+    # Newest row wins: duplicate rows from past alembic drift must not crash readers.
+    return session.scalars(
+        select(SecureConfig)
+        .where(SecureConfig.key == OPERATOR_SEED_KEY)
+        .order_by(SecureConfig.id.desc())
+        .limit(1)
+    ).first()
+
+
+class OperatorIdentityCache:
+    """Caches the configured ``OperatorIdentity``; safe across threads."""
+
+    def __init__(
+        self,
+        check_interval: float = _DEFAULT_CHECK_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._check_interval = check_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._identity: OperatorIdentity | None = None
+        self._next_check = 0.0
+
+    def get(self, session: Session) -> OperatorIdentity | None:
+        """Current identity, or ``None`` when no seed is stored."""
+        identity = self._identity
+        now = self._clock()
+        if identity is not None and now < self._next_check:
+            return identity
+        with self._lock:
+            return self._refresh(session, now)
+
+    def _refresh(self, session: Session, now: float) -> OperatorIdentity | None:
+        """Re-read the newest row and decrypt only if it changed; caller holds ``_lock``."""
+        if self._identity is not None and now < self._next_check:
+            return self._identity
+        row = _newest_seed_row(session)
+        if row is None:
+            self._identity = None
+            return None
+        cached = self._identity
+        if cached is not None and cached.ciphertext == row.encrypted_value:
+            self._next_check = now + self._check_interval
+            return cached
+        identity = OperatorIdentity.from_row(row)
+        IDENTITY_LOADS.labels(reason="initial" if cached is None else "changed").inc()
+        if not identity.configured:
+            log.warning("operator_seed_undecryptable", row_id=row.id)
+            self._identity = None
+            return identity
+        self._identity = identity
+        self._next_check = now + self._check_interval
+        return identity
+
+    def invalidate(self) -> None:
+        """Drop the cached identity; the next ``get()`` reads the row and decrypts again."""
+        with self._lock:
+            self._identity = None
+            self._next_check = 0.0
+
+
+# Created on first use; the admin seed write and the scheduler reload command invalidate it.
+class _State:
+    cache: OperatorIdentityCache | None = None
+
+
+def get_operator_identity_cache() -> OperatorIdentityCache:
+    """Process-wide operator identity cache."""
+    if _State.cache is None:
+        _State.cache = OperatorIdentityCache(
+            check_interval=float(
+                os.getenv("P2S_OPERATOR_IDENTITY_CHECK_SECONDS", str(_DEFAULT_CHECK_SECONDS))
+            )
+        )
+    return _State.cache
+
+
+def get_operator_identity(session: Session) -> OperatorIdentity | None:
+    """Stored operator identity (``None`` when no seed row exists)."""
+    return get_operator_identity_cache().get(session)
+
+
+def load_operator_seed(session: Session) -> str | None:
+    """Decrypted operator seed, or ``None`` when missing or undecryptable."""
+    identity = get_operator_identity(session)
+    return identity.seed if identity is not None else None
+
+
+def resolve_operator_account(session: Session) -> str | None:
+    """Operator address: ``P2S_OPERATOR_ACCOUNT``, else derived from the stored seed."""
+    account = os.getenv("P2S_OPERATOR_ACCOUNT", "")
+    if account:
+        return account
+    identity = get_operator_identity(session)
+    return identity.address if identity is not None else None
+
+
+def invalidate_operator_identity() -> None:
+    """Forget the cached identity in this process (call after the seed changes)."""
+    get_operator_identity_cache().invalidate()
+
+
+__all__ = [
+    "OPERATOR_SEED_KEY",
+    "OperatorIdentity",
+    "OperatorIdentityCache",
+    "get_operator_identity",
+    "get_operator_identity_cache",
+    "invalidate_operator_identity",
+    "load_operator_seed",
+    "resolve_operator_account",
+]
@@ -10,6 +10,9 @@ from src.lib.observability import instrument_http_call
 
 log = logging.getLogger(__name__)
 
+# Most Discord user ids Yunite accepts in one registration/links request.
+YUNITE_MAX_BATCH = 100
+
 
 class YuniteService:
     """Yunite API to resolve Epic account IDs from Discord users.
@@ -87,35 +90,44 @@ class YuniteService:
 
     def get_epic_id_for_discord(self, discord_user_id: str) -> str | None:
         """Get Epic account ID for a Discord user, or None if not found."""
+        return self.get_epic_ids_for_discord_many([discord_user_id]).get(discord_user_id)
+
+    def get_epic_ids_for_discord_many(self, discord_user_ids: list[str]) -> dict[str, str | None]:
+        """Resolve many Discord users with one request per ``YUNITE_MAX_BATCH`` ids.
+
+        Every requested id is present in the result; users that are not linked
+        or not found map to None. HTTP errors other than 404 are raised.
+        """
+        ids = list(dict.fromkeys(discord_user_ids))
         if self.dry_run:
             # Deterministic fake mapping for tests
-            return f"epic_{discord_user_id}"
-        resp = self._get_registration_links([discord_user_id])
-        if resp.status_code == HTTPStatus.NOT_FOUND:
-            return None
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Yunite API response format:
-        # {"users": [{"discord": {"id": "..."}, "epic": {"epicID": "..."}}], "notLinked": [], "notFound": []}
-        if not isinstance(data, dict):
-            log.warning("Yunite unexpected response format: %s, data: %s", type(data), data)
-            return None
-
-        # Check if user is in notLinked or notFound
-        not_linked = data.get("notLinked", [])
-        not_found = data.get("notFound", [])
-        if discord_user_id in not_linked or discord_user_id in not_found:
-            return None
-
-        # Find user in users array
-        users = data.get("users", [])
-        for user in users:
-            discord_info = user.get("discord", {})
-            if discord_info.get("id") == discord_user_id:
-                epic_info = user.get("epic", {})
-                epic_id: str | None = epic_info.get("epicID") or epic_info.get("epicId")
-                return epic_id
-
-        # User not found in response
-        return None
+            return {uid: f"epic_{uid}" for uid in ids}
+        links: dict[str, str | None] = dict.fromkeys(ids)
+        for start in range(0, len(ids), YUNITE_MAX_BATCH):
+            chunk = ids[start : start + YUNITE_MAX_BATCH]
+            resp = self._get_registration_links(chunk)
+            if resp.status_code == HTTPStatus.NOT_FOUND:
+                continue
+            resp.raise_for_status()
+            links.update(_parse_registration_links(resp.json(), chunk))
+        return links
+
+
+def _parse_registration_links(data: Any, requested: list[str]) -> dict[str, str | None]:
+    """Map requested Discord ids to Epic ids from one registration/links response.
+
+    Response format:
+    {"users": [{"discord": {"id": "..."}, "epic": {"epicID": "..."}}], "notLinked": [], "notFound": []}
+    """
+    links: dict[str, str | None] = dict.fromkeys(requested)
+    if not isinstance(data, dict):
+        log.warning("Yunite unexpected response format: %s, data: %s", type(data), data)
+        return links
+    # notLinked / notFound ids simply keep None
+    missing = set(data.get("notLinked", [])) | set(data.get("notFound", []))
+    for user in data.get("users", []):
+        discord_id = user.get("discord", {}).get("id")
+        if discord_id in links and discord_id not in missing:
+            epic_info = user.get("epic", {})
+            links[discord_id] = epic_info.get("epicID") or epic_info.get("epicId")
+    return links
@@ -10,6 +10,7 @@
   let activePromo = null;
   let refreshTimer = null;
   const REFRESH_INTERVAL = 30000; // 30s auto-refresh
+  const LIVE_POLL_EVERY = 10; // with the live stream open: every 10th tick (5 min)
 
   // ── DOM refs ─────────────────────────────────────────
   const $ = (sel) => document.querySelector(sel);
@@ -21,6 +22,7 @@
 
   // ── Init ─────────────────────────────────────────────
   async function init() {
+    await loadBootstrap();
     await loadProductConfig();
     setupNav();
     await checkExistingSession();
@@ -28,7 +30,8 @@
     // Route to current hash (or default to leaderboard)
     handleHashChange();
     window.addEventListener("hashchange", handleHashChange);
-    // Start auto-refresh
+    // Live updates for public pages; polling covers the rest (and fallback)
+    startLiveStream();
     startAutoRefresh();
   }
 
@@ -49,11 +52,29 @@
     window.location.hash = page;
   }
 
+  // One request for first paint: seeds httpCache so the loaders below
+  // render from it instead of issuing their own requests.
+  async function loadBootstrap() {
+    try {
+      const r = await fetch("/api/bootstrap", { cache: "no-store" });
+      if (!r.ok) return;
+      const b = await r.json();
+      primeHttpCache("/me/status", b.me);
+      primeHttpCache("/config/product", b.config);
+      primeHttpCache("/api/leaderboard?limit=50", b.leaderboard);
+      primeHttpCache("/api/feed?limit=" + FEED_LIMIT, b.feed);
+      primeHttpCache("/api/donations", b.donations);
+      primeHttpCache("/hodl/boosted", b.hodl_boosted);
+      primeHttpCache("/api/scheduler/countdown", b.countdown);
+      if (b.donate_info && b.donate_info.address) renderDonateInfo(b.donate_info);
+    } catch (_) { /* fall back to per-endpoint loaders */ }
+  }
+
   async function checkExistingSession() {
     try {
-      const r = await fetch("/me/status");
-      if (r.ok) {
-        const s = await r.json();
+      const res = await fetchJSONCached("/me/status");
+      if (res && res.data) {
+        const s = res.data;
         user = { discord_username: s.discord_username || "You" };
         $(".username").textContent = user.discord_username;
         return true;
@@ -64,9 +85,9 @@
 
   async function loadProductConfig() {
     try {
-      const r = await fetch("/config/product");
-      if (r.ok) {
-        productConfig = await r.json();
+      const res = await fetchJSONCached("/config/product");
+      if (res && res.data) {
+        productConfig = res.data;
         const brand = $(".brand-name");
         if (brand && productConfig.app_name) brand.textContent = productConfig.app_name;
         isDryRun = !!(productConfig.feature_flags && productConfig.feature_flags.dry_run_banner);
@@ -170,17 +191,131 @@
     if (name === "admin" && user) loadAdmin();
   }
 
+  // ── Conditional GET ──────────────────────────────────
+  // Public endpoints send ETag + Cache-Control. Keep the last body per URL,
+  // reuse it while max-age holds, then revalidate with If-None-Match so an
+  // unchanged resource costs a bodiless 304 and no re-render.
+  const httpCache = {};
+
+  function maxAgeMs(r) {
+    var m = /max-age=(\d+)/.exec(r.headers.get("Cache-Control") || "");
+    return m ? parseInt(m[1], 10) * 1000 : 0;
+  }
+
+  async function fetchJSONCached(url) {
+    var entry = httpCache[url];
+    var now = Date.now();
+    if (entry && entry.primed) {
+      entry.primed = false;
+      return { data: entry.data, changed: true };
+    }
+    if (entry && now < entry.freshUntil) return { data: entry.data, changed: false };
+    var headers = {};
+    if (entry && entry.etag) headers["If-None-Match"] = entry.etag;
+    var r = await fetch(url, { headers: headers, cache: "no-store" });
+    if (r.status === 304 && entry) {
+      entry.freshUntil = now + maxAgeMs(r);
+      return { data: entry.data, changed: false };
+    }
+    if (!r.ok) return null;
+    var data = await r.json();
+    httpCache[url] = { etag: r.headers.get("ETag"), data: data, freshUntil: now + maxAgeMs(r) };
+    return { data: data, changed: true };
+  }
+
+  // Seed an entry from /api/bootstrap; the next load of `url` renders it once.
+  function primeHttpCache(url, data) {
+    httpCache[url] = { etag: null, data: data, freshUntil: 0, primed: true };
+  }
+
+  // After a local write (demo seed, manual scheduler run) revalidate everything.
+  function expireHttpCache() {
+    Object.keys(httpCache).forEach(function (url) { httpCache[url].freshUntil = 0; });
+  }
+
   // ── Auto-refresh ───────────────────────────────────
   function startAutoRefresh() {
     if (refreshTimer) clearInterval(refreshTimer);
+    let ticks = 0;
     refreshTimer = setInterval(function () {
       const hash = window.location.hash.replace("#", "") || "activity";
       const page = ALL_PAGES.has(hash) ? hash : "activity";
       if (page === "login") return;
+      // Public pages are pushed over /api/stream while it is connected; a slow
+      // revalidation stays on in case an update never reaches this worker.
+      ticks += 1;
+      if (liveStreamOpen && LIVE_PAGES.has(page) && ticks % LIVE_POLL_EVERY !== 0) return;
       loadPageData(page);
     }, REFRESH_INTERVAL);
   }
 
+  // ── Live stream (SSE) ──────────────────────────────
+  // /api/stream pushes accrual/payout/donation/milestone events as the
+  // scheduler commits. The feed is patched in place from the event payload;
+  // leaderboard and donations revalidate (a cheap 304 / server cache hit).
+  const LIVE_PAGES = new Set(["leaderboard", "activity", "donations", "boosted"]);
+  const FEED_LIMIT = 30;
+  let liveStream = null;
+  let liveStreamOpen = false;
+  let liveReloadTimer = null;
+  let feedRows = { accruals: [], payouts: [] };
+
+  function currentPage() {
+    const hash = window.location.hash.replace("#", "") || "activity";
+    return ALL_PAGES.has(hash) ? hash : "activity";
+  }
+
+  // Coalesce bursts of events into one revalidation per second.
+  function scheduleLiveReload(pages) {
+    if (liveReloadTimer) clearTimeout(liveReloadTimer);
+    liveReloadTimer = setTimeout(function () {
+      liveReloadTimer = null;
+      expireHttpCache();
+      const page = currentPage();
+      if (pages.indexOf(page) !== -1) loadPageData(page);
+    }, 1000);
+  }
+
+  function startLiveStream() {
+    if (!window.EventSource || liveStream) return;
+    liveStream = new EventSource("/api/stream");
+    liveStream.onopen = function () { liveStreamOpen = true; };
+    liveStream.onerror = function () {
+      // EventSource reconnects (with Last-Event-ID) on its own; poll meanwhile.
+      liveStreamOpen = false;
+    };
+    liveStream.addEventListener("accrual", function (ev) {
+      var d = JSON.parse(ev.data);
+      feedRows.accruals = (d.accruals || []).concat(feedRows.accruals).slice(0, FEED_LIMIT);
+      renderFeedAccruals(feedRows.accruals);
+      scheduleLiveReload(["leaderboard"]);
+    });
+    liveStream.addEventListener("payout", function (ev) {
+      var d = JSON.parse(ev.data);
+      if (d.payouts && d.payouts.length) {
+        feedRows.payouts = d.payouts.concat(feedRows.payouts).slice(0, FEED_LIMIT);
+        renderFeedPayouts(feedRows.payouts);
+      }
+      // Settling flips accrual status and changes totals: revalidate.
+      scheduleLiveReload(["leaderboard", "activity", "donations"]);
+    });
+    liveStream.addEventListener("donation", function () {
+      scheduleLiveReload(["donations"]);
+      fetchDonateInfo();
+    });
+    liveStream.addEventListener("milestone", function (ev) {
+      var d = JSON.parse(ev.data);
+      toast((d.emoji || "") + " Milestone unlocked: " + d.name, "success");
+      scheduleLiveReload(["donations"]);
+    });
+    liveStream.addEventListener("refresh", function () {
+      scheduleLiveReload(Array.from(LIVE_PAGES));
+    });
+    liveStream.addEventListener("resync", function () {
+      scheduleLiveReload(Array.from(LIVE_PAGES));
+    });
+  }
+
   // ── Login ────────────────────────────────────────────
   window.discordLogin = function () {
     window.location.href = "/auth/discord/login";
@@ -198,6 +333,7 @@
       // Auto-seed demo data
       if (btn) btn.textContent = "Setting up demo...";
       try { await fetch("/demo/seed", { method: "POST" }); } catch (_) {}
+      expireHttpCache();
 
       toast("Logged in as " + user.discord_username, "success");
       updateNavVisibility();
@@ -212,8 +348,8 @@
   window.logout = function () {
     user = null;
     isAdmin = false;
-    document.cookie = "p2s_session=; Max-Age=0; path=/";
-    document.cookie = "p2s_admin=; Max-Age=0; path=/";
+    // Session cookies are httponly; the server clears them and revokes the token.
+    fetch("/auth/logout", { method: "POST" }).catch(() => {});
     updateNavVisibility();
     navigate("leaderboard");
   };
@@ -221,9 +357,9 @@
   // ── Leaderboard ────────────────────────────────────
   async function loadLeaderboard() {
     try {
-      const r = await fetch("/api/leaderboard?limit=50");
-      if (r.ok) {
-        const data = await r.json();
+      const res = await fetchJSONCached("/api/leaderboard?limit=50");
+      if (res && res.changed) {
+        const data = res.data;
         renderLeaderboard(data.players || [], data.caps || {});
         const countEl = $("#leaderboard-count");
         if (countEl) countEl.textContent = data.total + " players" + (activePromo ? " \u00B7 " + activePromo.emoji + " " + activePromo.multiplier + "\u00D7 promo active!" : "");
@@ -336,11 +472,12 @@
   // ── Activity Feed ──────────────────────────────────
   async function loadActivityFeed() {
     try {
-      const r = await fetch("/api/feed?limit=30");
-      if (r.ok) {
-        const data = await r.json();
-        renderFeedAccruals(data.accruals || []);
-        renderFeedPayouts(data.payouts || []);
+      const res = await fetchJSONCached("/api/feed?limit=" + FEED_LIMIT);
+      if (res && res.changed) {
+        const data = res.data;
+        feedRows = { accruals: data.accruals || [], payouts: data.payouts || [] };
+        renderFeedAccruals(feedRows.accruals);
+        renderFeedPayouts(feedRows.payouts);
       }
     } catch (_) {}
   }
@@ -392,9 +529,9 @@
   // ── Donations ────────────────────────────────────────
   async function loadDonations() {
     try {
-      var r = await fetch("/api/donations");
-      if (!r.ok) return;
-      var data = await r.json();
+      var res = await fetchJSONCached("/api/donations");
+      if (!res || !res.changed) return;
+      var data = res.data;
 
       // Thermometer
       var totalEl = $("#donation-total");
@@ -517,9 +654,9 @@
   // ── Boosted Users ────────────────────────────────────
   async function loadBoostedUsers() {
     try {
-      var r = await fetch("/hodl/boosted");
-      if (!r.ok) return;
-      var data = await r.json();
+      var res = await fetchJSONCached("/hodl/boosted");
+      if (!res || !res.changed) return;
+      var data = res.data;
       var countEl = $("#boosted-count");
       if (countEl) countEl.textContent = data.total + " boosted player" + (data.total !== 1 ? "s" : "");
       var tbody = $("#boosted-tbody");
@@ -707,10 +844,10 @@
   }
 
   // ── Pagination state ──────────────────────────────────
-  var _accrualOffset = 0;
+  var _accrualCursor = null;
   var _accrualHasMore = false;
   var _accrualLoading = false;
-  var _payoutOffset = 0;
+  var _payoutCursor = null;
   var _payoutHasMore = false;
   var _payoutLoading = false;
   var _PAGE_SIZE = 20;
@@ -719,12 +856,14 @@
     if (_accrualLoading) return;
     _accrualLoading = true;
     try {
-      if (!append) _accrualOffset = 0;
-      const r = await fetch("/me/accruals?limit=" + _PAGE_SIZE + "&offset=" + _accrualOffset);
+      if (!append) _accrualCursor = null;
+      var url = "/me/accruals?limit=" + _PAGE_SIZE;
+      if (_accrualCursor) url += "&cursor=" + encodeURIComponent(_accrualCursor);
+      const r = await fetch(url);
       if (r.ok) {
         const data = await r.json();
         _accrualHasMore = data.has_more;
-        _accrualOffset += (data.accruals || []).length;
+        _accrualCursor = data.next_cursor || null;
         renderAccruals(data.accruals || [], append);
       }
     } catch (_) {}
@@ -735,12 +874,14 @@
     if (_payoutLoading) return;
     _payoutLoading = true;
     try {
-      if (!append) _payoutOffset = 0;
-      const r = await fetch("/me/payouts?limit=" + _PAGE_SIZE + "&offset=" + _payoutOffset);
+      if (!append) _payoutCursor = null;
+      var url = "/me/payouts?limit=" + _PAGE_SIZE;
+      if (_payoutCursor) url += "&cursor=" + encodeURIComponent(_payoutCursor);
+      const r = await fetch(url);
       if (r.ok) {
         const data = await r.json();
         _payoutHasMore = data.has_more;
-        _payoutOffset += (data.payouts || []).length;
+        _payoutCursor = data.next_cursor || null;
         renderPayouts(data.payouts || [], append);
       }
     } catch (_) {}
@@ -1146,6 +1287,7 @@
       });
       if (!r.ok) throw new Error(await r.text());
       toast("Payout config updated", "success");
+      expireHttpCache();
       await loadPayoutConfig();
     } catch (e) {
       toast("Failed: " + e.message, "error");
@@ -1257,6 +1399,7 @@
       if (!r.ok) throw new Error(await r.text());
       const data = await r.json();
       toast("Seeded: " + data.summary, "success");
+      expireHttpCache();
       loadDashboard();
     } catch (e) {
       toast("Seed failed: " + e.message, "error");
@@ -1281,6 +1424,7 @@
       } else {
         toast(data.message || "No demo data to clear", "info");
       }
+      expireHttpCache();
       loadAdminStats();
     } catch (e) {
       toast("Clear failed: " + e.message, "error");
@@ -1290,6 +1434,20 @@
     }
   };
 
+  // ── Scheduler Commands ──────────────────────────────
+  // Trigger/settle return 202 with a command id; the scheduler leader runs it
+  // and writes per-phase progress back, so poll until it finishes.
+  async function awaitSchedulerCommand(id) {
+    for (;;) {
+      const r = await fetch("/admin/scheduler/commands/" + id);
+      if (!r.ok) throw new Error(await r.text());
+      const cmd = await r.json();
+      if (cmd.status === "error") throw new Error(cmd.error || "command failed");
+      if (cmd.status === "done") return cmd;
+      await new Promise(function (resolve) { setTimeout(resolve, 1000); });
+    }
+  }
+
   // ── Trigger Scheduler ────────────────────────────────
   window.triggerScheduler = async function () {
     const btn = $("#scheduler-btn") || document.querySelector('[onclick="triggerScheduler()"]');
@@ -1306,7 +1464,9 @@
       }
       if (!r.ok) throw new Error(await r.text());
       var data = await r.json();
-      toast("Scheduler: " + (data.summary || data.detail), "success");
+      if (r.status === 202) data = await awaitSchedulerCommand(data.command_id);
+      toast("Scheduler: " + (data.summary || data.detail || data.status), "success");
+      expireHttpCache();
       loadPageData(window.location.hash.replace("#", "") || "activity");
     } catch (e) {
       toast("Scheduler failed: " + e.message, "error");
@@ -1322,7 +1482,11 @@
     try {
       const r = await fetch("/admin/scheduler/settle", { method: "POST" });
       if (!r.ok) throw new Error(await r.text());
-      const data = await r.json();
+      const queued = await r.json();
+      const done = await awaitSchedulerCommand(queued.command_id);
+      const data = done.progress.settlement || {};
+      if (data.skipped_low_balance) throw new Error("operator balance too low");
+      expireHttpCache();
       toast("Settlement: " + data.candidates + " candidates, " + data.payouts + " payouts, " + data.accruals_settled + " settled", "success");
       loadPageData("admin");
     } catch (e) {
@@ -1347,9 +1511,9 @@
 
   async function fetchCountdown() {
     try {
-      const r = await fetch("/api/scheduler/countdown");
-      if (r.ok) {
-        const d = await r.json();
+      const res = await fetchJSONCached("/api/scheduler/countdown");
+      if (res && res.changed) {
+        const d = res.data;
         if (d.next_accrual_in !== null) accrualRemaining = d.next_accrual_in;
         if (d.next_settlement_in !== null) settlementRemaining = d.next_settlement_in;
         if (!countdownTimer) {
@@ -1389,7 +1553,12 @@
     try {
       var r = await fetch("/api/donate-info");
       if (!r.ok) return;
-      var d = await r.json();
+      renderDonateInfo(await r.json());
+    } catch (_) {}
+  }
+
+  function renderDonateInfo(d) {
+    try {
       if (!d.address) return;
       var bar = $("#donate-bar");
       if (!bar) return;
@@ -1397,7 +1566,7 @@
       var addrEl = $("#donate-address");
       if (addrEl) addrEl.textContent = d.address;
       var balEl = $("#donate-balance-value");
-      if (balEl && d.balance !== null) balEl.textContent = parseFloat(d.balance).toFixed(2);
+      if (balEl && d.balance !== null && d.balance !== undefined) balEl.textContent = parseFloat(d.balance).toFixed(2);
       // Render QR code
       var qrEl = $("#donate-qr");
       if (qrEl && typeof qrcode !== "undefined") {
@@ -1510,9 +1679,10 @@
 
   // ── Boot ─────────────────────────────────────────────
   document.addEventListener("DOMContentLoaded", function () {
-    init();
-    fetchCountdown();
-    fetchDonateInfo();
+    init().then(function () {
+      fetchCountdown();
+      fetchDonateInfo();
+    });
     // Re-sync countdown from server every 60s
     setInterval(fetchCountdown, 60000);
     // Re-sync donate info every 5 minutes
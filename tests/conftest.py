@@ -1,6 +1,7 @@
 import os
 import sys
 import tempfile
+from collections.abc import Iterator
 from pathlib import Path
 
 import pytest
@@ -57,3 +58,21 @@ def db_session(app) -> Session:  # type: ignore[override]
         yield session
     finally:
         session.close()
+
+
+@pytest.fixture()
+def session() -> Iterator[Session]:
+    """Fresh in-memory database with the full schema, isolated per test.
+
+    Unlike ``db_session`` (the app's shared database), nothing leaks between tests.
+    """
+    from sqlalchemy import create_engine
+
+    from src.models import models  # noqa: F401
+    from src.models.base import Base
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        yield s
+    engine.dispose()
@@ -0,0 +1,49 @@
+"""Public read routes: async handlers, cache hits without a session, read engine."""
+
+import inspect
+from http import HTTPStatus
+
+import pytest
+
+from src.api import donations, leaderboard, user
+from src.lib.response_cache import get_response_cache
+
+PUBLIC_PATHS = ("/api/leaderboard", "/api/feed", "/api/donations", "/hodl/boosted")
+
+
+def test_public_handlers_are_coroutines():
+    for handler in (
+        leaderboard.leaderboard,
+        leaderboard.activity_feed,
+        leaderboard.scheduler_countdown,
+        donations.donations,
+        user.hodl_boosted,
+        user.hodl_tiers,
+    ):
+        assert inspect.iscoroutinefunction(handler), handler.__name__
+
+
+def test_cache_hits_do_not_open_a_session(app, client, monkeypatch):
+    for path in PUBLIC_PATHS:
+        assert client.get(path).status_code == HTTPStatus.OK
+
+    def _no_db():
+        pytest.fail("cache hit opened a DB session")
+
+    monkeypatch.setattr(app.state, "session_factory", _no_db)
+    for path in PUBLIC_PATHS:
+        resp = client.get(path)
+        assert resp.status_code == HTTPStatus.OK
+        assert resp.headers["X-Cache"] == "HIT"
+
+
+def test_public_reads_use_the_read_engine(app, client, monkeypatch):
+    assert app.state.read_session_factory is not app.state.session_factory
+    get_response_cache().invalidate()
+
+    def _no_writer():
+        pytest.fail("public read used the writer engine")
+
+    monkeypatch.setattr(app.state, "session_factory", _no_writer)
+    for path in (*PUBLIC_PATHS, "/api/bootstrap"):
+        assert client.get(path).status_code == HTTPStatus.OK
@@ -0,0 +1,39 @@
+"""Contract tests for the aggregated /api/bootstrap endpoint."""
+
+from http import HTTPStatus
+
+SECTIONS = (
+    "me",
+    "countdown",
+    "config",
+    "leaderboard",
+    "feed",
+    "donations",
+    "hodl_boosted",
+    "donate_info",
+)
+
+
+def test_bootstrap_anonymous_has_every_section(client):
+    client.cookies.clear()
+    resp = client.get("/api/bootstrap")
+    assert resp.status_code == HTTPStatus.OK
+    data = resp.json()
+    for key in SECTIONS:
+        assert key in data
+    assert data["me"] is None
+    assert "players" in data["leaderboard"]
+    assert "accruals" in data["feed"]
+    assert "boosted_users" in data["hodl_boosted"]
+
+
+def test_bootstrap_sections_match_standalone_endpoints(client):
+    client.post("/auth/demo-login")
+    client.post("/demo/seed")
+    data = client.get("/api/bootstrap").json()
+    assert data["me"]["discord_username"] == "DemoPlayer"
+    assert data["me"] == client.get("/me/status").json()
+    assert data["leaderboard"] == client.get("/api/leaderboard?limit=50").json()
+    assert data["feed"] == client.get("/api/feed?limit=30").json()
+    assert data["hodl_boosted"] == client.get("/hodl/boosted").json()
+    assert data["config"] == client.get("/config/product").json()
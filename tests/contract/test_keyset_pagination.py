@@ -0,0 +1,87 @@
+"""Cursor (keyset) pagination on /me/accruals, /me/payouts and /admin/audit."""
+
+from datetime import UTC, datetime
+from decimal import Decimal
+from http import HTTPStatus
+
+from src.lib.auth import issue_admin_session, session_secret
+from src.models.models import AdminAudit, Payout, RewardAccrual, User
+
+PAGE = 3
+ROWS = 8
+# Far outside any epoch the demo seed/scheduler would use.
+EPOCH_BASE = 9_000_000_000
+
+
+def _demo_user(client, db_session) -> User:
+    client.post("/auth/demo-login")
+    return db_session.query(User).filter(User.discord_user_id == "demo_user_001").one()
+
+
+def _walk(client, path: str, key: str) -> list[int]:
+    ids: list[int] = []
+    url = f"{path}?limit={PAGE}"
+    while True:
+        data = client.get(url).json()
+        ids.extend(row["id"] for row in data[key])
+        assert data["has_more"] == (data["next_cursor"] is not None)
+        if not data["next_cursor"]:
+            return ids
+        url = f"{path}?limit={PAGE}&cursor={data['next_cursor']}"
+
+
+def test_accrual_cursor_pages_match_offset_order_with_timestamp_ties(client, db_session):
+    user = _demo_user(client, db_session)
+    # Same created_at for every row: ordering must fall back to id.
+    tied = datetime(2020, 1, 1, tzinfo=UTC).replace(tzinfo=None)
+    for i in range(ROWS):
+        db_session.add(
+            RewardAccrual(
+                user_id=user.id,
+                kills=1,
+                amount_ban=Decimal("0.1"),
+                epoch_minute=EPOCH_BASE + i,
+                created_at=tied,
+            )
+        )
+    db_session.commit()
+
+    walked = _walk(client, "/me/accruals", "accruals")
+    full = [a["id"] for a in client.get("/me/accruals?limit=200").json()["accruals"]]
+    assert walked == full
+    assert len(set(walked)) == len(walked)
+
+    second = client.get(f"/me/accruals?limit={PAGE}&offset={PAGE}").json()
+    assert [a["id"] for a in second["accruals"]] == full[PAGE : 2 * PAGE]
+
+
+def test_payout_cursor_pages_and_sort_restriction(client, db_session):
+    user = _demo_user(client, db_session)
+    for i in range(ROWS):
+        db_session.add(
+            Payout(user_id=user.id, address="ban_x", amount_ban=Decimal(i), status="sent")
+        )
+    db_session.commit()
+
+    walked = _walk(client, "/me/payouts", "payouts")
+    full = [p["id"] for p in client.get("/me/payouts?limit=100").json()["payouts"]]
+    assert walked == full
+
+    token = client.get(f"/me/payouts?limit={PAGE}").json()["next_cursor"]
+    resp = client.get(f"/me/payouts?sort=amount_ban&cursor={token}")
+    assert resp.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_invalid_cursor_is_rejected(client, db_session):
+    _demo_user(client, db_session)
+    assert client.get("/me/accruals?cursor=not-a-cursor").status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_admin_audit_cursor_pages(client, db_session):
+    for i in range(ROWS):
+        db_session.add(AdminAudit(action="keyset_test", summary=str(i)))
+    db_session.commit()
+    client.cookies.set("p2s_admin", issue_admin_session("ops@example.com", session_secret()))
+    walked = _walk(client, "/admin/audit", "events")
+    full = [e["id"] for e in client.get("/admin/audit?limit=200").json()["events"]]
+    assert walked == full
@@ -0,0 +1,67 @@
+import json
+import time
+from http import HTTPStatus
+
+import pytest
+
+MAX_AGE_CEILING = 30
+
+
+@pytest.mark.parametrize("path", ["/api/leaderboard", "/api/feed", "/api/donations"])
+def test_public_endpoint_honours_if_none_match(client, path):
+    first = client.get(path)
+    assert first.status_code == HTTPStatus.OK
+    etag = first.headers["ETag"]
+    assert etag.startswith('"')
+    assert "max-age=" in first.headers["Cache-Control"]
+
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == HTTPStatus.NOT_MODIFIED
+    assert again.content == b""
+    assert again.headers["ETag"] == etag
+
+    stale = client.get(path, headers={"If-None-Match": '"not-the-current-version"'})
+    assert stale.status_code == HTTPStatus.OK
+    assert stale.json() == first.json()
+
+
+def test_countdown_etag_tracks_schedule_and_caps_max_age(client, tmp_path, monkeypatch):
+    hb = tmp_path / "heartbeat.json"
+    now = time.time()
+    hb.write_text(
+        json.dumps(
+            {
+                "ts": now,
+                "accrual_interval_seconds": 20,
+                "settlement_interval_seconds": 600,
+                "last_accrual_ts": now,
+                "last_settlement_ts": now,
+            }
+        )
+    )
+    monkeypatch.setenv("P2S_HEARTBEAT_FILE", str(hb))
+
+    first = client.get("/api/scheduler/countdown")
+    assert first.status_code == HTTPStatus.OK
+    etag = first.headers["ETag"]
+    max_age = int(first.headers["Cache-Control"].split("max-age=")[1].split(",")[0])
+    assert max_age <= first.json()["next_accrual_in"]
+
+    assert (
+        client.get("/api/scheduler/countdown", headers={"If-None-Match": etag}).status_code
+        == HTTPStatus.NOT_MODIFIED
+    )
+
+    # Leaderboard max-age never outlives the next scheduler cycle.
+    lb = client.get("/api/leaderboard")
+    lb_max_age = int(lb.headers["Cache-Control"].split("max-age=")[1].split(",")[0])
+    assert lb_max_age <= min(MAX_AGE_CEILING, max_age + 1)
+
+    # A new accrual cycle changes the schedule version.
+    data = json.loads(hb.read_text())
+    data["last_accrual_ts"] = now + 20
+    hb.write_text(json.dumps(data))
+    assert (
+        client.get("/api/scheduler/countdown", headers={"If-None-Match": etag}).status_code
+        == HTTPStatus.OK
+    )
@@ -0,0 +1,34 @@
+"""Session identity resolution for /me endpoints: caching, logout, reverify."""
+
+from http import HTTPStatus
+
+from src.api.deps import IDENTITY_LOOKUPS, get_identity_cache
+
+REPEATS = 3
+
+
+def _count(result: str) -> float:
+    return IDENTITY_LOOKUPS.labels(result=result)._value.get()
+
+
+def test_repeat_requests_hit_the_cache(client):
+    get_identity_cache().clear()
+    client.post("/auth/demo-login")
+    misses, hits = _count("miss"), _count("hit")
+    for _ in range(REPEATS):
+        assert client.get("/me/accruals?limit=1").status_code == HTTPStatus.OK
+    assert _count("miss") == misses + 1
+    assert _count("hit") == hits + REPEATS - 1
+
+
+def test_logout_revokes_the_token(client):
+    client.post("/auth/demo-login")
+    token = client.cookies.get("p2s_session")
+    assert client.get("/me/status").status_code == HTTPStatus.OK
+
+    resp = client.post("/auth/logout")
+    assert resp.status_code == HTTPStatus.OK
+    # Replaying the old cookie is rejected even though its signature is still valid.
+    client.cookies.set("p2s_session", token)
+    assert client.get("/me/status").status_code == HTTPStatus.UNAUTHORIZED
+    assert client.get("/me/payouts").status_code == HTTPStatus.UNAUTHORIZED
@@ -0,0 +1,51 @@
+"""Readers keep flowing during long writes under the production SQLite profile."""
+
+import os
+import threading
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.lib.db import make_engine, make_read_engine
+
+SKIP_PERF = os.getenv("PAY2SLAY_SKIP_PERF") == "1"
+ROWS = 1_000
+READERS = 4
+# Well under the profile's busy_timeout (5s): a reader that waited on the
+# writer's lock would still be alive here rather than failing fast.
+JOIN_TIMEOUT_SECONDS = 2.0
+
+
+@pytest.mark.skipif(SKIP_PERF, reason="Performance smoke tests skipped via PAY2SLAY_SKIP_PERF=1")
+def test_production_profile_reads_are_not_blocked_by_writer(tmp_path):
+    writer = make_engine(f"sqlite:///{tmp_path / 'p2s.db'}", "production")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE accruals (id INTEGER PRIMARY KEY, kills INT)"))
+        conn.execute(text("INSERT INTO accruals (kills) VALUES (0)"), [{}] * ROWS)
+    reader = make_read_engine(writer, replica_url="")
+    assert reader is not None
+
+    totals: list[int] = []
+    errors: list[OperationalError] = []
+
+    def read() -> None:
+        try:
+            with reader.connect() as conn:
+                totals.append(conn.execute(text("SELECT sum(kills) FROM accruals")).scalar())
+        except OperationalError as exc:
+            errors.append(exc)
+
+    with writer.begin() as conn:  # settlement-style transaction held open
+        conn.execute(text("UPDATE accruals SET kills = kills + 1"))
+        threads = [threading.Thread(target=read) for _ in range(READERS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(JOIN_TIMEOUT_SECONDS)
+        assert not any(t.is_alive() for t in threads)  # finished while the write is open
+
+    assert errors == []  # no "database is locked"
+    assert totals == [0] * READERS  # readers see the last committed snapshot
+    reader.dispose()
+    writer.dispose()
@@ -0,0 +1,129 @@
+"""Unit tests for the shared, pooled Banano node RPC transport and its batched calls."""
+
+from __future__ import annotations
+
+import json
+from decimal import Decimal
+from typing import Any
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from src.services import banano_client
+from src.services.banano_client import (
+    BananoClient,
+    BananoRpc,
+    BananoRpcPolicy,
+    get_banano_rpc,
+    seed_to_address,
+)
+
+NODE = "http://node.test"
+SEED = "c" * 64
+RAW_PER_BAN = 10**29
+TIMEOUT = 3.0
+SLOW_TIMEOUT = 45.0
+PENDING = ["AA" * 32, "BB" * 32, "CC" * 32]
+
+
+class FakeNode:
+    """Banano node answering the actions the client and bananopie send."""
+
+    def __init__(self) -> None:
+        self.actions: list[str] = []
+        self.timeouts: dict[str, float] = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        action = body["action"]
+        self.actions.append(action)
+        self.timeouts[action] = request.extensions["timeout"]["read"]
+        return httpx.Response(200, json=self.reply(body))
+
+    def reply(self, body: dict[str, Any]) -> dict[str, Any]:
+        action = body["action"]
+        if action == "accounts_balances":
+            return {
+                "balances": {
+                    a: {"balance": str((i + 1) * RAW_PER_BAN), "pending": "0"}
+                    for i, a in enumerate(body["accounts"])
+                }
+            }
+        if action == "receivable":
+            return {"blocks": dict.fromkeys(PENDING, str(RAW_PER_BAN))}
+        if action == "blocks_info":
+            return {
+                "blocks": {
+                    h: {"amount": str(RAW_PER_BAN), "block_account": "ban_donor"}
+                    for h in body["hashes"]
+                }
+            }
+        if action == "account_info":
+            return {"error": "Account not found"}  # unopened: receive opens it
+        if action == "process":
+            return {"hash": body["block"]["link"]}
+        return {"error": f"unexpected {action}"}
+
+
+def _client(node: FakeNode, seed: str | None = None) -> BananoClient:
+    policy = BananoRpcPolicy(timeout_seconds=TIMEOUT, slow_timeout_seconds=SLOW_TIMEOUT)
+    rpc = BananoRpc(NODE, policy, client=httpx.Client(transport=httpx.MockTransport(node)))
+    return BananoClient(node_url=NODE, dry_run=False, seed=seed, rpc=rpc)
+
+
+def _latency_count(action: str) -> float:
+    return REGISTRY.get_sample_value("banano_rpc_latency_seconds_count", {"action": action}) or 0.0
+
+
+def test_clients_share_one_transport_per_node(monkeypatch):
+    monkeypatch.setattr(banano_client._State, "rpcs", {})
+    first = BananoClient(node_url=NODE, dry_run=False)
+    second = BananoClient(node_url=NODE, dry_run=False, seed=SEED)
+    assert first.rpc is second.rpc is get_banano_rpc(NODE)
+    assert BananoClient(node_url=NODE).rpc is None  # dry-run never touches the node
+
+
+def test_accounts_balances_is_one_call_and_timed_per_action(monkeypatch):
+    node = FakeNode()
+    accounts = [f"ban_{i}" for i in range(5)]
+    before = _latency_count("accounts_balances")
+
+    balances = _client(node).accounts_balances(accounts)
+    assert node.actions == ["accounts_balances"]
+    assert balances["ban_4"] == (5.0, 0.0)
+    assert _latency_count("accounts_balances") == before + 1
+
+    monkeypatch.setattr(banano_client, "BANANO_MAX_BATCH", 2)
+    node.actions.clear()
+    assert len(_client(node).accounts_balances(accounts)) == len(accounts)
+    assert node.actions == ["accounts_balances"] * 3
+
+
+def test_receive_prefetches_block_info_in_one_batch():
+    node = FakeNode()
+    client = _client(node, seed=SEED)
+
+    assert client.receive_all_pending(account=seed_to_address(SEED)) == len(PENDING)
+    assert node.actions.count("blocks_info") == 1
+    assert "block_info" not in node.actions  # bananopie's per-block lookup served locally
+    assert node.actions.count("process") == len(PENDING)
+    assert node.timeouts["process"] == SLOW_TIMEOUT
+    assert node.timeouts["receivable"] == TIMEOUT
+
+
+def test_node_and_transport_errors_are_counted():
+    def down(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    rpc = BananoRpc(NODE, client=httpx.Client(transport=httpx.MockTransport(down)))
+    labels = {"action": "account_balance", "kind": "http"}
+    before = REGISTRY.get_sample_value("banano_rpc_errors_total", labels) or 0.0
+    with pytest.raises(httpx.ConnectError):
+        BananoClient(node_url=NODE, dry_run=False, rpc=rpc).account_balance("ban_x")
+    assert REGISTRY.get_sample_value("banano_rpc_errors_total", labels) == before + 1
+
+    node = FakeNode()  # account_info errors: bananopie sees it raised, as with its own RPC
+    with pytest.raises(RuntimeError, match="Node response"):
+        _client(node, seed=SEED).send("operator", seed_to_address(SEED), "1", Decimal("1"))
+    assert node.actions == ["account_info"]
@@ -0,0 +1,40 @@
+"""Unit tests for the engine profiles in src.lib.db."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+
+from src.lib.db import PROFILE_PRODUCTION, get_profile, make_engine
+
+BUSY_TIMEOUT_MS = 5000
+SYNCHRONOUS_NORMAL = 1
+TEMP_STORE_MEMORY = 2
+
+
+def test_production_pragmas_are_applied_per_connection(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'p2s.db'}", "production")
+    assert engine.pool.size() == PROFILE_PRODUCTION.pool_size
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == BUSY_TIMEOUT_MS
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == SYNCHRONOUS_NORMAL
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == TEMP_STORE_MEMORY
+
+
+def test_compat_profile_keeps_driver_defaults(tmp_path):
+    engine = make_engine(f"sqlite:///{tmp_path / 'p2s.db'}", "compat")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+
+
+def test_in_memory_sqlite_accepts_any_profile():
+    with make_engine("sqlite://", "production").connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+
+def test_profile_selection(monkeypatch):
+    monkeypatch.setenv("P2S_DB_PROFILE", "compat")
+    assert get_profile().name == "compat"
+    with pytest.raises(ValueError, match="unknown DB profile"):
+        get_profile("turbo")
@@ -0,0 +1,169 @@
+"""Unit tests for the incremental chain-history donation sync."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from src.api.leaderboard import donate_info
+from src.jobs import donation_sync
+from src.jobs.donation_sync import SOURCE_CHAIN_SYNC, insert_receive_blocks, run_donation_sync
+from src.models.models import DonationLedger, DonationSyncCursor
+from src.services import banano_client
+from src.services.banano_client import BananoClient
+
+ACCOUNT = "ban_operator"
+PAGE = 4
+BLOCKS = 10
+NEW_BLOCKS = 3
+RAW_PER_BAN = 10**29
+
+
+class FakeChain(BananoClient):
+    """Operator account history served from a list, like the node's ``account_history``."""
+
+    def __init__(self, blocks: int) -> None:
+        super().__init__(node_url="http://node.test", dry_run=True)
+        self.dry_run = False
+        self.blocks: list[dict[str, Any]] = []
+        self.heads: list[str | None] = []
+        self.extend(blocks)
+
+    def extend(self, n: int) -> None:
+        for _ in range(n):
+            height = len(self.blocks) + 1
+            kind = "send" if height % 5 == 0 else "receive"
+            self.blocks.append(
+                {
+                    "type": kind,
+                    "account": f"ban_donor{height % 3}",
+                    "amount": str(height * RAW_PER_BAN),
+                    "hash": f"H{height:04d}",
+                    "height": str(height),
+                }
+            )
+
+    def account_history(  # type: ignore[override]
+        self, account: str, *, head: str | None = None, count: int = 500, reverse: bool = True
+    ) -> list[dict[str, Any]]:
+        if not reverse:
+            return list(reversed(self.blocks))[:count]
+        self.heads.append(head)
+        start = (
+            0
+            if head is None
+            else next(i for i, b in enumerate(self.blocks) if b["hash"] == head) + 1
+        )
+        return self.blocks[start : start + count]
+
+
+class ReceivingChain(FakeChain):
+    """``FakeChain`` with one pending donation that receiving adds to the history."""
+
+    def __init__(self, blocks: int) -> None:
+        super().__init__(blocks)
+        self.pending = [{"hash": "SEND", "sender": "ban_donor", "amount_ban": 11.0}]
+
+    def get_receivable_blocks(self, account: str, count: int = 100) -> list[dict[str, Any]]:
+        return list(self.pending)
+
+    def receive_all_pending(self, account: str | None = None) -> int:
+        received = len(self.pending)
+        self.extend(received)  # height 11: a receive block with its own hash
+        self.pending = []
+        return received
+
+    def account_balance(self, account: str) -> tuple[float, float]:
+        return 0.0, 0.0
+
+
+def _receives(chain: FakeChain) -> list[dict[str, Any]]:
+    return [b for b in chain.blocks if b["type"] == "receive"]
+
+
+def _total(session: Session) -> Decimal:
+    return session.scalar(select(func.coalesce(func.sum(DonationLedger.amount_ban), 0)))
+
+
+def test_backfill_pages_through_history_and_records_receives_once(session):
+    chain = FakeChain(BLOCKS)
+    counters = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+
+    assert counters["pages"] == -(-BLOCKS // PAGE)
+    assert counters["donations_inserted"] == len(_receives(chain))
+    assert _total(session) == sum(int(b["height"]) for b in _receives(chain))
+    cursor = session.get(DonationSyncCursor, ACCOUNT)
+    assert (cursor.block_hash, cursor.height) == ("H0010", BLOCKS)
+
+    again = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert again["donations_inserted"] == 0
+    assert chain.heads[-1] == "H0010"  # resumed after the cursor, no replay
+
+
+def test_sync_resumes_from_cursor_with_only_new_blocks(session):
+    chain = FakeChain(BLOCKS)
+    run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    chain.extend(NEW_BLOCKS)
+    chain.heads.clear()
+
+    counters = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert chain.heads == ["H0010"]
+    assert counters["blocks_scanned"] == NEW_BLOCKS
+    assert session.query(DonationLedger).count() == len(_receives(chain))
+
+
+def test_run_is_capped_and_the_next_run_continues(session, monkeypatch):
+    monkeypatch.setattr(donation_sync, "MAX_PAGES_PER_RUN", 1)
+    chain = FakeChain(BLOCKS)
+    first = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert first["blocks_scanned"] == PAGE
+    second = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert second["blocks_scanned"] == PAGE
+    assert session.get(DonationSyncCursor, ACCOUNT).height == 2 * PAGE
+
+
+def test_existing_ledger_is_baselined_not_replayed(session):
+    session.add(DonationLedger(amount_ban=Decimal("100"), blocks_received=1, source="scheduler"))
+    session.commit()
+    chain = FakeChain(BLOCKS)
+
+    counters = run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert counters["baselined"] == 1
+    assert session.query(DonationLedger).count() == 1
+    assert session.get(DonationSyncCursor, ACCOUNT).block_hash == "H0010"
+
+    chain.extend(1)  # height 11: a receive
+    assert run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)["donations_inserted"] == 1
+
+
+def test_rebuild_insert_skips_blocks_the_sync_recorded(session):
+    chain = FakeChain(BLOCKS)
+    run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    assert insert_receive_blocks(session, chain.blocks, source="rebuild") == []
+    sources = set(session.scalars(select(DonationLedger.source)))
+    assert sources == {SOURCE_CHAIN_SYNC}
+
+
+def test_donate_info_leaves_received_blocks_to_the_sync(session, monkeypatch):
+    chain = ReceivingChain(BLOCKS)
+    run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+    monkeypatch.setenv("P2S_OPERATOR_ACCOUNT", ACCOUNT)
+    monkeypatch.delenv("P2S_DONATION_SYNC", raising=False)
+    monkeypatch.setattr(banano_client, "BananoClient", lambda **_: chain)
+    integrations = SimpleNamespace(node_rpc="http://node.test", dry_run=False)
+    request = SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(config=SimpleNamespace(integrations=integrations))
+        )
+    )
+
+    donate_info(request, session)  # type: ignore[arg-type]
+    assert chain.pending == []
+    run_donation_sync(session, chain, ACCOUNT, page_size=PAGE)
+
+    assert _total(session) == sum(Decimal(b["amount"]) / RAW_PER_BAN for b in _receives(chain))
+    assert session.scalar(select(func.count(DonationLedger.id))) == len(_receives(chain))
@@ -0,0 +1,87 @@
+"""Unit tests for the incrementally maintained economics snapshot."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from src.lib import events
+from src.services.domain import donation_service
+from src.services.domain.donation_service import EconomicsCache, EconomicsSnapshot
+
+RECONCILE_SECONDS = 60.0
+FIRST_BLOOD = 100
+DONATED = Decimal("90")
+PAID = Decimal("40")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLedger:
+    """Stands in for the SUM queries and counts how often they run."""
+
+    def __init__(self, donated: Decimal, paid: Decimal) -> None:
+        self.donated, self.paid, self.sums = donated, paid, 0
+
+    def install(self, monkeypatch) -> None:
+        def total_donated(_session):
+            self.sums += 1
+            return self.donated
+
+        monkeypatch.setattr(donation_service, "get_total_donated", total_donated)
+        monkeypatch.setattr(donation_service, "get_total_paid_out", lambda _s: self.paid)
+
+
+def test_derived_fields_are_precomputed():
+    snap = EconomicsSnapshot(
+        seed_fund=0.0,
+        base_rate=1.0,
+        total_donated=Decimal("150"),
+        total_paid_out=Decimal("0"),
+        reconciled_at=0.0,
+    )
+    assert snap.milestone.threshold == FIRST_BLOOD
+    assert snap.sustainability_factor == donation_service._SUSTAINABILITY_MAX
+    assert snap.effective_rate == round(1.0 * snap.milestone.payout_multiplier * 2.0, 4)
+
+
+def test_events_advance_totals_without_queries(monkeypatch):
+    ledger = FakeLedger(DONATED, PAID)
+    ledger.install(monkeypatch)
+    clock = FakeClock()
+    cache = EconomicsCache(reconcile_seconds=RECONCILE_SECONDS, clock=clock)
+    first = cache.snapshot(None)  # type: ignore[arg-type]
+    assert ledger.sums == 1
+    assert first.milestone.threshold == 0
+
+    cache.on_event(events.Event(events.TOPIC_DONATION, {"donated_ban": 10.0}, 0.0))
+    cache.on_event(events.Event(events.TOPIC_SETTLEMENT, {"paid_out_ban": 5.5}, 0.0))
+    snap = cache.snapshot(None)  # type: ignore[arg-type]
+    assert ledger.sums == 1
+    assert snap.total_donated == DONATED + 10
+    assert snap.total_paid_out == PAID + Decimal("5.5")
+    assert snap.milestone.threshold == FIRST_BLOOD
+
+
+def test_reconcile_on_interval_and_on_opaque_events(monkeypatch):
+    ledger = FakeLedger(DONATED, PAID)
+    ledger.install(monkeypatch)
+    clock = FakeClock()
+    cache = EconomicsCache(reconcile_seconds=RECONCILE_SECONDS, clock=clock)
+    cache.snapshot(None)  # type: ignore[arg-type]
+
+    # A rebuild/dedupe carries no amount: totals are unknown until re-summed.
+    cache.on_event(events.Event(events.TOPIC_DONATION, {"source": "rebuild"}, 0.0))
+    ledger.donated = Decimal("500")
+    assert cache.snapshot(None).total_donated == ledger.donated  # type: ignore[arg-type]
+
+    # Out-of-process writes are picked up by the periodic reconcile.
+    ledger.donated = Decimal("600")
+    assert cache.snapshot(None).total_donated != ledger.donated  # type: ignore[arg-type]
+    clock.now += RECONCILE_SECONDS
+    assert cache.snapshot(None).total_donated == ledger.donated  # type: ignore[arg-type]
@@ -0,0 +1,185 @@
+"""Unit tests for the batched, staleness-driven HODL balance scan and its Solana RPC client."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy.orm import Session
+
+from src.jobs.hodl_scan import run_hodl_scan
+from src.lib.config import PayoutConfig
+from src.models.models import User
+from src.services.domain.hodl_boost_service import (
+    SolanaRpcClient,
+    SolanaRpcError,
+    SolanaRpcPolicy,
+)
+
+WALLETS = 7
+RPC_BATCH = 3
+BALANCE = 20_000
+STALE_SECONDS = 3600
+FAILING_WALLET = "sol_wallet_2"
+RESCANNED = 2  # the failed wallet plus the one that went stale
+THRESHOLD = 2
+RESET = 30.0
+RPC_URL = "http://solana.test"
+
+
+class FakeRpc:
+    """Solana JSON-RPC endpoint answering getTokenAccountsByOwner batches."""
+
+    def __init__(self) -> None:
+        self.posts: list[int] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        calls = body if isinstance(body, list) else [body]
+        self.posts.append(len(calls))
+        replies = []
+        for call in calls:
+            wallet = call["params"][0]
+            if wallet == FAILING_WALLET:
+                replies.append({"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32005}})
+                continue
+            amount = {"tokenAmount": {"uiAmount": BALANCE}}
+            account = {"account": {"data": {"parsed": {"info": amount}}}}
+            replies.append({"jsonrpc": "2.0", "id": call["id"], "result": {"value": [account]}})
+        if not isinstance(body, list):
+            return httpx.Response(200, json=replies[0])
+        return httpx.Response(200, json=list(reversed(replies)))  # ids, not order, match
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _rpc(handler, clock: FakeClock | None = None) -> SolanaRpcClient:
+    policy = SolanaRpcPolicy(backoff_base=0.0, failure_threshold=THRESHOLD, reset_seconds=RESET)
+    return SolanaRpcClient(
+        RPC_URL,
+        policy,
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        clock=clock or FakeClock(),
+    )
+
+
+def _payout_cfg() -> PayoutConfig:
+    return PayoutConfig(
+        payout_amount_ban_per_kill=1,
+        scheduler_minutes=1,
+        daily_payout_cap=1,
+        weekly_payout_cap=1,
+        reset_tz="UTC",
+        hodl_boost_enabled=True,
+        hodl_boost_token_ca="mint",
+        hodl_scan_stale_seconds=STALE_SECONDS,
+        hodl_scan_rpc_batch_size=RPC_BATCH,
+    )
+
+
+def _seed(session: Session) -> None:
+    fresh = datetime.now(UTC).replace(tzinfo=None)
+    for i in range(WALLETS):
+        session.add(User(discord_user_id=f"hodl{i}", solana_wallet_address=f"sol_wallet_{i}"))
+    # recently verified: skipped until it goes stale
+    session.add(
+        User(
+            discord_user_id="hodl_fresh",
+            solana_wallet_address="sol_fresh",
+            jpmt_verified_at=fresh,
+        )
+    )
+    session.add(User(discord_user_id="no_wallet"))
+    session.commit()
+
+
+def test_scan_batches_rpc_calls_and_skips_fresh_wallets(session):
+    _seed(session)
+    rpc = FakeRpc()
+    counters = run_hodl_scan(session, _payout_cfg(), rpc=_rpc(rpc))
+
+    assert sorted(rpc.posts) == [WALLETS - 2 * RPC_BATCH, RPC_BATCH, RPC_BATCH]
+    assert counters == {"users_scanned": WALLETS, "users_updated": WALLETS - 1, "errors": 1}
+    failed = session.query(User).filter_by(solana_wallet_address=FAILING_WALLET).one()
+    assert failed.jpmt_verified_at is None  # retried next scan, balance untouched
+    assert session.query(User).filter(User.jpmt_balance == BALANCE).count() == WALLETS - 1
+
+
+def test_rescan_only_touches_wallets_past_the_staleness_window(session):
+    _seed(session)
+    rpc = FakeRpc()
+    client = _rpc(rpc)
+    run_hodl_scan(session, _payout_cfg(), rpc=client)
+    rpc.posts.clear()
+    assert run_hodl_scan(session, _payout_cfg(), rpc=client)["users_scanned"] == 1
+    assert rpc.posts == [1]  # only the failed wallet again
+
+    stale = datetime.now(UTC).replace(tzinfo=None) - timedelta(seconds=STALE_SECONDS + 1)
+    session.query(User).filter_by(solana_wallet_address="sol_fresh").update(
+        {"jpmt_verified_at": stale}
+    )
+    session.commit()
+    counters = run_hodl_scan(session, _payout_cfg(), rpc=client)
+    assert counters["users_scanned"] == RESCANNED
+
+
+def test_rejected_batch_keeps_previous_balances(session):
+    _seed(session)
+
+    def reject(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"jsonrpc": "2.0", "error": {"message": "no batches"}})
+
+    counters = run_hodl_scan(session, _payout_cfg(), rpc=_rpc(reject))
+    assert counters["errors"] == WALLETS
+    assert session.query(User).filter(User.jpmt_verified_at.is_not(None)).count() == 1
+
+
+def test_client_retries_transient_failures():
+    rpc = FakeRpc()
+    statuses = [503, 429]
+
+    def flaky(request: httpx.Request) -> httpx.Response:
+        if statuses:
+            return httpx.Response(statuses.pop())
+        return rpc(request)
+
+    client = _rpc(flaky)
+    assert client.token_balance("sol_ok", "mint") == BALANCE
+    assert not client.circuit_open
+
+
+def test_circuit_opens_fails_fast_then_recovers():
+    clock = FakeClock()
+    healthy = {"up": False}
+    rpc = FakeRpc()
+    posts: list[int] = []
+
+    def endpoint(request: httpx.Request) -> httpx.Response:
+        posts.append(1)
+        if not healthy["up"]:
+            raise httpx.ConnectError("down")
+        return rpc(request)
+
+    client = _rpc(endpoint, clock)
+    for _ in range(THRESHOLD):
+        with pytest.raises(SolanaRpcError):
+            client.token_balance("sol_ok", "mint")
+    assert client.circuit_open
+
+    attempts = len(posts)
+    with pytest.raises(SolanaRpcError, match="circuit open"):
+        client.token_balance("sol_ok", "mint")
+    assert len(posts) == attempts  # rejected without touching the endpoint
+
+    healthy["up"] = True
+    clock.now += RESET
+    assert client.token_balance("sol_ok", "mint") == BALANCE  # half-open trial closes it
+    assert not client.circuit_open
@@ -0,0 +1,51 @@
+"""Unit tests for the session identity cache behind /me endpoints."""
+
+from __future__ import annotations
+
+from src.api.deps import IdentityCache, SessionIdentity
+
+TTL = 60.0
+ALICE = SessionIdentity(user_id=1, discord_user_id="alice")
+BOB = SessionIdentity(user_id=2, discord_user_id="bob")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entries_expire_at_ttl_or_token_expiry_whichever_first():
+    clock = FakeClock()
+    cache = IdentityCache(ttl_seconds=TTL, clock=clock)
+    cache.put("long", ALICE, token_exp=clock.now + 3600)
+    cache.put("short", BOB, token_exp=clock.now + 10)
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == ALICE
+    clock.now += TTL
+    assert cache.get("long") is None
+
+
+def test_lru_bound_and_invalidation():
+    clock = FakeClock()
+    cache = IdentityCache(ttl_seconds=TTL, max_entries=2, clock=clock)
+    cache.put("a", ALICE, token_exp=clock.now + 3600)
+    cache.put("b", BOB, token_exp=clock.now + 3600)
+    assert cache.get("a") == ALICE  # touch: "b" is now least recent
+    cache.put("c", ALICE, token_exp=clock.now + 3600)
+    assert cache.get("b") is None
+    cache.invalidate_user("alice")
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+
+
+def test_revoked_token_is_forgotten_and_denied():
+    clock = FakeClock()
+    cache = IdentityCache(ttl_seconds=TTL, clock=clock)
+    cache.put("tok", ALICE, token_exp=clock.now + 3600)
+    cache.revoke("tok", token_exp=clock.now + 3600)
+    assert cache.get("tok") is None
+    assert cache.is_revoked("tok")
@@ -0,0 +1,88 @@
+"""Unit tests for the /api/stream broadcaster."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+from src.lib import events
+from src.lib.live_stream import RESYNC_FRAME, _Broadcaster, _SchedulerRelay, get_broadcaster
+
+QUEUE_SIZE = 2
+
+
+async def test_single_publish_fans_out_to_every_subscriber() -> None:
+    b = _Broadcaster()
+    b.set_loop(asyncio.get_running_loop())
+    queues = [b.subscribe() for _ in range(3)]
+    b.publish("accrual", {"accruals_created": 1})
+    frames = [await asyncio.wait_for(q.get(), timeout=1) for q in queues]
+    assert len(set(frames)) == 1
+    assert frames[0].startswith(f"id: {b.epoch + 1}\nevent: accrual\n")
+    for q in queues:
+        b.unsubscribe(q)
+    assert b.subscriber_count == 0
+
+
+async def test_slow_subscriber_is_resynced_not_blocking() -> None:
+    b = _Broadcaster(queue_size=QUEUE_SIZE)
+    b.set_loop(asyncio.get_running_loop())
+    slow = b.subscribe()
+    for i in range(QUEUE_SIZE + 1):
+        b.publish("payout", {"n": i})
+    await asyncio.sleep(0)
+    assert slow.qsize() == 1
+    assert slow.get_nowait() == RESYNC_FRAME
+
+
+def test_replay_since_and_gap_detection() -> None:
+    b = _Broadcaster(replay=QUEUE_SIZE)
+    for i in range(4):
+        b.publish("donation", {"n": i})
+    replay = b.replay_since(b.epoch + 3)
+    assert replay is not None
+    assert len(replay) == 1
+    assert replay[0].startswith(f"id: {b.epoch + 4}\n")
+    assert b.replay_since(b.epoch + 4) == []
+    assert b.replay_since(b.epoch) is None  # older than the ring: client must resync
+
+
+def test_ids_from_another_process_resync() -> None:
+    b, other = _Broadcaster(), _Broadcaster()
+    other.publish("payout", {"n": 1})
+    assert b.replay_since(other.epoch + 1) is None  # empty ring, foreign id
+    for i in range(3):
+        b.publish("payout", {"n": i})
+    assert b.replay_since(1) is None  # a pre-restart id below this epoch
+    assert b.replay_since(b.epoch + 4) is None  # never issued here
+
+
+def test_bus_events_become_named_frames() -> None:
+    broadcaster = get_broadcaster()
+    last_id = broadcaster.publish("refresh", {})
+    events.publish(events.TOPIC_SETTLEMENT, payouts=[{"amount_ban": 1.5}])
+    frames = broadcaster.replay_since(last_id) or []
+    frame = frames[-1]
+    assert "\nevent: payout\n" in frame
+    data = json.loads(frame.split("data: ", 1)[1])
+    assert data["payouts"] == [{"amount_ban": 1.5}]
+
+
+def test_relay_turns_foreign_heartbeats_into_refresh() -> None:
+    beats: list[dict[str, object]] = [{"ts": 1.0, "host": "leader", "pid": 7}]
+    relay = _SchedulerRelay(lambda: beats[-1], origin=("worker", 8))
+    broadcaster = get_broadcaster()
+    last_id = broadcaster.publish("refresh", {})
+
+    assert not relay.poll_once()  # first read only records where the leader is
+    beats.append({"ts": 2.0, "host": "leader", "pid": 7})
+    assert relay.poll_once()
+    assert not relay.poll_once()  # unchanged beat
+    frames = broadcaster.replay_since(last_id) or []
+    assert len(frames) == 1
+    assert "\nevent: refresh\n" in frames[0]
+
+    local = _SchedulerRelay(lambda: beats[-1], origin=("leader", 7))
+    local.poll_once()
+    beats.append({"ts": 3.0, "host": "leader", "pid": 7})
+    assert not local.poll_once()  # in-process scheduler already published its events
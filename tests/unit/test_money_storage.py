@@ -0,0 +1,125 @@
+"""Unit tests for the opt-in integer money storage (``P2S_MONEY_STORAGE``)."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.orm import Session
+
+from src.models import models  # noqa: F401
+from src.models.base import Base
+from src.models.models import Payout, User
+from src.models.types import (
+    STORAGE_DECIMAL,
+    STORAGE_INTEGER,
+    convert_money_columns,
+    dialect_money_storage,
+    from_units,
+    pin_money_storage,
+    to_units,
+)
+
+AMOUNTS = [Decimal("0.1"), Decimal("0.2"), Decimal("1.23456789")]
+ONE_TENTH_UNITS = 10_000_000
+
+
+def _seed(session: Session) -> None:
+    user = User(discord_user_id="money_user")
+    session.add(user)
+    session.flush()
+    session.add_all(
+        Payout(user_id=user.id, address="ban_x", amount_ban=a, status="sent") for a in AMOUNTS
+    )
+    session.commit()
+
+
+def test_units_round_trip():
+    assert to_units(0.1) == to_units(Decimal("0.1")) == ONE_TENTH_UNITS
+    assert to_units(Decimal("0.000000015")) == 2  # noqa: PLR2004 - half-even to 1e-8
+    assert from_units(to_units("42.5")) == Decimal("42.5")
+
+
+def test_integer_mode_stores_units_and_sums_natively(monkeypatch):
+    monkeypatch.setenv("P2S_MONEY_STORAGE", STORAGE_INTEGER)
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        _seed(s)
+        stored = s.execute(text("SELECT typeof(amount_ban), amount_ban FROM payouts")).all()
+        assert {kind for kind, _ in stored} == {"integer"}
+        assert sorted(v for _, v in stored) == sorted(to_units(a) for a in AMOUNTS)
+        total = s.query(func.coalesce(func.sum(Payout.amount_ban), 0)).scalar()
+        assert total == sum(AMOUNTS)  # exact, no REAL rounding
+        assert s.query(Payout).filter(Payout.amount_ban > Decimal("1")).count() == 1
+
+
+def test_mode_is_pinned_per_engine(monkeypatch):
+    monkeypatch.delenv("P2S_MONEY_STORAGE", raising=False)
+    engine = create_engine("sqlite://")
+    assert dialect_money_storage(engine.dialect) == "decimal"
+    monkeypatch.setenv("P2S_MONEY_STORAGE", STORAGE_INTEGER)
+    assert dialect_money_storage(engine.dialect) == "decimal"
+    assert dialect_money_storage(create_engine("sqlite://").dialect) == STORAGE_INTEGER
+
+
+def test_convert_existing_database_both_ways(monkeypatch, tmp_path: Path):
+    monkeypatch.delenv("P2S_MONEY_STORAGE", raising=False)
+    url = f"sqlite:///{tmp_path / 'money.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        _seed(s)
+    engine.dispose()
+
+    monkeypatch.setenv("P2S_MONEY_STORAGE", STORAGE_INTEGER)
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        assert "payouts.amount_ban" in convert_money_columns(conn, Base.metadata)
+    with engine.begin() as conn:
+        assert convert_money_columns(conn, Base.metadata) == []  # idempotent
+    with Session(engine) as s:
+        assert sorted(s.scalars(select(Payout.amount_ban))) == sorted(AMOUNTS)
+    engine.dispose()
+
+    monkeypatch.setenv("P2S_MONEY_STORAGE", "decimal")
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        assert "payouts.amount_ban" in convert_money_columns(conn, Base.metadata)
+    with Session(engine) as s:
+        assert sorted(s.scalars(select(Payout.amount_ban))) == sorted(AMOUNTS)
+    engine.dispose()
+
+
+def test_engines_follow_the_stored_type_not_the_environment(monkeypatch, tmp_path: Path):
+    monkeypatch.setenv("P2S_MONEY_STORAGE", STORAGE_INTEGER)
+    url = f"sqlite:///{tmp_path / 'money.db'}"
+    engine = create_engine(url)
+    assert pin_money_storage(engine, Base.metadata) == STORAGE_INTEGER  # empty: configured
+    Base.metadata.create_all(engine)
+    with Session(engine) as s:
+        _seed(s)
+    engine.dispose()
+
+    monkeypatch.setenv("P2S_MONEY_STORAGE", STORAGE_DECIMAL)  # a worker with drifted config
+    engine = create_engine(url)
+    assert pin_money_storage(engine, Base.metadata) == STORAGE_INTEGER
+    with Session(engine) as s:
+        assert sorted(s.scalars(select(Payout.amount_ban))) == sorted(AMOUNTS)
+        assert s.execute(text("SELECT typeof(amount_ban) FROM payouts")).scalars().all() == [
+            "integer"
+        ] * len(AMOUNTS)  # nothing converted behind the migration's back
+    engine.dispose()
+
+    engine = create_engine(url)
+    dialect_money_storage(engine.dialect)  # already compiled as decimal
+    with pytest.raises(RuntimeError, match="restart"):
+        pin_money_storage(engine, Base.metadata)
+
+
+def test_rejects_unknown_mode(monkeypatch):
+    monkeypatch.setenv("P2S_MONEY_STORAGE", "float")
+    with pytest.raises(ValueError, match="P2S_MONEY_STORAGE"):
+        dialect_money_storage(create_engine("sqlite://").dialect)
@@ -0,0 +1,106 @@
+"""Unit tests for the in-memory operator identity (seed, public key, address)."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.lib.crypto import encrypt_value
+from src.models.models import SecureConfig
+from src.services import operator_identity
+from src.services.banano_client import seed_to_address
+from src.services.operator_identity import OPERATOR_SEED_KEY, OperatorIdentityCache
+
+SEED_A = "a" * 64
+SEED_B = "b" * 64
+CHECK_SECONDS = 60.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def decrypts(monkeypatch) -> list[str]:
+    calls: list[str] = []
+    original = operator_identity.decrypt_value
+
+    def spy(ciphertext: str) -> str | None:
+        calls.append(ciphertext)
+        return original(ciphertext)
+
+    monkeypatch.setattr(operator_identity, "decrypt_value", spy)
+    return calls
+
+
+def _store(session: Session, seed: str) -> SecureConfig:
+    row = session.query(SecureConfig).filter_by(key=OPERATOR_SEED_KEY).one_or_none()
+    if row is None:
+        row = SecureConfig(key=OPERATOR_SEED_KEY, encrypted_value="", set_by="ops@example.com")
+        session.add(row)
+    row.encrypted_value = encrypt_value(seed)
+    session.commit()
+    return row
+
+
+def test_identity_is_decrypted_and_derived_once(session, decrypts):
+    _store(session, SEED_A)
+    cache = OperatorIdentityCache(check_interval=CHECK_SECONDS, clock=FakeClock())
+
+    first = cache.get(session)
+    assert first is not None and first.configured
+    assert first.seed == SEED_A
+    assert first.address == seed_to_address(SEED_A)
+    assert first.public_key is not None and first.address is not None
+    assert cache.get(session) is first
+    assert len(decrypts) == 1
+
+
+def test_changed_seed_is_seen_after_check_interval_or_invalidate(session, decrypts):
+    _store(session, SEED_A)
+    clock = FakeClock()
+    cache = OperatorIdentityCache(check_interval=CHECK_SECONDS, clock=clock)
+    cache.get(session)
+
+    clock.now += CHECK_SECONDS  # unchanged row: compared, not decrypted again
+    assert cache.get(session).seed == SEED_A
+    assert len(decrypts) == 1
+
+    _store(session, SEED_B)
+    assert cache.get(session).seed == SEED_A  # within the interval: served from memory
+    clock.now += CHECK_SECONDS
+    assert cache.get(session).address == seed_to_address(SEED_B)
+
+    _store(session, SEED_A)
+    cache.invalidate()
+    assert cache.get(session).seed == SEED_A
+
+
+def test_missing_or_undecryptable_seed_is_not_cached(session):
+    cache = OperatorIdentityCache(check_interval=CHECK_SECONDS, clock=FakeClock())
+    assert cache.get(session) is None
+
+    row = _store(session, SEED_A)
+    assert cache.get(session).seed == SEED_A  # picked up without waiting for the interval
+
+    row.encrypted_value = "not-a-fernet-token"
+    session.commit()
+    cache.invalidate()
+    broken = cache.get(session)
+    assert broken is not None and not broken.configured
+    assert broken.set_by == "ops@example.com"
+    _store(session, SEED_B)
+    assert cache.get(session).seed == SEED_B
+
+
+def test_env_account_wins_over_derived_address(session, monkeypatch):
+    monkeypatch.setattr(operator_identity._State, "cache", OperatorIdentityCache(clock=FakeClock()))
+    _store(session, SEED_A)
+    monkeypatch.delenv("P2S_OPERATOR_ACCOUNT", raising=False)
+    assert operator_identity.resolve_operator_account(session) == seed_to_address(SEED_A)
+    monkeypatch.setenv("P2S_OPERATOR_ACCOUNT", "ban_env")
+    assert operator_identity.resolve_operator_account(session) == "ban_env"
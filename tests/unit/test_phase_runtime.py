@@ -0,0 +1,151 @@
+"""Unit tests for the scheduler phase runtime (independent cadences, ordering, timeouts)."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.jobs.phases import Phase, PhaseRuntime
+from src.lib.db import make_session_factory
+
+INTERVAL = 10.0
+TIMEOUT = 30.0
+WAIT = 5.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def factory() -> Iterator[sessionmaker[Session]]:
+    engine = create_engine("sqlite://")
+    yield make_session_factory(engine)
+    engine.dispose()
+
+
+class Recorder:
+    """Phase body that counts runs and optionally blocks until released."""
+
+    def __init__(self, *, block: bool = False, fail: bool = False) -> None:
+        self.runs = 0
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self._block = block
+        self._fail = fail
+
+    def __call__(self, session: Session) -> None:
+        self.runs += 1
+        self.started.set()
+        if self._block:
+            assert self.release.wait(WAIT)
+        if self._fail:
+            raise RuntimeError("boom")
+
+
+def _phase(name: str, body: Recorder, **kw) -> Phase:
+    return Phase(name, body, lambda: INTERVAL, timeout_seconds=TIMEOUT, **kw)
+
+
+def _idle(runtime: PhaseRuntime, name: str) -> None:
+    deadline = time.monotonic() + WAIT
+    while runtime.running()[name] and time.monotonic() < deadline:
+        runtime.wait(0.01)
+    assert not runtime.running()[name]
+
+
+def _runtime(factory, phases: list[Phase], clock: FakeClock, **kw) -> PhaseRuntime:
+    return PhaseRuntime(factory, phases, clock=clock, **kw)
+
+
+def test_slow_phase_does_not_delay_others(factory):
+    clock = FakeClock()
+    slow, fast = Recorder(block=True), Recorder()
+    runtime = _runtime(factory, [_phase("slow", slow), _phase("fast", fast)], clock)
+
+    assert runtime.tick() == INTERVAL
+    _idle(runtime, "fast")
+    for _ in range(3):
+        clock.now += INTERVAL
+        runtime.tick()
+        _idle(runtime, "fast")
+    assert fast.runs == 4  # noqa: PLR2004 - one run per interval
+    assert slow.runs == 1  # concurrency=1: never overlaps itself
+    slow.release.set()
+    _idle(runtime, "slow")
+    clock.now += INTERVAL
+    runtime.tick()
+    assert slow.started.wait(WAIT)
+    _idle(runtime, "slow")
+    assert slow.runs == 2  # noqa: PLR2004
+
+
+def test_dependency_runs_first_and_blocks_dependent(factory):
+    clock = FakeClock()
+    receive, settle = Recorder(block=True), Recorder()
+    runtime = _runtime(
+        factory,
+        [_phase("settlement", settle, after=("receive",)), _phase("receive", receive)],
+        clock,
+    )
+    runtime.tick()
+    assert receive.started.wait(WAIT)
+    runtime.tick()
+    assert settle.runs == 0  # still waiting on receive
+    receive.release.set()
+    _idle(runtime, "receive")
+    runtime.tick()
+    _idle(runtime, "settlement")
+    assert settle.runs == 1
+
+
+def test_timeout_unblocks_dependents_but_keeps_the_slot(factory):
+    clock = FakeClock()
+    stuck, after = Recorder(block=True), Recorder()
+    runtime = _runtime(
+        factory, [_phase("stuck", stuck), _phase("after", after, after=("stuck",))], clock
+    )
+    runtime.tick()
+    assert stuck.started.wait(WAIT)
+    clock.now += TIMEOUT
+    runtime.tick()
+    _idle(runtime, "after")
+    assert after.runs == 1
+    assert stuck.runs == 1  # the overdue run still holds its concurrency slot
+    stuck.release.set()
+    _idle(runtime, "stuck")
+
+
+def test_errors_are_contained_and_reported(factory):
+    clock = FakeClock()
+    done: list[tuple[str, str | None]] = []
+    runtime = _runtime(
+        factory,
+        [_phase("bad", Recorder(fail=True))],
+        clock,
+        on_done=lambda name, error: done.append((name, error)),
+    )
+    runtime.tick()
+    _idle(runtime, "bad")
+    assert done == [("bad", "boom")]
+
+
+@pytest.mark.parametrize(
+    "phases",
+    [
+        lambda: [_phase("a", Recorder(), after=("missing",))],
+        lambda: [_phase("a", Recorder(), after=("b",)), _phase("b", Recorder(), after=("a",))],
+    ],
+)
+def test_rejects_bad_dependencies(factory, phases: Callable[[], list[Phase]]):
+    with pytest.raises(ValueError):
+        PhaseRuntime(factory, phases())
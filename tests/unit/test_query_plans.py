@@ -0,0 +1,171 @@
+"""Query-plan regression suite for the hot settlement, leaderboard and donation queries.
+
+Each case runs the real service code against an in-memory SQLite schema built
+from the models, captures the SELECTs it issues and runs ``EXPLAIN QUERY PLAN``
+on them. A bare ``SCAN <table>`` (no index) fails the test unless the query
+genuinely needs every row of that table; each case also names the index it is
+expected to use so a silently dropped index is caught too.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.api.leaderboard import _build_feed, _build_leaderboard, _CapStatusMemo, _compute_cap_status
+from src.jobs.settlement import repair_orphaned_accruals, repair_underpaid_accruals
+from src.models import models  # noqa: F401
+from src.models.base import Base
+from src.models.models import DonationLedger, Payout, RewardAccrual, User
+from src.services.domain.donation_service import get_donation_leaderboard, get_total_paid_out
+from src.services.domain.settlement_service import SettlementService
+
+DAILY_CAP = 10
+WEEKLY_CAP = 100
+BARE_SCAN = re.compile(r"^SCAN (\w+)$")
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng)
+    with Session(eng) as s:
+        user = User(discord_user_id="plan_user", discord_username="plan")
+        s.add(user)
+        s.flush()
+        payout = Payout(user_id=user.id, address="ban_x", amount_ban=Decimal(1), status="sent")
+        s.add(payout)
+        s.flush()
+        now = datetime.now(UTC)
+        s.add_all(
+            [
+                RewardAccrual(
+                    user_id=user.id,
+                    kills=1,
+                    amount_ban=Decimal(1),
+                    epoch_minute=1,
+                    settled=True,
+                    settled_at=now,
+                    payout_id=payout.id,
+                ),
+                RewardAccrual(user_id=user.id, kills=2, amount_ban=Decimal(2), epoch_minute=2),
+                DonationLedger(amount_ban=Decimal(5), sender_address="ban_donor"),
+            ]
+        )
+        s.commit()
+    yield eng
+    eng.dispose()
+
+
+def _plans(engine: Engine, run: Callable[[Session], Any]) -> list[str]:
+    statements: list[tuple[str, Any]] = []
+
+    def capture(_conn, _cursor, statement, params, _context, _executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, params))
+
+    with Session(engine) as session:
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            run(session)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+    details: list[str] = []
+    with engine.connect() as conn:
+        for statement, params in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params).all()
+            details.extend(row[3] for row in rows)
+    return details
+
+
+def _memo(session: Session) -> _CapStatusMemo:
+    return _CapStatusMemo(session, (DAILY_CAP, WEEKLY_CAP))
+
+
+def _user_id(session: Session) -> int:
+    return session.query(User.id).filter(User.discord_user_id == "plan_user").scalar()
+
+
+CASES: list[tuple[str, Callable[[Session], Any], set[str], frozenset[str]]] = [
+    (
+        "settlement_candidates",
+        lambda s: SettlementService(s, DAILY_CAP, WEEKLY_CAP).select_candidates(),
+        {"ix_accrual_settled_user", "ix_payout_status_created", "ix_accrual_payout"},
+        frozenset(),
+    ),
+    (
+        "cap_status",
+        lambda s: _compute_cap_status(s, _user_id(s), DAILY_CAP, WEEKLY_CAP),
+        {"ix_accrual_settled_user", "ix_accrual_payout", "ix_summary_user_totals"},
+        frozenset(),
+    ),
+    (
+        "leaderboard",
+        lambda s: _build_leaderboard(s, _memo(s), 50, 0),
+        {"ix_payout_status_created", "ix_summary_user_totals"},
+        frozenset({"users"}),  # every player is listed
+    ),
+    (
+        "feed",
+        lambda s: _build_feed(s, _memo(s), 30),
+        {"ix_accrual_created", "ix_payout_created"},
+        frozenset(),
+    ),
+    ("total_paid_out", get_total_paid_out, {"ix_payout_status_created"}, frozenset()),
+    (
+        "donor_leaderboard",
+        get_donation_leaderboard,
+        {"ix_donation_sender"},
+        frozenset({"sqlite_master"}),  # first schema-registry probe
+    ),
+    ("repair_orphans", repair_orphaned_accruals, {"ix_accrual_settled_user"}, frozenset()),
+    (
+        "repair_underpaid",
+        repair_underpaid_accruals,
+        {"ix_payout_status_created", "ix_accrual_payout"},
+        frozenset(),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    ("run", "expected_indexes", "scannable"),
+    [case[1:] for case in CASES],
+    ids=[case[0] for case in CASES],
+)
+def test_hot_query_uses_indexes(engine, run, expected_indexes, scannable):
+    plan = _plans(engine, run)
+    full_scans = [d for d in plan if (m := BARE_SCAN.match(d)) and m.group(1) not in scannable]
+    assert not full_scans, "\n".join(plan)
+    used = " ".join(plan)
+    missing = {ix for ix in expected_indexes if ix not in used}
+    assert not missing, f"expected {sorted(missing)} in plan:\n" + "\n".join(plan)
+
+
+def test_startup_schema_drops_superseded_indexes():
+    from src.api.app import _ensure_schema_columns
+    from src.lib.observability import get_logger
+
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng)
+    with eng.begin() as conn:  # an existing database created before the keyset indexes
+        conn.exec_driver_sql(
+            "CREATE INDEX ix_accrual_user_created ON reward_accruals (user_id, created_at)"
+        )
+        conn.exec_driver_sql("CREATE INDEX ix_payout_user_created ON payouts (user_id, created_at)")
+        conn.exec_driver_sql("CREATE INDEX ix_accrual_settled ON reward_accruals (settled)")
+    _ensure_schema_columns(eng, get_logger("test"))
+    with eng.connect() as conn:
+        names = set(
+            conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = 'index'").scalars()
+        )
+    assert {"ix_accrual_user_created_id", "ix_accrual_settled_user"} <= names
+    assert not names & {"ix_accrual_user_created", "ix_payout_user_created", "ix_accrual_settled"}
@@ -0,0 +1,42 @@
+"""Unit tests for the read-only engine beside the writer."""
+
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from src.lib.db import make_engine, make_read_engine
+
+
+def test_sqlite_file_reader_is_query_only_and_writer_uses_wal(tmp_path):
+    writer = make_engine(f"sqlite:///{tmp_path / 'p2s.db'}")
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO t (id) VALUES (1)"))
+    reader = make_read_engine(writer, replica_url="")
+    assert reader is not None
+    with writer.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    with reader.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        with pytest.raises(OperationalError, match="readonly"):
+            conn.execute(text("INSERT INTO t (id) VALUES (2)"))
+
+
+def test_compat_profile_keeps_its_journal_and_shares_the_writer(tmp_path):
+    writer = make_engine(f"sqlite:///{tmp_path / 'p2s.db'}", profile="compat")
+    assert make_read_engine(writer, replica_url="") is None
+    with writer.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+
+
+def test_in_memory_and_unreplicated_servers_share_the_writer():
+    assert make_read_engine(make_engine("sqlite://"), replica_url="") is None
+
+
+def test_replica_url_wins(tmp_path):
+    writer = make_engine("sqlite://")
+    reader = make_read_engine(writer, replica_url=f"sqlite:///{tmp_path / 'replica.db'}")
+    assert reader is not None
+    assert reader.url.database == str(tmp_path / "replica.db")
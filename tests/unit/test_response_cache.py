@@ -0,0 +1,78 @@
+from src.lib import events
+from src.lib.response_cache import (
+    ROUTE_DONATIONS,
+    ROUTE_FEED,
+    ROUTE_HODL_TIERS,
+    ROUTE_LEADERBOARD,
+    ResponseCache,
+)
+
+EXPECTED_MISSES = 2
+MAX_BYTES = 10
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hit_miss_and_ttl_expiry():
+    clock = FakeClock()
+    cache = ResponseCache(ttls={ROUTE_FEED: 10.0}, clock=clock)
+    assert cache.get(ROUTE_FEED, "30") is None
+    assert cache.put(ROUTE_FEED, "30", b'{"a":1}')
+    assert cache.get(ROUTE_FEED, "30") == b'{"a":1}'
+    clock.now += 11
+    assert cache.get(ROUTE_FEED, "30") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == EXPECTED_MISSES
+    assert stats["routes"][ROUTE_FEED]["hit_ratio"] == 1 / 3
+
+
+def test_routes_without_ttl_are_not_cached():
+    cache = ResponseCache(ttls={})
+    assert not cache.put(ROUTE_FEED, "30", b"{}")
+    assert cache.get(ROUTE_FEED, "30") is None
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(ttls={ROUTE_LEADERBOARD: 60.0}, max_entries=2, max_bytes=MAX_BYTES)
+    cache.put(ROUTE_LEADERBOARD, "a", b"1234")
+    cache.put(ROUTE_LEADERBOARD, "b", b"1234")
+    assert cache.get(ROUTE_LEADERBOARD, "a") is not None  # "a" becomes most recent
+    cache.put(ROUTE_LEADERBOARD, "c", b"1234")
+    assert cache.get(ROUTE_LEADERBOARD, "b") is None
+    assert cache.get(ROUTE_LEADERBOARD, "a") is not None
+    cache.put(ROUTE_LEADERBOARD, "d", b"123456789")
+    assert cache.stats()["bytes"] <= MAX_BYTES
+
+
+def test_events_invalidate_only_affected_routes():
+    cache = ResponseCache(
+        ttls={ROUTE_LEADERBOARD: 60.0, ROUTE_DONATIONS: 60.0, ROUTE_HODL_TIERS: 60.0}
+    )
+    unsubscribe = events.subscribe(events.ALL_TOPICS, cache.on_event)
+    try:
+        cache.put(ROUTE_LEADERBOARD, "50:0", b"{}")
+        cache.put(ROUTE_DONATIONS, "", b"{}")
+        cache.put(ROUTE_HODL_TIERS, "", b"{}")
+        events.publish(events.TOPIC_ACCRUAL, accruals_created=1)
+        assert cache.get(ROUTE_LEADERBOARD, "50:0") is None
+        assert cache.get(ROUTE_DONATIONS, "") == b"{}"
+        events.publish(events.TOPIC_DONATION, source="test")
+        assert cache.get(ROUTE_DONATIONS, "") is None
+        assert cache.get(ROUTE_HODL_TIERS, "") == b"{}"
+    finally:
+        unsubscribe()
+
+
+def test_put_after_invalidation_is_discarded():
+    cache = ResponseCache(ttls={ROUTE_FEED: 60.0})
+    generation = cache.generation(ROUTE_FEED)
+    cache.invalidate([ROUTE_FEED])  # scheduler committed while the miss was rendering
+    assert not cache.put(ROUTE_FEED, "30", b"stale", generation=generation)
+    assert cache.get(ROUTE_FEED, "30") is None
@@ -0,0 +1,194 @@
+"""Unit tests for the retention pipeline (daily summaries + NDJSON archive)."""
+
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.api.leaderboard import _build_leaderboard, _CapStatusMemo, _compute_cap_status
+from src.models import models  # noqa: F401
+from src.models.base import Base
+from src.models.models import (
+    AdminAudit,
+    Payout,
+    RewardAccrual,
+    User,
+    UserDailySummary,
+    VerificationRecord,
+)
+from src.services.domain.donation_service import get_total_paid_out
+from src.services.domain.retention_service import RetentionJob, RetentionPolicy
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=UTC)
+OLD = (NOW - timedelta(days=120)).replace(tzinfo=None)
+RECENT = (NOW - timedelta(days=2)).replace(tzinfo=None)
+DAILY_CAP, WEEKLY_CAP = 10, 100
+SEEDED_ACCRUALS = 6
+OLD_PAID_ACCRUALS = 2
+
+
+@pytest.fixture()
+def engine() -> Iterator[Engine]:
+    eng = create_engine("sqlite://")
+    Base.metadata.create_all(eng)
+    with Session(eng) as s:
+        user = User(discord_user_id="ret_user", discord_username="ret")
+        s.add(user)
+        s.flush()
+        old_paid = Payout(
+            user_id=user.id, address="ban_x", amount_ban=Decimal(3), status="sent", created_at=OLD
+        )
+        underpaid = Payout(
+            user_id=user.id, address="ban_x", amount_ban=Decimal(1), status="sent", created_at=OLD
+        )
+        recent_paid = Payout(
+            user_id=user.id,
+            address="ban_x",
+            amount_ban=Decimal(4),
+            status="sent",
+            created_at=RECENT,
+        )
+        s.add_all([old_paid, underpaid, recent_paid])
+        s.flush()
+
+        def accrual(minute: int, amount: int, **kw) -> RewardAccrual:
+            return RewardAccrual(
+                user_id=user.id,
+                kills=amount,
+                amount_ban=Decimal(amount),
+                epoch_minute=minute,
+                **kw,
+            )
+
+        s.add_all(
+            [
+                accrual(1, 1, settled=True, payout_id=old_paid.id, created_at=OLD),
+                accrual(2, 2, settled=True, payout_id=old_paid.id, created_at=OLD),
+                accrual(3, 2, settled=True, payout_id=underpaid.id, created_at=OLD),
+                accrual(4, 4, settled=True, payout_id=recent_paid.id, created_at=RECENT),
+                accrual(5, 5, settled=True, created_at=OLD),  # orphan: repair re-pays it
+                accrual(6, 6, created_at=OLD),  # unsettled
+            ]
+        )
+        s.add_all(
+            [
+                VerificationRecord(
+                    user_id=user.id,
+                    discord_user_id="ret_user",
+                    source="discord_oauth",
+                    status="ok",
+                    created_at=OLD,
+                ),
+                VerificationRecord(
+                    user_id=user.id,
+                    discord_user_id="ret_user",
+                    source="yunite_sync",
+                    status="ok",
+                    created_at=OLD,
+                ),
+                AdminAudit(action="old", created_at=OLD),
+                AdminAudit(action="new", created_at=RECENT),
+            ]
+        )
+        s.commit()
+    yield eng
+    eng.dispose()
+
+
+def _snapshot(session: Session) -> tuple[dict, dict, Decimal]:
+    user_id = session.query(User.id).scalar()
+    board = _build_leaderboard(session, _CapStatusMemo(session, (DAILY_CAP, WEEKLY_CAP)), 50, 0)
+    cap = _compute_cap_status(session, user_id, DAILY_CAP, WEEKLY_CAP)
+    return board["players"][0], cap, get_total_paid_out(session)
+
+
+def _job(session: Session, tmp_path: Path, batch_size: int = 1) -> RetentionJob:
+    policy = RetentionPolicy(retention_days=30, batch_size=batch_size, archive_dir=tmp_path)
+    return RetentionJob(session, policy, now=lambda: NOW)
+
+
+def _count(session: Session, model) -> int:
+    return session.query(func.count(model.id)).scalar()
+
+
+def test_prune_keeps_totals_exact_and_archives_rows(engine, tmp_path):
+    with Session(engine) as s:
+        before = _snapshot(s)
+        report = _job(s, tmp_path).run()
+
+        assert report.archived == {
+            "payouts": 1,
+            "reward_accruals": OLD_PAID_ACCRUALS,
+            "verification_records": 1,
+            "admin_audit": 1,
+        }
+        assert report.batches == len(report.archived) - 1  # batch_size=1; accruals ride along
+        assert _snapshot(s) == before
+
+        summary = s.query(UserDailySummary).one()
+        assert (summary.kills, summary.accrual_count, summary.payout_count) == (3, 2, 1)
+        assert summary.paid_ban == Decimal(3)
+        # Underpaid, recent, orphaned and unsettled accruals stay live.
+        assert _count(s, RewardAccrual) == SEEDED_ACCRUALS - OLD_PAID_ACCRUALS
+        assert s.query(Payout.amount_ban).order_by(Payout.id).all() == [(1,), (4,)]
+        assert s.query(VerificationRecord.source).scalar() == "yunite_sync"
+        assert s.query(AdminAudit.action).scalar() == "new"
+
+    archived = tmp_path / "reward_accruals"
+    (path,) = archived.iterdir()
+    with gzip.open(path, "rt", encoding="utf-8") as fh:
+        rows = [json.loads(line) for line in fh]
+    assert sorted(r["epoch_minute"] for r in rows) == [1, 2]
+
+
+def test_second_run_merges_into_existing_summary(engine, tmp_path):
+    with Session(engine) as s:
+        _job(s, tmp_path).run()
+        user_id = s.query(User.id).scalar()
+        payout = Payout(
+            user_id=user_id, address="ban_x", amount_ban=Decimal(7), status="sent", created_at=OLD
+        )
+        s.add(payout)
+        s.flush()
+        s.add(
+            RewardAccrual(
+                user_id=user_id,
+                kills=7,
+                amount_ban=Decimal(7),
+                epoch_minute=9,
+                settled=True,
+                payout_id=payout.id,
+                created_at=OLD,
+            )
+        )
+        s.commit()
+        before = _snapshot(s)
+        _job(s, tmp_path, batch_size=100).run()
+        assert _snapshot(s) == before
+        summary = s.query(UserDailySummary).one()
+        assert (summary.kills, summary.payout_count) == (10, 2)
+
+
+def test_dry_run_reports_without_writing(engine, tmp_path):
+    with Session(engine) as s:
+        report = _job(s, tmp_path).run(dry_run=True)
+        assert report.archived["payouts"] == 1
+        assert report.archived["reward_accruals"] == OLD_PAID_ACCRUALS
+        assert report.batches == 0
+        assert _count(s, RewardAccrual) == SEEDED_ACCRUALS
+        assert _count(s, UserDailySummary) == 0
+    assert not any(tmp_path.iterdir())
+
+
+def test_policy_never_reaches_into_cap_windows():
+    with pytest.raises(ValueError, match="retention_days"):
+        RetentionPolicy(retention_days=7)
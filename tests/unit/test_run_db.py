@@ -0,0 +1,33 @@
+"""Unit tests for ``run_db``, which async public routes use for their DB work."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from src.api.deps import run_db
+
+
+class _Session:
+    closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+async def test_run_db_uses_a_threadpool_session_on_the_read_engine():
+    writer, reader = _Session(), _Session()
+    state = SimpleNamespace(session_factory=lambda: writer, read_session_factory=lambda: reader)
+    request = SimpleNamespace(app=SimpleNamespace(state=state))
+
+    result = await run_db(request, lambda db: db is reader)  # type: ignore[arg-type]
+    assert result is True
+    assert reader.closed and not writer.closed
+
+
+async def test_run_db_falls_back_to_the_writer_without_a_read_engine():
+    session = _Session()
+    state = SimpleNamespace(session_factory=lambda: session)
+    request = SimpleNamespace(app=SimpleNamespace(state=state))
+
+    assert await run_db(request, lambda db: db is session) is True  # type: ignore[arg-type]
+    assert session.closed
@@ -0,0 +1,98 @@
+"""Unit tests for the in-memory runtime overrides service."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+from datetime import date
+
+import pytest
+
+from src.lib.runtime_overrides import MIN_INTERVAL_SECONDS, OverridesSnapshot, RuntimeOverrides
+
+CHECK_SECONDS = 5.0
+DAILY, WEEKLY = 100, 500
+OVERRIDE_DAILY = 40
+ACCRUAL_IV = 90
+PROMO_DAILY = 200
+PROMO_DAY = date(2026, 2, 18)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make(tmp_path, clock, today=lambda: date(2026, 1, 1)):
+    path = tmp_path / "overrides.json"
+    return path, RuntimeOverrides(path, check_interval=CHECK_SECONDS, clock=clock, today=today)
+
+
+def test_missing_file_means_defaults(tmp_path):
+    _, ovr = _make(tmp_path, FakeClock())
+    snap = ovr.snapshot()
+    assert snap.payout is None
+    assert snap.caps(DAILY, WEEKLY) == (DAILY, WEEKLY)
+    assert snap.intervals(1200) == {
+        "accrual_interval_seconds": 1200,
+        "settlement_interval_seconds": 1200,
+    }
+
+
+def test_reads_file_only_when_stamp_changes(tmp_path, monkeypatch):
+    clock = FakeClock()
+    path, ovr = _make(tmp_path, clock)
+    path.write_text(json.dumps({"payout": {"daily_kill_cap": OVERRIDE_DAILY}}))
+    reads = []
+    original = RuntimeOverrides._read
+    monkeypatch.setattr(RuntimeOverrides, "_read", lambda self: reads.append(1) or original(self))
+
+    first = ovr.snapshot()
+    assert first.caps(DAILY, WEEKLY) == (OVERRIDE_DAILY, WEEKLY)
+    for _ in range(10):
+        assert ovr.snapshot() is first
+    clock.now += CHECK_SECONDS
+    assert ovr.snapshot() is first  # re-stat, unchanged file: no re-read
+    assert len(reads) == 1
+
+    # Another process replaces the file (new inode); picked up after the check interval.
+    tmp = tmp_path / "new.json"
+    tmp.write_text(json.dumps({"accrual_interval_seconds": 10}))
+    tmp.replace(path)
+    assert ovr.snapshot() is first
+    clock.now += CHECK_SECONDS
+    assert ovr.snapshot().intervals(1200)["accrual_interval_seconds"] == MIN_INTERVAL_SECONDS
+
+
+def test_update_writes_through_and_reloads_immediately(tmp_path):
+    path, ovr = _make(tmp_path, FakeClock())
+    before = ovr.snapshot()
+    after = ovr.update(lambda cur: cur.update(accrual_interval_seconds=ACCRUAL_IV))
+    assert after.version > before.version
+    assert after.accrual_interval_seconds == ACCRUAL_IV
+    assert json.loads(path.read_text()) == {"accrual_interval_seconds": ACCRUAL_IV}
+    assert ovr.snapshot() is after
+
+
+def test_snapshot_is_immutable():
+    snap = OverridesSnapshot.parse({"payout": {"ban_per_kill": "bad"}})
+    assert snap.ban_per_kill is None
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        snap.daily_kill_cap = 1  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        snap.data["payout"] = {}  # type: ignore[index]
+
+
+def test_promo_resolved_once_per_day(tmp_path, monkeypatch):
+    monkeypatch.setenv("P2S_LUNAR_NEW_YEAR", "1")
+    day = {"today": date(2026, 2, 16)}
+    _, ovr = _make(tmp_path, FakeClock(), today=lambda: day["today"])
+    assert ovr.snapshot().promo is None
+    day["today"] = PROMO_DAY
+    snap = ovr.snapshot()
+    assert snap.promo is not None
+    assert snap.effective_caps(DAILY, WEEKLY)[0] == PROMO_DAILY
+    assert ovr.snapshot() is snap
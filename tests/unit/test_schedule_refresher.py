@@ -0,0 +1,45 @@
+"""Unit tests for the in-memory scheduler schedule behind Cache-Control max-age."""
+
+from __future__ import annotations
+
+import time
+
+from src.lib import http_cache
+
+INTERVAL = 600
+CEILING = 30.0
+LONG_WAIT = 3600.0
+TOTAL_READS = 3  # initial refresh, explicit refresh, direct read once stopped
+
+
+def test_request_paths_read_the_refreshed_copy_only(monkeypatch):
+    reads: list[float] = []
+    now = time.time()
+
+    def heartbeat() -> dict[str, float]:
+        reads.append(now)
+        return {
+            "ts": now,
+            "accrual_interval_seconds": INTERVAL,
+            "settlement_interval_seconds": INTERVAL,
+            "last_accrual_ts": now - len(reads),
+            "last_settlement_ts": now,
+        }
+
+    monkeypatch.setattr(http_cache, "read_heartbeat", heartbeat)
+    http_cache.start_schedule_refresher(interval=LONG_WAIT)
+    try:
+        for _ in range(5):
+            assert http_cache.max_age_until_next_cycle(CEILING) == CEILING
+        first = http_cache.read_schedule()
+        assert len(reads) == 1  # the refresher's initial read; handlers never hit DB/disk
+
+        http_cache.refresh_heartbeat()
+        second = http_cache.read_schedule()
+        assert first is not None and second is not None
+        assert second.version != first.version
+    finally:
+        http_cache.stop_schedule_refresher()
+
+    http_cache.read_schedule()
+    assert len(reads) == TOTAL_READS  # no refresher: read directly
@@ -0,0 +1,195 @@
+"""Unit tests for the scheduler control channel (command queue, progress, heartbeat)."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.jobs.__main__ import _claim_commands, _dispatch_command, _LoopState
+from src.jobs.phases import Phase, PhaseRuntime
+from src.lib.db import make_engine, make_session_factory
+from src.lib.scheduler_control import (
+    ACTION_ACCRUE,
+    ACTION_RELOAD,
+    ACTION_SETTLE,
+    ACTION_TRIGGER,
+    STATUS_DONE,
+    STATUS_ERROR,
+    STATUS_PENDING,
+    STATUS_RUNNING,
+    Command,
+    CommandProgress,
+    ControlChannel,
+    DbControlChannel,
+    LocalControlChannel,
+)
+from src.models.models import SchedulerCommand
+
+WAIT = 5.0
+PAYOUTS = 3
+NEVER = 1e9
+STALE_SECONDS = 60.0
+
+
+@pytest.fixture()
+def factory(tmp_path: Path) -> Iterator[sessionmaker[Session]]:
+    engine = make_engine(f"sqlite:///{tmp_path / 'control.db'}")
+    yield make_session_factory(engine)
+    engine.dispose()
+
+
+def _wait_finished(channel, command_id: int):
+    deadline = time.monotonic() + WAIT
+    while time.monotonic() < deadline:
+        command = channel.get(command_id)
+        if command is not None and command.finished:
+            return command
+        time.sleep(0.01)
+    raise AssertionError("command never finished")
+
+
+def test_local_submit_wakes_and_is_claimed_once():
+    channel = LocalControlChannel()
+    command = channel.submit(ACTION_SETTLE, requested_by="ops@example.com")
+    assert channel.wake.is_set()
+    (claimed,) = channel.claim("leader")
+    assert claimed.id == command.id
+    assert claimed.status == STATUS_RUNNING
+    assert channel.claim("leader") == []
+    with pytest.raises(ValueError, match="action"):
+        channel.submit("explode")
+
+
+def test_incomplete_transport_fails_when_created():
+    class ClaimOnly(ControlChannel):
+        def claim(self, holder: str) -> list[Command]:
+            return []
+
+    with pytest.raises(TypeError, match="abstract"):
+        ClaimOnly()  # type: ignore[abstract]
+
+
+def test_db_claim_is_exclusive_and_progress_round_trips(factory):
+    api, leader, follower = (DbControlChannel(factory) for _ in range(3))
+    command = api.submit(ACTION_TRIGGER, requested_by="ops@example.com")
+    (claimed,) = leader.claim("leader")
+    assert follower.claim("follower") == []
+
+    progress = CommandProgress(leader, claimed, ["accrual", "settlement"])
+    progress.waiter("accrual")({"users_considered": 2}, None)
+    assert api.get(command.id).status == STATUS_RUNNING
+    progress.waiter("settlement")(None, "node down")
+
+    seen = api.get(command.id)
+    assert seen.status == STATUS_ERROR
+    assert seen.claimed_by == "leader"
+    assert seen.progress["accrual"] == {"status": "ok", "users_considered": 2}
+    assert seen.error == "settlement: node down"
+    assert seen.finished_at is not None
+    assert api.get(command.id + 1) is None
+
+
+def test_commands_of_a_dead_or_deposed_claimer_are_failed(factory):
+    api = DbControlChannel(factory)
+    old_leader = DbControlChannel(factory, stale_seconds=STALE_SECONDS)
+    new_leader = DbControlChannel(factory, stale_seconds=STALE_SECONDS)
+    settle = api.submit(ACTION_SETTLE)
+    trigger = api.submit(ACTION_TRIGGER)
+    stuck, _ = old_leader.claim("old-leader")
+    live = api.submit(ACTION_ACCRUE)
+    (own,) = new_leader.claim("new-leader")
+    assert own.id == live.id
+    assert api.get(settle.id).status == STATUS_RUNNING  # no progress missed yet
+
+    with factory() as session:  # the old leader's last progress is a lease TTL ago
+        session.execute(
+            update(SchedulerCommand)
+            .where(SchedulerCommand.claimed_by.is_not(None))
+            .values(updated_at=datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=1))
+        )
+        session.commit()
+    assert new_leader.claim("new-leader") == []
+
+    for command_id in (settle.id, trigger.id):
+        failed = api.get(command_id)
+        assert failed.status == STATUS_ERROR and failed.finished_at is not None
+        assert "old-leader" in failed.error
+    assert api.get(own.id).status == STATUS_RUNNING  # the claimer's own long run is left alone
+
+    stuck.status = STATUS_DONE  # a late update from the deposed leader
+    old_leader.update(stuck)
+    assert api.get(settle.id).status == STATUS_ERROR
+
+
+def test_db_heartbeat_visible_to_other_processes(factory):
+    scheduler, api = DbControlChannel(factory), DbControlChannel(factory)
+    assert api.last_heartbeat() is None
+    scheduler.beat({"status": "ok", "ts": 1.0})
+    scheduler.beat({"status": "ok", "ts": 2.0})
+    api._heartbeat_cache = (0.0, None)  # skip the read cache
+    assert api.last_heartbeat() == {"status": "ok", "ts": 2.0}
+
+
+def test_reload_finishes_without_running_phases():
+    channel = LocalControlChannel()
+    runtime = PhaseRuntime(sessionmaker(), [], wake=channel.wake)
+    command = channel.submit(ACTION_RELOAD)
+    for claimed in channel.claim("leader"):
+        _dispatch_command(runtime, channel, claimed)
+    assert channel.get(command.id).status == STATUS_DONE
+
+
+def test_dispatch_runs_requested_phase_out_of_schedule(factory):
+    channel = LocalControlChannel()
+    ran: list[str] = []
+
+    def settle(session: Session) -> dict[str, int]:
+        ran.append("settlement")
+        return {"payouts": PAYOUTS}
+
+    phases = [
+        Phase("accrual", lambda s: ran.append("accrual"), lambda: NEVER),
+        Phase("settlement", settle, lambda: NEVER),
+    ]
+    runtime = PhaseRuntime(factory, phases, wake=channel.wake, clock=lambda: 0.0)
+    assert runtime.tick() > WAIT  # nothing due on its own
+
+    command = channel.submit(ACTION_SETTLE)
+    for claimed in channel.claim("leader"):
+        _dispatch_command(runtime, channel, claimed)
+    runtime.tick()
+
+    done = _wait_finished(channel, command.id)
+    assert done.status == STATUS_DONE
+    assert done.progress["settlement"] == {"status": "ok", "payouts": PAYOUTS}
+    assert ran == ["settlement"]
+
+
+def test_dispatch_fails_actions_this_scheduler_cannot_run(factory):
+    channel = LocalControlChannel()
+    runtime = PhaseRuntime(factory, [Phase("settlement", lambda s: None, lambda: NEVER)])
+    command = channel.submit(ACTION_ACCRUE)
+    for claimed in channel.claim("shard"):
+        _dispatch_command(runtime, channel, claimed)
+    assert channel.get(command.id).status == STATUS_ERROR
+
+
+def test_shard_instance_leaves_admin_commands_to_the_leader(factory):
+    api, shard_channel, leader_channel = (DbControlChannel(factory) for _ in range(3))
+    command = api.submit(ACTION_SETTLE, requested_by="ops@example.com")
+    shard = PhaseRuntime(factory, [Phase("accrual", lambda s: None, lambda: NEVER)])
+
+    assert _claim_commands(shard, shard_channel, _LoopState(accrual_only=True)) == []
+    assert api.get(command.id).status == STATUS_PENDING
+
+    leader = PhaseRuntime(factory, [Phase("settlement", lambda s: None, lambda: NEVER)])
+    (claimed,) = _claim_commands(leader, leader_channel, _LoopState())
+    assert claimed.id == command.id
+    leader.tick()
+    assert _wait_finished(api, command.id).status == STATUS_DONE
@@ -0,0 +1,45 @@
+"""Unit tests for the per-engine schema capability cache."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.lib.schema_registry import SCHEMA_PROBES, refresh_schema, schema_for
+from src.services.domain.donation_service import get_total_donated, record_donation
+
+
+def _probes() -> float:
+    return SCHEMA_PROBES._value.get()
+
+
+def test_probes_once_per_engine_until_refreshed():
+    engine = create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE widgets (id INTEGER PRIMARY KEY, name TEXT)"))
+    before = _probes()
+    caps = schema_for(engine)
+    assert caps.has_table("widgets")
+    assert caps.has_column("widgets", "name")
+    assert not caps.has_column("widgets", "colour")
+    with engine.connect() as conn:
+        assert schema_for(conn) is caps
+    assert _probes() == before + 1
+
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE widgets ADD COLUMN colour TEXT"))
+    assert not schema_for(engine).has_column("widgets", "colour")
+    assert refresh_schema(engine).has_column("widgets", "colour")
+
+
+def test_donation_helpers_do_not_reflect_per_call():
+    engine = create_engine("sqlite://")
+    session = Session(engine)
+    schema_for(engine)
+    before = _probes()
+    for _ in range(5):
+        assert record_donation(session, amount_ban=Decimal(1)) is None  # table missing: no-op
+        assert get_total_donated(session) == 0
+    assert _probes() == before
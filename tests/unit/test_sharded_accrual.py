@@ -0,0 +1,112 @@
+"""Unit tests for sharded accrual (user-id slices, pool coordinator, rate budget split)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.jobs.accrual import METRIC_ACCRUAL_USERS, AccrualJobConfig, ShardSpec, accrue_users
+from src.jobs.lease import LeaderLease, LeaseLostError
+from src.jobs.sharding import merge_shard_results, run_shard, run_sharded_accrual, shard_tasks
+from src.lib import events
+from src.lib.db import make_engine, make_session_factory
+from src.models.base import Base
+from src.models.models import RewardAccrual, User, WalletLink
+from src.services.fortnite_service import FortniteService, KillsDelta
+
+USERS = 7
+SHARDS = 3
+DELTA = 2
+PER_MINUTE = 90
+MERGED_SHARDS = 80
+
+
+class FixedDeltaFortnite(FortniteService):
+    def __init__(self) -> None:  # type: ignore[super-init-not-called]
+        self._dry_run = False
+
+    def get_kills_since(self, epic_account_id: str, cursor: str | None):  # type: ignore[override]
+        prev = int(cursor) if cursor and cursor.isdigit() else 0
+        return KillsDelta(epic_account_id, cursor, str(prev + DELTA), DELTA)
+
+
+@pytest.fixture()
+def db(tmp_path: Path) -> Iterator[tuple[str, sessionmaker[Session]]]:
+    url = f"sqlite:///{tmp_path / 'shards.db'}"
+    engine = make_engine(url)
+    Base.metadata.create_all(engine)
+    factory = make_session_factory(engine)
+    with factory() as s:
+        for i in range(USERS):
+            user = User(discord_user_id=f"shard_u{i}", epic_account_id=f"epic{i}")
+            s.add(user)
+            s.flush()
+            s.add(WalletLink(user_id=user.id, address=f"ban_shard_{i}", verified=True))
+        s.commit()
+    yield url, factory
+    engine.dispose()
+
+
+def _fortnite() -> FortniteService:
+    return FortniteService(api_key="k", per_minute_limit=PER_MINUTE, dry_run=True)
+
+
+def test_shard_spec_parse():
+    assert ShardSpec.parse("1/4") == ShardSpec(1, 4)
+    assert str(ShardSpec(2, 3)) == "2/3"
+    for bad in ("4/4", "1", "-1/2", "0/0"):
+        with pytest.raises(ValueError, match="shard"):
+            ShardSpec.parse(bad)
+
+
+def test_shards_partition_users_exactly_once(db):
+    _, factory = db
+    seen: list[int] = []
+    with factory() as s:
+        for i in range(SHARDS):
+            cfg = AccrualJobConfig(dry_run=False, shard=ShardSpec(i, SHARDS))
+            counters, _ = accrue_users(s, FixedDeltaFortnite(), cfg)
+            seen.append(counters["users_considered"])
+        assert sum(seen) == USERS
+        assert min(seen) > 0
+        assert s.query(RewardAccrual.user_id).distinct().count() == USERS
+
+
+def test_tasks_split_rate_budget_and_carry_the_lease(db):
+    url, factory = db
+    lease = LeaderLease(factory, holder="leader")
+    assert lease.acquire()
+    tasks = shard_tasks(url, _fortnite(), AccrualJobConfig(shards=SHARDS), lease=lease)
+    assert [t.accrual_cfg.shard for t in tasks] == [ShardSpec(i, SHARDS) for i in range(SHARDS)]
+    assert {t.fortnite_kwargs["per_minute_limit"] for t in tasks} == {PER_MINUTE // SHARDS}
+    assert {(t.lease_holder, t.lease_token) for t in tasks} == {("leader", lease.token)}
+
+
+def test_worker_stops_when_leader_is_deposed(db):
+    url, factory = db
+    lease = LeaderLease(factory, holder="old")
+    assert lease.acquire()
+    (task, *_) = shard_tasks(url, _fortnite(), AccrualJobConfig(shards=SHARDS), lease=lease)
+    lease.release()
+    assert LeaderLease(factory, holder="new").acquire()
+    with pytest.raises(LeaseLostError):
+        run_shard(task)
+
+
+def test_merge_sums_counters_and_caps_event_rows():
+    part = {"users_considered": 2, "accruals_created": 1, "zero_delta": 1, "total_kills": 3}
+    counters, rows = merge_shard_results([(part, [{"n": i}]) for i in range(MERGED_SHARDS)])
+    assert counters["total_kills"] == part["total_kills"] * MERGED_SHARDS
+    assert len(rows) == events.MAX_EVENT_ROWS
+
+
+def test_pool_coordinator_merges_into_process_metrics(db):
+    url, _ = db
+    before = METRIC_ACCRUAL_USERS._value.get()
+    counters = run_sharded_accrual(url, _fortnite(), AccrualJobConfig(shards=SHARDS))
+    assert counters["users_considered"] == USERS
+    assert counters["zero_delta"] == USERS  # dry-run Fortnite reports no new kills
+    assert METRIC_ACCRUAL_USERS._value.get() - before == USERS
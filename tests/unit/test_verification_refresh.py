@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import json
+
+import httpx
 from sqlalchemy.orm import Session
 
 from src.jobs.verification_refresh import (
     VerificationRefreshConfig,
     run_verification_refresh,
 )
-from src.models.models import User
+from src.models.models import User, VerificationRecord
+from src.services.yunite_service import YUNITE_MAX_BATCH, YuniteService
 
 
 def test_verification_refresh_updates_missing_epic(db_session: Session):  # type: ignore[override]
@@ -19,3 +23,46 @@ def test_verification_refresh_updates_missing_epic(db_session: Session):  # type
     assert res["candidates"] >= 1
     db_session.refresh(u)
     assert u.epic_account_id == "epic_vr_user"
+
+
+def test_verification_refresh_include_linked_relinks_changed_ids(db_session: Session):  # type: ignore[override]
+    stale = User(discord_user_id="vr_relinked", epic_account_id="epic_old")
+    current = User(discord_user_id="vr_current", epic_account_id="epic_vr_current")
+    db_session.add_all([stale, current])
+    db_session.commit()
+    cfg = VerificationRefreshConfig(batch_size=None, include_linked=True)
+    res = run_verification_refresh(db_session, cfg)
+    assert res["yunite_requests"] == -(-res["candidates"] // YUNITE_MAX_BATCH)
+    db_session.refresh(stale)
+    assert stale.epic_account_id == "epic_vr_relinked"
+    records = db_session.query(VerificationRecord).filter_by(source="verification_refresh")
+    assert records.filter_by(user_id=stale.id).count() == 1
+    assert records.filter_by(user_id=current.id).count() == 0
+
+
+def test_yunite_bulk_lookup_chunks_and_parses_one_pass():
+    ids = [f"d{i}" for i in range(YUNITE_MAX_BATCH * 2 + 5)]
+    posts: list[int] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        batch = json.loads(request.content)["userIds"]
+        posts.append(len(batch))
+        linked = [u for u in batch if u.endswith("0")]
+        return httpx.Response(
+            200,
+            json={
+                "users": [{"discord": {"id": u}, "epic": {"epicID": f"E{u}"}} for u in linked],
+                "notLinked": [u for u in batch if u.endswith("1")],
+                "notFound": [u for u in batch if u not in linked and not u.endswith("1")],
+            },
+        )
+
+    yunite = YuniteService(api_key="k", guild_id="g", dry_run=False)
+    yunite.http = httpx.Client(transport=httpx.MockTransport(handler))
+    links = yunite.get_epic_ids_for_discord_many(ids)
+    assert posts == [YUNITE_MAX_BATCH, YUNITE_MAX_BATCH, len(ids) - 2 * YUNITE_MAX_BATCH]
+    assert set(links) == set(ids)
+    assert links["d10"] == "Ed10"
+    assert links["d11"] is None
+    assert links["d12"] is None
+    assert yunite.get_epic_id_for_discord("d20") == "Ed20"